@@ -12,11 +12,15 @@ class DifferenceStats(CumulativeStats):
         uuid: str,
         tracker: str,
         hypixel_data: dict,
-        mode: str='overall'
+        mode: str='overall',
+        rotational_data: rotational.BedwarsRotation | None=None
     ) -> None:
-        rotation_type = rotational.RotationType.from_string(tracker)
-        bedwars_stats_snapshot = rotational.RotationalStatsManager(uuid) \
-            .get_rotational_data(rotation_type)
+        # Fetched once by the command, rather than by every mode's render
+        bedwars_stats_snapshot = rotational_data
+        if bedwars_stats_snapshot is None:
+            rotation_type = rotational.RotationType.from_string(tracker)
+            bedwars_stats_snapshot = rotational.RotationalStatsManager(uuid) \
+                .get_rotational_data(rotation_type)
 
         super().__init__(hypixel_data, bedwars_stats_snapshot.data, strict_mode=mode)
 
@@ -42,8 +42,8 @@ class MilestonesStats(BedwarsStats):
         val_1_until_ratio = val_1_at_ratio - val_1
 
         if self.session is not None:
-            session_val_1 = val_1 - self.session.data.__dict__[key_1]
-            session_val_2 = val_2 - self.session.data.__dict__[key_2]
+            session_val_1 = val_1 - getattr(self.session.data, key_1)
+            session_val_2 = val_2 - getattr(self.session.data, key_2)
 
             val_1_repitition = val_1_until_ratio / (session_val_1 or 1)
 
@@ -17,10 +17,14 @@ class RotationalStats(calctools.CumulativeStats):
         uuid: str,
         rotation_type: rotational.RotationType,
         hypixel_data: dict,
-        mode: str='overall'
+        mode: str='overall',
+        rotational_data: rotational.BedwarsRotation | None=None
     ) -> None:
-        self.rotational_data = rotational.RotationalStatsManager(uuid) \
-            .get_rotational_data(rotation_type)
+        # Fetched once by the command, rather than by every mode's render
+        if rotational_data is None:
+            rotational_data = rotational.RotationalStatsManager(uuid) \
+                .get_rotational_data(rotation_type)
+        self.rotational_data = rotational_data
 
         super().__init__(hypixel_data, self.rotational_data.data, strict_mode=mode)
 
@@ -32,6 +32,7 @@ class Compare(commands.Cog):
         name_1 = player_1 if player_2 else None
         name_2 = player_2 if player_2 else player_1
 
+        await lib.prefetch_player_info([name_1, name_2])
         name_1, uuid_1 = await lib.fetch_player_info(name_1, interaction)
         name_2, uuid_2 = await lib.fetch_player_info(name_2, interaction)
 
@@ -49,7 +50,7 @@ class Compare(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_compare, kwargs)
-        lib.update_command_stats(interaction.user.id, 'compare')
+        await lib.async_update_command_stats(interaction.user.id, 'compare')
 
 
 async def setup(client: commands.Bot) -> None:
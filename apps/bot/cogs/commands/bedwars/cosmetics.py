@@ -25,11 +25,8 @@ class Cosmetics(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        hypixel_data = await lib.fetch_hypixel_data(uuid)
+        name, uuid, hypixel_data, _ = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG, skin_size=None)
         rendered = await render_cosmetics(name, uuid, hypixel_data)
 
         await interaction.edit_original_response(
@@ -37,7 +34,7 @@ class Cosmetics(commands.Cog):
             attachments=[discord.File(rendered, filename='cosmetics.png')]
         )
 
-        lib.update_command_stats(interaction.user.id, 'cosmetics')
+        await lib.async_update_command_stats(interaction.user.id, 'cosmetics')
 
 
 async def setup(client: commands.Bot) -> None:
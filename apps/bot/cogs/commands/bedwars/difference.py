@@ -1,4 +1,3 @@
-import asyncio
 from datetime import datetime, timedelta, timezone
 
 import discord
@@ -31,23 +30,17 @@ class Difference(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG)
 
-        await interaction.followup.send(self.LOADING_MSG)
+        utc_offset = (await lib.async_get_dynamic_reset_time(uuid)).utc_offset
+        manager = lib.AsyncRotationalStatsManager(uuid)
 
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
-
-        utc_offset = rotational.get_dynamic_reset_time(uuid).utc_offset
-        manager = rotational.RotationalStatsManager(uuid)
-
-        rotational_data = manager.get_rotational_data(
+        rotational_data = await manager.get_rotational_data(
             rotational.RotationType.from_string(tracker))
 
         if not rotational_data:
-            manager.initialize_rotational_tracking(hypixel_data)
+            await manager.initialize_rotational_tracking(hypixel_data)
 
             await interaction.edit_original_response(
                 content=f'Historical stats for {lib.fname(name)} will now be tracked.')
@@ -63,11 +56,12 @@ class Difference(commands.Cog):
             "method": tracker,
             "hypixel_data": hypixel_data,
             "skin_model": skin_model,
-            "save_dir": interaction.id
+            "save_dir": interaction.id,
+            "rotational_data": rotational_data
         }
 
         await lib.handle_modes_renders(interaction, render_difference, kwargs)
-        lib.update_command_stats(interaction.user.id, f'difference_{tracker}')
+        await lib.async_update_command_stats(interaction.user.id, f'difference_{tracker}')
 
 
     @difference_group.command(
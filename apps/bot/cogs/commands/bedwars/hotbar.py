@@ -24,18 +24,16 @@ class Hotbar(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        hypixel_data = await lib.fetch_hypixel_data(uuid)
+        name, uuid, hypixel_data, _ = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG, skin_size=None,
+            freshness=lib.RELAXED_FRESHNESS)
         rendered = await render_hotbar(name, uuid, hypixel_data)
         await interaction.edit_original_response(
             content=None,
             attachments=[discord.File(rendered, filename="hotbar.png")]
         )
 
-        lib.update_command_stats(interaction.user.id, 'hotbar')
+        await lib.async_update_command_stats(interaction.user.id, 'hotbar')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -6,7 +6,6 @@ from discord.ext import commands
 
 import statalib as lib
 from render.milestones import render_milestones
-from statalib.sessions import SessionManager
 
 
 class Milestones(commands.Cog):
@@ -41,7 +40,7 @@ class Milestones(commands.Cog):
         if session == 0:  # Use no session if `0` is specified.
             session_info = None
         else:
-            session_info = SessionManager(uuid).get_session(session)
+            session_info = await lib.AsyncSessionManager(uuid).get_session(session)
 
             # Specified session doesn't exist
             if session_info is None and session is not None:
@@ -67,7 +66,7 @@ class Milestones(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_milestones, kwargs)
-        lib.update_command_stats(interaction.user.id, 'milestones')
+        await lib.async_update_command_stats(interaction.user.id, 'milestones')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -24,11 +24,8 @@ class MostPlayed(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        hypixel_data = await lib.fetch_hypixel_data(uuid)
+        name, uuid, hypixel_data, _ = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG, skin_size=None)
 
         rendered = await render_mostplayed(name, uuid, hypixel_data)
         await interaction.edit_original_response(
@@ -36,7 +33,7 @@ class MostPlayed(commands.Cog):
             attachments=[discord.File(rendered, filename='mostplayed.png')]
         )
 
-        lib.update_command_stats(interaction.user.id, 'mostplayed')
+        await lib.async_update_command_stats(interaction.user.id, 'mostplayed')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -1,5 +1,3 @@
-import asyncio
-
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -27,14 +25,8 @@ class Practice(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG)
 
         rendered = await render_practice(name, uuid, hypixel_data, skin_model)
 
@@ -43,7 +35,7 @@ class Practice(commands.Cog):
             attachments=[discord.File(rendered, filename='practice.png')]
         )
 
-        lib.update_command_stats(interaction.user.id, 'practice')
+        await lib.async_update_command_stats(interaction.user.id, 'practice')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -1,5 +1,3 @@
-import asyncio
-
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -37,14 +35,8 @@ class Projection(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG)
 
         session_info = await lib.find_dynamic_session_interaction(
             interaction_callback=interaction.edit_original_response,
@@ -75,7 +67,7 @@ class Projection(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_projection, kwargs)
-        lib.update_command_stats(interaction.user.id, 'projection')
+        await lib.async_update_command_stats(interaction.user.id, 'projection')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -25,10 +25,8 @@ class Resources(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-        hypixel_data = await lib.fetch_hypixel_data(uuid)
+        name, uuid, hypixel_data, _ = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG, skin_size=None)
 
         kwargs = {
             "name": name,
@@ -38,7 +36,7 @@ class Resources(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_resources, kwargs)
-        lib.update_command_stats(interaction.user.id, 'resources')
+        await lib.async_update_command_stats(interaction.user.id, 'resources')
 
 
 async def setup(client: commands.Bot) -> None:
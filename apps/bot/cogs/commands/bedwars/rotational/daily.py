@@ -28,23 +28,17 @@ class Daily(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG)
 
-        await interaction.followup.send(self.LOADING_MSG)
+        manager = lib.AsyncRotationalStatsManager(uuid)
+        reset_time = await lib.async_get_dynamic_reset_time(uuid)
 
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
-
-        manager = rotational.RotationalStatsManager(uuid)
-        reset_time = rotational.get_dynamic_reset_time(uuid)
-
-        rotational_data = manager.get_rotational_data(
+        rotational_data = await manager.get_rotational_data(
             rotational.RotationType.from_string('daily'))
 
         if not rotational_data:
-            manager.initialize_rotational_tracking(hypixel_data)
+            await manager.initialize_rotational_tracking(hypixel_data)
 
             await interaction.edit_original_response(
                 content=f'Historical stats for {lib.fname(name)} will now be tracked.')
@@ -61,10 +55,11 @@ class Daily(commands.Cog):
             "title": "Daily Stats",
             "hypixel_data": hypixel_data,
             "skin_model": skin_model,
-            "save_dir": interaction.id
+            "save_dir": interaction.id,
+            "rotational_data": rotational_data
         }
 
-        if lib.rotational_stats.has_auto_reset_access(uuid):
+        if await lib.async_has_auto_reset_access(uuid):
             # i dont know why this works but it does so dont touch it
             # it doesnt do what i think it does
             next_occurrence = now.replace(
@@ -90,7 +85,7 @@ class Daily(commands.Cog):
             message=message,
             custom_view=lib.tracker_view()
         )
-        lib.update_command_stats(interaction.user.id, 'daily')
+        await lib.async_update_command_stats(interaction.user.id, 'daily')
 
 
     @app_commands.command(
@@ -109,17 +104,19 @@ class Daily(commands.Cog):
         await lib.run_interaction_checks(interaction)
 
         name, uuid = await lib.fetch_player_info(player, interaction)
-        discord_id = lib.uuid_to_discord_id(uuid=uuid)
+        discord_id = await lib.async_uuid_to_discord_id(uuid)
 
-        max_lookback = rotational.get_max_lookback([discord_id, interaction.user.id])
+        # Daily periods past the player's own lookback are folded into their
+        # weekly and monthly periods, so the viewer's plan can't extend it
+        max_lookback = await lib.async_get_max_lookback([discord_id])
 
         if max_lookback is not None and max_lookback < days:
-            embeds = rotational.build_invalid_lookback_embeds(max_lookback)
+            embeds = rotational.build_invalid_lookback_embeds(max_lookback, daily=True)
             await interaction.followup.send(embeds=embeds)
             return
 
         days = max(days, 1)  # Minimum of 1 day
-        reset_time = rotational.get_dynamic_reset_time(uuid)
+        reset_time = await lib.async_get_dynamic_reset_time(uuid)
 
         now = datetime.now(timezone(timedelta(hours=reset_time.utc_offset)))
 
@@ -141,8 +138,8 @@ class Daily(commands.Cog):
             datetime_info=relative_date
         )
 
-        manager = rotational.RotationalStatsManager(uuid)
-        historical_data = manager.get_historical_rotation_data(period_id.to_string())
+        manager = lib.AsyncRotationalStatsManager(uuid)
+        historical_data = await manager.get_historical_rotation_data(period_id.to_string())
 
         if not historical_data:
             await interaction.followup.send(
@@ -170,7 +167,7 @@ class Daily(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_rotational, kwargs)
-        lib.update_command_stats(interaction.user.id, 'lastday')
+        await lib.async_update_command_stats(interaction.user.id, 'lastday')
 
 
 async def setup(client: commands.Bot) -> None:
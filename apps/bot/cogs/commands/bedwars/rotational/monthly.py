@@ -29,23 +29,17 @@ class Monthly(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG)
 
-        await interaction.followup.send(self.LOADING_MSG)
+        manager = lib.AsyncRotationalStatsManager(uuid)
+        reset_time = await lib.async_get_dynamic_reset_time(uuid)
 
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
-
-        manager = rotational.RotationalStatsManager(uuid)
-        reset_time = rotational.get_dynamic_reset_time(uuid)
-
-        rotational_data = manager.get_rotational_data(
+        rotational_data = await manager.get_rotational_data(
             rotational.RotationType.from_string('monthly'))
 
         if not rotational_data:
-            manager.initialize_rotational_tracking(hypixel_data)
+            await manager.initialize_rotational_tracking(hypixel_data)
 
             await interaction.edit_original_response(
                 content=f'Historical stats for {lib.fname(name)} will now be tracked.')
@@ -55,7 +49,7 @@ class Monthly(commands.Cog):
         formatted_date = now.strftime(f"%b {now.day}{lib.ordinal(now.day)}, %Y")
 
 
-        if lib.rotational_stats.has_auto_reset_access(uuid):
+        if await lib.async_has_auto_reset_access(uuid):
             next_occurrence = now.replace(
                 hour=reset_time.reset_hour, minute=0, second=0, microsecond=0)
 
@@ -91,7 +85,8 @@ class Monthly(commands.Cog):
             "title": "Monthly Stats",
             "hypixel_data": hypixel_data,
             "skin_model": skin_model,
-            "save_dir": interaction.id
+            "save_dir": interaction.id,
+            "rotational_data": rotational_data
         }
 
         await lib.handle_modes_renders(
@@ -101,7 +96,7 @@ class Monthly(commands.Cog):
             message=message,
             custom_view=lib.tracker_view()
         )
-        lib.update_command_stats(interaction.user.id, 'monthly')
+        await lib.async_update_command_stats(interaction.user.id, 'monthly')
 
 
     @app_commands.command(
@@ -120,9 +115,9 @@ class Monthly(commands.Cog):
         await lib.run_interaction_checks(interaction)
 
         name, uuid = await lib.fetch_player_info(player, interaction)
-        discord_id = lib.uuid_to_discord_id(uuid=uuid)
+        discord_id = await lib.async_uuid_to_discord_id(uuid)
 
-        max_lookback = rotational.get_max_lookback([discord_id, interaction.user.id])
+        max_lookback = await lib.async_get_max_lookback([discord_id, interaction.user.id])
 
         if max_lookback is not None and max_lookback < (months * 30):
             embeds = rotational.build_invalid_lookback_embeds(max_lookback)
@@ -130,7 +125,7 @@ class Monthly(commands.Cog):
             return
 
         months = max(months, 1)  # Minimum of 1 month
-        reset_time = rotational.get_dynamic_reset_time(uuid)
+        reset_time = await lib.async_get_dynamic_reset_time(uuid)
 
         now = datetime.now(timezone(timedelta(hours=reset_time.utc_offset)))
 
@@ -151,8 +146,8 @@ class Monthly(commands.Cog):
             datetime_info=relative_date
         )
 
-        manager = rotational.RotationalStatsManager(uuid)
-        historical_data = manager.get_historical_rotation_data(period_id.to_string())
+        manager = lib.AsyncRotationalStatsManager(uuid)
+        historical_data = await manager.get_historical_rotation_data(period_id.to_string())
 
         if not historical_data:
             await interaction.followup.send(
@@ -180,7 +175,7 @@ class Monthly(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_rotational, kwargs)
-        lib.update_command_stats(interaction.user.id, 'lastmonth')
+        await lib.async_update_command_stats(interaction.user.id, 'lastmonth')
 
 
 async def setup(client: commands.Bot) -> None:
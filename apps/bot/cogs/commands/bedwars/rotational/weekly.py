@@ -28,23 +28,17 @@ class Weekly(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG)
 
-        await interaction.followup.send(self.LOADING_MSG)
+        manager = lib.AsyncRotationalStatsManager(uuid)
+        reset_time = await lib.async_get_dynamic_reset_time(uuid)
 
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
-
-        manager = rotational.RotationalStatsManager(uuid)
-        reset_time = rotational.get_dynamic_reset_time(uuid)
-
-        rotational_data = manager.get_rotational_data(
+        rotational_data = await manager.get_rotational_data(
             rotational.RotationType.from_string('weekly'))
 
         if not rotational_data:
-            manager.initialize_rotational_tracking(hypixel_data)
+            await manager.initialize_rotational_tracking(hypixel_data)
 
             await interaction.edit_original_response(
                 content=f'Historical stats for {lib.fname(name)} will now be tracked.')
@@ -54,7 +48,7 @@ class Weekly(commands.Cog):
         formatted_date = now.strftime(f"%b {now.day}{lib.ordinal(now.day)}, %Y")
 
 
-        if lib.rotational_stats.has_auto_reset_access(uuid):
+        if await lib.async_has_auto_reset_access(uuid):
             next_occurrence = now.replace(
                 hour=reset_time.reset_hour, minute=0, second=0, microsecond=0)
 
@@ -79,7 +73,8 @@ class Weekly(commands.Cog):
             "title": "Weekly Stats",
             "hypixel_data": hypixel_data,
             "skin_model": skin_model,
-            "save_dir": interaction.id
+            "save_dir": interaction.id,
+            "rotational_data": rotational_data
         }
 
         await lib.handle_modes_renders(
@@ -89,7 +84,7 @@ class Weekly(commands.Cog):
             message=message,
             custom_view=lib.tracker_view()
         )
-        lib.update_command_stats(interaction.user.id, 'weekly')
+        await lib.async_update_command_stats(interaction.user.id, 'weekly')
 
 
     @app_commands.command(
@@ -108,9 +103,9 @@ class Weekly(commands.Cog):
         await lib.run_interaction_checks(interaction)
 
         name, uuid = await lib.fetch_player_info(player, interaction)
-        discord_id = lib.uuid_to_discord_id(uuid=uuid)
+        discord_id = await lib.async_uuid_to_discord_id(uuid)
 
-        max_lookback = rotational.get_max_lookback([discord_id, interaction.user.id])
+        max_lookback = await lib.async_get_max_lookback([discord_id, interaction.user.id])
 
         if max_lookback is not None and max_lookback < (weeks * 7):
             embeds = rotational.build_invalid_lookback_embeds(max_lookback)
@@ -118,7 +113,7 @@ class Weekly(commands.Cog):
             return
 
         weeks = max(weeks, 1)  # Minimum of 1 week
-        reset_time = rotational.get_dynamic_reset_time(uuid)
+        reset_time = await lib.async_get_dynamic_reset_time(uuid)
 
         now = datetime.now(timezone(timedelta(hours=reset_time.utc_offset)))
 
@@ -139,8 +134,8 @@ class Weekly(commands.Cog):
             datetime_info=relative_date
         )
 
-        manager = rotational.RotationalStatsManager(uuid)
-        historical_data = manager.get_historical_rotation_data(period_id.to_string())
+        manager = lib.AsyncRotationalStatsManager(uuid)
+        historical_data = await manager.get_historical_rotation_data(period_id.to_string())
 
         if not historical_data:
             await interaction.followup.send(
@@ -168,7 +163,7 @@ class Weekly(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_rotational, kwargs)
-        lib.update_command_stats(interaction.user.id, 'lastweek')
+        await lib.async_update_command_stats(interaction.user.id, 'lastweek')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -29,23 +29,17 @@ class Yearly(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG)
 
-        await interaction.followup.send(self.LOADING_MSG)
+        manager = lib.AsyncRotationalStatsManager(uuid)
+        reset_time = await lib.async_get_dynamic_reset_time(uuid)
 
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
-
-        manager = rotational.RotationalStatsManager(uuid)
-        reset_time = rotational.get_dynamic_reset_time(uuid)
-
-        rotational_data = manager.get_rotational_data(
+        rotational_data = await manager.get_rotational_data(
             rotational.RotationType.from_string('yearly'))
 
         if not rotational_data:
-            manager.initialize_rotational_tracking(hypixel_data)
+            await manager.initialize_rotational_tracking(hypixel_data)
 
             await interaction.edit_original_response(
                 content=f'Historical stats for {lib.fname(name)} will now be tracked.')
@@ -57,7 +51,7 @@ class Yearly(commands.Cog):
         if reset_time.reset_hour > 0:
             reset_time.reset_hour -= 1  # Idk
 
-        if lib.rotational_stats.has_auto_reset_access(uuid):
+        if await lib.async_has_auto_reset_access(uuid):
             next_occurrence = datetime(
                 year=now.year+1, month=1, day=1, hour=reset_time.reset_hour, minute=0,
                 second=0, tzinfo=timezone(timedelta(hours=reset_time.utc_offset))
@@ -79,7 +73,8 @@ class Yearly(commands.Cog):
             "title": "Yearly Stats",
             "hypixel_data": hypixel_data,
             "skin_model": skin_model,
-            "save_dir": interaction.id
+            "save_dir": interaction.id,
+            "rotational_data": rotational_data
         }
 
         await lib.handle_modes_renders(
@@ -90,7 +85,7 @@ class Yearly(commands.Cog):
             custom_view=lib.tracker_view()
         )
 
-        lib.update_command_stats(interaction.user.id, 'yearly')
+        await lib.async_update_command_stats(interaction.user.id, 'yearly')
 
 
     @app_commands.command(
@@ -109,14 +104,14 @@ class Yearly(commands.Cog):
         await lib.run_interaction_checks(interaction)
 
         name, uuid = await lib.fetch_player_info(player, interaction)
-        discord_id = lib.uuid_to_discord_id(uuid=uuid)
+        discord_id = await lib.async_uuid_to_discord_id(uuid)
 
         years = max(years, 1)  # Minimum of 1 year
 
         # Check if user is within their lookback limitations
         # First checks if a user is checking only 1 year back
         # and then checks if the max lookback days are within the given amount
-        max_lookback = rotational.get_max_lookback([discord_id, interaction.user.id])
+        max_lookback = await lib.async_get_max_lookback([discord_id, interaction.user.id])
 
         if years != 1 and max_lookback is not None and max_lookback < (years * 365):
             embeds = rotational.build_invalid_lookback_embeds(max_lookback)
@@ -124,7 +119,7 @@ class Yearly(commands.Cog):
             return
 
         # Get time / date information
-        reset_time = rotational.get_dynamic_reset_time(uuid)
+        reset_time = await lib.async_get_dynamic_reset_time(uuid)
 
         now = datetime.now(timezone(timedelta(hours=reset_time.reset_hour)))
         try:
@@ -145,8 +140,8 @@ class Yearly(commands.Cog):
         )
 
         # Check if historical data exists
-        manager = rotational.RotationalStatsManager(uuid)
-        historical_data = manager.get_historical_rotation_data(period_id.to_string())
+        manager = lib.AsyncRotationalStatsManager(uuid)
+        historical_data = await manager.get_historical_rotation_data(period_id.to_string())
 
         if not historical_data:
             await interaction.followup.send(
@@ -175,7 +170,7 @@ class Yearly(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_rotational, kwargs)
-        lib.update_command_stats(interaction.user.id, 'lastyear')
+        await lib.async_update_command_stats(interaction.user.id, 'lastyear')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -1,6 +1,5 @@
 """Code that needs to be rewritten"""
 
-import asyncio
 import sqlite3
 
 import discord
@@ -9,7 +8,6 @@ from discord.ext import commands
 
 import statalib as lib
 from render.session import render_session
-from statalib.sessions import SessionManager
 
 
 class ManageSession(lib.CustomBaseView):
@@ -41,12 +39,12 @@ class ManageSession(lib.CustomBaseView):
         button.disabled = True
         await self.message.edit(view=self)
 
-        session_manager = lib.SessionManager(self.uuid)
-        session_manager.delete_session(self.session)
+        session_manager = lib.AsyncSessionManager(self.uuid)
+        await session_manager.delete_session(self.session)
 
         if self.action == "reset":
             hypixel_data = await lib.fetch_hypixel_data(self.uuid)
-            session_manager.create_session(self.session, hypixel_data)
+            await session_manager.create_session(self.session, hypixel_data)
 
             await interaction.followup.send(
                 f'Session `{self.session}` has been reset successfully!', ephemeral=True)
@@ -90,14 +88,8 @@ class Sessions(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG)
 
         session_info = await lib.find_dynamic_session_interaction(
             interaction_callback=interaction.edit_original_response,
@@ -117,7 +109,7 @@ class Sessions(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_session, kwargs)
-        lib.update_command_stats(interaction.user.id, 'session')
+        await lib.async_update_command_stats(interaction.user.id, 'session')
 
 
     @session_group.command(name="start", description="Starts a new session")
@@ -125,7 +117,7 @@ class Sessions(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        uuid = lib.get_linked_player(interaction.user.id)
+        uuid = await lib.async_get_linked_player(interaction.user.id)
 
         if not uuid:
             await interaction.followup.send(
@@ -133,13 +125,12 @@ class Sessions(commands.Cog):
                 "Use `/session stats <player>` to create a session if none exists!")
             return
 
-        session_manager = lib.SessionManager(uuid)
-        active_sessions = session_manager.active_sessions()
+        session_manager = lib.AsyncSessionManager(uuid)
+        active_sessions = await session_manager.active_sessions()
         active_sessions_count = len(active_sessions)
 
-        max_user_sessions = lib.SubscriptionManager(interaction.user.id)\
-            .get_subscription()\
-            .package_property("max_sessions", 2)
+        subscription = (await lib.async_get_entitlements(interaction.user.id)).subscription
+        max_user_sessions = subscription.package_property("max_sessions", 2)
 
         if active_sessions_count >= max_user_sessions:
             await interaction.followup.send(
@@ -156,12 +147,12 @@ class Sessions(commands.Cog):
             session_id = active_sessions_count + 1
 
         hypixel_data = await lib.fetch_hypixel_data(uuid)
-        session_manager.create_session(session_id, hypixel_data)
+        await session_manager.create_session(session_id, hypixel_data)
 
         await interaction.followup.send(
             f'A new session was successfully created! Session ID: `{session_id}`')
 
-        lib.update_command_stats(interaction.user.id, 'startsession')
+        await lib.async_update_command_stats(interaction.user.id, 'startsession')
 
 
     @session_group.command(name="end", description="Ends an active session")
@@ -170,14 +161,14 @@ class Sessions(commands.Cog):
     async def end_session(self, interaction: discord.Interaction, session: int=1):
         await lib.run_interaction_checks(interaction)
 
-        uuid = lib.get_linked_player(interaction.user.id)
+        uuid = await lib.async_get_linked_player(interaction.user.id)
         if not uuid:
             await interaction.response.send_message(
                 "You don't have an account linked! In order to link use `/link`!")
             return
 
-        session_manager = lib.SessionManager(uuid)
-        active_sessions = session_manager.active_sessions()
+        session_manager = lib.AsyncSessionManager(uuid)
+        active_sessions = await session_manager.active_sessions()
 
         if session in active_sessions:
             view = ManageSession(session, uuid, action="delete")
@@ -191,7 +182,7 @@ class Sessions(commands.Cog):
             await interaction.response.send_message(
                 f"You don't have an active session with ID: `{session}`!")
 
-        lib.update_command_stats(interaction.user.id, 'endsession')
+        await lib.async_update_command_stats(interaction.user.id, 'endsession')
 
 
     @session_group.command(name="reset", description="Resets an active session")
@@ -204,13 +195,13 @@ class Sessions(commands.Cog):
     ) -> None:
         await lib.run_interaction_checks(interaction)
 
-        uuid = lib.get_linked_player(interaction.user.id)
+        uuid = await lib.async_get_linked_player(interaction.user.id)
         if not uuid:
             await interaction.response.send_message(
                 "You don't have an account linked! In order to link use `/link`!")
             return
 
-        session_info = SessionManager(uuid).get_session(session)
+        session_info = await lib.AsyncSessionManager(uuid).get_session(session)
         if session_info is None:
             await interaction.response.send_message(
                 f"Couldn't find a session with ID: `{session or 1}`")
@@ -222,7 +213,7 @@ class Sessions(commands.Cog):
             view=view, ephemeral=True)
         view.message = await interaction.original_response()
 
-        lib.update_command_stats(interaction.user.id, 'resetsession')
+        await lib.async_update_command_stats(interaction.user.id, 'resetsession')
 
 
     @session_group.command(name="active", description="View all active sessions")
@@ -230,15 +221,15 @@ class Sessions(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        uuid = lib.get_linked_player(interaction.user.id)
+        uuid = await lib.async_get_linked_player(interaction.user.id)
 
         if not uuid:
             await interaction.followup.send(
                 "You don't have an account linked! In order to link use `/link`!")
             return
 
-        session_manager = lib.SessionManager(uuid)
-        active_sessions = session_manager.active_sessions()
+        session_manager = lib.AsyncSessionManager(uuid)
+        active_sessions = await session_manager.active_sessions()
 
         if active_sessions:
             session_string = ", ".join([str(item) for item in active_sessions])
@@ -248,7 +239,7 @@ class Sessions(commands.Cog):
             await interaction.followup.send(
                 "You don't have any sessions active! Use `/session start` to create one!")
 
-        lib.update_command_stats(interaction.user.id, 'activesessions')
+        await lib.async_update_command_stats(interaction.user.id, 'activesessions')
 
 
 async def setup(client: commands.Bot) -> None:
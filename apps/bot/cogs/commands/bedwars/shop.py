@@ -24,11 +24,8 @@ class Shop(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        hypixel_data = await lib.fetch_hypixel_data(uuid)
+        name, uuid, hypixel_data, _ = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG, skin_size=None)
 
         rendered = await render_shop(name, uuid, hypixel_data)
 
@@ -37,7 +34,7 @@ class Shop(commands.Cog):
             attachments=[discord.File(rendered, filename="shop.png")]
         )
 
-        lib.update_command_stats(interaction.user.id, 'shop')
+        await lib.async_update_command_stats(interaction.user.id, 'shop')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Callable
 
 import discord
@@ -23,14 +22,8 @@ class Total(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG, freshness=lib.RELAXED_FRESHNESS)
 
         kwargs = {
             "name": name,
@@ -41,7 +34,7 @@ class Total(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_func, kwargs)
-        lib.update_command_stats(interaction.user.id, method)
+        await lib.async_update_command_stats(interaction.user.id, method)
 
 
     @app_commands.command(
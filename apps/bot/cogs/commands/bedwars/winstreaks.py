@@ -1,5 +1,3 @@
-import asyncio
-
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -26,14 +24,8 @@ class Winstreaks(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        name, uuid = await lib.fetch_player_info(player, interaction)
-
-        await interaction.followup.send(self.LOADING_MSG)
-
-        skin_model, hypixel_data = await asyncio.gather(
-            lib.fetch_skin_model(uuid, 144),
-            lib.fetch_hypixel_data(uuid)
-        )
+        name, uuid, hypixel_data, skin_model = await lib.fetch_player_bundle(
+            player, interaction, self.LOADING_MSG, freshness=lib.RELAXED_FRESHNESS)
 
         rendered = await render_winstreaks(name, uuid, hypixel_data, skin_model)
 
@@ -42,7 +34,7 @@ class Winstreaks(commands.Cog):
             attachments=[discord.File(rendered, filename='winstreaks.png')]
         )
 
-        lib.update_command_stats(interaction.user.id, 'winstreaks')
+        await lib.async_update_command_stats(interaction.user.id, 'winstreaks')
 
 
 async def setup(client: commands.Bot) -> None:
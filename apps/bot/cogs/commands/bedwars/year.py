@@ -58,7 +58,7 @@ class Year(commands.Cog):
         }
 
         await lib.handle_modes_renders(interaction, render_year, kwargs)
-        lib.update_command_stats(interaction.user.id, f'year_{year}')
+        await lib.async_update_command_stats(interaction.user.id, f'year_{year}')
 
 
     @year_group.command(
@@ -93,11 +93,11 @@ class Year(commands.Cog):
         await interaction.response.defer()
         name, uuid = await lib.fetch_player_info(player, interaction)
 
-        discord_id = lib.uuid_to_discord_id(uuid)
+        discord_id = await lib.async_uuid_to_discord_id(uuid)
 
         # Either command user or checked player has access
-        condition_1 = lib.has_access(discord_id, 'year_2026')
-        condition_2 = lib.has_access(interaction.user.id, 'year_2026')
+        condition_1 = await lib.async_has_access(discord_id, 'year_2026')
+        condition_2 = await lib.async_has_access(interaction.user.id, 'year_2026')
 
         if not condition_1 and not condition_2:
             embeds = lib.load_embeds('2026', color='primary')
@@ -113,7 +113,7 @@ class Denick(commands.Cog):
 
         await interaction.followup.send(embed=embed)
 
-        lib.update_command_stats(interaction.user.id, 'numberdenick')
+        await lib.async_update_command_stats(interaction.user.id, 'numberdenick')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -17,7 +17,7 @@ class Linking(commands.Cog):
     @app_commands.checks.dynamic_cooldown(lib.generic_command_cooldown)
     async def link(self, interaction: discord.Interaction, player: str):
         await lib.linking_interaction(interaction, player)
-        lib.update_command_stats(interaction.user.id, 'link')
+        await lib.async_update_command_stats(interaction.user.id, 'link')
 
 
     @app_commands.command(name="unlink", description="Unlink your account")
@@ -27,7 +27,7 @@ class Linking(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        previous_uuid = lib.delete_linked_data(interaction.user.id)
+        previous_uuid = await lib.async_delete_linked_data(interaction.user.id)
 
         if previous_uuid is None:
             message = "You don't have an account linked! In order to link use `/link`!"
@@ -35,7 +35,7 @@ class Linking(commands.Cog):
             message = 'Successfully unlinked your account!'
 
         await interaction.followup.send(message)
-        lib.update_command_stats(interaction.user.id, 'unlink')
+        await lib.async_update_command_stats(interaction.user.id, 'unlink')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -21,7 +21,7 @@ class Credits(commands.Cog):
         embeds = lib.load_embeds('credits', color='primary')
         await interaction.response.send_message(embeds=embeds)
 
-        lib.update_command_stats(interaction.user.id, 'credits')
+        await lib.async_update_command_stats(interaction.user.id, 'credits')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -20,7 +20,7 @@ class Help(commands.Cog):
         view = lib.HelpMenuButtons()
         await interaction.response.send_message(embeds=embeds, view=view)
 
-        lib.update_command_stats(interaction.user.id, 'help')
+        await lib.async_update_command_stats(interaction.user.id, 'help')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -24,11 +24,11 @@ class Info(commands.Cog):
         await interaction.response.defer()
         await lib.run_interaction_checks(interaction)
 
-        commands_ran = lib.get_commands_total()
-        linked_accounts = lib.get_linked_total()
+        commands_ran = await lib.async_get_commands_total()
+        linked_accounts = await lib.async_get_linked_total()
 
         total_guilds = len(self.client.guilds)
-        total_users = lib.get_user_total()
+        total_users = await lib.async_get_user_total()
 
         with open(f'{lib.REL_PATH}/database/uptime.json') as datafile:
             start_time = load_json(datafile)['start_time']
@@ -77,7 +77,7 @@ class Info(commands.Cog):
         embeds = lib.load_embeds('info', format_values, color='primary')
         await interaction.followup.send(embeds=embeds)
 
-        lib.update_command_stats(discord_id=interaction.user.id, command='info')
+        await lib.async_update_command_stats(discord_id=interaction.user.id, command='info')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -24,7 +24,7 @@ class Premium(commands.Cog):
             view=lib.views.PremiumInfoView()
         )
 
-        lib.update_command_stats(discord_id=interaction.user.id, command='premium')
+        await lib.async_update_command_stats(discord_id=interaction.user.id, command='premium')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -57,7 +57,7 @@ class Suggest(commands.Cog):
         channel = self.client.get_channel(channel_id)
         await interaction.response.send_modal(SubmitSuggestion(channel))
 
-        lib.update_command_stats(interaction.user.id, 'suggest')
+        await lib.async_update_command_stats(interaction.user.id, 'suggest')
 
 
 async def setup(client: commands.Bot) -> None:
@@ -1,4 +1,3 @@
-import sqlite3
 from json import load as load_json
 
 import discord
@@ -22,17 +21,7 @@ class Usage(commands.Cog):
 
         discord_id = interaction.user.id
 
-        with sqlite3.connect(f'{lib.REL_PATH}/database/core.db') as conn:
-            cursor = conn.cursor()
-
-            cursor.execute(
-                f"SELECT * FROM command_usage WHERE discord_id = {discord_id}")
-            command_usage = cursor.fetchone()
-
-            column_names = [desc[0] for desc in cursor.description]
-
-
-        usage_dict = {}
+        command_usage = await lib.async_get_command_usage(discord_id)
 
         if not command_usage:
             embed = discord.Embed(
@@ -42,23 +31,10 @@ class Usage(commands.Cog):
                 color=lib.get_embed_color('primary')
             )
         else:
-            for i, usage in enumerate(command_usage[1:]):
-                if usage:
-                    usage_dict[column_names[i+1]] = usage
-
-            overall = '**Overall - 0**'
+            overall = f'**Overall - {sum(command_usage.values())}**'
             description = []
 
-            sorted_usage = sorted(
-                usage_dict.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )
-
-            for key, value in sorted_usage:
-                if key == 'overall':
-                    overall = f'**Overall - {value}**'
-                    continue
+            for key, value in command_usage.items():
                 command = lib.ASSET_LOADER.command_map.get(key, '/unknown')
                 description.append(f'`{command}` - `{value}`')
 
@@ -74,7 +50,7 @@ class Usage(commands.Cog):
 
         await interaction.followup.send(embed=embed)
 
-        lib.update_command_stats(discord_id, 'usage')
+        await lib.async_update_command_stats(discord_id, 'usage')
 
 
 async def setup(client: commands.Bot) -> None:
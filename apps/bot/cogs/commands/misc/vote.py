@@ -19,7 +19,7 @@ class Vote(commands.Cog):
 
         vote_links = lib.config('global.links.voting')
 
-        voting_data = lib.get_voting_data(interaction.user.id)
+        voting_data = await lib.async_get_voting_data(interaction.user.id)
         if voting_data:
             total_votes = voting_data[1]
             last_vote = voting_data[3]
@@ -48,7 +48,7 @@ class Vote(commands.Cog):
         embeds = lib.load_embeds('vote', format_values, color='primary')
 
         await interaction.followup.send(embeds=embeds)
-        lib.update_command_stats(interaction.user.id, command='vote')
+        await lib.async_update_command_stats(interaction.user.id, command='vote')
 
 
 async def setup(client: commands.Bot) -> None:
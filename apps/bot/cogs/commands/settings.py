@@ -35,7 +35,7 @@ class SettingsSelect(discord.ui.Select):
         if self.placeholder == "Select Theme":
             if value == 'none':
                 value = None
-            lib.set_active_theme(discord_id, value)
+            await lib.async_set_active_theme(discord_id, value)
             await interaction.followup.send('Successfully updated theme!', ephemeral=True)
             return
 
@@ -44,10 +44,12 @@ class SettingsSelect(discord.ui.Select):
             manager = lib.rotational_stats.ConfiguredResetTimeManager(interaction.user.id)
 
             if self.placeholder == 'Select your GMT offset':
-                manager.update(lib.rotational_stats.ResetTime(utc_offset=value))
+                await lib.db_executor.write(
+                    manager.update, lib.rotational_stats.ResetTime(utc_offset=value))
                 message = f'Successfully updated timezone to `GMT{lib.prefix_int(value)}:00`'
             else:
-                manager.update(lib.rotational_stats.ResetTime(reset_hour=value))
+                await lib.db_executor.write(
+                    manager.update, lib.rotational_stats.ResetTime(reset_hour=value))
                 message = f'Successfully updated reset hour to `{HOURS[value]}`'
 
             await interaction.followup.send(message, ephemeral=True)
@@ -113,7 +115,7 @@ class SettingsButtons(lib.CustomBaseView):
 
         embeds = lib.load_embeds('active_theme', color='primary')
 
-        owned_themes = lib.get_owned_themes(interaction.user.id)
+        owned_themes = await lib.async_get_owned_themes(interaction.user.id)
         theme_packs: dict = lib.config('global.theme_packs')
 
         # themes available to anyone through voting
@@ -203,7 +205,7 @@ class Settings(commands.Cog):
         await interaction.followup.send(
             embeds=embeds, view=SettingsButtons(interaction=interaction))
 
-        lib.update_command_stats(interaction.user.id, 'settings')
+        await lib.async_update_command_stats(interaction.user.id, 'settings')
 
 
 async def setup(client: commands.Bot) -> None:
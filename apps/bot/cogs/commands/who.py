@@ -30,7 +30,7 @@ class Who(commands.Cog):
             await interaction.response.send_message(
                 f'Name for **{uuid}** -> `{name}`', ephemeral=True)
 
-        lib.update_command_stats(interaction.user.id, 'who')
+        await lib.async_update_command_stats(interaction.user.id, 'who')
 
 
 async def setup(client: commands.Bot) -> None:
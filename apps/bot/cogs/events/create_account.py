@@ -19,7 +19,7 @@ class CreateAccount(commands.Cog):
         """Create account if it doesnt exist"""
         # logger.debug(
         #     f'Created account for {interaction.user} ({interaction.user.id})')
-        lib.create_account(interaction.user.id)
+        await lib.async_create_account(interaction.user.id)
 
 
 async def setup(client: commands.Bot) -> None:
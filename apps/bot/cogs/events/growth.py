@@ -18,13 +18,13 @@ class Growth(commands.Cog):
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
-        lib.insert_growth_data(guild.id, action='add', growth='guild')
+        await lib.async_insert_growth_data(guild.id, action='add', growth='guild')
         self.update_server_count_file()
 
 
     @commands.Cog.listener()
     async def on_guild_remove(self, guild: discord.Guild):
-        lib.insert_growth_data(guild.id, action='remove', growth='guild')
+        await lib.async_insert_growth_data(guild.id, action='remove', growth='guild')
         self.update_server_count_file()
 
 
@@ -0,0 +1,33 @@
+import asyncio
+
+from discord.ext import commands, tasks
+
+import statalib as lib
+
+
+class CacheMaintenance(commands.Cog):
+    def __init__(self, client):
+        self.client: commands.Bot = client
+
+
+    @tasks.loop(hours=1)
+    async def sweep_caches_loop(self):
+        await lib.sweep_response_caches()
+        await asyncio.to_thread(lib.skin_render_cache.prune)
+
+
+    @sweep_caches_loop.error
+    async def on_sweep_caches_error(self, error):
+        await lib.log_error_msg(self.client, error)
+
+
+    async def cog_load(self):
+        self.sweep_caches_loop.start()
+
+
+    async def cog_unload(self):
+        self.sweep_caches_loop.cancel()
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(CacheMaintenance(client))
@@ -0,0 +1,40 @@
+from discord.ext import commands, tasks
+
+import statalib as lib
+from statalib import rotational_stats as rotational
+
+
+class HistoricalRetention(commands.Cog):
+    def __init__(self, client):
+        self.client: commands.Bot = client
+
+        self.retention = rotational.HistoricalRetention()
+
+
+    @tasks.loop(hours=24)
+    async def compact_historical_loop(self):
+        await self.retention.async_run()
+
+
+    @compact_historical_loop.error
+    async def on_compact_historical_error(self, error):
+        await lib.log_error_msg(self.client, error)
+
+
+    @commands.command()
+    @commands.is_owner()
+    async def retention_report(self, ctx: commands.Context):
+        result = await self.retention.async_run(dry_run=True)
+        await ctx.send(result.summary())
+
+
+    async def cog_load(self):
+        self.compact_historical_loop.start()
+
+
+    async def cog_unload(self):
+        self.compact_historical_loop.cancel()
+
+
+async def setup(client: commands.Bot) -> None:
+    await client.add_cog(HistoricalRetention(client))
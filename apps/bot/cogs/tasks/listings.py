@@ -21,7 +21,7 @@ class Listings(commands.Cog):
         await self.client.wait_until_ready()
 
         guild_count = len(self.client.guilds)
-        total_users = lib.get_user_total()
+        total_users = await lib.async_get_user_total()
 
         client_id = self.client.user.id
 
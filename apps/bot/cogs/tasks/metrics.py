@@ -34,9 +34,9 @@ class Metrics(commands.Cog):
         await self.client.wait_until_ready()
 
         metrics = {
-            'linked': lib.get_linked_total(),
-            'users': lib.get_user_total(),
-            'commands': lib.get_commands_total(),
+            'linked': await lib.async_get_linked_total(),
+            'users': await lib.async_get_user_total(),
+            'commands': await lib.async_get_commands_total(),
             'servers': len(self.client.guilds)
         }
 
@@ -28,9 +28,10 @@ def render_difference(
     mode: str,
     hypixel_data: dict,
     skin_model: bytes,
-    save_dir: str
+    save_dir: str,
+    rotational_data: lib.rotational_stats.BedwarsRotation | None=None
 ):
-    stats = DifferenceStats(uuid, method, hypixel_data, mode)
+    stats = DifferenceStats(uuid, method, hypixel_data, mode, rotational_data)
     progress, target, xp_bar_progress = stats.progress
 
     image = get_background(
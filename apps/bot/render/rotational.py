@@ -23,11 +23,13 @@ def render_rotational(
     hypixel_data: dict,
     skin_model: bytes,
     save_dir: str,
-    period_id: rotational.HistoricalRotationPeriodID | None=None
+    period_id: rotational.HistoricalRotationPeriodID | None=None,
+    rotational_data: rotational.BedwarsRotation | None=None
 ):
     if tracker in rotational.RotationType._value2member_map_:
         rotation_type = rotational.RotationType.from_string(tracker)
-        stats = RotationalStats(uuid, rotation_type, hypixel_data, mode)
+        stats = RotationalStats(
+            uuid, rotation_type, hypixel_data, mode, rotational_data)
     else:
         stats = HistoricalRotationalStats(uuid, period_id, hypixel_data, mode)
 
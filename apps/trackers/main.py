@@ -1,6 +1,5 @@
 import asyncio
 import logging
-import time
 import sqlite3
 from datetime import datetime, timedelta, timezone, UTC
 from os import getenv
@@ -90,8 +89,21 @@ class Client(commands.Bot):
         logger.info(f'Logged in as {client.user} (ID: {client.user.id})\n------')
 
     async def setup_hook(self) -> None:
+        # The bot shares the Hypixel key from its own process, so its
+        # interactive requests can't preempt ours. Synced from the response
+        # headers, this reserve leaves most of the key's quota to the bot.
+        statalib.hypixel_rate_limiter.background_reserve = \
+            tracker_pacing_config().get('background_reserve', 150)
+
+        await statalib.http_client.start()
+        statalib.role_update_dispatcher.start()
         reset_trackers_loop.start()
 
+    async def close(self) -> None:
+        await super().close()
+        await statalib.http_client.close()
+        await statalib.role_update_dispatcher.stop()
+
 client = Client()
 
 # Bounce all command errors
@@ -101,8 +113,16 @@ async def on_command_error(_, __):
     return
 
 
+def tracker_pacing_config() -> dict:
+    try:
+        return statalib.config('apps.bot.tracker_resetting.pacing')
+    except KeyError:
+        return {}
+
+
 async def reset_trackers():
     fetched_players = []
+    request_delay: float = tracker_pacing_config().get('request_delay', 2)
 
     auto_reset_config: dict = \
         statalib.config('apps.bot.tracker_resetting.automatic') or {}
@@ -125,8 +145,6 @@ async def reset_trackers():
             continue
 
         try:
-            start_time = time.time()
-
             # Ensure user has access
             if not statalib.rotational_stats.has_auto_reset_access(
                     uuid, auto_reset_config):
@@ -141,8 +159,12 @@ async def reset_trackers():
 
             fetched_players.append(uuid)  # Prevent duplicate fetching
 
+            # Paced, so that the reset doesn't burst through the quota of
+            # the Hypixel key that the bot uses in a separate process
+            await asyncio.sleep(request_delay)
             hypixel_data = await statalib.fetch_hypixel_data_rate_limit_safe(
-                uuid, attempts=15)  # Mildly important that it succeeds
+                uuid, attempts=15,  # Mildly important that it succeeds
+                priority=statalib.RequestPriority.BACKGROUND)
 
             if not hypixel_data.get('success'):
                 logger.warning(f"Hypixel request unsuccessful: {hypixel_data}")
@@ -158,10 +180,6 @@ async def reset_trackers():
         except Exception as error:
             await statalib.log_error_msg(client, error)
 
-        # limit requests to 1 per 2 seconds
-        time_elapsed = time.time() - start_time
-        await asyncio.sleep(2 - time_elapsed)
-
 
 @tasks.loop(hours=1)
 async def reset_trackers_loop():
@@ -183,12 +201,16 @@ async def on_tracker_reset(
     resetting = rotational.RotationalResetting(uuid)
     yesterday_dt = (timezone - timedelta(days=1))
 
+    # Every rotation that may be reset, in a single query
+    rotations = rotational.RotationalStatsManager(uuid).get_rotations()
+
     def reset_rotational(rotation_type: rotational.RotationType) -> None:
         try:
             snapshot_id = resetting.archive_rotational_data(
                 period_id=rotational.HistoricalRotationPeriodID(
                     rotation_type, datetime_info=yesterday_dt),
-                current_hypixel_data=hypixel_data
+                current_hypixel_data=hypixel_data,
+                current_rotational_data=rotations.get(rotation_type)
             )
             resetting.refresh_rotational_data(
                 rotation_type=rotation_type, current_hypixel_data=hypixel_data)
@@ -0,0 +1,21 @@
+-- Indexes for the lookups made on most interactions and renders
+
+-- uuid_to_discord_id
+CREATE INDEX IF NOT EXISTS linked_accounts_uuid
+    ON linked_accounts (uuid);
+
+-- Username autocomplete, matched case insensitively by prefix
+CREATE INDEX IF NOT EXISTS autofill_username
+    ON autofill (username COLLATE NOCASE);
+
+-- Paused subscriptions of a user
+CREATE INDEX IF NOT EXISTS subscriptions_paused_discord_id
+    ON subscriptions_paused (discord_id);
+
+-- Growth over a period of time
+CREATE INDEX IF NOT EXISTS growth_data_timestamp
+    ON growth_data (timestamp);
+
+-- Active sessions of a player
+CREATE INDEX IF NOT EXISTS session_info_uuid
+    ON session_info (uuid, session);
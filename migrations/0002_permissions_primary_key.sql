@@ -0,0 +1,15 @@
+-- `discord_id` was declared `INTEGER PRIMRAY KEY`, which SQLite reads as a
+-- type name, so the table was created without a primary key. Rebuild it,
+-- keeping the latest row of each user.
+
+CREATE TABLE permissions_new (
+    discord_id INTEGER PRIMARY KEY,
+    permissions TEXT
+);
+
+INSERT INTO permissions_new (discord_id, permissions)
+    SELECT discord_id, permissions FROM permissions
+    WHERE rowid IN (SELECT MAX(rowid) FROM permissions GROUP BY discord_id);
+
+DROP TABLE permissions;
+ALTER TABLE permissions_new RENAME TO permissions;
@@ -0,0 +1,34 @@
+"""
+Move the command usage from one column per command to one row per
+`(discord_id, command)`. Discord id 0 keeps holding the global counts.
+
+The per user `overall` column isn't kept, it is the sum of the user's rows.
+"""
+
+import sqlite3
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    cursor = conn.execute('SELECT * FROM command_usage LIMIT 0')
+    commands = [
+        desc[0] for desc in cursor.description
+        if desc[0] not in ('discord_id', 'overall')
+    ]
+
+    conn.execute('ALTER TABLE command_usage RENAME TO command_usage_wide')
+    conn.execute(
+        'CREATE TABLE command_usage ('
+        'discord_id INTEGER NOT NULL, '
+        'command TEXT NOT NULL, '
+        'count INTEGER NOT NULL DEFAULT 0, '
+        'PRIMARY KEY (discord_id, command)'
+        ') WITHOUT ROWID')
+
+    for command in commands:
+        conn.execute(
+            'INSERT INTO command_usage (discord_id, command, count) '
+            f'SELECT discord_id, ?, "{command}" FROM command_usage_wide '
+            f'WHERE "{command}" > 0',
+            (command,))
+
+    conn.execute('DROP TABLE command_usage_wide')
@@ -0,0 +1,107 @@
+"""
+Store stats snapshots packed into a single BLOB, and pack the existing
+snapshots. See `statalib/stats_snapshot.py` for the format.
+
+The version 1 field layout and the packing are copied here rather than
+imported, so that replaying this migration isn't affected by later layouts.
+"""
+
+import sqlite3
+
+
+LAYOUT_VERSION = 1
+
+# The stats of layout version 1, in the order they are packed in
+LAYOUT_KEYS = (
+    'Experience', 'wins_bedwars', 'losses_bedwars', 'final_kills_bedwars',
+    'final_deaths_bedwars', 'kills_bedwars', 'deaths_bedwars',
+    'beds_broken_bedwars', 'beds_lost_bedwars', 'games_played_bedwars',
+    'eight_one_wins_bedwars', 'eight_one_losses_bedwars',
+    'eight_one_final_kills_bedwars', 'eight_one_final_deaths_bedwars',
+    'eight_one_kills_bedwars', 'eight_one_deaths_bedwars',
+    'eight_one_beds_broken_bedwars', 'eight_one_beds_lost_bedwars',
+    'eight_one_games_played_bedwars', 'eight_two_wins_bedwars',
+    'eight_two_losses_bedwars', 'eight_two_final_kills_bedwars',
+    'eight_two_final_deaths_bedwars', 'eight_two_kills_bedwars',
+    'eight_two_deaths_bedwars', 'eight_two_beds_broken_bedwars',
+    'eight_two_beds_lost_bedwars', 'eight_two_games_played_bedwars',
+    'four_three_wins_bedwars', 'four_three_losses_bedwars',
+    'four_three_final_kills_bedwars', 'four_three_final_deaths_bedwars',
+    'four_three_kills_bedwars', 'four_three_deaths_bedwars',
+    'four_three_beds_broken_bedwars', 'four_three_beds_lost_bedwars',
+    'four_three_games_played_bedwars', 'four_four_wins_bedwars',
+    'four_four_losses_bedwars', 'four_four_final_kills_bedwars',
+    'four_four_final_deaths_bedwars', 'four_four_kills_bedwars',
+    'four_four_deaths_bedwars', 'four_four_beds_broken_bedwars',
+    'four_four_beds_lost_bedwars', 'four_four_games_played_bedwars',
+    'two_four_wins_bedwars', 'two_four_losses_bedwars',
+    'two_four_final_kills_bedwars', 'two_four_final_deaths_bedwars',
+    'two_four_kills_bedwars', 'two_four_deaths_bedwars',
+    'two_four_beds_broken_bedwars', 'two_four_beds_lost_bedwars',
+    'two_four_games_played_bedwars', 'items_purchased_bedwars',
+    'eight_one_items_purchased_bedwars', 'eight_two_items_purchased_bedwars',
+    'four_three_items_purchased_bedwars', 'four_four_items_purchased_bedwars',
+    'two_four_items_purchased_bedwars',
+)
+
+
+def pack_values(values: list[int]) -> bytes:
+    # Zigzag encoded varints, as `pack_snapshot_values` packed them
+    buffer = bytearray()
+
+    for value in values:
+        if not isinstance(value, int):
+            if not (isinstance(value, float) and value.is_integer()):
+                raise ValueError(f'Snapshot values must be integers, got {value!r}')
+            value = int(value)
+
+        value = value * 2 if value >= 0 else -value * 2 - 1
+
+        while value > 0x7f:
+            buffer.append((value & 0x7f) | 0x80)
+            value >>= 7
+        buffer.append(value)
+
+    return bytes(buffer)
+
+
+def pack_stored_snapshots(cursor: sqlite3.Cursor, batch_size: int=1000) -> None:
+    # Snapshots that can't be packed are left in the column table
+    column_names = ', '.join(LAYOUT_KEYS)
+    last_snapshot_id = ''
+
+    while True:
+        cursor.execute(
+            f'SELECT snapshot_id, {column_names} FROM bedwars_stats_snapshots '
+            'WHERE snapshot_id > ? ORDER BY snapshot_id LIMIT ?',
+            (last_snapshot_id, batch_size))
+        rows = cursor.fetchall()
+
+        if not rows:
+            return
+        last_snapshot_id = rows[-1][0]
+
+        packed_rows = []
+        for snapshot_id, *values in rows:
+            try:
+                packed_rows.append((snapshot_id, LAYOUT_VERSION, pack_values(values)))
+            except ValueError:
+                continue
+
+        cursor.executemany(
+            'INSERT INTO bedwars_stats_snapshots_packed '
+            '(snapshot_id, layout_version, data) VALUES (?, ?, ?)', packed_rows)
+        cursor.executemany(
+            'DELETE FROM bedwars_stats_snapshots WHERE snapshot_id = ?',
+            [(row[0],) for row in packed_rows])
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        'CREATE TABLE bedwars_stats_snapshots_packed ('
+        'snapshot_id TEXT NOT NULL PRIMARY KEY, '
+        'layout_version INTEGER NOT NULL, '
+        'data BLOB NOT NULL'
+        ') WITHOUT ROWID')
+
+    pack_stored_snapshots(conn.cursor())
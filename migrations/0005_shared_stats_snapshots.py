@@ -0,0 +1,114 @@
+"""
+Store packed stats snapshots by content, shared by every session, rotation
+and historical period with the same stats and counted by reference. See
+`statalib/stats_snapshot.py` for how snapshots are stored and released.
+
+Existing snapshots are moved to their content IDs, the info tables are
+rebuilt to allow several rows to reference the same snapshot, and packed
+snapshots that nothing references are dropped.
+"""
+
+import hashlib
+import sqlite3
+
+
+# The info tables without the `UNIQUE` constraint on `snapshot_id`
+INFO_TABLES = {
+    'session_info': (
+        'session INTEGER, '
+        'uuid TEXT, '
+        'snapshot_id TEXT NOT NULL, '
+        'creation_timestamp REAL NOT NULL, '
+        'PRIMARY KEY (session, uuid)'
+    ),
+    'historical_info': (
+        'uuid TEXT, '
+        'period_id TEXT, '
+        'level REAL, '
+        'snapshot_id TEXT NOT NULL, '
+        'PRIMARY KEY (uuid, period_id)'
+    ),
+    'rotational_info': (
+        'uuid TEXT NOT NULL, '
+        'rotation TEXT NOT NULL, '
+        "last_reset_timestamp REAL DEFAULT (strftime('%s', 'now', 'utc')), "
+        'snapshot_id TEXT NOT NULL, '
+        'PRIMARY KEY (uuid, rotation)'
+    ),
+}
+
+
+def snapshot_content_id(layout_version: int, data: bytes) -> str:
+    # Copied rather than imported, the IDs must not change if it ever does
+    return hashlib.blake2b(
+        layout_version.to_bytes(2, 'big') + data, digest_size=16).hexdigest()
+
+
+def rebuild_info_table(conn: sqlite3.Connection, table: str) -> None:
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+    selected_columns = ', '.join(
+        'IFNULL(ids.new_id, info.snapshot_id)' if column == 'snapshot_id'
+        else f'info.{column}' for column in columns)
+
+    conn.execute(f'CREATE TABLE {table}_new ({INFO_TABLES[table]})')
+    conn.execute(
+        f'INSERT INTO {table}_new ({", ".join(columns)}) '
+        f'SELECT {selected_columns} FROM {table} AS info '
+        'LEFT JOIN temp.snapshot_ids AS ids ON ids.old_id = info.snapshot_id')
+    conn.execute(f'DROP TABLE {table}')
+    conn.execute(f'ALTER TABLE {table}_new RENAME TO {table}')
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    conn.create_function(
+        'snapshot_content_id', 2, snapshot_content_id, deterministic=True)
+
+    conn.execute(
+        'CREATE TEMP TABLE snapshot_ids ('
+        'old_id TEXT NOT NULL PRIMARY KEY, new_id TEXT NOT NULL'
+        ') WITHOUT ROWID')
+    conn.execute(
+        'INSERT INTO temp.snapshot_ids (old_id, new_id) '
+        'SELECT snapshot_id, snapshot_content_id(layout_version, data) '
+        'FROM bedwars_stats_snapshots_packed')
+
+    for table in INFO_TABLES:
+        rebuild_info_table(conn, table)
+
+    # Dropped with the old `session_info` table
+    conn.execute('CREATE INDEX session_info_uuid ON session_info (uuid, session)')
+
+    conn.execute(
+        'CREATE TEMP TABLE snapshot_refs ('
+        'snapshot_id TEXT NOT NULL PRIMARY KEY, refcount INTEGER NOT NULL'
+        ') WITHOUT ROWID')
+    conn.execute(
+        'INSERT INTO temp.snapshot_refs (snapshot_id, refcount) '
+        'SELECT snapshot_id, COUNT(*) FROM ('
+        'SELECT snapshot_id FROM session_info '
+        'UNION ALL SELECT snapshot_id FROM historical_info '
+        'UNION ALL SELECT snapshot_id FROM rotational_info'
+        ') GROUP BY snapshot_id')
+
+    conn.execute(
+        'CREATE TABLE bedwars_stats_snapshots_packed_new ('
+        'snapshot_id TEXT NOT NULL PRIMARY KEY, '
+        'layout_version INTEGER NOT NULL, '
+        'data BLOB NOT NULL, '
+        'refcount INTEGER NOT NULL DEFAULT 1'
+        ') WITHOUT ROWID')
+    conn.execute(
+        'INSERT OR IGNORE INTO bedwars_stats_snapshots_packed_new '
+        '(snapshot_id, layout_version, data, refcount) '
+        'SELECT ids.new_id, packed.layout_version, packed.data, refs.refcount '
+        'FROM bedwars_stats_snapshots_packed AS packed '
+        'JOIN temp.snapshot_ids AS ids ON ids.old_id = packed.snapshot_id '
+        'JOIN temp.snapshot_refs AS refs ON refs.snapshot_id = ids.new_id')
+
+    conn.execute('DROP TABLE bedwars_stats_snapshots_packed')
+    conn.execute(
+        'ALTER TABLE bedwars_stats_snapshots_packed_new '
+        'RENAME TO bedwars_stats_snapshots_packed')
+
+    conn.execute('DROP TABLE temp.snapshot_ids')
+    conn.execute('DROP TABLE temp.snapshot_refs')
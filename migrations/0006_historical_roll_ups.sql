@@ -0,0 +1,3 @@
+-- Weekly and monthly periods summed from daily periods by the historical
+-- retention, instead of archived by a reset
+ALTER TABLE historical_info ADD COLUMN rolled_up INTEGER NOT NULL DEFAULT 0;
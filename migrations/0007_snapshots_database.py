@@ -0,0 +1,73 @@
+"""
+Move the stats snapshots and the tables referencing them to the attached
+`snapshots` database, so that writing snapshots doesn't lock the database
+with the accounts, links and subscriptions. See `DatabaseConfig` in
+`statalib/database.py` for how the database is attached.
+
+Transactions aren't atomic across attached WAL databases, so the tables are
+copied and committed first, and only dropped from the main database along
+with the version update. The copies are made exact again right before the
+drop, for the rows written in between. Copying again after a crash skips copied rows.
+
+Without a `snapshots` database configured, nothing is moved.
+"""
+
+import re
+import sqlite3
+
+
+SNAPSHOT_TABLES = (
+    'bedwars_stats_snapshots',
+    'bedwars_stats_snapshots_packed',
+    'session_info',
+    'historical_info',
+    'rotational_info',
+)
+
+_CREATE_TABLE = re.compile(r'^CREATE TABLE (?:IF NOT EXISTS )?"?(\w+)"?')
+_CREATE_INDEX = re.compile(r'^CREATE (UNIQUE )?INDEX (?:IF NOT EXISTS )?"?(\w+)"?')
+
+
+def main_tables(conn: sqlite3.Connection) -> list[str]:
+    return [
+        table for table in SNAPSHOT_TABLES
+        if conn.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+            (table,)).fetchone()
+    ]
+
+
+def copy_table(conn: sqlite3.Connection, table: str) -> None:
+    schema_rows = conn.execute(
+        'SELECT type, sql FROM main.sqlite_master '
+        "WHERE tbl_name = ? AND sql IS NOT NULL ORDER BY type = 'index'", (table,)
+    ).fetchall()
+
+    for schema_type, sql in schema_rows:
+        if schema_type == 'table':
+            sql = _CREATE_TABLE.sub(r'CREATE TABLE IF NOT EXISTS snapshots.\1', sql)
+        else:
+            sql = _CREATE_INDEX.sub(r'CREATE \1INDEX IF NOT EXISTS snapshots.\2', sql)
+        conn.execute(sql)
+
+    conn.execute(f'INSERT OR IGNORE INTO snapshots.{table} SELECT * FROM main.{table}')
+
+
+def migrate(conn: sqlite3.Connection) -> None:
+    schemas = [row[1] for row in conn.execute('PRAGMA database_list')]
+    if 'snapshots' not in schemas:
+        return  # Single file layout, the tables stay in the main database
+
+    for table in main_tables(conn):
+        copy_table(conn, table)
+    conn.commit()
+
+    conn.execute('BEGIN IMMEDIATE')
+
+    # Copied again under the same lock as the drop, rows inserted, updated or
+    # deleted since the commit would be lost otherwise. Tables are listed
+    # again, another process may have moved them while the lock was released.
+    for table in main_tables(conn):
+        conn.execute(f'DELETE FROM snapshots.{table}')
+        conn.execute(f'INSERT INTO snapshots.{table} SELECT * FROM main.{table}')
+        conn.execute(f'DROP TABLE main.{table}')
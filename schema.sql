@@ -1,3 +1,5 @@
+-- Base schema, changes to it are made with the scripts in `migrations`
+
 CREATE TABLE IF NOT EXISTS autofill (
     discord_id INTEGER PRIMARY KEY,
     uuid TEXT,
@@ -198,3 +200,18 @@ CREATE TABLE IF NOT EXISTS rotational_info (
     snapshot_id TEXT NOT NULL UNIQUE,
     PRIMARY KEY (uuid, rotation)
 );
+
+CREATE TABLE IF NOT EXISTS player_identities (
+    uuid TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    verified_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS player_identities_name_lower
+    ON player_identities (name_lower);
+
+CREATE TABLE IF NOT EXISTS missing_player_names (
+    name_lower TEXT PRIMARY KEY,
+    checked_at REAL NOT NULL
+);
@@ -10,11 +10,28 @@ from .themes import *
 from .autocomplete import *
 from .handlers import *
 from .subscriptions import *
+from .cache_maintenance import *
+from .database import *
+from .migrations import *
+from .async_database import *
+from .loop_lag import *
+from .usage_recorder import *
+from .role_updates import *
+from .circuit_breaker import *
+from .freshness import *
+from .http_client import *
+from .identity_cache import *
+from .json_codec import *
+from .memory_cache import *
+from .player_projection import *
+from .single_flight import *
+from .rate_limiting import *
 from .network import *
 from .permissions import *
 from .aliases import *
 from .account_manager import *
 from .accounts import *
+from .entitlements import *
 
 from .loggers.handlers import *
 from .loggers.formatters import *
@@ -26,6 +43,7 @@ from .render.usernames import *
 from .render.colors import *
 from .render.splitting import *
 from .render.text import *
+from .render.skins import *
 
 from . import views as views
 from .views.modes import *
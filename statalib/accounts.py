@@ -2,7 +2,8 @@ import sqlite3
 from datetime import UTC, datetime
 from typing import NamedTuple
 
-from .common import REL_PATH
+from .entitlements import entitlements_cache
+from .functions import db_connect
 
 
 class AccountDataTuple(NamedTuple):
@@ -57,11 +58,16 @@ def create_account(
 
     if cursor:
         cursor.execute(*query)
-        return
+        created = cursor.rowcount > 0
+    else:
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(*query)
+            created = cursor.rowcount > 0
 
-    with sqlite3.connect(f'{REL_PATH}/database/core.db') as conn:
-        cursor = conn.cursor()
-        cursor.execute(*query)
+    # Called for every interaction, most of which don't create an account
+    if created:
+        entitlements_cache.invalidate(discord_id)
 
 
 def _select_account_data(discord_id: int, cursor: sqlite3.Cursor):
@@ -101,7 +107,7 @@ def get_account(
     if cursor:
         return _get_account(discord_id, create, cursor)
 
-    with sqlite3.connect(f'{REL_PATH}/database/core.db') as conn:
+    with db_connect() as conn:
         cursor = conn.cursor()
         return _get_account(discord_id, create, cursor)
 
@@ -139,8 +145,9 @@ def set_account_blacklist(
     """
     if cursor:
         _set_account_blacklist(discord_id, blacklisted, create, cursor)
-        return
+    else:
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            _set_account_blacklist(discord_id, blacklisted, create, cursor)
 
-    with sqlite3.connect(f'{REL_PATH}/database/core.db') as conn:
-        cursor = conn.cursor()
-        _set_account_blacklist(discord_id, blacklisted, create, cursor)
+    entitlements_cache.invalidate(discord_id)
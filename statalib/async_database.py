@@ -0,0 +1,244 @@
+"""
+Async versions of the database helpers and managers, which run their
+queries on the database executor instead of blocking the event loop.
+"""
+
+from typing import Iterable
+
+from .accounts import create_account
+from .aliases import PlayerName, PlayerUUID
+from .database import db_executor
+from .entitlements import Entitlements
+from .functions import (
+    get_command_usage,
+    get_commands_total,
+    get_user_total,
+    get_voting_data
+)
+from .linking import (
+    delete_linked_data,
+    get_linked_player,
+    get_linked_total,
+    set_linked_data,
+    update_autofill,
+    uuid_to_discord_id
+)
+from .permissions import get_entitlements, read_entitlements
+from .rotational_stats import (
+    BedwarsHistoricalRotation,
+    BedwarsRotation,
+    ResetTime,
+    RotationalStatsManager,
+    RotationType,
+    get_dynamic_reset_time,
+    get_subscriptions_max_lookback,
+    has_auto_reset_access
+)
+from .sessions import BedwarsSession, SessionManager
+from .themes import get_owned_themes, set_active_theme
+from .usage_recorder import usage_recorder
+
+
+async def async_get_linked_player(discord_id: int) -> PlayerUUID | None:
+    """Async wrapper for ~get_linked_player()"""
+    return await db_executor.read(get_linked_player, discord_id)
+
+
+async def async_uuid_to_discord_id(uuid: PlayerUUID) -> int | None:
+    """Async wrapper for ~uuid_to_discord_id()"""
+    return await db_executor.read(uuid_to_discord_id, uuid)
+
+
+async def async_get_linked_total() -> int:
+    """Async wrapper for ~get_linked_total()"""
+    return await db_executor.read(get_linked_total)
+
+
+async def async_set_linked_data(discord_id: int, uuid: PlayerUUID) -> None:
+    """Async wrapper for ~set_linked_data()"""
+    await db_executor.write(set_linked_data, discord_id, uuid)
+
+
+async def async_delete_linked_data(discord_id: int) -> bool:
+    """Async wrapper for ~delete_linked_data()"""
+    return await db_executor.write(delete_linked_data, discord_id)
+
+
+async def async_update_autofill(
+    discord_id: int,
+    uuid: PlayerUUID,
+    username: PlayerName
+) -> None:
+    """Async wrapper for ~update_autofill()"""
+    await db_executor.write(update_autofill, discord_id, uuid, username)
+
+
+async def async_get_entitlements(discord_id: int) -> Entitlements:
+    """
+    Async version of ~get_entitlements(). The entitlements are read on a
+    reader thread, and only loaded by the writer if the user's account has
+    to be created or their expired subscription updated.
+    """
+    entitlements = await db_executor.read(read_entitlements, discord_id)
+
+    if entitlements is None:
+        entitlements = await db_executor.write(get_entitlements, discord_id)
+    return entitlements
+
+
+async def async_has_access(
+    discord_id: int,
+    permissions: str | list[str],
+    allow_star: bool=True
+) -> bool:
+    """Async version of ~has_access()"""
+    if not discord_id:
+        return False
+
+    entitlements = await async_get_entitlements(discord_id)
+    return entitlements.has_permission(permissions, allow_star, include_package=True)
+
+
+async def async_get_voting_data(discord_id: int) -> tuple:
+    """Async wrapper for ~get_voting_data()"""
+    return await db_executor.read(get_voting_data, discord_id)
+
+
+async def async_update_command_stats(discord_id: int, command: str) -> None:
+    """
+    Async version of ~update_command_stats(), buffered by the usage
+    recorder and written with its next flush.
+    """
+    usage_recorder.record_command(discord_id, command)
+
+
+async def async_insert_growth_data(
+    discord_id: int,
+    action: str,
+    growth: str,
+    timestamp: float=None
+) -> None:
+    """
+    Async version of ~insert_growth_data(), buffered by the usage
+    recorder and written with its next flush.
+    """
+    usage_recorder.record_growth(discord_id, action, growth, timestamp)
+
+
+async def async_get_user_total() -> int:
+    """Async wrapper for ~get_user_total()"""
+    return await db_executor.read(get_user_total)
+
+
+async def async_get_commands_total() -> int:
+    """Async wrapper for ~get_commands_total()"""
+    return await db_executor.read(get_commands_total)
+
+
+async def async_create_account(discord_id: int) -> None:
+    """Async wrapper for ~create_account()"""
+    await db_executor.write(create_account, discord_id)
+
+
+async def async_get_owned_themes(discord_id: int) -> list:
+    """Async wrapper for ~get_owned_themes()"""
+    return await db_executor.read(get_owned_themes, discord_id)
+
+
+async def async_set_active_theme(discord_id: int, theme_name: str) -> None:
+    """Async wrapper for ~set_active_theme()"""
+    await db_executor.write(set_active_theme, discord_id, theme_name)
+
+
+async def async_get_command_usage(discord_id: int) -> dict[str, int]:
+    """Async wrapper for ~get_command_usage()"""
+    return await db_executor.read(get_command_usage, discord_id)
+
+
+async def async_get_dynamic_reset_time(uuid: PlayerUUID) -> ResetTime:
+    """Async wrapper for ~get_dynamic_reset_time()"""
+    return await db_executor.read(get_dynamic_reset_time, uuid)
+
+
+async def async_get_max_lookback(discord_ids: list[int]) -> int | None:
+    """Async version of ~get_max_lookback()"""
+    subscriptions = [
+        (await async_get_entitlements(discord_id)).subscription
+        for discord_id in discord_ids
+        if discord_id is not None
+    ]
+    return get_subscriptions_max_lookback(subscriptions)
+
+
+async def async_has_auto_reset_access(uuid: PlayerUUID) -> bool:
+    """Async wrapper for ~has_auto_reset_access()"""
+    # May create the linked user's account or update their subscription
+    return await db_executor.write(has_auto_reset_access, uuid)
+
+
+class AsyncSessionManager:
+    """Async wrapper for ~SessionManager"""
+    def __init__(self, uuid: PlayerUUID) -> None:
+        self.manager = SessionManager(uuid)
+
+
+    async def get_session(self, session_id: int | None=1) -> BedwarsSession | None:
+        """Async wrapper for ~SessionManager.get_session()"""
+        return await db_executor.read(self.manager.get_session, session_id)
+
+
+    async def create_session(self, session_id: int, hypixel_data: dict) -> None:
+        """Async wrapper for ~SessionManager.create_session()"""
+        await db_executor.write(self.manager.create_session, session_id, hypixel_data)
+
+
+    async def delete_session(self, session_id: int) -> None:
+        """Async wrapper for ~SessionManager.delete_session()"""
+        await db_executor.write(self.manager.delete_session, session_id)
+
+
+    async def session_count(self) -> int:
+        """Async wrapper for ~SessionManager.session_count()"""
+        return await db_executor.read(self.manager.session_count)
+
+
+    async def active_sessions(self) -> list[int]:
+        """Async wrapper for ~SessionManager.active_sessions()"""
+        return await db_executor.read(self.manager.active_sessions)
+
+
+class AsyncRotationalStatsManager:
+    """Async wrapper for ~RotationalStatsManager"""
+    def __init__(self, uuid: PlayerUUID) -> None:
+        self.manager = RotationalStatsManager(uuid)
+
+
+    async def get_rotational_data(
+        self,
+        rotation_type: RotationType
+    ) -> BedwarsRotation | None:
+        """Async wrapper for ~RotationalStatsManager.get_rotational_data()"""
+        return await db_executor.read(self.manager.get_rotational_data, rotation_type)
+
+
+    async def get_rotations(
+        self,
+        rotation_types: Iterable[RotationType] | None=None
+    ) -> dict[RotationType, BedwarsRotation]:
+        """Async wrapper for ~RotationalStatsManager.get_rotations()"""
+        return await db_executor.read(self.manager.get_rotations, rotation_types)
+
+
+    async def get_historical_rotation_data(
+        self,
+        period_id: str
+    ) -> BedwarsHistoricalRotation | None:
+        """Async wrapper for ~RotationalStatsManager.get_historical_rotation_data()"""
+        return await db_executor.read(
+            self.manager.get_historical_rotation_data, period_id)
+
+
+    async def initialize_rotational_tracking(self, hypixel_data: dict) -> None:
+        """Async wrapper for ~RotationalStatsManager.initialize_rotational_tracking()"""
+        await db_executor.write(
+            self.manager.initialize_rotational_tracking, hypixel_data)
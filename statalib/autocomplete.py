@@ -1,12 +1,12 @@
-import sqlite3
+import re
 import typing
 
 from discord import app_commands, Interaction
 
-from .common import REL_PATH
-from .linking import get_linked_player
-from .mcfetch import AsyncFetchPlayer
-from .sessions import SessionManager
+from .async_database import AsyncSessionManager, async_get_linked_player
+from .database import db_executor
+from .identity_cache import identity_cache
+from .functions import db_connect
 
 
 async def session_autocompletion(
@@ -34,19 +34,32 @@ async def session_autocompletion(
                 break
 
     if username:
-        uuid = await AsyncFetchPlayer(name=username).uuid
+        identity = await identity_cache.resolve_name(username)
+        uuid = identity.uuid if identity else None
     else:
-        uuid = get_linked_player(interaction.user.id)
+        uuid = await async_get_linked_player(interaction.user.id)
 
     if uuid is None:
         return []
 
-    active_sessions = SessionManager(uuid).active_sessions()
+    active_sessions = await AsyncSessionManager(uuid).active_sessions()
 
     data = [app_commands.Choice(name=ses[0], value=ses[0]) for ses in active_sessions]
     return data
 
 
+def _search_autofill(current: str) -> list[tuple]:
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        # Prefix matches can use the case insensitive username index
+        escaped = re.sub(r'([\\%_])', r'\\\1', current)
+        cursor.execute(
+            "SELECT * FROM autofill WHERE username LIKE ? ESCAPE '\\' LIMIT 25",
+            (f'{escaped}%',)
+        )
+        return cursor.fetchall()
+
+
 async def username_autocompletion(
     interaction: Interaction,
     current: str
@@ -54,12 +67,6 @@ async def username_autocompletion(
     """
     Interaction username autocomplete
     """
-    with sqlite3.connect(f'{REL_PATH}/database/core.db') as conn:
-        cursor = conn.cursor()
-        result = cursor.execute(
-            "SELECT * FROM autofill WHERE LOWER(username) LIKE ? LIMIT 25",
-            (fr'%{current.lower()}%',)
-        )
-
+    result = await db_executor.read(_search_autofill, current)
     data = [app_commands.Choice(name=row[2], value=row[2]) for row in result]
     return data
@@ -0,0 +1,254 @@
+"""Expiry sweeping, size capping and vacuuming of the SQLite response caches."""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+
+import aiosqlite
+from aiohttp_client_cache import SQLiteBackend
+
+from .cfg import config
+
+
+logger = logging.getLogger('statalytics')
+
+# `PRAGMA auto_vacuum` value of incremental mode
+_AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass
+class CacheMaintenanceConfig:
+    """Limits of the maintenance of a response cache."""
+    batch_size: int = 500
+    max_bytes: int = 512 * 1024 * 1024
+    vacuum_pages: int = 1024
+
+    @staticmethod
+    def from_config(name: str) -> 'CacheMaintenanceConfig':
+        """
+        Load the maintenance limits of a response cache from the
+        `global.network.cache_maintenance` section of the config file.
+        Missing values use the dataclass defaults.
+        :param name: The name of the response cache to load the limits for.
+        """
+        try:
+            maintenance_config: dict = config('global.network.cache_maintenance')
+        except KeyError:
+            maintenance_config = {}
+
+        cache_config = {
+            **maintenance_config.get('default', {}),
+            **maintenance_config.get(name, {})
+        }
+        return CacheMaintenanceConfig(**cache_config)
+
+
+@dataclass
+class CacheSweepResult:
+    """The outcome of a single sweep of a response cache."""
+    expired: int = 0
+    evicted: int = 0
+    reclaimed_bytes: int = 0
+
+
+@dataclass
+class CacheMaintenanceStats:
+    """Counters for the maintenance of a response cache."""
+    sweeps: int = 0
+    expired: int = 0
+    evicted: int = 0
+    reclaimed_bytes: int = 0
+
+
+class CacheSweeper:
+    """
+    Keeps the SQLite file of a response cache bounded. The cache backend only
+    skips expired responses when reading them, so without sweeping they stay
+    on disk forever.
+
+    A sweep deletes expired responses, evicts the least recently written
+    responses while the cache holds more than `max_bytes` of data, and
+    returns the freed pages to the file system with an incremental vacuum.
+
+    All work happens in batches of `batch_size` rows on the backend's own
+    connection, so requests using the cache are interleaved between batches
+    rather than waiting for the entire sweep.
+    """
+    def __init__(
+        self,
+        name: str,
+        cache_backend: SQLiteBackend,
+        cache_maintenance_config: CacheMaintenanceConfig | None=None
+    ) -> None:
+        """
+        :param name: The name of the response cache, used for logging.
+        :param cache_backend: The cache backend to maintain.
+        :param cache_maintenance_config: Override the configured limits.
+        """
+        self.name = name
+        self.cache_backend = cache_backend
+        self.config = cache_maintenance_config or CacheMaintenanceConfig.from_config(name)
+        self.stats = CacheMaintenanceStats()
+
+        self._lock = asyncio.Lock()
+
+
+    @property
+    def _responses(self):
+        return self.cache_backend.responses
+
+
+    @property
+    def _redirects(self):
+        return self.cache_backend.redirects
+
+
+    def file_size(self) -> int:
+        """The size of the cache's database file in bytes."""
+        try:
+            return os.path.getsize(self._responses.filename)
+        except FileNotFoundError:
+            return 0
+
+
+    async def _pragma(self, db: aiosqlite.Connection, pragma: str) -> int:
+        cursor = await db.execute(f'PRAGMA {pragma}')
+        row = await cursor.fetchone()
+        return row[0] if row else 0
+
+
+    async def data_size(self) -> int:
+        """The amount of bytes used by data, excluding free pages."""
+        async with self._responses.get_connection() as db:
+            page_size = await self._pragma(db, 'page_size')
+            page_count = await self._pragma(db, 'page_count')
+            freelist_count = await self._pragma(db, 'freelist_count')
+
+        return (page_count - freelist_count) * page_size
+
+
+    async def _delete_keys(self, keys: list[str]) -> None:
+        placeholders = ', '.join('?' for _ in keys)
+
+        async with self._responses.get_connection(commit=True) as db:
+            await db.execute(
+                f'DELETE FROM `{self._responses.table_name}` '
+                f'WHERE key IN ({placeholders})', keys)
+
+        # Drop the aliases of the deleted responses as well
+        async with self._redirects.get_connection(commit=True) as db:
+            await db.execute(
+                f'DELETE FROM `{self._redirects.table_name}` '
+                f'WHERE value IN ({placeholders})', keys)
+
+
+    async def sweep_expired(self) -> int:
+        """
+        Delete every expired response, `batch_size` rows at a time.
+        Returns the amount of deleted responses.
+        """
+        deleted = 0
+        last_rowid = 0
+
+        while True:
+            async with self._responses.get_connection() as db:
+                cursor = await db.execute(
+                    f'SELECT rowid, key, value FROM `{self._responses.table_name}` '
+                    'WHERE rowid > ? ORDER BY rowid LIMIT ?',
+                    (last_rowid, self.config.batch_size))
+                rows = await cursor.fetchall()
+
+            if not rows:
+                return deleted
+
+            last_rowid = rows[-1][0]
+
+            expired_keys = []
+            for _, key, value in rows:
+                response = self._responses.deserialize(value)
+                # Responses that fail to deserialize can never be read either
+                if response is None or getattr(response, 'is_expired', False):
+                    expired_keys.append(key)
+
+            if expired_keys:
+                await self._delete_keys(expired_keys)
+                deleted += len(expired_keys)
+
+            await asyncio.sleep(0)
+
+
+    async def enforce_size_limit(self) -> int:
+        """
+        Evict the least recently written responses, `batch_size` rows at a
+        time, until at most `max_bytes` of data is stored.
+        Returns the amount of evicted responses.
+        """
+        evicted = 0
+
+        while await self.data_size() > self.config.max_bytes:
+            # Writes replace the row, so the lowest rowids were written the longest ago
+            async with self._responses.get_connection() as db:
+                cursor = await db.execute(
+                    f'SELECT key FROM `{self._responses.table_name}` '
+                    'ORDER BY rowid LIMIT ?', (self.config.batch_size,))
+                keys = [row[0] for row in await cursor.fetchall()]
+
+            if not keys:
+                break
+
+            await self._delete_keys(keys)
+            evicted += len(keys)
+
+            await asyncio.sleep(0)
+
+        return evicted
+
+
+    async def incremental_vacuum(self) -> int:
+        """
+        Return free pages to the file system, `vacuum_pages` pages at a time.
+        Caches created without incremental auto vacuum are converted once
+        with a full `VACUUM`. Returns the amount of reclaimed bytes.
+        """
+        size_before = self.file_size()
+
+        async with self._responses.get_connection(commit=True) as db:
+            if await self._pragma(db, 'auto_vacuum') != _AUTO_VACUUM_INCREMENTAL:
+                logger.info(f'Enabling incremental vacuum for the {self.name} cache')
+                await db.commit()
+                await db.execute('PRAGMA auto_vacuum = INCREMENTAL')
+                await db.execute('VACUUM')
+
+        while True:
+            async with self._responses.get_connection(commit=True) as db:
+                if await self._pragma(db, 'freelist_count') == 0:
+                    break
+                # `execute` only steps the pragma once, freeing a single page
+                await db.executescript(
+                    f'PRAGMA incremental_vacuum({self.config.vacuum_pages});')
+
+            await asyncio.sleep(0)
+
+        return max(0, size_before - self.file_size())
+
+
+    async def sweep(self) -> CacheSweepResult:
+        """Delete expired responses, enforce the size cap and vacuum the cache."""
+        async with self._lock:
+            result = CacheSweepResult(
+                expired=await self.sweep_expired(),
+                evicted=await self.enforce_size_limit()
+            )
+            result.reclaimed_bytes = await self.incremental_vacuum()
+
+        self.stats.sweeps += 1
+        self.stats.expired += result.expired
+        self.stats.evicted += result.evicted
+        self.stats.reclaimed_bytes += result.reclaimed_bytes
+
+        logger.info(
+            f'Swept {self.name} cache: {result.expired} expired, '
+            f'{result.evicted} evicted, {result.reclaimed_bytes} bytes reclaimed')
+
+        return result
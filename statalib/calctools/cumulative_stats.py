@@ -68,7 +68,7 @@ class CumulativeStats(BedwarsStats):
         #     return mode_stats
 
         prefix = bedwars_modes_map.get(self._strict_mode.lower())
-        return self._bedwars_stats_snapshot.__dict__.get(f'{prefix}{key}', default)
+        return getattr(self._bedwars_stats_snapshot, f'{prefix}{key}', default)
 
 
     def _calc_cum(self, key: str) -> int:
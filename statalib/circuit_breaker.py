@@ -0,0 +1,224 @@
+"""Circuit breakers that fail fast while an upstream is unavailable."""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+from .cfg import config
+from .errors import CircuitOpenError
+
+
+logger = logging.getLogger('statalytics')
+
+
+class CircuitState(Enum):
+    """State of a circuit breaker."""
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Thresholds of a circuit breaker."""
+    failure_rate: float = 0.5
+    minimum_calls: int = 10
+    window: float = 60
+    open_duration: float = 30
+    half_open_probes: int = 1
+
+    @staticmethod
+    def from_config(name: str) -> 'CircuitBreakerConfig':
+        """
+        Load the thresholds of a circuit breaker from the
+        `global.network.circuit_breakers` section of the config file.
+        Missing values use the dataclass defaults.
+        :param name: The name of the circuit breaker to load the thresholds for.
+        """
+        try:
+            breakers_config: dict = config('global.network.circuit_breakers')
+        except KeyError:
+            breakers_config = {}
+
+        breaker_config = {
+            **breakers_config.get('default', {}),
+            **breakers_config.get(name, {})
+        }
+        return CircuitBreakerConfig(**breaker_config)
+
+
+@dataclass
+class CircuitBreakerStats:
+    """Counters for a circuit breaker."""
+    successes: int = 0
+    failures: int = 0
+    rejected: int = 0
+    opened: int = 0
+
+
+class CircuitBreaker:
+    """
+    Tracks the error rate of the calls made to an upstream over a rolling
+    window. Once at least `minimum_calls` calls have been made in the window
+    and `failure_rate` of them failed, the circuit opens and every call is
+    rejected with `CircuitOpenError` instead of waiting for the upstream.
+
+    After `open_duration` seconds the circuit becomes half open and lets
+    `half_open_probes` calls through. If they all succeed the circuit closes
+    again, otherwise it reopens.
+    """
+    def __init__(
+        self,
+        name: str,
+        circuit_breaker_config: CircuitBreakerConfig | None=None
+    ) -> None:
+        """
+        :param name: The name of the circuit breaker, used for logging.
+        :param circuit_breaker_config: Override the configured thresholds.
+        """
+        self.name = name
+        self.config = circuit_breaker_config or CircuitBreakerConfig.from_config(name)
+        self.stats = CircuitBreakerStats()
+
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+
+        # (timestamp, failed) of every call made within the window
+        self._calls: deque[tuple[float, bool]] = deque()
+
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the circuit."""
+        if (self._state == CircuitState.OPEN
+                and time.monotonic() - self._opened_at >= self.config.open_duration):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+
+    @property
+    def failure_rate(self) -> float:
+        """The fraction of calls in the window that failed."""
+        self._trim_window()
+        if not self._calls:
+            return 0.0
+        return sum(failed for _, failed in self._calls) / len(self._calls)
+
+
+    def _transition(self, state: CircuitState) -> None:
+        self._state = state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+            self.stats.opened += 1
+            logger.warning(
+                f'{self.name} circuit breaker opened, rejecting requests '
+                f'for {self.config.open_duration} seconds')
+
+        elif state == CircuitState.HALF_OPEN:
+            logger.info(f'{self.name} circuit breaker half open, probing upstream')
+
+        else:
+            self._calls.clear()
+            logger.info(f'{self.name} circuit breaker closed')
+
+
+    def _trim_window(self) -> None:
+        cutoff = time.monotonic() - self.config.window
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+
+    def _record(self, failed: bool) -> None:
+        self._calls.append((time.monotonic(), failed))
+        self._trim_window()
+
+        if (len(self._calls) >= self.config.minimum_calls
+                and self.failure_rate >= self.config.failure_rate):
+            self._transition(CircuitState.OPEN)
+
+
+    def before_request(self) -> None:
+        """
+        Check that a request can be made, taking a probe slot if the circuit
+        is half open. Every allowed request must be followed by either
+        `record_success()`, `record_failure()` or `release()`.
+        :raises CircuitOpenError: If the request is rejected.
+        """
+        state = self.state
+
+        if state == CircuitState.CLOSED:
+            return
+
+        if (state == CircuitState.HALF_OPEN
+                and self._probes_in_flight < self.config.half_open_probes):
+            self._probes_in_flight += 1
+            return
+
+        self.stats.rejected += 1
+        raise CircuitOpenError(f'{self.name} circuit breaker is {state.value}')
+
+
+    def record_success(self) -> None:
+        """Mark an allowed request as successful."""
+        self.stats.successes += 1
+
+        if self._state == CircuitState.HALF_OPEN:
+            self._probe_successes += 1
+            if self._probe_successes >= self.config.half_open_probes:
+                self._transition(CircuitState.CLOSED)
+        elif self._state == CircuitState.CLOSED:
+            self._record(failed=False)
+
+
+    def record_failure(self) -> None:
+        """Mark an allowed request as failed."""
+        self.stats.failures += 1
+
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+        elif self._state == CircuitState.CLOSED:
+            self._record(failed=True)
+
+
+    def release(self) -> None:
+        """Mark an allowed request as completed without an outcome (eg: cancelled)."""
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        failure_exceptions: tuple[type[BaseException], ...]=(Exception,),
+        **kwargs
+    ) -> Any:
+        """
+        Call `func(*args, **kwargs)` through the circuit breaker.
+        :param func: The coroutine function to call.
+        :param failure_exceptions: The exceptions that count as a failed call. \
+            Any other exception is raised without being recorded.
+        :raises CircuitOpenError: If the call is rejected.
+        """
+        self.before_request()
+
+        try:
+            result = await func(*args, **kwargs)
+        except failure_exceptions:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+
+        self.record_success()
+        return result
@@ -0,0 +1,267 @@
+"""Reusable, tuned connections to the SQLite databases."""
+
+import asyncio
+import contextvars
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from .cfg import config
+
+
+def _default_attached_databases() -> dict[str, str]:
+    return {'snapshots': 'snapshots.db'}
+
+
+@dataclass
+class DatabaseConfig:
+    """
+    Pragmas applied to every database connection, databases attached to
+    them and executor threads.
+
+    `attached_databases` maps schema names to database files, stored next
+    to the database being connected to. Every table lives in one of the
+    files, so unqualified table names resolve to whichever file has them.
+    """
+    journal_mode: str = 'wal'
+    synchronous: str = 'normal'
+    cache_size_kib: int = 16 * 1024
+    mmap_size: int = 256 * 1024 * 1024
+    busy_timeout: float = 10
+    reader_threads: int = 4
+    attached_databases: dict[str, str] = field(default_factory=_default_attached_databases)
+
+    @staticmethod
+    def from_config() -> 'DatabaseConfig':
+        """
+        Load the settings from the `global.database` section of the config
+        file. Missing values use the dataclass defaults.
+        """
+        try:
+            database_config: dict = config('global.database')
+        except KeyError:
+            database_config = {}
+
+        return DatabaseConfig(**database_config)
+
+
+@dataclass
+class ConnectionStats:
+    """Counters for the connection manager."""
+    opened: int = 0
+    reused: int = 0
+
+
+@dataclass
+class QueryCounter:
+    """The amount of statements run by a unit of work, like a command."""
+    queries: int = 0
+
+
+_query_counter: contextvars.ContextVar[QueryCounter | None] = \
+    contextvars.ContextVar('query_counter', default=None)
+
+
+def _count_query(_statement: str) -> None:
+    counter = _query_counter.get()
+    if counter is not None:
+        counter.queries += 1
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Count the statements run on any database connection within the block,
+    including the ones run on executor threads it waits for, since they
+    run in a copy of the calling context.
+    """
+    counter = QueryCounter()
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+
+class ConnectionManager:
+    """
+    Hands out one connection per database file per thread, which is reused
+    for every following `connect` call made from that thread.
+
+    Connections are used the same way as ones returned by `sqlite3.connect`:
+    `with connection_manager.connect() as conn:` commits on success and rolls
+    back on error, but doesn't close the connection. Connections must not be
+    closed by their users, and must not be handed to other threads.
+    """
+    def __init__(self, database_config: DatabaseConfig | None=None) -> None:
+        """
+        :param database_config: Override the configured pragmas.
+        """
+        self.config = database_config or DatabaseConfig.from_config()
+        self.stats = ConnectionStats()
+
+        self._local = threading.local()
+
+
+    def _open(self, db_fp: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(db_fp, timeout=self.config.busy_timeout)
+        schemas = ['main']
+
+        if db_fp != ':memory:':
+            for schema, filename in self.config.attached_databases.items():
+                attached_fp = os.path.join(os.path.dirname(db_fp), filename)
+                conn.execute(f'ATTACH DATABASE ? AS {schema}', (attached_fp,))
+                schemas.append(schema)
+
+        # Pragmas apply to a single database file. WAL mode is stored in
+        # the file, so it is a no-op for every connection but the first
+        for schema in schemas:
+            conn.execute(f'PRAGMA {schema}.journal_mode = {self.config.journal_mode}')
+            conn.execute(f'PRAGMA {schema}.synchronous = {self.config.synchronous}')
+            conn.execute(f'PRAGMA {schema}.cache_size = -{int(self.config.cache_size_kib)}')
+            conn.execute(f'PRAGMA {schema}.mmap_size = {int(self.config.mmap_size)}')
+        conn.execute('PRAGMA temp_store = memory')
+
+        conn.set_trace_callback(_count_query)
+        return conn
+
+
+    def _thread_connections(self) -> dict[str, sqlite3.Connection]:
+        # Dropped along with the thread, which closes its connections
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+
+    def connect(self, db_fp: str | None=None) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection to a database file, opening
+        it if the thread doesn't have one yet.
+        :param db_fp: The database file, defaults to `config.DB_FILE_PATH`.
+        """
+        db_fp = db_fp or config.DB_FILE_PATH
+        connections = self._thread_connections()
+
+        conn = connections.get(db_fp)
+        if conn is not None:
+            self.stats.reused += 1
+            return conn
+
+        conn = self._open(db_fp)
+        connections[db_fp] = conn
+        self.stats.opened += 1
+        return conn
+
+
+    def close(self) -> None:
+        """
+        Close the calling thread's connections. Following `connect`
+        calls from the thread open new connections.
+        """
+        connections = self._thread_connections()
+
+        for conn in connections.values():
+            conn.close()
+        connections.clear()
+
+
+connection_manager = ConnectionManager()  # Globally used instance
+
+
+@dataclass
+class DatabaseExecutorStats:
+    """Counters for the database executor."""
+    reads: int = 0
+    writes: int = 0
+    pending: int = 0
+    max_queue_wait: float = 0.0
+
+
+class DatabaseExecutor:
+    """
+    Runs blocking database calls outside of the event loop.
+
+    Writes are run one at a time by a single writer thread, so they never
+    wait on each other's locks. Reads are run by a pool of reader threads
+    and, thanks to WAL mode, aren't blocked by the writer. Every thread uses
+    its own connection from the connection manager.
+    """
+    def __init__(self, reader_threads: int | None=None) -> None:
+        """
+        :param reader_threads: Override the configured amount of reader threads.
+        """
+        self.reader_threads = reader_threads or DatabaseConfig.from_config().reader_threads
+        self.stats = DatabaseExecutorStats()
+
+        self._reader: ThreadPoolExecutor | None = None
+        self._writer: ThreadPoolExecutor | None = None
+
+
+    def _executor(self, write: bool) -> ThreadPoolExecutor:
+        # Created on first use, so that importing doesn't start threads
+        if write:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(1, thread_name_prefix='db-writer')
+            return self._writer
+
+        if self._reader is None:
+            self._reader = ThreadPoolExecutor(
+                self.reader_threads, thread_name_prefix='db-reader')
+        return self._reader
+
+
+    async def _run(self, write: bool, func: Callable, args: tuple, kwargs: dict) -> Any:
+        queued_at = time.perf_counter()
+
+        def call():
+            queue_wait = time.perf_counter() - queued_at
+            self.stats.max_queue_wait = max(self.stats.max_queue_wait, queue_wait)
+            return func(*args, **kwargs)
+
+        # Like `asyncio.to_thread`, so that the caller's query counter is used
+        context = contextvars.copy_context()
+
+        self.stats.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor(write), context.run, call)
+        finally:
+            self.stats.pending -= 1
+
+
+    async def read(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call a function that only reads from the database on a reader thread.
+        :param func: The blocking function to call.
+        """
+        self.stats.reads += 1
+        return await self._run(False, func, args, kwargs)
+
+
+    async def write(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call a function that writes to the database on the writer thread.
+        :param func: The blocking function to call.
+        """
+        self.stats.writes += 1
+        return await self._run(True, func, args, kwargs)
+
+
+    def shutdown(self, wait: bool=True) -> None:
+        """
+        Stop the executor threads. Calls made afterwards start new threads.
+        :param wait: Whether to wait for the pending calls to finish.
+        """
+        for executor in (self._reader, self._writer):
+            if executor is not None:
+                executor.shutdown(wait=wait)
+        self._reader = self._writer = None
+
+
+db_executor = DatabaseExecutor()  # Globally used instance
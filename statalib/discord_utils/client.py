@@ -1,17 +1,65 @@
 import json
 import logging
+from dataclasses import dataclass
 from datetime import datetime, UTC
 
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 from ..cfg import config
 from ..views import add_info_view, PremiumInfoView
 from ..common import REL_PATH
+from ..database import count_queries, db_executor
+from ..http_client import http_client
+from ..loop_lag import loop_lag_monitor
+from ..role_updates import role_update_dispatcher
+from ..usage_recorder import usage_recorder
 
 logger = logging.getLogger('statalytics')
 
 
+@dataclass
+class CommandQueryStats:
+    """Counters for the database queries made by a command."""
+    runs: int = 0
+    queries: int = 0
+    max_queries: int = 0
+
+    @property
+    def average(self) -> float:
+        """The average amount of queries made per run."""
+        if self.runs == 0:
+            return 0.0
+        return self.queries / self.runs
+
+
+class CommandTree(app_commands.CommandTree):
+    """Command tree that counts the database queries made by each command."""
+    def __init__(self, client: discord.Client, **kwargs) -> None:
+        super().__init__(client, **kwargs)
+        self.query_stats: dict[str, CommandQueryStats] = {}
+
+
+    async def _call(self, interaction: discord.Interaction) -> None:
+        # Runs the command along with its checks and cooldown
+        with count_queries() as counter:
+            try:
+                await super()._call(interaction)
+            finally:
+                if interaction.command is not None:
+                    self._record_queries(interaction.command.qualified_name, counter.queries)
+
+
+    def _record_queries(self, command: str, queries: int) -> None:
+        stats = self.query_stats.setdefault(command, CommandQueryStats())
+        stats.runs += 1
+        stats.queries += queries
+        stats.max_queries = max(stats.max_queries, queries)
+
+        logger.debug(f'/{command} made {queries} database queries')
+
+
 class Client(commands.AutoShardedBot):
     def __init__(self, *, intents: discord.Intents=None):
         if intents is None:
@@ -20,10 +68,16 @@ class Client(commands.AutoShardedBot):
 
         super().__init__(
             intents=intents,
-            command_prefix=commands.when_mentioned_or('$')
+            command_prefix=commands.when_mentioned_or('$'),
+            tree_cls=CommandTree
         )
 
     async def setup_hook(self):
+        await http_client.start()
+        loop_lag_monitor.start()
+        usage_recorder.start()
+        role_update_dispatcher.start()
+
         cogs = config('apps.bot.cogs.enabled')
         for ext in cogs:
             try:
@@ -40,6 +94,15 @@ class Client(commands.AutoShardedBot):
             json.dump({"start_time": datetime.now(UTC).timestamp()}, datafile, indent=4)
 
 
+    async def close(self):
+        await super().close()
+        await http_client.close()
+        await loop_lag_monitor.stop()
+        await usage_recorder.stop()
+        await role_update_dispatcher.stop()
+        db_executor.shutdown()
+
+
     async def on_ready(self):
         logger.info(f'Logged in as {self.user} (ID: {self.user.id})\n------')
         await self.change_presence(activity=discord.Game(name="/help"))
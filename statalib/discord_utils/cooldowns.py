@@ -4,27 +4,27 @@ import typing
 import discord
 from discord import app_commands
 
-from ..subscriptions import SubscriptionManager
-from ..permissions import has_access
+from ..async_database import async_get_entitlements
+from ..entitlements import Entitlements
+from ..permissions import get_entitlements
 from ..cfg import config
+from ..database import db_executor
 from ..functions import get_voting_data
 
 
-def generic_command_cooldown(
-    interaction: discord.Interaction
-) -> typing.Optional[app_commands.Cooldown]:
-    """
-    Gets interaction cooldown based on subscription and voting status.
-    Cooldowns can be managed in the `config.json` file
+def _generic_command_cooldown(
+    discord_id: int,
+    entitlements: Entitlements | None=None
+) -> app_commands.Cooldown:
+    if entitlements is None:
+        entitlements = get_entitlements(discord_id)
 
-    Paramaters will be handled automatically by discord.py
-    """
     # if the user bypasses the cooldown
-    if has_access(interaction.user.id, 'cooldown_bypass'):
+    if entitlements.has_permission('cooldown_bypass', include_package=True):
         return app_commands.Cooldown(1, 0.0)
 
     # If the user has voted recently
-    voting_data = get_voting_data(interaction.user.id)
+    voting_data = get_voting_data(discord_id)
 
     if voting_data:
         hours_since_voted = (time.time() - voting_data[3]) / 3600
@@ -34,10 +34,26 @@ def generic_command_cooldown(
             return app_commands.Cooldown(1, 1.75)
 
     # default configured cooldown
-    cooldown_data = SubscriptionManager(interaction.user.id)\
-        .get_subscription().package_property("generic_command_cooldown", {})
+    cooldown_data = entitlements.subscription\
+        .package_property("generic_command_cooldown", {})
 
     return app_commands.Cooldown(
         rate=cooldown_data.get('rate', 1),
         per=cooldown_data.get('per', 3.5)
     )
+
+
+async def generic_command_cooldown(
+    interaction: discord.Interaction
+) -> typing.Optional[app_commands.Cooldown]:
+    """
+    Gets interaction cooldown based on subscription and voting status.
+    Cooldowns can be managed in the `config.json` file
+
+    Paramaters will be handled automatically by discord.py
+    """
+    # Loaded first, as loading them may have to write
+    entitlements = await async_get_entitlements(interaction.user.id)
+
+    return await db_executor.read(
+        _generic_command_cooldown, interaction.user.id, entitlements)
@@ -1,34 +1,96 @@
+import asyncio
 import logging
-from typing import Callable
+import re
+from typing import Callable, NamedTuple
 
-from aiohttp import ContentTypeError, ClientConnectionError
+from aiohttp import ClientError
 from discord import Interaction, Embed
 
 from .responses import interaction_send_object
-from ..account_manager import Account
 from ..aliases import PlayerName, PlayerUUID, PlayerDynamic
 from ..functions import fname, load_embeds
 from ..views.info import SessionInfoButton
-from ..network import fetch_hypixel_data, mojang_session
-from ..mcfetch import AsyncFetchPlayer2
-from ..sessions import SessionManager, BedwarsSession
+from ..freshness import FreshnessPolicy, STRICT_FRESHNESS
+from ..network import fetch_hypixel_data, fetch_skin_model
+from ..identity_cache import identity_cache, normalize_uuid
+from ..sessions import BedwarsSession
+from ..async_database import (
+    AsyncSessionManager,
+    async_get_entitlements,
+    async_get_linked_player,
+    async_update_autofill
+)
 from ..errors import (
     PlayerNotFoundError,
     SessionNotFoundError,
     MojangInvalidResponseError,
+    CircuitOpenError,
     UserBlacklistedError,
     MissingPermissionsError
 )
-from ..linking import (
-    link_account,
-    get_linked_player,
-    update_autofill
-)
+from ..linking import link_account
 
 
 logger = logging.getLogger('statalytics')
 
 
+# Undashed uuids, anything else has to be resolved by name first
+_UUID = re.compile(r'^[0-9a-f]{32}$')
+
+_PLAYER_NOT_FOUND_MSG = "That player does not exist!"
+
+
+async def _send_not_linked_message(interaction: Interaction, eph: bool=False) -> None:
+    msg = ("You are not linked! Either specify "
+           "a player or link your account using `/link`!")
+
+    if interaction.response.is_done():
+        await interaction.followup.send(msg)
+    else:
+        await interaction.response.send_message(msg, ephemeral=eph)
+
+
+async def _resolve_linked_player(
+    discord_id: int,
+    uuid: PlayerUUID
+) -> tuple[PlayerName, PlayerUUID]:
+    try:
+        identity = await identity_cache.resolve_uuid(uuid)
+    except (ClientError, CircuitOpenError) as exc:
+        raise MojangInvalidResponseError from exc
+
+    name = identity.name if identity else None
+
+    await async_update_autofill(discord_id, uuid, name)
+    return name, uuid
+
+
+async def _resolve_player(player: str) -> tuple[PlayerName, PlayerUUID] | None:
+    # allow for linked discord ids
+    if player.isnumeric() and len(player) >= 16:
+        player = await async_get_linked_player(int(player)) or ''
+
+    try:
+        identity = await identity_cache.resolve(player)
+    except (ClientError, CircuitOpenError) as exc:
+        raise MojangInvalidResponseError from exc
+
+    if identity is None:
+        return None
+    return identity.name, identity.uuid
+
+
+async def _known_uuid(player: str) -> PlayerUUID | None:
+    # uuids and linked discord ids don't need Mojang to find the uuid
+    if player.isnumeric() and len(player) >= 16:
+        return await async_get_linked_player(int(player))
+
+    uuid = normalize_uuid(player)
+    if _UUID.match(uuid):
+        return uuid
+    return None
+
+
 async def fetch_player_info(
     player: PlayerDynamic,
     interaction: Interaction,
@@ -41,42 +103,129 @@ async def fetch_player_info(
     :param eph: whether or not to respond with an ephemeral message (default false)
     """
     if player is None:
-        uuid = get_linked_player(interaction.user.id)
+        uuid = await async_get_linked_player(interaction.user.id)
 
-        if uuid:
-            try:
-                name = await AsyncFetchPlayer2(uuid, cache_backend=mojang_session).name
-            except (ContentTypeError, ClientConnectionError) as exc:
-                raise MojangInvalidResponseError from exc
+        if not uuid:
+            await _send_not_linked_message(interaction, eph)
+            raise PlayerNotFoundError
 
-            update_autofill(interaction.user.id, uuid, name)
-        else:
-            msg = ("You are not linked! Either specify "
-                   "a player or link your account using `/link`!")
+        return await _resolve_linked_player(interaction.user.id, uuid)
 
-            if interaction.response.is_done():
-                await interaction.followup.send(msg)
-            else:
-                await interaction.response.send_message(msg, ephemeral=eph)
+    player_info = await _resolve_player(player)
+
+    if player_info is None:
+        await interaction_send_object(interaction)(
+            _PLAYER_NOT_FOUND_MSG, ephemeral=eph)
+        raise PlayerNotFoundError
+
+    return player_info
+
+
+class PlayerBundle(NamedTuple):
+    """A player along with their Hypixel data and skin model."""
+    name: PlayerName
+    uuid: PlayerUUID
+    hypixel_data: dict
+    skin_model: bytes | None = None
+
+
+async def fetch_player_bundle(
+    player: PlayerDynamic,
+    interaction: Interaction,
+    loading_message: str | None=None,
+    skin_size: int | None=144,
+    freshness: FreshnessPolicy=STRICT_FRESHNESS
+) -> PlayerBundle:
+    """
+    Get the name, uuid, Hypixel data, and skin model of a player. When the
+    uuid is already known (a uuid or a linked player), the Hypixel data and
+    skin model are fetched while the name is resolved. The loading message
+    is sent at the same time.
+
+    If the player doesn't exist, the fetches are cancelled and the loading
+    message is replaced with an error.
+    :param player: Username, uuid, or linked discord id of the player
+    :param interaction: The discord interaction object used
+    :param loading_message: The message to send while the player is fetched
+    :param skin_size: The size of the skin model, or `None` to skip the skin
+    :param freshness: How old the player's Hypixel data is allowed to be
+    """
+    if player is None:
+        known_uuid = await async_get_linked_player(interaction.user.id)
+
+        if not known_uuid:
+            await _send_not_linked_message(interaction)
             raise PlayerNotFoundError
     else:
-        # allow for linked discord ids
-        if player.isnumeric() and len(player) >= 16:
-            player = get_linked_player(int(player)) or ''
+        known_uuid = await _known_uuid(player)
 
-        player_data = AsyncFetchPlayer2(player, cache_backend=mojang_session)
+    fetches: list[asyncio.Task] = []
 
-        try:
-            name = await player_data.name
-            uuid = await player_data.uuid
-        except (ContentTypeError, ClientConnectionError) as exc:
-            raise MojangInvalidResponseError from exc
+    def start_fetches(uuid: PlayerUUID) -> None:
+        fetches.append(asyncio.create_task(
+            fetch_hypixel_data(uuid, freshness=freshness)))
+        if skin_size is not None:
+            fetches.append(asyncio.create_task(fetch_skin_model(uuid, skin_size)))
 
-        if name is None:
-            await interaction_send_object(interaction)(
-                "That player does not exist!", ephemeral=eph)
+    if known_uuid:
+        start_fetches(known_uuid)
+
+    loading = None
+    if loading_message is not None:
+        loading = asyncio.create_task(
+            interaction_send_object(interaction)(loading_message))
+
+    try:
+        if player is None:
+            player_info = await _resolve_linked_player(interaction.user.id, known_uuid)
+        else:
+            player_info = await _resolve_player(player)
+
+        if player_info is None:
+            if loading is not None:
+                await loading
+                await interaction.edit_original_response(content=_PLAYER_NOT_FOUND_MSG)
+            else:
+                await interaction_send_object(interaction)(_PLAYER_NOT_FOUND_MSG)
             raise PlayerNotFoundError
-    return name, uuid
+
+        name, uuid = player_info
+
+        if not fetches:
+            start_fetches(uuid)
+
+        if loading is not None:
+            await loading
+
+        hypixel_data, *skin_model = await asyncio.gather(*fetches)
+    except BaseException:
+        for task in fetches:
+            task.cancel()
+
+        # Let the loading message arrive before any error response
+        pending = fetches if loading is None else [*fetches, loading]
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+
+    return PlayerBundle(name, uuid, hypixel_data, *skin_model)
+
+
+async def prefetch_player_info(players: list[PlayerDynamic]) -> None:
+    """
+    Resolve the names of several players with as few Mojang requests as
+    possible, so that the following `fetch_player_info` calls are cached.
+    Errors are ignored and left for `fetch_player_info` to report.
+    :param players: Usernames, uuids, or linked discord ids of the players
+    """
+    names = [
+        player for player in players
+        if player and len(player) <= 16 and not player.isnumeric()
+    ]
+
+    try:
+        await identity_cache.resolve_names(names)
+    except (ClientError, CircuitOpenError):
+        pass
 
 
 async def linking_interaction(
@@ -134,15 +283,15 @@ async def find_dynamic_session_interaction(
     :param session: The session to attempt to be retrieved
     :param eph: whether or not to respond ephemerally
     """
-    session_manager = SessionManager(uuid)
-    session_info = session_manager.get_session(session)
+    session_manager = AsyncSessionManager(uuid)
+    session_info = await session_manager.get_session(session)
 
     # no sessions exist because... i forgot to finish this comment now idk
     if not session_info:
-        session_count = session_manager.session_count()
+        session_count = await session_manager.session_count()
 
         if session_count == 0:
-            session_manager.create_session(session_id=1, hypixel_data=hypixel_data)
+            await session_manager.create_session(session_id=1, hypixel_data=hypixel_data)
 
             await interaction_callback(
                 content=f"**{fname(username)}** has no active sessions so one was created!"
@@ -188,22 +337,22 @@ async def run_interaction_checks(
     :param allow_star: whether or not to allow star permissions if certain\
         permissions are required
     """
-    account = Account(interaction.user.id)
+    entitlements = await async_get_entitlements(interaction.user.id)
+    account_permissions = entitlements.permissions
 
-    if account.exists:
-        if check_blacklisted and account.blacklisted:
-            embeds = load_embeds('blacklisted', color='danger')
-            await _send_interaction_check_response(interaction, embeds)
+    if check_blacklisted and entitlements.blacklisted:
+        embeds = load_embeds('blacklisted', color='danger')
+        await _send_interaction_check_response(interaction, embeds)
 
-            logger.debug(
-                f'`Blacklisted User`: Denied {interaction.user} '
-                f'({interaction.user.id}) access to an interaction')
-            raise UserBlacklistedError
+        logger.debug(
+            f'`Blacklisted User`: Denied {interaction.user} '
+            f'({interaction.user.id}) access to an interaction')
+        raise UserBlacklistedError
 
     if permissions:
         # User doesn't have at least one of the required permissions
-        if not (allow_star and '*' in account.permissions):
-            if not set(permissions) & set(account.permissions):
+        if not (allow_star and '*' in account_permissions):
+            if not set(permissions) & set(account_permissions):
                 embeds = load_embeds('missing_permissions', color='danger')
                 await _send_interaction_check_response(interaction, embeds)
 
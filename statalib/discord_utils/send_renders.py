@@ -6,18 +6,12 @@ import asyncio
 import discord
 
 from ..common import REL_PATH
+from ..async_database import async_has_access
 from ..permissions import has_access
 from ..views.modes import ModesView
 
 
-def random_tip_message(discord_id: int):
-    """
-    Chooses a random message to send if the user doesnt have tip bypass perms
-    :param discord_id: the discord id of the respective user
-    """
-    if has_access(discord_id, 'no_tips'):
-        return None
-
+def _choose_tip_message() -> str | None:
     if random.choice(([False]*5) + ([True]*2)):  # 2 in 7 chance
         try:
             with open(f'{REL_PATH}/bot/tips.json', 'r') as datafile:
@@ -30,6 +24,23 @@ def random_tip_message(discord_id: int):
     return None
 
 
+def random_tip_message(discord_id: int):
+    """
+    Chooses a random message to send if the user doesnt have tip bypass perms
+    :param discord_id: the discord id of the respective user
+    """
+    if has_access(discord_id, 'no_tips'):
+        return None
+    return _choose_tip_message()
+
+
+async def async_random_tip_message(discord_id: int) -> str | None:
+    """Async version of ~random_tip_message()"""
+    if await async_has_access(discord_id, 'no_tips'):
+        return None
+    return await asyncio.to_thread(_choose_tip_message)
+
+
 async def handle_modes_renders(
     interaction: discord.Interaction,
     func: object,
@@ -46,7 +57,7 @@ async def handle_modes_renders(
     :param view: a discord view to merge with the sent view
     """
     if not message:
-        message = random_tip_message(interaction.user.id)
+        message = await async_random_tip_message(interaction.user.id)
 
     os.makedirs(f'{REL_PATH}/database/rendered/{interaction.id}')
     await func(mode="Overall", **kwargs)
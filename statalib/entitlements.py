@@ -0,0 +1,168 @@
+"""In-memory cache of what each user is entitled to."""
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .cfg import config
+from .memory_cache import MemoryCache, MemoryCacheConfig
+
+if TYPE_CHECKING:
+    from .subscriptions import Subscription
+
+
+@dataclass
+class EntitlementsCacheConfig:
+    """Limits of the entitlements cache."""
+    ttl: float = 30
+    max_users: int = 10_000
+
+    @staticmethod
+    def from_config() -> 'EntitlementsCacheConfig':
+        """
+        Load the limits from the `global.entitlements_cache` section of the
+        config file. Missing values use the dataclass defaults.
+        """
+        try:
+            entitlements_cache_config: dict = config('global.entitlements_cache')
+        except KeyError:
+            entitlements_cache_config = {}
+
+        return EntitlementsCacheConfig(**entitlements_cache_config)
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    """The account permissions, blacklist and subscription of a user."""
+    subscription: 'Subscription'
+    permissions: tuple[str, ...]
+    blacklisted: bool
+    access: frozenset[str]
+
+    def has_permission(
+        self,
+        permissions: str | list[str],
+        allow_star: bool=True,
+        include_package: bool=False
+    ) -> bool:
+        """
+        Whether the user has at least one of the given permissions.
+        :param permissions: The permission(s) to check for.
+        :param allow_star: Whether the `*` permission grants every permission.
+        :param include_package: Whether to include the permissions of \
+            the user's subscription package.
+        """
+        user_permissions = self.access if include_package else self.permissions
+
+        if allow_star and '*' in user_permissions:
+            return True
+
+        if isinstance(permissions, str):
+            permissions = [permissions]
+
+        return not set(permissions).isdisjoint(user_permissions)
+
+
+@dataclass
+class EntitlementsCacheStats:
+    """Counters for the entitlements cache."""
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    discarded: int = 0
+
+
+class EntitlementsCache:
+    """
+    Caches the entitlements of recently seen users, so that the several
+    permission checks made while handling a single command only query the
+    database once. Every function that changes an account, its permissions
+    or its subscription invalidates the user's entry.
+
+    Entries are loaded outside of any lock. To avoid storing an entry that
+    was loaded before a concurrent invalidation, loads are tagged with the
+    invalidation count they started at, and are discarded if any user was
+    invalidated in the meantime. The ttl bounds how long an entry loaded
+    before a write is committed can be served for.
+    """
+    def __init__(
+        self,
+        entitlements_cache_config: EntitlementsCacheConfig | None=None
+    ) -> None:
+        """
+        :param entitlements_cache_config: Override the configured limits.
+        """
+        self.config = entitlements_cache_config or EntitlementsCacheConfig.from_config()
+        self.stats = EntitlementsCacheStats()
+
+        # Every entry has a size of 1, so the size limit is a user limit
+        self._cache = MemoryCache(
+            'entitlements', MemoryCacheConfig(self.config.max_users, self.config.ttl))
+        self._lock = threading.Lock()
+        self._generation = 0
+
+
+    def get(self, discord_id: int) -> Entitlements | None:
+        """
+        Get the cached entitlements of a user.
+        :param discord_id: The discord id of the user.
+        :return: The entitlements or `None` if they aren't cached.
+        """
+        with self._lock:
+            entitlements = self._cache.get(discord_id)
+
+        if entitlements is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return entitlements
+
+
+    def generation(self) -> int:
+        """The tag to pass to `set` for entitlements about to be loaded."""
+        return self._generation
+
+
+    def set(
+        self,
+        discord_id: int,
+        entitlements: Entitlements,
+        generation: int
+    ) -> None:
+        """
+        Cache the entitlements of a user, unless a user was invalidated
+        since they started loading.
+        :param discord_id: The discord id of the user.
+        :param entitlements: The loaded entitlements.
+        :param generation: The value of `generation()` before loading.
+        """
+        expires_in = entitlements.subscription.expires_in()
+
+        with self._lock:
+            if generation != self._generation:
+                self.stats.discarded += 1
+                return
+
+            # An expired subscription is replaced on the next load
+            self._cache.set(discord_id, entitlements, size=1, ttl=expires_in)
+
+
+    def invalidate(self, discord_id: int) -> None:
+        """
+        Remove the cached entitlements of a user.
+        :param discord_id: The discord id of the user.
+        """
+        with self._lock:
+            self._generation += 1
+            self._cache.delete(discord_id)
+        self.stats.invalidations += 1
+
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+
+entitlements_cache = EntitlementsCache()  # Globally used instance
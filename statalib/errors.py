@@ -57,3 +57,6 @@ class MissingPermissionsError(AppCommandError):
 
 class DataNotFoundError(Exception):
     """Expected data was not found in the database"""
+
+class CircuitOpenError(Exception):
+    """Upstream circuit breaker is open, requests are being rejected"""
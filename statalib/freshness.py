@@ -0,0 +1,61 @@
+"""Freshness policies for serving cached upstream data."""
+
+from dataclasses import dataclass
+
+from .cfg import config
+
+
+@dataclass(frozen=True)
+class FreshnessPolicy:
+    """
+    Determines how old cached data is allowed to be when it is served.
+
+    - Data younger than `max_age` is fresh and served as is.
+    - Data up to `stale_while_revalidate` seconds past `max_age` is served \
+        immediately while a fresh copy is fetched in the background.
+    - Data up to `stale_if_error` seconds past `max_age` is served if a \
+        fresh copy can't be fetched.
+    """
+    max_age: float = 300
+    stale_while_revalidate: float = 0
+    stale_if_error: float = 0
+
+    @staticmethod
+    def from_config(name: str) -> 'FreshnessPolicy':
+        """
+        Load a freshness policy from the `global.network.freshness`
+        section of the config file. Missing values use the dataclass defaults.
+        :param name: The name of the freshness policy to load.
+        """
+        try:
+            return FreshnessPolicy(**config(f'global.network.freshness.{name}'))
+        except KeyError:
+            return FreshnessPolicy()
+
+    def is_fresh(self, age: float) -> bool:
+        """
+        Whether data of a given age can be served without fetching it again.
+        :param age: The age of the data in seconds.
+        """
+        return age <= self.max_age
+
+    def can_revalidate(self, age: float) -> bool:
+        """
+        Whether data of a given age can be served while being refreshed.
+        :param age: The age of the data in seconds.
+        """
+        return age <= self.max_age + self.stale_while_revalidate
+
+    def can_serve_on_error(self, age: float) -> bool:
+        """
+        Whether data of a given age can be served if refreshing it fails.
+        :param age: The age of the data in seconds.
+        """
+        return age <= self.max_age + self.stale_if_error
+
+
+# Never serve data older than the cache expiry
+STRICT_FRESHNESS = FreshnessPolicy.from_config('strict')
+
+# Serve stale data instantly and while hypixel is unavailable
+RELAXED_FRESHNESS = FreshnessPolicy.from_config('relaxed')
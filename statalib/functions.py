@@ -14,9 +14,17 @@ import discord
 from .assets import ASSET_LOADER
 from .cfg import config
 from .common import REL_PATH
+from .database import connection_manager
+from .migrations import apply_migrations
 
 
-db_connect = lambda: sqlite3.connect(config.DB_FILE_PATH)
+def db_connect(db_fp: str | None=None) -> sqlite3.Connection:
+    """
+    Returns the calling thread's reusable connection to a database.
+    The connection must not be closed.
+    :param db_fp: The database file, defaults to `config.DB_FILE_PATH`.
+    """
+    return connection_manager.connect(db_fp)
 
 
 def to_thread(func: typing.Callable) -> typing.Coroutine:
@@ -64,7 +72,8 @@ def insert_growth_data(
     discord_id: int,
     action: Literal['add', 'remove'],
     growth: Literal['guild', 'user', 'linked'],
-    timestamp: float=None
+    timestamp: float=None,
+    cursor: sqlite3.Cursor=None
 ):
     """
     Inserts a row of growth data into database
@@ -72,13 +81,12 @@ def insert_growth_data(
     :param action: the action that caused growth (add, remove, etc)
     :param growth: what impacted the growth (guild, user, etc)
     :param timestamp: the timestamp of the action (defaults to now)
+    :param cursor: custom `sqlite3.Cursor` object to execute queries with
     """
     if timestamp is None:
         timestamp = time.time()
 
-    with db_connect() as conn:
-        cursor = conn.cursor()
-
+    def _insert_growth_data(cursor: sqlite3.Cursor) -> None:
         cursor.execute(
             'INSERT INTO growth_data '
             '(timestamp, discord_id, action, growth) '
@@ -86,40 +94,35 @@ def insert_growth_data(
             (timestamp, discord_id, action, growth)
         )
 
+    if cursor:
+        _insert_growth_data(cursor)
+        return
 
-def _update_usage(command, discord_id):
     with db_connect() as conn:
-        cursor = conn.cursor()
+        _insert_growth_data(conn.cursor())
 
-        # Check if command column exists
-        cursor.execute('SELECT * FROM command_usage WHERE discord_id = 0')
-        column_names = [desc[0] for desc in cursor.description]
 
-        # Add column if it doesnt exist
-        if not command in column_names:
-            cursor.execute(f'ALTER TABLE command_usage ADD COLUMN {command} INTEGER')
-
-        # Update users command usage stats
+def increment_command_usage(
+    cursor: sqlite3.Cursor,
+    usage: dict[tuple[int, str], int]
+) -> None:
+    """
+    Adds to the command usage stats of users. Users without any usage
+    yet are added to the user growth data.
+    :param cursor: `sqlite3.Cursor` object to execute queries with
+    :param usage: the amount of times each `(discord_id, command)` was run
+    """
+    for discord_id in {discord_id for discord_id, _ in usage}:
         cursor.execute(
-            f"SELECT overall, {command} FROM command_usage WHERE discord_id = ?",
-            (discord_id,))
-        result = cursor.fetchone()
-
-        if result and result[0]:
-            cursor.execute(f"""
-                UPDATE command_usage
-                SET overall = overall + 1,
-                {command} = {f'{command} + 1' if result[1] else 1}
-                WHERE discord_id = {discord_id}
-            """)  # if command current is null, it will be set to 1
-        else:
-            cursor.execute(
-                "INSERT INTO command_usage "
-                f"(discord_id, overall, {command}) VALUES (?, ?, ?)",
-                (discord_id, 1, 1))
-
-    if not result:
-        insert_growth_data(discord_id, action='add', growth='user')
+            'SELECT 1 FROM command_usage WHERE discord_id = ? LIMIT 1', (discord_id,))
+        if cursor.fetchone() is None:
+            insert_growth_data(discord_id, action='add', growth='user', cursor=cursor)
+
+    cursor.executemany(
+        'INSERT INTO command_usage (discord_id, command, count) VALUES (?, ?, ?) '
+        'ON CONFLICT (discord_id, command) DO UPDATE SET count = count + excluded.count',
+        [(discord_id, command, count) for (discord_id, command), count in usage.items()]
+    )
 
 
 def update_command_stats(discord_id: int, command: str) -> None:
@@ -128,8 +131,9 @@ def update_command_stats(discord_id: int, command: str) -> None:
     :param discord_id: the user that ran he command
     :param command: the command run by the user to increment
     """
-    _update_usage(command, discord_id)
-    _update_usage(command, 0)  # Global commands
+    with db_connect() as conn:
+        # Discord id 0 holds the global command usage
+        increment_command_usage(conn.cursor(), {(discord_id, command): 1, (0, command): 1})
 
 
 def fname(username: str):
@@ -164,10 +168,10 @@ def get_user_total() -> int:
 
 def _commands_ran(discord_id: int, default: Any, cursor: sqlite3.Cursor):
     cursor.execute(
-        'SELECT overall FROM command_usage WHERE discord_id = ?', (discord_id,))
+        'SELECT SUM(count) FROM command_usage WHERE discord_id = ?', (discord_id,))
     result = cursor.fetchone()
 
-    if result:
+    if result and result[0] is not None:
         return result[0]
     return default
 
@@ -196,15 +200,21 @@ def get_commands_total() -> int:
     """
     Returns total amount of commands run by all users
     """
-    with db_connect() as conn:
-        cursor = conn.cursor()
+    # Discord id 0 holds the global command usage
+    return commands_ran(0)
 
-        cursor.execute('SELECT overall FROM command_usage WHERE discord_id = 0')
-        result = cursor.fetchone()
 
-    if result:
-        return result[0]
-    return 0
+def get_command_usage(discord_id: int) -> dict[str, int]:
+    """
+    Returns how many times a user ran each command, most run first
+    :param discord_id: the discord id of the respective user
+    """
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT command, count FROM command_usage '
+            'WHERE discord_id = ? ORDER BY count DESC', (discord_id,))
+        return dict(cursor.fetchall())
 
 
 def _set_embed_color(embed: discord.Embed, color: str | int):
@@ -399,9 +409,24 @@ def comma_separated_to_list(comma_seperated_list: str) -> list:
 
 
 def setup_database_schema(schema_fp=f"{REL_PATH}/schema.sql", db_fp=config.DB_FILE_PATH) -> None:
+    """
+    Create the base schema if no migrations were applied yet, then apply
+    any pending migrations from the `migrations` directory.
+    :param schema_fp: The base schema file.
+    :param db_fp: The database file to set up.
+    """
     with open(schema_fp) as db_schema_file:
         db_schema_setup = db_schema_file.read()
 
-    with sqlite3.connect(db_fp) as conn:
+    with db_connect(db_fp) as conn:
         cursor = conn.cursor()
-        cursor.executescript(db_schema_setup)
+
+        # Migrations may move or rebuild the base tables, which
+        # would otherwise be created again
+        cursor.execute(
+            "SELECT 1 FROM main.sqlite_master WHERE type = 'table' "
+            "AND name = 'schema_version'")
+        if cursor.fetchone() is None:
+            cursor.executescript(db_schema_setup)
+
+    apply_migrations(db_fp)
@@ -0,0 +1,203 @@
+"""Process-wide pooled HTTP sessions shared by every upstream fetch."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from aiohttp import ClientSession, TCPConnector
+from aiohttp_client_cache import CacheBackend, CachedSession
+
+from .cfg import config
+from .common import MISSING
+
+
+logger = logging.getLogger('statalytics')
+
+
+@dataclass
+class UpstreamPoolConfig:
+    """Connection pool limits for a single upstream host."""
+    limit: int = 100
+    limit_per_host: int = 30
+    keepalive_timeout: float = 60
+    dns_cache_ttl: int = 300
+
+    @staticmethod
+    def from_config(upstream: str) -> 'UpstreamPoolConfig':
+        """
+        Load the pool limits of an upstream from the `global.network.pools`
+        section of the config file. Missing values use the dataclass defaults.
+        :param upstream: The name of the upstream to load the pool limits for.
+        """
+        try:
+            pools_config: dict = config('global.network.pools')
+        except KeyError:
+            pools_config = {}
+
+        pool_config = {
+            **pools_config.get('default', {}),
+            **pools_config.get(upstream, {})
+        }
+        return UpstreamPoolConfig(**pool_config)
+
+
+class _UpstreamPool:
+    def __init__(
+        self,
+        pool_config: UpstreamPoolConfig,
+        cache_backend: CacheBackend | None
+    ) -> None:
+        self.pool_config = pool_config
+        self.cache_backend = cache_backend
+
+        self.connector: TCPConnector | None = None
+        self.sessions: dict[int, ClientSession] = {}
+
+
+    def open(self) -> None:
+        self.connector = TCPConnector(
+            limit=self.pool_config.limit,
+            limit_per_host=self.pool_config.limit_per_host,
+            keepalive_timeout=self.pool_config.keepalive_timeout,
+            ttl_dns_cache=self.pool_config.dns_cache_ttl
+        )
+
+
+    def session(self, cache_backend: CacheBackend | None) -> ClientSession:
+        key = id(cache_backend)
+
+        session = self.sessions.get(key)
+        if session is None or session.closed:
+            if cache_backend is None:
+                session = ClientSession(
+                    connector=self.connector, connector_owner=False)
+            else:
+                session = CachedSession(
+                    cache=cache_backend,
+                    connector=self.connector,
+                    connector_owner=False
+                )
+            self.sessions[key] = session
+        return session
+
+
+    async def close(self) -> None:
+        for session in self.sessions.values():
+            await session.close()
+        self.sessions.clear()
+
+        if self.connector is not None:
+            await self.connector.close()
+            self.connector = None
+
+
+class HTTPClientManager:
+    """
+    Manages a set of persistent, keep-alive connection pools, one per
+    upstream host. Every upstream shares a single connector between its
+    cached and uncached sessions so that TCP and TLS connections are reused
+    regardless of whether caching is used for a request.
+
+    Pools are opened by `start()` (called from the client's `setup_hook`)
+    and closed by `close()` on shutdown. If a session is requested before
+    `start()` has been called, the pools are opened lazily.
+    """
+    def __init__(self) -> None:
+        self._upstreams: dict[str, tuple[UpstreamPoolConfig | None, CacheBackend | None]] = {}
+        self._pools: dict[str, _UpstreamPool] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+
+    def register_upstream(
+        self,
+        upstream: str,
+        cache_backend: CacheBackend | None=None,
+        pool_config: UpstreamPoolConfig | None=None
+    ) -> None:
+        """
+        Register an upstream host that sessions can be requested for.
+        :param upstream: The name used to identify the upstream (eg: `hypixel`).
+        :param cache_backend: The default cache backend to attach to the \
+            upstream's cached session.
+        :param pool_config: Override the configured pool limits of the upstream.
+        """
+        self._upstreams[upstream] = (pool_config, cache_backend)
+
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the connection pools are currently open."""
+        return self._loop is not None
+
+
+    def _open_pool(self, upstream: str) -> _UpstreamPool:
+        pool_config, cache_backend = self._upstreams[upstream]
+
+        pool = _UpstreamPool(
+            pool_config or UpstreamPoolConfig.from_config(upstream), cache_backend)
+        pool.open()
+
+        self._pools[upstream] = pool
+        return pool
+
+
+    async def start(self) -> None:
+        """Open a connection pool for every registered upstream."""
+        if self.is_open:
+            if self._loop is asyncio.get_running_loop():
+                return
+            # Pools belong to a loop that no longer runs, drop them
+            self._pools.clear()
+
+        self._loop = asyncio.get_running_loop()
+
+        for upstream in self._upstreams:
+            self._open_pool(upstream)
+
+        logger.info(f'Opened HTTP connection pools for: {", ".join(self._pools)}')
+
+
+    async def close(self) -> None:
+        """Close every session and connection pool, as well as the cache backends."""
+        for pool in self._pools.values():
+            await pool.close()
+
+            if pool.cache_backend is not None:
+                await pool.cache_backend.close()
+
+        self._pools.clear()
+        self._loop = None
+
+
+    async def session(
+        self,
+        upstream: str,
+        cache_backend: CacheBackend | None=MISSING
+    ) -> ClientSession:
+        """
+        Get the persistent session of an upstream.
+        :param upstream: The name of the registered upstream.
+        :param cache_backend: The cache backend to use. If left unset, the \
+            upstream's registered cache backend is used. If `None`, an uncached \
+            session is returned.
+        """
+        if not self.is_open or self._loop is not asyncio.get_running_loop():
+            await self.start()
+
+        pool = self._pools.get(upstream) or self._open_pool(upstream)
+
+        if cache_backend is MISSING:
+            cache_backend = pool.cache_backend
+        return pool.session(cache_backend)
+
+
+def upstream_url(upstream: str) -> str:
+    """
+    Returns the base url of an upstream from the `global.network.upstream_urls`
+    section of the config file. Can be pointed at a local stand-in server.
+    :param upstream: The name of the upstream (eg: `hypixel`, `mojang_api`).
+    """
+    return config(f'global.network.upstream_urls.{upstream}')
+
+
+http_client = HTTPClientManager()  # Globally used instance
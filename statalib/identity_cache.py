@@ -0,0 +1,363 @@
+"""Persistent name <-> uuid cache of Minecraft players."""
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+
+from aiohttp import ClientError
+
+from .aliases import PlayerName, PlayerUUID
+from .cfg import config
+from .database import db_executor
+from .functions import db_connect
+from .http_client import http_client, upstream_url
+from .mcfetch.asyncmcfetch import AsyncFetchPlayer, mojang_circuit_breaker
+
+
+logger = logging.getLogger('statalytics')
+
+# Mojang's bulk profile endpoint accepts at most 10 names per request
+MOJANG_BULK_LIMIT = 10
+
+# Names that the bulk endpoint accepts, anything else is rejected with a 400
+_VALID_NAME = re.compile(r'^[A-Za-z0-9_]{1,16}$')
+
+
+@dataclass
+class IdentityCacheConfig:
+    """Lifetimes of cached player identities."""
+    refresh_after: float = 6 * 60 * 60
+    max_age: float = 30 * 24 * 60 * 60
+    negative_ttl: float = 30 * 60
+    batch_delay: float = 0.01
+
+    @staticmethod
+    def from_config() -> 'IdentityCacheConfig':
+        """
+        Load the lifetimes from the `global.network.identity_cache` section
+        of the config file. Missing values use the dataclass defaults.
+        """
+        try:
+            identity_cache_config: dict = config('global.network.identity_cache')
+        except KeyError:
+            identity_cache_config = {}
+
+        return IdentityCacheConfig(**identity_cache_config)
+
+
+@dataclass
+class IdentityCacheStats:
+    """Counters for the identity cache."""
+    hits: int = 0
+    stale_hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    bulk_requests: int = 0
+    refreshes: int = 0
+
+
+@dataclass(frozen=True)
+class PlayerIdentity:
+    """The current name of a player's uuid."""
+    uuid: PlayerUUID
+    name: PlayerName
+    verified_at: float
+
+
+def normalize_uuid(uuid: PlayerUUID) -> PlayerUUID:
+    """
+    Returns the undashed, lowercase form of a uuid, as returned by Mojang.
+    :param uuid: The uuid to normalize.
+    """
+    return uuid.replace('-', '').lower()
+
+
+class IdentityCache:
+    """
+    Resolves player names and uuids using the `player_identities` table,
+    falling back to Mojang for unknown players.
+
+    Identities older than `refresh_after` are still returned, but are
+    re-verified in the background. Identities older than `max_age` are
+    re-verified before being returned. Names that don't belong to anyone
+    are remembered for `negative_ttl` seconds.
+
+    Names that need to be looked up are queued for `batch_delay` seconds
+    and resolved together through Mojang's bulk profile endpoint, so
+    resolving several names at once only costs one request per 10 names.
+    """
+    def __init__(self, identity_cache_config: IdentityCacheConfig | None=None) -> None:
+        """
+        :param identity_cache_config: Override the configured lifetimes.
+        """
+        self.config = identity_cache_config or IdentityCacheConfig.from_config()
+        self.stats = IdentityCacheStats()
+
+        # Unresolved lookups by lowercase name, including ones in flight
+        self._lookups: dict[str, asyncio.Future] = {}
+        # Lowercase names waiting for the next bulk request
+        self._queued: list[str] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+        self._refreshing_uuids: set[PlayerUUID] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+
+    def _is_fresh(self, verified_at: float) -> bool:
+        return time.time() - verified_at < self.config.refresh_after
+
+
+    def _is_usable(self, verified_at: float) -> bool:
+        return time.time() - verified_at < self.config.max_age
+
+
+    def _get_by_name(self, name_lower: str) -> PlayerIdentity | None:
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT uuid, name, verified_at FROM player_identities '
+                'WHERE name_lower = ? ORDER BY verified_at DESC LIMIT 1',
+                (name_lower,))
+            row = cursor.fetchone()
+
+        return PlayerIdentity(*row) if row else None
+
+
+    def _get_by_uuid(self, uuid: PlayerUUID) -> PlayerIdentity | None:
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT uuid, name, verified_at FROM player_identities WHERE uuid = ?',
+                (uuid,))
+            row = cursor.fetchone()
+
+        return PlayerIdentity(*row) if row else None
+
+
+    def _is_known_missing(self, name_lower: str) -> bool:
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT checked_at FROM missing_player_names WHERE name_lower = ?',
+                (name_lower,))
+            row = cursor.fetchone()
+
+        return row is not None and time.time() - row[0] < self.config.negative_ttl
+
+
+    def _store(
+        self,
+        identities: list[PlayerIdentity],
+        missing_names: list[str]=()
+    ) -> None:
+        with db_connect() as conn:
+            cursor = conn.cursor()
+
+            for identity in identities:
+                name_lower = identity.name.lower()
+                # A name belongs to a single player, anyone else had it before
+                cursor.execute(
+                    'DELETE FROM player_identities WHERE name_lower = ? AND uuid != ?',
+                    (name_lower, identity.uuid))
+                cursor.execute(
+                    'INSERT OR REPLACE INTO player_identities '
+                    '(uuid, name, name_lower, verified_at) VALUES (?, ?, ?, ?)',
+                    (identity.uuid, identity.name, name_lower, identity.verified_at))
+                cursor.execute(
+                    'DELETE FROM missing_player_names WHERE name_lower = ?', (name_lower,))
+
+            now = time.time()
+            for name_lower in missing_names:
+                cursor.execute(
+                    'DELETE FROM player_identities WHERE name_lower = ?', (name_lower,))
+                cursor.execute(
+                    'INSERT OR REPLACE INTO missing_player_names '
+                    '(name_lower, checked_at) VALUES (?, ?)', (name_lower, now))
+
+
+    def _start_task(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+    async def _fetch_profiles(self, names: list[str]) -> list[dict]:
+        session = await http_client.session('mojang', cache_backend=None)
+
+        async with session.post(
+            f"{upstream_url('mojang_api')}/profiles/minecraft", json=names
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+    async def _resolve_batch(self, names: list[str]) -> None:
+        try:
+            self.stats.bulk_requests += 1
+            profiles = await mojang_circuit_breaker.call(
+                self._fetch_profiles, names,
+                failure_exceptions=(ClientError, TimeoutError))
+        except Exception as exc:
+            for name_lower in names:
+                self._lookups.pop(name_lower).set_exception(exc)
+            return
+
+        now = time.time()
+        identities = {
+            profile['name'].lower(): PlayerIdentity(profile['id'], profile['name'], now)
+            for profile in profiles
+            if profile.get('id') and profile.get('name')
+        }
+        missing_names = [name for name in names if name not in identities]
+
+        try:
+            await db_executor.write(
+                self._store, list(identities.values()), missing_names)
+        except Exception:
+            logger.exception('Failed to store player identities')
+
+        for name_lower in names:
+            self._lookups.pop(name_lower).set_result(identities.get(name_lower))
+
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        queued, self._queued = self._queued, []
+
+        for i in range(0, len(queued), MOJANG_BULK_LIMIT):
+            self._start_task(self._resolve_batch(queued[i:i + MOJANG_BULK_LIMIT]))
+
+
+    def _lookup_name(self, name_lower: str) -> asyncio.Future:
+        future = self._lookups.get(name_lower)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Background refreshes are never awaited, so their errors are dropped
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        self._lookups[name_lower] = future
+        self._queued.append(name_lower)
+
+        if len(self._queued) >= MOJANG_BULK_LIMIT:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.config.batch_delay, self._flush)
+
+        return future
+
+
+    async def resolve_name(self, name: PlayerName) -> PlayerIdentity | None:
+        """
+        Get the identity of the player currently using a name.
+        Returns `None` if the name doesn't belong to anyone.
+        :param name: The name of the player, case insensitive.
+        :raises ClientError | CircuitOpenError: If Mojang couldn't be reached.
+        """
+        if not _VALID_NAME.match(name):
+            return None
+
+        name_lower = name.lower()
+
+        identity = await db_executor.read(self._get_by_name, name_lower)
+        if identity is not None:
+            if self._is_fresh(identity.verified_at):
+                self.stats.hits += 1
+                return identity
+
+            if self._is_usable(identity.verified_at):
+                self.stats.stale_hits += 1
+                self.stats.refreshes += 1
+                self._lookup_name(name_lower)
+                return identity
+
+        elif await db_executor.read(self._is_known_missing, name_lower):
+            self.stats.negative_hits += 1
+            return None
+
+        self.stats.misses += 1
+        return await asyncio.shield(self._lookup_name(name_lower))
+
+
+    async def resolve_names(
+        self,
+        names: list[PlayerName]
+    ) -> dict[PlayerName, PlayerIdentity | None]:
+        """
+        Get the identities of the players currently using each name. Unknown
+        names are looked up with as few requests as possible.
+        :param names: The names of the players, case insensitive.
+        :raises ClientError | CircuitOpenError: If Mojang couldn't be reached.
+        """
+        identities = await asyncio.gather(*(self.resolve_name(name) for name in names))
+        return dict(zip(names, identities))
+
+
+    async def _fetch_by_uuid(self, uuid: PlayerUUID) -> PlayerIdentity | None:
+        session = await http_client.session('mojang')
+        name = await AsyncFetchPlayer(uuid=uuid, session=session).name
+
+        if name is None:
+            return None
+
+        identity = PlayerIdentity(uuid, name, time.time())
+        await db_executor.write(self._store, [identity])
+        return identity
+
+
+    async def _refresh_uuid(self, uuid: PlayerUUID) -> None:
+        try:
+            await self._fetch_by_uuid(uuid)
+        except Exception as exc:
+            logger.warning(f'Failed to refresh the identity of {uuid}: {exc!r}')
+        finally:
+            self._refreshing_uuids.discard(uuid)
+
+
+    async def resolve_uuid(self, uuid: PlayerUUID) -> PlayerIdentity | None:
+        """
+        Get the identity of the player with a uuid.
+        Returns `None` if the uuid doesn't belong to anyone.
+        :param uuid: The uuid of the player, dashed or undashed.
+        :raises ClientError | CircuitOpenError: If Mojang couldn't be reached.
+        """
+        uuid = normalize_uuid(uuid)
+
+        identity = await db_executor.read(self._get_by_uuid, uuid)
+        if identity is not None:
+            if self._is_fresh(identity.verified_at):
+                self.stats.hits += 1
+                return identity
+
+            if self._is_usable(identity.verified_at):
+                self.stats.stale_hits += 1
+                if uuid not in self._refreshing_uuids:
+                    self.stats.refreshes += 1
+                    self._refreshing_uuids.add(uuid)
+                    self._start_task(self._refresh_uuid(uuid))
+                return identity
+
+        self.stats.misses += 1
+        return await self._fetch_by_uuid(uuid)
+
+
+    async def resolve(self, identifier: str) -> PlayerIdentity | None:
+        """
+        Get the identity of a player from either their name or uuid. Whether
+        the identifier is a name or uuid is determined by its length.
+        :param identifier: The name or uuid of the player.
+        :raises ClientError | CircuitOpenError: If Mojang couldn't be reached.
+        """
+        if len(identifier) > 16:
+            return await self.resolve_uuid(identifier)
+        return await self.resolve_name(identifier)
+
+
+identity_cache = IdentityCache()  # Globally used instance
@@ -0,0 +1,96 @@
+"""Pluggable JSON encoding and decoding of upstream response bodies."""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .cfg import config
+
+
+logger = logging.getLogger('statalytics')
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """A JSON implementation used to decode and encode response bodies."""
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+STDLIB_JSON_CODEC = JSONCodec(
+    name='json',
+    loads=json.loads,
+    dumps=lambda obj: json.dumps(obj, separators=(',', ':')).encode()
+)
+
+if orjson is not None:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    ORJSON_CODEC = JSONCodec(name='orjson', loads=orjson.loads, dumps=orjson.dumps)
+else:
+    ORJSON_CODEC = None
+
+
+def _load_offload_threshold() -> int:
+    try:
+        return config('global.network.json_offload_threshold')
+    except KeyError:
+        return 1024 * 1024
+
+
+# Bodies at least this many bytes long are decoded in a worker thread
+JSON_OFFLOAD_THRESHOLD: int = _load_offload_threshold()
+
+_json_codec: JSONCodec = ORJSON_CODEC or STDLIB_JSON_CODEC
+
+
+def get_json_codec() -> JSONCodec:
+    """Returns the JSON codec that is currently in use."""
+    return _json_codec
+
+
+def set_json_codec(codec: JSONCodec) -> None:
+    """
+    Replace the JSON codec used for response bodies.
+    :param codec: The JSON codec to use.
+    """
+    global _json_codec
+    _json_codec = codec
+    logger.info(f'Using {codec.name} for JSON decoding')
+
+
+def json_loads(body: bytes | str) -> Any:
+    """
+    Decode a JSON document using the current codec.
+    :param body: The JSON document to decode.
+    """
+    return _json_codec.loads(body)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """
+    Encode an object as a compact JSON document using the current codec.
+    :param obj: The object to encode.
+    """
+    return _json_codec.dumps(obj)
+
+
+async def async_json_loads(body: bytes | str) -> Any:
+    """
+    Decode a JSON document using the current codec. Documents larger than
+    `JSON_OFFLOAD_THRESHOLD` are decoded in a worker thread so that they
+    don't block the event loop.
+    :param body: The JSON document to decode.
+    """
+    codec = _json_codec
+
+    if len(body) >= JSON_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(codec.loads, body)
+    return codec.loads(body)
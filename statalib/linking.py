@@ -2,6 +2,7 @@ from .mcfetch import AsyncFetchPlayer
 from .sessions import SessionManager
 from .permissions import has_access
 from .aliases import PlayerName, PlayerUUID
+from .database import db_executor
 from .functions import insert_growth_data, db_connect
 
 
@@ -159,18 +160,28 @@ async def link_account(
             if not name:
                 name = await AsyncFetchPlayer(uuid=uuid).name
 
-            set_linked_data(discord_id, uuid)
-            update_autofill(discord_id, uuid, name)
-
-            session_manager = SessionManager(uuid)
-            if session_manager.session_count() == 0:
-                session_manager.create_session(session_id=1, hypixel_data=hypixel_data)
-                return 2
-            return 1
+            return await db_executor.write(
+                _store_link, discord_id, uuid, name, hypixel_data)
         return 0
     return -1
 
 
+def _store_link(
+    discord_id: int,
+    uuid: PlayerUUID,
+    name: PlayerName,
+    hypixel_data: dict
+) -> int:
+    set_linked_data(discord_id, uuid)
+    update_autofill(discord_id, uuid, name)
+
+    session_manager = SessionManager(uuid)
+    if session_manager.session_count() == 0:
+        session_manager.create_session(session_id=1, hypixel_data=hypixel_data)
+        return 2
+    return 1
+
+
 class LinkingManager:
     def __init__(self, discord_id: int):
         self._discord_id = discord_id
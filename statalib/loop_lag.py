@@ -0,0 +1,133 @@
+"""Measurement of how long the event loop is blocked for."""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from statistics import quantiles
+
+from .cfg import config
+
+
+logger = logging.getLogger('statalytics')
+
+
+@dataclass
+class LoopLagConfig:
+    """Sampling settings of the loop lag monitor."""
+    interval: float = 0.05
+    window: int = 1200
+    warn_threshold: float = 0.25
+
+    @staticmethod
+    def from_config() -> 'LoopLagConfig':
+        """
+        Load the settings from the `global.loop_lag` section of the config
+        file. Missing values use the dataclass defaults.
+        """
+        try:
+            loop_lag_config: dict = config('global.loop_lag')
+        except KeyError:
+            loop_lag_config = {}
+
+        return LoopLagConfig(**loop_lag_config)
+
+
+@dataclass
+class LoopLagStats:
+    """Counters for the loop lag monitor."""
+    samples: int = 0
+    stalls: int = 0
+    max_lag: float = 0.0
+
+
+class LoopLagMonitor:
+    """
+    Measures the lag of the event loop by sleeping for a fixed interval and
+    recording how much later than requested the sleep ended. Anything that
+    blocks the loop, like a synchronous database query, delays the wake up
+    by as long as it runs.
+
+    Lags above `warn_threshold` seconds are counted as stalls and logged.
+    """
+    def __init__(self, loop_lag_config: LoopLagConfig | None=None) -> None:
+        """
+        :param loop_lag_config: Override the configured sampling settings.
+        """
+        self.config = loop_lag_config or LoopLagConfig.from_config()
+        self.stats = LoopLagStats()
+
+        self._lags: deque[float] = deque(maxlen=self.config.window)
+        self._task: asyncio.Task | None = None
+
+
+    @property
+    def running(self) -> bool:
+        """Whether the monitor is currently sampling."""
+        return self._task is not None and not self._task.done()
+
+
+    def _record(self, lag: float) -> None:
+        self._lags.append(lag)
+        self.stats.samples += 1
+        self.stats.max_lag = max(self.stats.max_lag, lag)
+
+        if lag >= self.config.warn_threshold:
+            self.stats.stalls += 1
+            logger.warning(f'The event loop was blocked for {lag * 1000:.0f}ms')
+
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            expected = loop.time() + self.config.interval
+            await asyncio.sleep(self.config.interval)
+            self._record(max(loop.time() - expected, 0.0))
+
+
+    def start(self) -> None:
+        """Start sampling the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._sample())
+
+
+    async def stop(self) -> None:
+        """Stop sampling, keeping the recorded lags."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+    def reset(self) -> None:
+        """Forget every recorded lag."""
+        self._lags.clear()
+        self.stats = LoopLagStats()
+
+
+    def percentile(self, percentile: int) -> float:
+        """
+        Returns a percentile of the recent lags in seconds.
+        :param percentile: The percentile to return, from 1 to 99.
+        """
+        if len(self._lags) < 2:
+            return self._lags[0] if self._lags else 0.0
+        return quantiles(self._lags, n=100, method='inclusive')[percentile - 1]
+
+
+    def snapshot(self) -> dict[str, float | int]:
+        """Returns the counters and recent lag percentiles in milliseconds."""
+        return {
+            'samples': self.stats.samples,
+            'stalls': self.stats.stalls,
+            'p50_ms': round(self.percentile(50) * 1000, 2),
+            'p99_ms': round(self.percentile(99) * 1000, 2),
+            'max_ms': round(self.stats.max_lag * 1000, 2)
+        }
+
+
+loop_lag_monitor = LoopLagMonitor()  # Globally used instance
@@ -1,16 +1,28 @@
 import json
 from base64 import b64decode
 
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientSession
 from aiohttp_client_cache import CacheBackend, CachedSession
 
+from ..circuit_breaker import CircuitBreaker
+from ..http_client import upstream_url
+from ..single_flight import SingleFlight
+
+
+# Concurrent requests for the same url share a single request
+mojang_requests = SingleFlight('mojang')
+
+# Rejects requests while mojang is unavailable
+mojang_circuit_breaker = CircuitBreaker('mojang')
+
 
 class AsyncFetchPlayer:
     def __init__(
         self,
         name: str=None,
         uuid: str=None,
-        cache_backend: CacheBackend=None
+        cache_backend: CacheBackend=None,
+        session: ClientSession=None
     ):
         """
         Initializes a FetchPlayer object with a name and/or uuid.
@@ -20,6 +32,9 @@ class AsyncFetchPlayer:
             uuid (str, optional): The player's uuid. Defaults to None.
             cache_backend (class, optional): The backend used for caching
             responses, if `None`, caching won't be used.
+            session (ClientSession, optional): A persistent session to make
+            requests with. If provided, `cache_backend` is ignored and the
+            session is left open.
 
         Raises:
             AssertionError: If both name and uuid are None or if both are not None.
@@ -31,6 +46,7 @@ class AsyncFetchPlayer:
         self._pretty_name = None
 
         self._skin_url = None
+        self._skin_variant = 'classic'
         self._skin_texture = None
 
         self._player_exists = True
@@ -38,6 +54,7 @@ class AsyncFetchPlayer:
         self._has_loaded_by_uuid = False
 
         self.cache_backend = cache_backend
+        self.session = session
 
 
     @property
@@ -68,6 +85,13 @@ class AsyncFetchPlayer:
         return self._skin_url
 
 
+    @property
+    async def skin_variant(self) -> str:
+        """Returns the player's skin model, either `classic` or `slim`."""
+        await self.skin_url
+        return self._skin_variant
+
+
     @property
     async def skin_texture(self) -> str | None:
         """Returns the player's skin texture image as bytes."""
@@ -75,14 +99,20 @@ class AsyncFetchPlayer:
             skin_url = await self.skin_url
             if skin_url is None:
                 return None
-            texture = (await self._make_request(skin_url)).content
-            self._skin_texture = await texture.read()
+            self._skin_texture = await self.fetch_texture(skin_url)
 
         return self._skin_texture
 
 
+    async def fetch_texture(self, url: str) -> bytes:
+        """Fetches a skin texture image, such as one of the default skins."""
+        return await self._fetch(url, as_json=False)
+
+
     async def _make_request(self, url: str):
-        if self.cache_backend is None:
+        if self.session is not None:
+            data = await self.session.get(url)
+        elif self.cache_backend is None:
             async with ClientSession() as session:
                 data = await session.get(url)
         else:
@@ -91,11 +121,27 @@ class AsyncFetchPlayer:
         return data
 
 
+    async def __read_response(self, url: str, as_json: bool):
+        response = await self._make_request(url)
+
+        if response.status >= 500:
+            response.raise_for_status()
+
+        if as_json:
+            return await response.json()
+        return await response.read()
+
+
+    async def _fetch(self, url: str, as_json: bool=True):
+        return await mojang_requests.do(
+            url, mojang_circuit_breaker.call, self.__read_response, url, as_json,
+            failure_exceptions=(ClientError, TimeoutError))
+
+
     async def _load_by_name(self):
         if self._uuid is None and self._player_exists:
-            data: dict = await (await self._make_request(
-                f"https://api.mojang.com/users/profiles/minecraft/{self._name}"
-            )).json()
+            data: dict = await self._fetch(
+                f"{upstream_url('mojang_api')}/users/profiles/minecraft/{self._name}")
 
             self._uuid = data.get("id")
             self._pretty_name = data.get("name")
@@ -106,9 +152,9 @@ class AsyncFetchPlayer:
 
     async def _load_by_uuid(self):
         if (not self._has_loaded_by_uuid) and self._player_exists:
-            data: dict = await (await self._make_request(
-                f"https://sessionserver.mojang.com/session/minecraft/profile/{self._uuid}"
-            )).json()
+            data: dict = await self._fetch(
+                f"{upstream_url('mojang_sessionserver')}"
+                f"/session/minecraft/profile/{self._uuid}")
 
             name = data.get("name")
 
@@ -124,17 +170,20 @@ class AsyncFetchPlayer:
                     encoded_str = item.get('value', '')
                     textures: dict = json.loads(b64decode(encoded_str) or '{}')
 
-                    self._skin_url = textures.get('textures', {}).get('SKIN', {}).get('url')
+                    skin: dict = textures.get('textures', {}).get('SKIN', {})
+                    self._skin_url = skin.get('url')
+                    self._skin_variant = skin.get('metadata', {}).get('model', 'classic')
                     break
 
-            self._has_loaded_by_uuid == True
+            self._has_loaded_by_uuid = True
 
 
 class AsyncFetchPlayer2(AsyncFetchPlayer):
     def __init__(
         self,
         identifier: str,
-        cache_backend: CacheBackend=None
+        cache_backend: CacheBackend=None,
+        session: ClientSession=None
     ):
         """
         Wrapper for the `FetchPlayer` class that allows either a username or uuid to
@@ -145,8 +194,12 @@ class AsyncFetchPlayer2(AsyncFetchPlayer):
             identifier (str, optional): The player's username or uuid.
             cache_backend (class, optional): The backend used for caching
             responses, if `None`, caching won't be used.
+            session (ClientSession, optional): A persistent session to make
+            requests with. If provided, `cache_backend` is ignored.
         """
         if len(identifier) > 16:
-            super().__init__(uuid=identifier, cache_backend=cache_backend)
+            super().__init__(
+                uuid=identifier, cache_backend=cache_backend, session=session)
         else:
-            super().__init__(name=identifier, cache_backend=cache_backend)
+            super().__init__(
+                name=identifier, cache_backend=cache_backend, session=session)
@@ -0,0 +1,173 @@
+"""Size bounded in-memory cache of decoded upstream responses."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+from .cfg import config
+
+
+@dataclass
+class MemoryCacheConfig:
+    """Limits of an in-memory cache."""
+    max_bytes: int = 64 * 1024 * 1024
+    ttl: float = 300
+
+    @staticmethod
+    def from_config(name: str) -> 'MemoryCacheConfig':
+        """
+        Load the limits of a memory cache from the `global.network.memory_caches`
+        section of the config file. Missing values use the dataclass defaults.
+        :param name: The name of the memory cache to load the limits for.
+        """
+        try:
+            return MemoryCacheConfig(**config(f'global.network.memory_caches.{name}'))
+        except KeyError:
+            return MemoryCacheConfig()
+
+
+@dataclass
+class MemoryCacheStats:
+    """Counters for an in-memory cache."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """The fraction of lookups that were served from memory."""
+        lookups = self.hits + self.misses
+        if lookups == 0:
+            return 0.0
+        return self.hits / lookups
+
+
+@dataclass
+class _MemoryCacheEntry:
+    value: Any
+    size: int
+    expires: float
+
+
+class MemoryCache:
+    """
+    A least recently used cache of already decoded values, bounded by the
+    total size of the stored values rather than the amount of entries.
+
+    Since the real memory footprint of a decoded object is expensive to
+    measure, every value is stored with the size of the raw response it was
+    decoded from. The decoded objects are shared between every caller that
+    reads them, so they must be treated as read only.
+    """
+    def __init__(
+        self,
+        name: str,
+        memory_cache_config: MemoryCacheConfig | None=None
+    ) -> None:
+        """
+        :param name: The name of the cache, used for the config and metrics.
+        :param memory_cache_config: Override the configured cache limits.
+        """
+        self.name = name
+
+        memory_cache_config = memory_cache_config or MemoryCacheConfig.from_config(name)
+        self.max_bytes = memory_cache_config.max_bytes
+        self.ttl = memory_cache_config.ttl
+
+        self.stats = MemoryCacheStats()
+
+        self._entries: OrderedDict[Hashable, _MemoryCacheEntry] = OrderedDict()
+        self._size = 0
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires > time.monotonic()
+
+
+    @property
+    def size(self) -> int:
+        """The total size in bytes of every stored value."""
+        return self._size
+
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Get a stored value, marking it as recently used.
+        :param key: The key of the value.
+        :return: The stored value or `None` if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.expires <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        size: int,
+        ttl: float | None=None
+    ) -> None:
+        """
+        Store a value, evicting the least recently used values if
+        the cache would otherwise exceed its maximum size.
+        :param key: The key of the value.
+        :param value: The value to store.
+        :param size: The size in bytes of the value.
+        :param ttl: The amount of seconds until the value expires, \
+            defaults to the cache's ttl.
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+
+        if size > self.max_bytes or ttl <= 0:
+            return
+
+        while self._size + size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted.size
+            self.stats.evictions += 1
+
+        self._entries[key] = _MemoryCacheEntry(value, size, time.monotonic() + ttl)
+        self._size += size
+
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove a value from the cache if it is stored.
+        :param key: The key of the value.
+        """
+        if key in self._entries:
+            self._remove(key)
+
+
+    def clear(self) -> None:
+        """Remove every value from the cache."""
+        self._entries.clear()
+        self._size = 0
@@ -0,0 +1,170 @@
+"""Versioned migrations applied on top of the base database schema."""
+
+import importlib.util
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Callable, NamedTuple
+
+from .common import REL_PATH
+from .database import connection_manager
+
+
+logger = logging.getLogger('statalytics')
+
+MIGRATIONS_DIR = f'{REL_PATH}/migrations'
+
+# Migration files are named `<version>_<name>.sql`, e.g. `0001_lookup_indexes.sql`.
+# Migrations that can't be written in SQL alone are `<version>_<name>.py`
+# modules with a `migrate(conn)` function.
+_MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.(sql|py)$')
+
+
+class MigrationError(Exception):
+    """A migration couldn't be loaded or applied."""
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    sql: str | None = None
+    migrate: Callable[[sqlite3.Connection], None] | None = None
+
+
+def _load_migration(migrations_dir: str, filename: str) -> Migration:
+    match = _MIGRATION_FILE.match(filename)
+    version, name, extension = int(match.group(1)), match.group(2), match.group(3)
+    path = f'{migrations_dir}/{filename}'
+
+    if extension == 'sql':
+        with open(path) as migration_file:
+            return Migration(version, name, sql=migration_file.read())
+
+    spec = importlib.util.spec_from_file_location(f'migration_{version}_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return Migration(version, name, migrate=module.migrate)
+
+
+def load_migrations(migrations_dir: str=MIGRATIONS_DIR) -> list[Migration]:
+    """
+    Load the migration scripts of a directory, ordered by version.
+    Versions must start at 1 and have no gaps.
+    :param migrations_dir: The directory containing the migration scripts.
+    """
+    migrations = []
+
+    for filename in os.listdir(migrations_dir):
+        if _MIGRATION_FILE.match(filename):
+            migrations.append(_load_migration(migrations_dir, filename))
+
+    migrations.sort(key=lambda migration: migration.version)
+
+    for expected_version, migration in enumerate(migrations, start=1):
+        if migration.version != expected_version:
+            raise MigrationError(
+                f'Expected migration version {expected_version}, '
+                f'found {migration.version} ({migration.name})')
+
+    return migrations
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """
+    Returns the version of the latest migration applied to a database.
+    :param conn: A connection to the database.
+    """
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS schema_version ('
+        'version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at REAL NOT NULL)')
+
+    version = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()[0]
+    return version or 0
+
+
+def _split_statements(sql: str) -> list[str]:
+    statements = []
+    statement = ''
+
+    for line in sql.splitlines(keepends=True):
+        statement += line
+
+        if sqlite3.complete_statement(statement):
+            statements.append(statement)
+            statement = ''
+
+    if statement.strip():
+        statements.append(statement)  # Fails with a syntax error
+    return statements
+
+
+def _apply_migration(conn: sqlite3.Connection, migration: Migration) -> bool:
+    """
+    Apply a migration unless it was applied by another process.
+    Returns whether the migration was applied.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+
+    # Read again while holding the write lock, another process starting
+    # at the same time may have applied the migration first
+    if get_schema_version(conn) >= migration.version:
+        conn.rollback()
+        return False
+
+    if migration.sql is not None:
+        # Run one by one, `executescript` would commit the transaction
+        for statement in _split_statements(migration.sql):
+            conn.execute(statement)
+    else:
+        migration.migrate(conn)
+
+    # Migrations that commit partway release the lock in between,
+    # so the migration may have been completed by another process
+    if get_schema_version(conn) < migration.version:
+        conn.execute(
+            'INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)',
+            (migration.version, migration.name, time.time()))
+    conn.commit()
+    return True
+
+
+def apply_migrations(
+    db_fp: str | None=None,
+    migrations_dir: str=MIGRATIONS_DIR
+) -> list[Migration]:
+    """
+    Apply the migrations newer than the database's schema version. Every
+    migration runs in its own transaction along with its version update,
+    so a failed migration leaves the database at the previous version.
+    Migrations applied by another process in the meantime are skipped.
+    Returns the applied migrations.
+    :param db_fp: The database file, defaults to `config.DB_FILE_PATH`.
+    :param migrations_dir: The directory containing the migration scripts.
+    """
+    migrations = load_migrations(migrations_dir)
+    conn = connection_manager.connect(db_fp)
+
+    with conn:
+        schema_version = get_schema_version(conn)
+
+    pending = [migration for migration in migrations if migration.version > schema_version]
+    applied = []
+
+    for migration in pending:
+        try:
+            if not _apply_migration(conn, migration):
+                continue
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.rollback()
+            raise MigrationError(
+                f'Failed to apply migration {migration.version} '
+                f'({migration.name}): {exc}') from exc
+
+        applied.append(migration)
+        logger.info(f'Applied database migration {migration.version} ({migration.name})')
+
+    return applied
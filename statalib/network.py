@@ -1,59 +1,300 @@
 import asyncio
 import logging
+import time
+from datetime import datetime
 from typing import Literal
 from os import getenv
 from json import JSONDecodeError
 from http.client import RemoteDisconnected
 
 from requests import ReadTimeout, ConnectTimeout
-from aiohttp import ClientSession, ContentTypeError
-from aiohttp_client_cache import CachedSession, SQLiteBackend
+from aiohttp import ClientConnectionError, ClientError, ClientResponseError
+from aiohttp_client_cache import CachedResponse, SQLiteBackend
+from aiohttp_client_cache.cache_control import get_expiration_datetime
 
+from .cache_maintenance import CacheSweeper, CacheSweepResult
 from .cfg import config
 from .common import REL_PATH
-from .errors import HypixelInvalidResponseError, HypixelRateLimitedError
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .errors import CircuitOpenError, HypixelInvalidResponseError, HypixelRateLimitedError
+from .freshness import FreshnessPolicy, STRICT_FRESHNESS
+from .http_client import http_client, upstream_url
+from .identity_cache import identity_cache
+from .json_codec import async_json_loads, json_dumps
+from .memory_cache import MemoryCache
+from .player_projection import project_hypixel_data
+from .rate_limiting import HeaderRateLimiter, RequestPriority
+from .single_flight import SingleFlight
 from .aliases import PlayerUUID
+from .mcfetch.asyncmcfetch import (
+    AsyncFetchPlayer,
+    mojang_circuit_breaker,
+    mojang_requests
+)
+from .render.skins import (
+    DEFAULT_SKIN_TEXTURE_URLS,
+    RENDERABLE_SKIN_STYLES,
+    SkinRenderCache,
+    default_skin_variant,
+    render_skin_model,
+    skin_texture_hash
+)
 from .rotational_stats import async_reset_rotational_stats_if_whitelisted
 
 
 logger = logging.getLogger('statalytics')
 
+# Kept past their max age so they can be served stale
+STATS_CACHE_RETENTION: int = config('global.network.stats_cache_retention')
+
 stats_session = SQLiteBackend(
-    cache_name=f'{REL_PATH}/.cache/stats_cache', expire_after=300)
+    cache_name=f'{REL_PATH}/.cache/stats_cache', expire_after=STATS_CACHE_RETENTION)
 
 skin_session = SQLiteBackend(
     cache_name=f'{REL_PATH}/.cache/skin_cache', expire_after=900)
 
+# Either `local` to render skins from their textures, or `visage`
+SKIN_RENDERER: str = config('global.network.skin_rendering.renderer')
+
+# Texture urls and skin variants of players, saves a session server
+# request for every render. Expires like the visage renders used to
+skin_texture_memory_cache = MemoryCache('skin_textures')
+
+# Skin textures and local renders, keyed by texture
+skin_render_cache = SkinRenderCache(
+    f'{REL_PATH}/.cache/skins',
+    max_bytes=config('global.network.skin_rendering.cache_max_bytes'))
+
 mojang_session = SQLiteBackend(
     cache_name=f'{REL_PATH}/.cache/mojang_cache', expire_after=60)
 
 
+# Persistent connection pools for each upstream host
+http_client.register_upstream('hypixel', cache_backend=stats_session)
+http_client.register_upstream('visage', cache_backend=skin_session)
+http_client.register_upstream('mojang', cache_backend=mojang_session)
+
+# Expired responses are only skipped on read, so they have to be swept
+response_cache_sweepers = {
+    'hypixel': CacheSweeper('stats', stats_session),
+    'skin': CacheSweeper('skin', skin_session),
+    'mojang': CacheSweeper('mojang', mojang_session)
+}
+
+# Decoded player data, checked before the SQLite stats cache
+stats_memory_cache = MemoryCache('stats')
+
+hypixel_rate_limiter = HeaderRateLimiter('hypixel')
+
+# Concurrent requests for the same resource share a single upstream request
+hypixel_requests = SingleFlight('hypixel')
+hypixel_revalidations = SingleFlight('hypixel_revalidation')
+skin_requests = SingleFlight('skin')
+skin_renders = SingleFlight('skin_render')
+
+# Reject requests while an upstream is unavailable instead of waiting on it
+hypixel_circuit_breaker = CircuitBreaker('hypixel')
+visage_circuit_breaker = CircuitBreaker('visage')
+
+# Errors that mean hypixel failed to respond properly
+HYPIXEL_REQUEST_ERRORS = (
+    ReadTimeout, ConnectTimeout, TimeoutError, asyncio.TimeoutError,
+    JSONDecodeError, RemoteDisconnected, ClientConnectionError, ClientResponseError
+)
+
+
 SkinStyle = Literal[
     'face', 'front', 'frontfull', 'head',
     'bust', 'full', 'skin', 'processedskin'
 ]
 
 
+def __hypixel_player_url(uuid: str) -> str:
+    return f"{upstream_url('hypixel')}/player?uuid={uuid}"
+
+
+def __reset_rotational_stats(uuid: str, hypixel_data: dict) -> None:
+    # reset trackers using the data if they are due
+    asyncio.ensure_future(
+        async_reset_rotational_stats_if_whitelisted(uuid, hypixel_data)
+    )
+
+
+async def __read_hypixel_cache(
+    uuid: str,
+    cache_backend: SQLiteBackend
+) -> tuple[dict, float] | None:
+    """Returns the cached data of a player along with its age in seconds"""
+    # The memory tier only mirrors the default stats cache
+    memory_cache = stats_memory_cache if cache_backend is stats_session else None
+
+    if memory_cache is not None:
+        cached = memory_cache.get(uuid)
+        if cached is not None:
+            fetched_at, hypixel_data = cached
+            return hypixel_data, time.time() - fetched_at
+
+    cached_response = await cache_backend.get_response(
+        cache_backend.create_key('GET', __hypixel_player_url(uuid)))
+
+    if cached_response is None:
+        return None
+
+    hypixel_data = await async_json_loads(await cached_response.read())
+    age = (datetime.utcnow() - cached_response.created_at).total_seconds()
+
+    if memory_cache is not None and cached_response.expires is not None:
+        # Promote the entry for the rest of its lifetime in the SQLite tier
+        ttl = (cached_response.expires - datetime.utcnow()).total_seconds()
+        memory_cache.set(
+            uuid, (time.time() - age, hypixel_data),
+            len(await cached_response.read()), ttl)
+
+    return hypixel_data, age
+
+
 async def __make_hypixel_request(
-    session: ClientSession,
-    uuid: str
+    uuid: str,
+    cache_backend: SQLiteBackend | None,
+    priority: RequestPriority
 ) -> dict:
     api_key = getenv('API_KEY_HYPIXEL')
 
     options = {
-        'url': f"https://api.hypixel.net/player?uuid={uuid}",
+        'url': __hypixel_player_url(uuid),
         'headers': {"API-Key": api_key},
         'timeout': 5
     }
 
-    # fetch hypixel data
-    hypixel_data = await (await session.get(**options)).json()
+    # Only requests that actually reach hypixel count towards the rate limit
+    await hypixel_rate_limiter.acquire(priority)
 
-    # reset trackers using the data if they are due
-    asyncio.ensure_future(
-        async_reset_rotational_stats_if_whitelisted(uuid, hypixel_data)
-    )
+    session = await http_client.session('hypixel', cache_backend=None)
+    try:
+        response = await session.get(**options)
+    except BaseException:
+        hypixel_rate_limiter.release()
+        raise
+    hypixel_rate_limiter.update_from_headers(response.headers)
+
+    if response.status >= 500:
+        response.raise_for_status()
+
+    # fetch hypixel data, keeping only the fields that are used
+    hypixel_data = project_hypixel_data(await async_json_loads(await response.read()))
+
+    if cache_backend is not None and await cache_backend.is_cacheable(response):
+        expires = get_expiration_datetime(cache_backend.expire_after)
+
+        # Cache the projected data rather than the full response body
+        cached_response = await CachedResponse.from_client_response(response, expires)
+        cached_response._body = json_dumps(hypixel_data)
+
+        await cache_backend.save_response(
+            cached_response, cache_backend.create_key('GET', options['url']), expires)
+
+        if cache_backend is stats_session:
+            stats_memory_cache.set(
+                uuid, (time.time(), hypixel_data), len(cached_response._body))
+
+    return hypixel_data
+
+
+async def __request_hypixel_data(
+    uuid: PlayerUUID,
+    cache_backend: SQLiteBackend | None,
+    retries: int,
+    retry_delay: int,
+    priority: RequestPriority
+) -> dict:
+    for attempt in range(retries + 1):
+        try:
+            return await hypixel_circuit_breaker.call(
+                __make_hypixel_request, uuid, cache_backend, priority,
+                failure_exceptions=HYPIXEL_REQUEST_ERRORS)
+
+        except CircuitOpenError as exc:
+            raise HypixelInvalidResponseError(
+                "Hypixel is currently unavailable.") from exc
+
+        except HYPIXEL_REQUEST_ERRORS as exc:
+            # Don't keep retrying once the circuit has opened
+            if attempt < retries and hypixel_circuit_breaker.state == CircuitState.CLOSED:
+                logger.warning(
+                    f"Hypixel request failed. Retrying in {retry_delay} seconds...")
+                await asyncio.sleep(retry_delay)
+            else:
+                raise HypixelInvalidResponseError(
+                    "Maximum number of retries exceeded.") from exc
+
+
+async def __revalidate_hypixel_data(
+    uuid: PlayerUUID,
+    cache_backend: SQLiteBackend,
+    retries: int,
+    retry_delay: int
+) -> None:
+    try:
+        hypixel_data = await __request_hypixel_data(
+            uuid, cache_backend, retries, retry_delay, RequestPriority.BACKGROUND)
+    except Exception as exc:
+        logger.warning(f"Failed to revalidate hypixel data of {uuid}: {exc!r}")
+        return
+
+    __reset_rotational_stats(uuid, hypixel_data)
 
+
+async def __fetch_hypixel_data(
+    uuid: PlayerUUID,
+    cache: bool,
+    cached_session: SQLiteBackend,
+    retries: int,
+    retry_delay: int,
+    priority: RequestPriority,
+    freshness: FreshnessPolicy
+) -> dict:
+    cache_backend = cached_session if cache else None
+
+    cached = None
+    if cache_backend is not None:
+        cached = await __read_hypixel_cache(uuid, cache_backend)
+
+    if cached is not None:
+        cached_data, age = cached
+
+        if freshness.is_fresh(age):
+            # Trackers are only reset with data that is fresh by the strict
+            # policy, stale data would leave recent games out of the archive
+            if STRICT_FRESHNESS.is_fresh(age):
+                __reset_rotational_stats(uuid, cached_data)
+            return cached_data
+
+        if freshness.can_revalidate(age):
+            # Serve the stale data and refresh it in the background,
+            # which resets the trackers once the fresh data arrives
+            asyncio.ensure_future(hypixel_revalidations.do(
+                (uuid, id(cache_backend)), __revalidate_hypixel_data,
+                uuid, cache_backend, retries, retry_delay))
+            return cached_data
+
+    stale_data = None
+    if cached is not None and freshness.can_serve_on_error(age):
+        stale_data = cached_data
+
+    try:
+        hypixel_data = await __request_hypixel_data(
+            uuid, cache_backend, retries, retry_delay, priority)
+    except HypixelInvalidResponseError:
+        if stale_data is None:
+            raise
+        logger.warning(f"Hypixel is unavailable, serving stale data of {uuid}")
+        return stale_data
+
+    if stale_data is not None and hypixel_data.get('throttle'):
+        logger.warning(f"Hypixel rate limit reached, serving stale data of {uuid}")
+        return stale_data
+
+    __reset_rotational_stats(uuid, hypixel_data)
     return hypixel_data
 
 
@@ -62,35 +303,28 @@ async def fetch_hypixel_data(
     cache: bool = True,
     cached_session: SQLiteBackend = stats_session,
     retries: int = 3,
-    retry_delay: int = 5
+    retry_delay: int = 5,
+    priority: RequestPriority = RequestPriority.INTERACTIVE,
+    freshness: FreshnessPolicy = STRICT_FRESHNESS
 ) -> dict:
     """
     Fetch a user's Hypixel data from Hypixel's
     API with retries and delay between retries.
+    Concurrent calls for the same player share a single request.
     :param uuid: The UUID of the user's data to fetch.
     :param cache: Whether to use caching or not.
     :param cached_session: Use a custom cache instead of the default stats cache.
     :param retries: Number of retries in case of a failed request.
     :param retry_delay: Delay (in seconds) between retries.
+    :param priority: The rate limiter lane to make the request in. Interactive \
+        requests are always made before background requests.
+    :param freshness: How old cached data is allowed to be. Use \
+        `RELAXED_FRESHNESS` to serve stale data while it is refreshed in the \
+        background, or while hypixel is unavailable.
     """
-    for attempt in range(retries + 1):
-        try:
-            if not cache:
-                async with ClientSession() as session:
-                    return await __make_hypixel_request(session, uuid)
-
-            async with CachedSession(cache=cached_session) as session:
-                return await __make_hypixel_request(session, uuid)
-
-        except (ReadTimeout, ConnectTimeout, TimeoutError, asyncio.TimeoutError,
-                JSONDecodeError, RemoteDisconnected, ContentTypeError) as exc:
-            if attempt < retries:
-                logger.warning(
-                    f"Hypixel request failed. Retrying in {retry_delay} seconds...")
-                await asyncio.sleep(retry_delay)
-            else:
-                raise HypixelInvalidResponseError(
-                    "Maximum number of retries exceeded.") from exc
+    return await hypixel_requests.do(
+        (uuid, cache, id(cached_session), freshness), __fetch_hypixel_data,
+        uuid, cache, cached_session, retries, retry_delay, priority, freshness)
 
 
 async def fetch_hypixel_data_rate_limit_safe(
@@ -100,11 +334,13 @@ async def fetch_hypixel_data_rate_limit_safe(
     retries: int = 3,
     retry_delay: int = 5,
     attempts=5,
-    attempt_delay=20
+    attempt_delay=20,
+    priority: RequestPriority = RequestPriority.INTERACTIVE
 ) -> dict:
     """
     Wrapper around `fetch_hypixel_data` that is rate limit safe.
-    5 attempts will be made with a 20 second delay if rate limited
+    5 attempts will be made if rate limited, each waiting until the rate
+    limit resets, or 20 seconds if hypixel didn't say when it resets.
 
     Fetch a user's Hypixel data from Hypixel's API
     with retries and delay between retries.
@@ -114,18 +350,19 @@ async def fetch_hypixel_data_rate_limit_safe(
     :param retries: Number of retries in case of a failed network request.
     :param retry_delay: Delay (in seconds) between failed network request retries.
     :param attempts: The amount of attempts to make if you are rate limited.
-    :param attempt_delay: Delay (in seconds) between attempts made if rate limited.
+    :param attempt_delay: Fallback delay (in seconds) between attempts made \
+        if rate limited and hypixel didn't provide a reset time.
+    :param priority: The rate limiter lane to make the request in.
     """
     for attempt in range(attempts + 1):
         hypixel_data = await fetch_hypixel_data(
-            uuid, cache, cached_session, retries, retry_delay)
+            uuid, cache, cached_session, retries, retry_delay, priority)
 
         if not hypixel_data.get('success') and hypixel_data.get('throttle'):
             if attempt < attempts:
-                logger.warning(
-                    'We are being rate limited by hypixel. '
-                    f'Retrying in {attempt_delay} seconds...')
-                await asyncio.sleep(attempt_delay)
+                # The next attempt waits for the rate limiter
+                delay = hypixel_rate_limiter.blocked_for or attempt_delay
+                hypixel_rate_limiter.block(delay)
             else:
                 raise HypixelRateLimitedError('Maximum number of retries exceeded.')
 
@@ -134,6 +371,75 @@ async def fetch_hypixel_data_rate_limit_safe(
     return hypixel_data
 
 
+def get_network_metrics() -> dict[str, dict]:
+    """Returns counters for the coalescing, circuit breakers and caching of each upstream"""
+    metrics = {
+        group.name: {
+            'calls': group.stats.calls,
+            'coalesced': group.stats.coalesced,
+            'in_flight': group.in_flight
+        }
+        for group in (
+            hypixel_requests, hypixel_revalidations, skin_requests, skin_renders,
+            mojang_requests)
+    }
+    for group, circuit_breaker in (
+        ('hypixel', hypixel_circuit_breaker),
+        ('skin', visage_circuit_breaker),
+        ('mojang', mojang_circuit_breaker)
+    ):
+        metrics[group]['circuit_breaker'] = {
+            'state': circuit_breaker.state.value,
+            'failure_rate': circuit_breaker.failure_rate,
+            'successes': circuit_breaker.stats.successes,
+            'failures': circuit_breaker.stats.failures,
+            'rejected': circuit_breaker.stats.rejected,
+            'opened': circuit_breaker.stats.opened
+        }
+    for group, sweeper in response_cache_sweepers.items():
+        metrics[group]['cache_maintenance'] = {
+            'sweeps': sweeper.stats.sweeps,
+            'expired': sweeper.stats.expired,
+            'evicted': sweeper.stats.evicted,
+            'reclaimed_bytes': sweeper.stats.reclaimed_bytes
+        }
+    metrics['mojang']['identity_cache'] = {
+        'hits': identity_cache.stats.hits,
+        'stale_hits': identity_cache.stats.stale_hits,
+        'negative_hits': identity_cache.stats.negative_hits,
+        'misses': identity_cache.stats.misses,
+        'bulk_requests': identity_cache.stats.bulk_requests,
+        'refreshes': identity_cache.stats.refreshes
+    }
+    metrics['skin']['render_cache'] = {
+        'hits': skin_render_cache.hits,
+        'misses': skin_render_cache.misses
+    }
+    metrics['hypixel']['memory_cache'] = {
+        'hits': stats_memory_cache.stats.hits,
+        'misses': stats_memory_cache.stats.misses,
+        'evictions': stats_memory_cache.stats.evictions,
+        'expirations': stats_memory_cache.stats.expirations,
+        'entries': len(stats_memory_cache),
+        'size': stats_memory_cache.size
+    }
+    return metrics
+
+
+async def sweep_response_caches() -> dict[str, CacheSweepResult]:
+    """
+    Delete expired responses, enforce the size caps and vacuum each
+    SQLite response cache. Returns the result of each sweep.
+    """
+    results = {}
+    for sweeper in response_cache_sweepers.values():
+        try:
+            results[sweeper.name] = await sweeper.sweep()
+        except Exception:
+            logger.exception(f'Failed to sweep the {sweeper.name} cache')
+    return results
+
+
 def skin_from_file(skin_type: str='bust') -> bytes:
     """Loads a steve skin from file"""
     print('loading from file')
@@ -141,19 +447,89 @@ def skin_from_file(skin_type: str='bust') -> bytes:
         return skin.read()
 
 
+async def __make_skin_request(options: dict) -> bytes:
+    session = await http_client.session('visage')
+
+    response = await session.get(**options)
+    response.raise_for_status()
+    return await response.read()
+
+
+async def __render_and_cache_skin_model(
+    texture: bytes,
+    texture_hash: str,
+    variant: str,
+    style: SkinStyle,
+    size: int
+) -> bytes:
+    skin_model = await asyncio.to_thread(render_skin_model, texture, style, size, variant)
+    skin_render_cache.set_render(texture_hash, variant, style, size, skin_model)
+    return skin_model
+
+
+async def __render_skin_model(
+    uuid: PlayerUUID,
+    size: int,
+    style: SkinStyle
+) -> bytes:
+    # Textures are cached on disk, so the mojang response cache isn't needed
+    player = AsyncFetchPlayer(
+        uuid=uuid, session=await http_client.session('mojang', cache_backend=None))
+
+    skin = skin_texture_memory_cache.get(uuid)
+    if skin is None:
+        skin = (await player.skin_url, await player.skin_variant)
+        skin_texture_memory_cache.set(uuid, skin, len(skin[0] or ''))
+
+    texture_url, variant = skin
+    if texture_url is None:
+        # Players without a custom skin are shown the default skin of their model
+        variant = default_skin_variant(uuid)
+        texture_url = DEFAULT_SKIN_TEXTURE_URLS[variant]
+
+    texture = skin_render_cache.get_texture(texture_url)
+    texture_is_cached = texture is not None
+    if not texture_is_cached:
+        texture = await player.fetch_texture(texture_url)
+
+    texture_hash = skin_texture_hash(texture)
+
+    skin_model = skin_render_cache.get_render(texture_hash, variant, style, size)
+    if skin_model is None:
+        # Players sharing a texture share the render
+        skin_model = await skin_renders.do(
+            (texture_hash, variant, style, size),
+            __render_and_cache_skin_model, texture, texture_hash, variant, style, size)
+
+    # Only cache textures once they are known to render
+    if not texture_is_cached:
+        skin_render_cache.set_texture(texture_url, texture)
+
+    return skin_model
+
+
 async def fetch_skin_model(
     uuid: PlayerUUID,
     size: int,
     style: SkinStyle='bust'
 ) -> bytes:
     """
-    Fetches a 3d skin model visage.surgeplay.com
+    Renders a 3d skin model from the player's skin texture, or the default
+    skin of their model if they have no custom skin. Skins that fail to
+    render are fetched from visage.surgeplay.com instead.
     If something goes wrong, a steve skin will returned
     :param uuid: The uuid of the relative player
     :param size: The skin render size in pixels
     """
+    if SKIN_RENDERER == 'local' and style in RENDERABLE_SKIN_STYLES:
+        try:
+            return await skin_requests.do(
+                (uuid, size, style), __render_skin_model, uuid, size, style)
+        except Exception as exc:
+            logger.warning(f'Failed to render the skin of {uuid} locally: {exc!r}')
+
     options = {
-        'url': f'https://visage.surgeplay.com/{style}/{size}/{uuid}',
+        'url': f"{upstream_url('visage')}/{style}/{size}/{uuid}",
         'timeout': 5,
         'headers': {
             'User-Agent': f'Statalytics {config("apps.bot.version")}'
@@ -161,9 +537,9 @@ async def fetch_skin_model(
     }
 
     try:
-        async with CachedSession(cache=skin_session) as session:
-            res_content = (await session.get(**options)).content
-            return await res_content.read()
+        return await skin_requests.do(
+            options['url'], visage_circuit_breaker.call, __make_skin_request, options,
+            failure_exceptions=(ClientError, TimeoutError))
 
     # except (ReadTimeout, ConnectTimeout, TimeoutError, asyncio.TimeoutError):
     except Exception:  # shit just wasnt working idk why
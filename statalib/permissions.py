@@ -1,9 +1,11 @@
 import sqlite3
+from typing import Callable
 
 from .accounts import create_account
 from .common import REL_PATH
+from .entitlements import Entitlements, entitlements_cache
 from .functions import comma_separated_to_list, db_connect
-from .subscriptions import SubscriptionManager
+from .subscriptions import Subscription, SubscriptionManager
 
 
 def get_permissions(discord_id: int) -> list:
@@ -25,6 +27,88 @@ def get_permissions(discord_id: int) -> list:
     return []
 
 
+def _build_entitlements(
+    subscription: Subscription,
+    permissions: str,
+    blacklisted: int
+) -> Entitlements:
+    permissions = tuple(comma_separated_to_list(permissions))
+
+    return Entitlements(
+        subscription=subscription,
+        permissions=permissions,
+        blacklisted=bool(blacklisted),
+        access=frozenset(subscription.package_permissions).union(permissions)
+    )
+
+
+def _load_entitlements(discord_id: int) -> Entitlements:
+    subscription = SubscriptionManager(discord_id).get_subscription()
+
+    with db_connect() as conn:
+        cursor = conn.cursor()
+
+        create_account(discord_id, cursor=cursor)
+
+        cursor.execute(
+            'SELECT permissions, blacklisted FROM accounts WHERE discord_id = ?',
+            (discord_id,))
+        account = cursor.fetchone()
+
+    return _build_entitlements(subscription, *account)
+
+
+def _read_entitlements(discord_id: int) -> Entitlements | None:
+    with db_connect() as conn:
+        cursor = conn.cursor()
+
+        subscription = SubscriptionManager(discord_id).read_subscription(cursor=cursor)
+
+        cursor.execute(
+            'SELECT permissions, blacklisted FROM accounts WHERE discord_id = ?',
+            (discord_id,))
+        account = cursor.fetchone()
+
+    # The account has to be created or the subscription updated
+    if subscription is None or account is None:
+        return None
+    return _build_entitlements(subscription, *account)
+
+
+def _cached_entitlements(
+    discord_id: int,
+    load: Callable[[int], Entitlements | None]
+) -> Entitlements | None:
+    entitlements = entitlements_cache.get(discord_id)
+    if entitlements is not None:
+        return entitlements
+
+    generation = entitlements_cache.generation()
+    entitlements = load(discord_id)
+    if entitlements is not None:
+        entitlements_cache.set(discord_id, entitlements, generation)
+    return entitlements
+
+
+def get_entitlements(discord_id: int) -> Entitlements:
+    """
+    Returns the permissions, blacklist and subscription of a discord user,
+    from the entitlements cache if they were loaded recently
+    :param discord_id: the discord id of the respective user
+    """
+    return _cached_entitlements(discord_id, _load_entitlements)
+
+
+def read_entitlements(discord_id: int) -> Entitlements | None:
+    """
+    Like `get_entitlements()`, but never writes to the database. Returns
+    `None` if the user's account has to be created or their expired
+    subscription updated first, which `get_entitlements()` does
+    :param discord_id: the discord id of the respective user
+    """
+    return _cached_entitlements(discord_id, _read_entitlements)
+
+
 def has_permission(
     discord_id: int,
     permissions: str | list[str],
@@ -38,19 +122,7 @@ def has_permission(
         at least one of the given permissions.
     :param allow_star: returns `True` if the user has the `*` permission
     """
-    user_permissions = get_permissions(discord_id)
-
-    if allow_star and '*' in user_permissions:
-        return True
-
-    if isinstance(permissions, str):
-        permissions = [permissions]
-
-    # at least one permission is in user_permissions
-    if set(permissions) & set(user_permissions):
-        return True
-
-    return False
+    return get_entitlements(discord_id).has_permission(permissions, allow_star)
 
 
 def set_permissions(discord_id: int, permissions: list | str):
@@ -78,6 +150,8 @@ def set_permissions(discord_id: int, permissions: list | str):
         else:
             create_account(discord_id, permissions=permissions, cursor=cursor)
 
+    entitlements_cache.invalidate(discord_id)
+
 
 def add_permission(discord_id: int, permission: str):
     """
@@ -123,27 +197,8 @@ def has_access(
     if not discord_id:
         return False
 
-    subscription = SubscriptionManager(discord_id).get_subscription()
-    package_perms = subscription.package_permissions
-
-    package_perms = set(package_perms)
-
-    user_permissions = get_permissions(discord_id)
-
-    for user_permission in user_permissions:
-        package_perms.add(user_permission)
-
-    if '*' in package_perms and allow_star:
-        return True
-
-    if isinstance(permissions, str):
-        permissions = [permissions]
-
-    # user has at least one of the following permissions
-    if set(permissions) & package_perms:
-        return True
-
-    return False
+    return get_entitlements(discord_id).has_permission(
+        permissions, allow_star, include_package=True)
 
 
 class PermissionManager:
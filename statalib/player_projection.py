@@ -0,0 +1,75 @@
+"""Projection of Hypixel player responses down to the fields that are used."""
+
+
+# Subtrees of the player object that are kept, everything else is dropped.
+# `True` keeps the entire subtree, a dict keeps only the listed children.
+HYPIXEL_PLAYER_FIELDS: dict = {
+    'uuid': True,
+    'displayname': True,
+    'rank': True,
+    'packageRank': True,
+    'newPackageRank': True,
+    'monthlyPackageRank': True,
+    'rankPlusColor': True,
+    'stats': {
+        'Bedwars': True
+    },
+    'achievements': {
+        'bedwars_level': True
+    },
+    'socialMedia': {
+        'links': {
+            'DISCORD': True
+        }
+    }
+}
+
+# Prefixes of the quests that are kept
+HYPIXEL_QUEST_PREFIXES: tuple[str, ...] = ('bedwars_',)
+
+
+def _project(data: dict, fields: dict) -> dict:
+    projected = {}
+
+    for key, subfields in fields.items():
+        if key not in data:
+            continue
+
+        value = data[key]
+        if subfields is True or not isinstance(value, dict):
+            projected[key] = value
+        else:
+            projected[key] = _project(value, subfields)
+
+    return projected
+
+
+def project_player_data(player_data: dict) -> dict:
+    """
+    Strip a Hypixel player object down to the fields that are used.
+    :param player_data: The player object of a Hypixel player response.
+    """
+    projected = _project(player_data, HYPIXEL_PLAYER_FIELDS)
+
+    quests = player_data.get('quests')
+    if isinstance(quests, dict):
+        projected['quests'] = {
+            quest: quest_data for quest, quest_data in quests.items()
+            if quest.startswith(HYPIXEL_QUEST_PREFIXES)
+        }
+
+    return projected
+
+
+def project_hypixel_data(hypixel_data: dict) -> dict:
+    """
+    Strip a Hypixel player response down to the fields that are used.
+    Everything except the player object (`success`, `cause`, etc) is kept.
+    :param hypixel_data: The Hypixel player response.
+    """
+    player_data = hypixel_data.get('player')
+
+    if not isinstance(player_data, dict):
+        return hypixel_data
+
+    return {**hypixel_data, 'player': project_player_data(player_data)}
@@ -0,0 +1,214 @@
+"""Header driven rate limiting for upstream API keys."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Mapping
+
+from .cfg import config
+
+
+logger = logging.getLogger('statalytics')
+
+
+class RequestPriority(IntEnum):
+    """
+    Priority lane of a rate limited request.
+    Lower values are served first.
+    """
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+@dataclass
+class RateLimitConfig:
+    """Rate limit of an API key."""
+    limit: int = 300
+    window: float = 300
+    background_reserve: int = 30
+
+    @staticmethod
+    def from_config(name: str) -> 'RateLimitConfig':
+        """
+        Load a rate limit from the `global.network.rate_limits` section
+        of the config file. Missing values use the dataclass defaults.
+        :param name: The name of the rate limit to load.
+        """
+        try:
+            return RateLimitConfig(**config(f'global.network.rate_limits.{name}'))
+        except KeyError:
+            return RateLimitConfig()
+
+
+class HeaderRateLimiter:
+    """
+    A token bucket rate limiter that stays in sync with the upstream using
+    the `RateLimit-Limit`, `RateLimit-Remaining` and `RateLimit-Reset`
+    response headers.
+
+    Tokens refill continuously at `limit / window` per second. Every response
+    replaces the local token estimate with the remaining amount reported by
+    the upstream, minus any requests that are still in flight. Once the
+    upstream reports that no requests remain, callers wait until the reset.
+
+    Background requests can only take a token if no interactive request is
+    waiting and more than `background_reserve` tokens would remain, so
+    interactive commands always preempt background work.
+    """
+    def __init__(
+        self,
+        name: str,
+        rate_limit_config: RateLimitConfig | None=None
+    ) -> None:
+        """
+        :param name: The name of the rate limiter, used for logging.
+        :param rate_limit_config: Override the configured rate limit.
+        """
+        self.name = name
+
+        rate_limit_config = rate_limit_config or RateLimitConfig.from_config(name)
+        self._limit = rate_limit_config.limit
+        self._window = rate_limit_config.window
+        self._background_reserve = rate_limit_config.background_reserve
+
+        self._tokens = float(self._limit)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+
+        self._waiting = {priority: 0 for priority in RequestPriority}
+
+
+    @property
+    def tokens(self) -> float:
+        """The estimated amount of requests that can currently be made."""
+        self._refill()
+        return self._tokens
+
+
+    @property
+    def blocked_for(self) -> float:
+        """The amount of seconds that requests are currently being held for."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+
+    @property
+    def background_reserve(self) -> int:
+        """The amount of tokens that background requests may not take."""
+        return self._background_reserve
+
+    @background_reserve.setter
+    def background_reserve(self, value: int) -> None:
+        self._background_reserve = value
+
+
+    @property
+    def _refill_rate(self) -> float:
+        return self._limit / self._window
+
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+
+        self._tokens = min(
+            self._limit, self._tokens + (now - self._last_refill) * self._refill_rate)
+        self._last_refill = now
+
+
+    def _available_to(self, priority: RequestPriority) -> float:
+        if priority == RequestPriority.INTERACTIVE:
+            return self._tokens
+
+        if self._waiting[RequestPriority.INTERACTIVE]:
+            return 0
+        return self._tokens - self._background_reserve
+
+
+    def _time_until_available(self, priority: RequestPriority) -> float:
+        now = time.monotonic()
+
+        if self._blocked_until:
+            if now < self._blocked_until:
+                return self._blocked_until - now
+
+            # The rate limit window has reset
+            self._blocked_until = 0.0
+            self._tokens = float(self._limit)
+            self._last_refill = now
+
+        self._refill()
+        available = self._available_to(priority)
+
+        if available >= 1:
+            return 0
+
+        # Time until enough tokens have refilled
+        return (1 - available) / self._refill_rate
+
+
+    async def acquire(
+        self,
+        priority: RequestPriority=RequestPriority.INTERACTIVE
+    ) -> None:
+        """
+        Wait until a request can be made and take a token for it. Every
+        acquired token must be followed by either `update_from_headers()`
+        or `release()` once the request has completed.
+        :param priority: The priority lane of the request.
+        """
+        self._waiting[priority] += 1
+        try:
+            while (delay := self._time_until_available(priority)) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self._waiting[priority] -= 1
+
+        self._tokens -= 1
+        self._in_flight += 1
+
+
+    def release(self) -> None:
+        """Mark an acquired request as completed without a response."""
+        self._in_flight = max(0, self._in_flight - 1)
+
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Mark an acquired request as completed and synchronize the
+        bucket with the rate limit headers of its response.
+        :param headers: The headers of the response.
+        """
+        self.release()
+
+        try:
+            limit = int(headers['RateLimit-Limit'])
+            remaining = int(headers['RateLimit-Remaining'])
+            reset = float(headers['RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+
+        self._refill()
+
+        if limit > 0:
+            self._limit = limit
+        self._tokens = max(0, remaining - self._in_flight)
+
+        if remaining <= 0:
+            self.block(reset)
+
+
+    def block(self, duration: float) -> None:
+        """
+        Prevent requests from being made for a certain duration,
+        for example after being throttled by the upstream.
+        :param duration: The amount of seconds to block requests for.
+        """
+        blocked_until = time.monotonic() + duration
+
+        if blocked_until > self._blocked_until:
+            self._blocked_until = blocked_until
+            logger.warning(
+                f'{self.name} rate limit reached. '
+                f'Holding requests for {duration:.1f} seconds...')
@@ -4,6 +4,7 @@ from .progress import *
 from .tools import *
 from .splitting import *
 from .text import *
+from .skins import *
 
 
 __all__ = [
@@ -0,0 +1,510 @@
+"""Local rendering of player skin models from their skin textures."""
+
+import hashlib
+import math
+import os
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Literal
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+
+SkinVariant = Literal['classic', 'slim']
+
+# Bump when the output changes, so that previously cached renders are ignored
+SKIN_RENDERER_VERSION = 1
+
+# Camera angles of the 3d styles, in degrees
+_YAW = 25
+_PITCH = 10
+
+# Renders are drawn this many times larger and then downscaled
+_SUPERSAMPLING = 2
+
+# The lowest point of the model that is included in a bust
+_BUST_CLIP_Y = 10
+
+# Overlay pixels below this opacity are left out
+_OVERLAY_ALPHA_CUTOFF = 128
+
+# Textures of the default Steve and Alex skins, by model
+DEFAULT_SKIN_TEXTURE_URLS: dict[SkinVariant, str] = {
+    'classic': 'http://textures.minecraft.net/texture/'
+        '1a4af718455d4aab528e7a61f86fa25e6a369d1768dcb13f7df319a713eb810b',
+    'slim': 'http://textures.minecraft.net/texture/'
+        '3b60a1f6d562f52aaebbf1434f1de147933a3affe0e764fa49ea057536623cd3',
+}
+
+
+@dataclass(frozen=True)
+class _Box:
+    """A cuboid of the player model, in skin texture pixels."""
+    origin: tuple[float, float, float]
+    size: tuple[int, int, int]
+    uv: tuple[int, int]
+    inflate: float = 0
+    overlay: bool = False
+    mirror: bool = False
+
+
+@dataclass(frozen=True)
+class _Face:
+    """A textured face of a cuboid."""
+    rect: tuple[int, int, int, int]
+    corner: np.ndarray
+    u_axis: np.ndarray
+    v_axis: np.ndarray
+    normal: np.ndarray
+
+
+def _model_boxes(
+    variant: SkinVariant,
+    legacy: bool,
+    parts: tuple[str, ...]
+) -> list[_Box]:
+    arm_width = 3 if variant == 'slim' else 4
+
+    base = {
+        'head': _Box((-4, 24, -4), (8, 8, 8), (0, 0)),
+        'body': _Box((-4, 12, -2), (8, 12, 4), (16, 16)),
+        'right_arm': _Box((-4 - arm_width, 12, -2), (arm_width, 12, 4), (40, 16)),
+        'left_arm': _Box((4, 12, -2), (arm_width, 12, 4), (32, 48)),
+        'right_leg': _Box((-4, 0, -2), (4, 12, 4), (0, 16)),
+        'left_leg': _Box((0, 0, -2), (4, 12, 4), (16, 48)),
+    }
+    overlays = {
+        'head': ((32, 0), 0.5),
+        'body': ((16, 32), 0.25),
+        'right_arm': ((40, 32), 0.25),
+        'left_arm': ((48, 48), 0.25),
+        'right_leg': ((0, 32), 0.25),
+        'left_leg': ((0, 48), 0.25),
+    }
+
+    if legacy:
+        # 64x32 skins have no left limbs or body overlays, the right limbs are mirrored
+        base['left_arm'] = _Box((4, 12, -2), (4, 12, 4), (40, 16), mirror=True)
+        base['left_leg'] = _Box((0, 0, -2), (4, 12, 4), (0, 16), mirror=True)
+        overlays = {'head': overlays['head']}
+
+    boxes = [base[part] for part in parts]
+    for part in parts:
+        if part in overlays:
+            uv, inflate = overlays[part]
+            box = base[part]
+            boxes.append(_Box(box.origin, box.size, uv, inflate, True, box.mirror))
+
+    return boxes
+
+
+def _box_faces(box: _Box) -> list[_Face]:
+    w, h, d = box.size
+    u, v = box.uv
+
+    x0, y0, z0 = (c - box.inflate for c in box.origin)
+    x1, y1, z1 = (
+        c + s + box.inflate for c, s in zip(box.origin, box.size))
+    dx, dy, dz = x1 - x0, y1 - y0, z1 - z0
+
+    right_rect, left_rect = (u, v + d, d, h), (u + d + w, v + d, d, h)
+    if box.mirror:
+        right_rect, left_rect = left_rect, right_rect
+
+    vec = lambda *c: np.array(c, dtype=float)
+
+    # The model faces +z (towards the camera), +x is on the player's left
+    return [
+        _Face((u + d, v + d, w, h), vec(x0, y1, z1), vec(dx, 0, 0), vec(0, -dy, 0), vec(0, 0, 1)),
+        _Face((u + 2 * d + w, v + d, w, h), vec(x1, y1, z0), vec(-dx, 0, 0), vec(0, -dy, 0), vec(0, 0, -1)),
+        _Face(right_rect, vec(x0, y1, z0), vec(0, 0, dz), vec(0, -dy, 0), vec(-1, 0, 0)),
+        _Face(left_rect, vec(x1, y1, z1), vec(0, 0, -dz), vec(0, -dy, 0), vec(1, 0, 0)),
+        _Face((u + d, v, w, d), vec(x0, y1, z0), vec(dx, 0, 0), vec(0, 0, dz), vec(0, 1, 0)),
+        _Face((u + d + w, v, w, d), vec(x0, y0, z1), vec(dx, 0, 0), vec(0, 0, -dz), vec(0, -1, 0)),
+    ]
+
+
+def _rotation(yaw: float, pitch: float) -> np.ndarray:
+    yaw, pitch = math.radians(yaw), math.radians(pitch)
+
+    rotate_y = np.array([
+        [math.cos(yaw), 0, math.sin(yaw)],
+        [0, 1, 0],
+        [-math.sin(yaw), 0, math.cos(yaw)]
+    ])
+    rotate_x = np.array([
+        [1, 0, 0],
+        [0, math.cos(pitch), -math.sin(pitch)],
+        [0, math.sin(pitch), math.cos(pitch)]
+    ])
+    # Screen y points down
+    flip_y = np.diag([1, -1, 1])
+
+    return flip_y @ rotate_x @ rotate_y
+
+
+def _shade(normal: np.ndarray) -> float:
+    # Soft light from the upper left of the camera
+    light = np.array([-0.35, -0.6, 0.72])
+    light /= np.linalg.norm(light)
+    return 0.62 + 0.38 * max(0.0, float(normal @ light))
+
+
+def _draw_face(
+    canvas: np.ndarray,
+    depth_buffer: np.ndarray,
+    texture: np.ndarray,
+    face: _Face,
+    rotation: np.ndarray,
+    scale: float,
+    offset: np.ndarray,
+    mirror: bool,
+    overlay: bool
+) -> None:
+    normal = rotation @ face.normal
+    if normal[2] <= 1e-6:
+        return  # facing away from the camera
+
+    corner = rotation @ face.corner * scale
+    corner[:2] += offset
+    u_axis = rotation @ face.u_axis * scale
+    v_axis = rotation @ face.v_axis * scale
+
+    corners = np.array([
+        corner, corner + u_axis, corner + v_axis, corner + u_axis + v_axis])
+    height, width = depth_buffer.shape
+
+    left = max(0, int(np.floor(corners[:, 0].min())))
+    right = min(width, int(np.ceil(corners[:, 0].max())))
+    top = max(0, int(np.floor(corners[:, 1].min())))
+    bottom = min(height, int(np.ceil(corners[:, 1].max())))
+    if left >= right or top >= bottom:
+        return
+
+    # Solve `corner + a * u_axis + b * v_axis = pixel` for every pixel center
+    basis = np.array([[u_axis[0], v_axis[0]], [u_axis[1], v_axis[1]]])
+    if abs(np.linalg.det(basis)) < 1e-9:
+        return
+    inverse = np.linalg.inv(basis)
+
+    xs, ys = np.meshgrid(
+        np.arange(left, right) + 0.5 - corner[0],
+        np.arange(top, bottom) + 0.5 - corner[1])
+    a = inverse[0, 0] * xs + inverse[0, 1] * ys
+    b = inverse[1, 0] * xs + inverse[1, 1] * ys
+    inside = (a >= 0) & (a < 1) & (b >= 0) & (b < 1)
+
+    tex_x, tex_y, tex_w, tex_h = face.rect
+    column = np.clip((a * tex_w).astype(int), 0, tex_w - 1)
+    if mirror:
+        column = tex_w - 1 - column
+    row = np.clip((b * tex_h).astype(int), 0, tex_h - 1)
+    pixels = texture[tex_y + row, tex_x + column]
+
+    depth = corner[2] + a * u_axis[2] + b * v_axis[2]
+    region = (slice(top, bottom), slice(left, right))
+
+    visible = inside & (depth > depth_buffer[region])
+    if overlay:
+        visible &= pixels[..., 3] >= _OVERLAY_ALPHA_CUTOFF
+
+    shaded = pixels[..., :3] * _shade(normal)
+    canvas[region][visible, :3] = shaded[visible]
+    canvas[region][visible, 3] = 255
+    depth_buffer[region][visible] = depth[visible]
+
+
+def load_skin_texture(texture: bytes) -> tuple[np.ndarray, bool]:
+    """
+    Decode a skin texture. Returns the RGBA pixels as a 64x64 array, and
+    whether the texture uses the legacy 64x32 layout.
+    :param texture: The PNG bytes of the skin texture.
+    :raises ValueError: If the texture isn't a valid skin.
+    """
+    try:
+        image = Image.open(BytesIO(texture)).convert('RGBA')
+    except UnidentifiedImageError as exc:
+        raise ValueError('Invalid skin texture') from exc
+
+    if image.size not in ((64, 64), (64, 32)):
+        raise ValueError(f'Invalid skin texture size: {image.size}')
+
+    legacy = image.size == (64, 32)
+    pixels = np.zeros((64, 64, 4), dtype=np.uint8)
+    pixels[:image.height] = np.asarray(image)
+
+    if legacy:
+        # Legacy skins with a fully opaque hat layer are drawn without it
+        hat = pixels[0:16, 32:64, 3]
+        if hat.min() == 255:
+            pixels[0:16, 32:64, 3] = 0
+
+    return pixels, legacy
+
+
+_STYLE_PARTS: dict[str, tuple[str, ...]] = {
+    'head': ('head',),
+    'face': ('head',),
+    'bust': ('head', 'body', 'right_arm', 'left_arm', 'right_leg', 'left_leg'),
+    'front': ('head', 'body', 'right_arm', 'left_arm', 'right_leg', 'left_leg'),
+    'full': ('head', 'body', 'right_arm', 'left_arm', 'right_leg', 'left_leg'),
+    'frontfull': ('head', 'body', 'right_arm', 'left_arm', 'right_leg', 'left_leg'),
+}
+
+# Styles drawn straight on, without any rotation
+_FLAT_STYLES = ('face', 'front', 'frontfull')
+
+# Styles that are only as wide as the model, rather than square
+_FULL_BODY_STYLES = ('full', 'frontfull')
+
+# Styles that are cut off at `_BUST_CLIP_Y`
+_BUST_STYLES = ('bust', 'front')
+
+RENDERABLE_SKIN_STYLES = tuple(_STYLE_PARTS) + ('skin', 'processedskin')
+
+
+def render_skin_model(
+    texture: bytes,
+    style: str,
+    size: int,
+    variant: SkinVariant='classic'
+) -> bytes:
+    """
+    Render a player model from a skin texture.
+    :param texture: The PNG bytes of the 64x64 or legacy 64x32 skin texture.
+    :param style: The style of the render, one of `RENDERABLE_SKIN_STYLES`.
+    :param size: The height of the render in pixels. Every style other \
+        than `full` and `frontfull` is square.
+    :param variant: The arm width of the skin, `classic` or `slim`.
+    :raises ValueError: If the texture isn't a valid skin or the style \
+        isn't supported.
+    """
+    if style not in RENDERABLE_SKIN_STYLES:
+        raise ValueError(f'Unsupported skin style: {style}')
+
+    pixels, legacy = load_skin_texture(texture)
+
+    if style in ('skin', 'processedskin'):
+        image = Image.fromarray(pixels)
+        if style == 'skin' and legacy:
+            image = image.crop((0, 0, 64, 32))
+        return _image_to_png(image)
+
+    yaw, pitch = (0, 0) if style in _FLAT_STYLES else (_YAW, _PITCH)
+    rotation = _rotation(yaw, pitch)
+    boxes = _model_boxes(variant, legacy, _STYLE_PARTS[style])
+
+    # Bounds of the projected model, in texture pixels
+    points = []
+    for box in boxes:
+        for face in _box_faces(box):
+            for corner in (face.corner, face.corner + face.u_axis + face.v_axis):
+                points.append(rotation @ corner)
+    points = np.array(points)
+
+    min_x, max_x = points[:, 0].min(), points[:, 0].max()
+    min_y, max_y = points[:, 1].min(), points[:, 1].max()
+    if style in _BUST_STYLES:
+        max_y = (rotation @ np.array([0, _BUST_CLIP_Y, 0]))[1]
+
+    padding = 0.02 * (max_y - min_y)
+    min_x, max_x = min_x - padding, max_x + padding
+    min_y = min_y - padding
+    model_width, model_height = max_x - min_x, max_y - min_y
+
+    if style in _FULL_BODY_STYLES:
+        width, height = max(1, round(size * model_width / model_height)), size
+    else:
+        width, height = size, size
+
+    scale = min(width / model_width, height / model_height) * _SUPERSAMPLING
+    canvas_width, canvas_height = width * _SUPERSAMPLING, height * _SUPERSAMPLING
+
+    # Center horizontally, busts are cut off at the bottom of the image
+    offset_x = (canvas_width - model_width * scale) / 2 - min_x * scale
+    if style in _BUST_STYLES:
+        offset_y = canvas_height - max_y * scale
+    else:
+        offset_y = (canvas_height - model_height * scale) / 2 - min_y * scale
+
+    canvas = np.zeros((canvas_height, canvas_width, 4), dtype=np.uint8)
+    depth_buffer = np.full((canvas_height, canvas_width), -np.inf)
+    offset = np.array([offset_x, offset_y])
+
+    for box in boxes:
+        for face in _box_faces(box):
+            _draw_face(
+                canvas, depth_buffer, pixels, face, rotation,
+                scale, offset, box.mirror, box.overlay)
+
+    image = Image.fromarray(canvas, 'RGBA').resize((width, height), Image.LANCZOS)
+    return _image_to_png(image)
+
+
+def _image_to_png(image: Image.Image) -> bytes:
+    image_bytes = BytesIO()
+    image.save(image_bytes, format='PNG')
+    return image_bytes.getvalue()
+
+
+def default_skin_variant(uuid: str) -> SkinVariant:
+    """
+    Returns the model of the default skin shown for a player without a
+    custom skin, which is Alex for UUIDs with an odd Java `hashCode()`.
+    :param uuid: The UUID of the player.
+    """
+    value = int(uuid.replace('-', ''), 16)
+    hilo = (value >> 64) ^ (value & 0xffffffffffffffff)
+    return 'slim' if ((hilo >> 32) ^ hilo) & 1 else 'classic'
+
+
+def skin_texture_hash(texture: bytes) -> str:
+    """
+    Returns the hash that identifies a skin texture.
+    :param texture: The PNG bytes of the skin texture.
+    """
+    return hashlib.sha256(texture).hexdigest()
+
+
+class SkinRenderCache:
+    """
+    Skin textures and rendered skin models stored on disk. Textures are
+    keyed by their url, renders by the hash of their texture, so players
+    sharing a texture share its renders.
+
+    Files are pruned oldest first once the directory holds more than
+    `max_bytes`. Reading a file marks it as recently used.
+    """
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        """
+        :param directory: The directory to store the files in.
+        :param max_bytes: The maximum amount of bytes to store.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def _texture_path(self, texture_url: str) -> str:
+        url_hash = hashlib.sha256(texture_url.encode()).hexdigest()
+        return os.path.join(self.directory, 'textures', f'{url_hash}.png')
+
+
+    def _render_path(
+        self,
+        texture_hash: str,
+        variant: SkinVariant,
+        style: str,
+        size: int
+    ) -> str:
+        filename = f'{texture_hash}_{variant}_{style}_{size}_v{SKIN_RENDERER_VERSION}.png'
+        return os.path.join(self.directory, 'renders', filename)
+
+
+    def _read(self, path: str) -> bytes | None:
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        self.hits += 1
+        return data
+
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write to a temporary file first so that readers never see partial files
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+
+    def get_texture(self, texture_url: str) -> bytes | None:
+        """
+        Get a cached skin texture.
+        :param texture_url: The url the texture was downloaded from.
+        """
+        return self._read(self._texture_path(texture_url))
+
+
+    def set_texture(self, texture_url: str, texture: bytes) -> None:
+        """
+        Cache a skin texture.
+        :param texture_url: The url the texture was downloaded from.
+        :param texture: The PNG bytes of the texture.
+        """
+        self._write(self._texture_path(texture_url), texture)
+
+
+    def get_render(
+        self,
+        texture_hash: str,
+        variant: SkinVariant,
+        style: str,
+        size: int
+    ) -> bytes | None:
+        """
+        Get a cached skin render.
+        :param texture_hash: The hash of the rendered texture.
+        :param variant: The arm width of the render.
+        :param style: The style of the render.
+        :param size: The size of the render.
+        """
+        return self._read(self._render_path(texture_hash, variant, style, size))
+
+
+    def set_render(
+        self,
+        texture_hash: str,
+        variant: SkinVariant,
+        style: str,
+        size: int,
+        render: bytes
+    ) -> None:
+        """
+        Cache a skin render.
+        :param texture_hash: The hash of the rendered texture.
+        :param variant: The arm width of the render.
+        :param style: The style of the render.
+        :param size: The size of the render.
+        :param render: The PNG bytes of the render.
+        """
+        self._write(self._render_path(texture_hash, variant, style, size), render)
+
+
+    def prune(self) -> int:
+        """
+        Delete the least recently used files until at most `max_bytes` are
+        stored. Returns the amount of deleted bytes.
+        """
+        files = []
+        for root, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in files)
+        deleted = 0
+
+        for _, size, path in sorted(files):
+            if total_size - deleted <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            deleted += size
+
+        return deleted
@@ -1,5 +1,4 @@
 import os
-import sqlite3
 from io import BytesIO
 from datetime import datetime, UTC
 
@@ -10,6 +9,7 @@ from ..assets import ASSET_LOADER
 from ..linking import uuid_to_discord_id
 from ..cfg import config
 from ..common import REL_PATH
+from ..functions import db_connect
 from ..permissions import has_access
 from ..themes import get_theme_properties
 from .colors import Colors, get_prestige_primary_color, get_rank_color
@@ -138,7 +138,7 @@ def get_background(bg_dir, uuid, default='base', **kwargs) -> Image.Image:
 
 
     # Voting and rewards data for active theme pack
-    with sqlite3.connect(f'{REL_PATH}/database/core.db') as conn:
+    with db_connect() as conn:
         cursor = conn.cursor()
 
         cursor.execute(f'SELECT * FROM voting_data WHERE discord_id = {discord_id}')
@@ -0,0 +1,342 @@
+"""
+Coalesced delivery of subscription role updates to the utils app.
+
+Subscription lookups queue a role update instead of sending it themselves.
+A background task sends the queued updates to the utils app's socket server.
+By default every event is sent as a single JSON object over its own
+connection, which is what the utils app reads. With `persistent_connection`
+enabled, they are sent over one persistent connection as newline delimited
+JSON events instead, which the utils app has to read line by line.
+
+Updates are deduplicated per user, keeping the latest subscription, and
+dropped if they match the subscription last sent for the user. Updates
+that fail to send stay queued and are retried after `retry_delay` seconds,
+unless a newer update for the user was queued in the meantime.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .cfg import config
+
+if TYPE_CHECKING:
+    from .subscriptions import Subscription
+
+
+logger = logging.getLogger('statalytics')
+
+_SubscriptionState = tuple[str, float | int | None]
+
+
+def _default_port() -> int | None:
+    try:
+        return config('apps.utils.socket_server_port')
+    except KeyError:
+        return None
+
+
+@dataclass
+class RoleUpdateConfig:
+    """Delivery settings of the role update dispatcher."""
+    host: str = 'utils'
+    port: int | None = None
+    flush_interval: float = 0.5
+    retry_delay: float = 30
+    connect_timeout: float = 2
+    max_remembered: int = 10_000
+    persistent_connection: bool = False
+
+    def __post_init__(self) -> None:
+        if self.port is None:
+            self.port = _default_port()
+
+    @staticmethod
+    def from_config() -> 'RoleUpdateConfig':
+        """
+        Load the settings from the `global.role_updates` section of the config
+        file. Missing values use the dataclass defaults, and the port defaults
+        to the utils app's `socket_server_port`.
+        """
+        try:
+            role_update_config: dict = config('global.role_updates')
+        except KeyError:
+            role_update_config = {}
+
+        return RoleUpdateConfig(**role_update_config)
+
+
+@dataclass
+class RoleUpdateStats:
+    """Counters for the role update dispatcher."""
+    queued: int = 0
+    coalesced: int = 0
+    unchanged: int = 0
+    sent: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    connections: int = 0
+
+
+class RoleUpdateDispatcher:
+    """
+    Queues subscription role updates from any thread and sends them from
+    the event loop the dispatcher was started on. See the module docstring
+    for the delivery semantics.
+    """
+    def __init__(self, role_update_config: RoleUpdateConfig | None=None) -> None:
+        """
+        :param role_update_config: Override the configured delivery settings.
+        """
+        self.config = role_update_config or RoleUpdateConfig.from_config()
+        self.stats = RoleUpdateStats()
+
+        self._pending: dict[int, _SubscriptionState] = {}
+        # The last subscription sent per user, least recently sent first
+        self._sent: OrderedDict[int, _SubscriptionState] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+        self._warned_not_running = False
+
+
+    @property
+    def pending(self) -> int:
+        """The amount of users with an update that hasn't been sent yet."""
+        return len(self._pending)
+
+
+    def dispatch(self, discord_id: int, subscription: 'Subscription') -> None:
+        """
+        Queue a role update for a user's current subscription. Never blocks,
+        and can be called from any thread.
+        :param discord_id: The discord id of the user.
+        :param subscription: The user's current subscription.
+        """
+        state = (subscription.package, subscription.expiry_timestamp)
+
+        with self._lock:
+            if discord_id in self._pending:
+                self.stats.coalesced += 1
+            elif self._sent.get(discord_id) == state:
+                self.stats.unchanged += 1
+                return
+
+            self._pending[discord_id] = state
+            self.stats.queued += 1
+
+        if self.running:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass  # The loop closed, sent by the next start
+        elif not self._warned_not_running:
+            self._warned_not_running = True
+            logger.warning(
+                'Role updates are being queued, but the role update dispatcher '
+                'was never started in this process, so they will not be sent')
+
+
+    def _take(self) -> dict[int, _SubscriptionState]:
+        with self._lock:
+            batch, self._pending = self._pending, {}
+
+            # Changed back to the sent subscription before being sent
+            for discord_id, state in list(batch.items()):
+                if self._sent.get(discord_id) == state:
+                    del batch[discord_id]
+                    self.stats.unchanged += 1
+            return batch
+
+
+    def _restore(self, batch: dict[int, _SubscriptionState]) -> None:
+        with self._lock:
+            # Updates queued since the batch was taken are newer
+            self._pending = batch | self._pending
+
+
+    def _remember(self, batch: dict[int, _SubscriptionState]) -> None:
+        with self._lock:
+            for discord_id, state in batch.items():
+                self._sent[discord_id] = state
+                self._sent.move_to_end(discord_id)
+
+            while len(self._sent) > self.config.max_remembered:
+                self._sent.popitem(last=False)
+
+
+    @staticmethod
+    def _encode_event(discord_id: int, state: _SubscriptionState) -> str:
+        package, expiry_timestamp = state
+        return json.dumps({
+            "action": "dispatch_event",
+            "event_name": "subscription_update",
+            "args": [discord_id, package, expiry_timestamp]
+        })
+
+
+    @classmethod
+    def _encode(cls, batch: dict[int, _SubscriptionState]) -> bytes:
+        events = (
+            cls._encode_event(discord_id, state) + '\n'
+            for discord_id, state in batch.items()
+        )
+        return ''.join(events).encode()
+
+
+    async def _connection(self) -> asyncio.StreamWriter:
+        # The utils app never replies, so reaching EOF means it disconnected
+        if self._writer is not None and not self._reader.at_eof() \
+            and not self._writer.is_closing():
+            return self._writer
+
+        await self._disconnect()
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.config.host, self.config.port),
+            self.config.connect_timeout)
+        self.stats.connections += 1
+        return self._writer
+
+
+    async def _disconnect(self) -> None:
+        if self._writer is None:
+            return
+
+        writer, self._reader, self._writer = self._writer, None, None
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+
+    async def _send_event(self, discord_id: int, state: _SubscriptionState) -> None:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.config.host, self.config.port),
+            self.config.connect_timeout)
+        self.stats.connections += 1
+
+        try:
+            writer.write(self._encode_event(discord_id, state).encode())
+            await writer.drain()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+    async def _flush_per_connection(self, batch: dict[int, _SubscriptionState]) -> bool:
+        sent: dict[int, _SubscriptionState] = {}
+
+        for discord_id, state in batch.items():
+            try:
+                await self._send_event(discord_id, state)
+            except (OSError, asyncio.TimeoutError) as exc:
+                # The utils app is probably offline
+                self.stats.failed_batches += 1
+                self._restore({
+                    key: value for key, value in batch.items() if key not in sent})
+                self._remember(sent)
+                self.stats.sent += len(sent)
+                logger.debug(
+                    f'Failed to send {len(batch) - len(sent)} role updates: {exc!r}')
+                return False
+            sent[discord_id] = state
+
+        self.stats.batches += 1
+        self.stats.sent += len(sent)
+        self._remember(sent)
+        return True
+
+
+    async def flush(self) -> bool:
+        """
+        Send every queued update, in a single write over the persistent
+        connection or over a connection per update.
+        :return: Whether the queued updates were sent.
+        """
+        batch = self._take()
+        if not batch:
+            return True
+
+        if not self.config.persistent_connection:
+            return await self._flush_per_connection(batch)
+
+        try:
+            writer = await self._connection()
+            writer.write(self._encode(batch))
+            await writer.drain()
+        except (OSError, asyncio.TimeoutError) as exc:
+            # The utils app is probably offline
+            self.stats.failed_batches += 1
+            self._restore(batch)
+            await self._disconnect()
+            logger.debug(f'Failed to send {len(batch)} role updates: {exc!r}')
+            return False
+
+        self.stats.batches += 1
+        self.stats.sent += len(batch)
+        self._remember(batch)
+        return True
+
+
+    async def _send_continuously(self) -> None:
+        while True:
+            await self._wake.wait()
+
+            # Gives updates queued right after another a chance to coalesce
+            await asyncio.sleep(self.config.flush_interval)
+            self._wake.clear()
+
+            if not await self.flush():
+                await asyncio.sleep(self.config.retry_delay)
+                self._wake.set()
+
+
+    @property
+    def running(self) -> bool:
+        """Whether the dispatcher is sending queued updates."""
+        return self._task is not None and not self._task.done()
+
+
+    def start(self) -> None:
+        """Start sending queued updates from the running event loop."""
+        if self.running:
+            return
+        self._warned_not_running = False
+
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._send_continuously())
+
+        if self._pending:
+            self._wake.set()
+
+
+    async def stop(self) -> None:
+        """Stop sending, make a last attempt at the queued updates and disconnect."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+        await self._disconnect()
+
+
+role_update_dispatcher = RoleUpdateDispatcher()  # Globally used instance
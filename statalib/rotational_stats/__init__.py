@@ -13,9 +13,19 @@ from .reset_time import (
 )
 from .lookback import (
     build_invalid_lookback_embeds as build_invalid_lookback_embeds,
-    get_max_lookback as get_max_lookback
+    get_max_lookback as get_max_lookback,
+    get_subscriptions_max_lookback as get_subscriptions_max_lookback
+)
+from .managers import (
+    RotationalStatsManager as RotationalStatsManager,
+    get_rotations as get_rotations
+)
+from .retention import (
+    HistoricalRetention as HistoricalRetention,
+    HistoricalRetentionConfig as HistoricalRetentionConfig,
+    RetentionResult as RetentionResult,
+    get_retention_days as get_retention_days
 )
-from .managers import RotationalStatsManager as RotationalStatsManager
 from .resetting import (
     RotationalResetting as RotationalResetting,
     has_auto_reset_access as has_auto_reset_access,
@@ -1,5 +1,5 @@
 from ..cfg import config
-from ..subscriptions import SubscriptionManager
+from ..subscriptions import Subscription, SubscriptionManager
 from ..functions import load_embeds
 
 
@@ -14,7 +14,22 @@ def get_max_lookback(discord_ids: list[int]) -> int | None:
     :param discord_ids: A list of Discord user IDs to find the max lookback for.
     :return: Number of days (int) or infinite lookback (None).
     """
-    if not discord_ids:
+    return get_subscriptions_max_lookback([
+        SubscriptionManager(discord_id).get_subscription()
+        for discord_id in discord_ids
+        if discord_id is not None
+    ])
+
+
+def get_subscriptions_max_lookback(subscriptions: list[Subscription]) -> int | None:
+    """
+    Get the highest max historical rotational stats lookback value
+    that any of the given subscriptions grants.
+
+    :param subscriptions: The subscriptions to find the max lookback for.
+    :return: Number of days (int) or infinite lookback (None).
+    """
+    if not subscriptions:
         try:
             # Get configured lookback of default package
             default_package = config("global.subscriptions.default_package")
@@ -24,11 +39,8 @@ def get_max_lookback(discord_ids: list[int]) -> int | None:
             return FALLBACK_MAX_LOOKBACK  # Fallback
 
     max_lookbacks: list[int | None] = [
-        SubscriptionManager(discord_id) \
-            .get_subscription() \
-            .package_property("max_lookback", FALLBACK_MAX_LOOKBACK)
-        for discord_id in discord_ids
-        if discord_id is not None
+        subscription.package_property("max_lookback", FALLBACK_MAX_LOOKBACK)
+        for subscription in subscriptions
     ]
 
     # No limit
@@ -39,10 +51,15 @@ def get_max_lookback(discord_ids: list[int]) -> int | None:
     return max(max_lookbacks)
 
 
-def build_invalid_lookback_embeds(max_lookback: int | None) -> list:
+def build_invalid_lookback_embeds(
+    max_lookback: int | None,
+    daily: bool=False
+) -> list:
     """
     Responds to a interaction with an max lookback exceeded message
     :param max_lookback: The maximum lookback the user had availiable
+    :param daily: Whether the lookback is of daily history, which only \
+        the checked player's plan determines
     """
     format_values = {
         'description': {
@@ -56,6 +73,7 @@ def build_invalid_lookback_embeds(max_lookback: int | None) -> list:
             }
         }
     }
-    embeds = load_embeds('max_lookback', format_values, color='primary')
+    embed_name = 'max_daily_lookback' if daily else 'max_lookback'
+    embeds = load_embeds(embed_name, format_values, color='primary')
 
     return embeds
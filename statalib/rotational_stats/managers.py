@@ -1,14 +1,101 @@
 import sqlite3
 from datetime import datetime, UTC
-from typing import Callable
-from uuid import uuid4
+from typing import Callable, Iterable
 
 from ._types import RotationType, BedwarsRotation, BedwarsHistoricalRotation
 from ._utils import get_bedwars_data
 from .reset_time import DefaultResetTimeManager, ResetTime
 from ..aliases import PlayerUUID
+from ..errors import DataNotFoundError
 from ..functions import db_connect
-from ..stats_snapshot import BedwarsStatsSnapshot, get_snapshot_data
+from ..stats_snapshot import (
+    BedwarsStatsSnapshot,
+    get_snapshot_data,
+    load_joined_snapshot,
+    store_snapshot
+)
+
+
+# Stays well below SQLite's limit on the amount of query parameters
+_UUID_BATCH_SIZE = 500
+
+
+def _select_rotations(
+    cursor: sqlite3.Cursor,
+    uuids: list[PlayerUUID],
+    rotations: list[str] | None
+) -> list[BedwarsRotation]:
+    query = (
+        "SELECT r.uuid, r.rotation, r.last_reset_timestamp, r.snapshot_id, "
+        "p.layout_version, p.data FROM rotational_info r "
+        "LEFT JOIN bedwars_stats_snapshots_packed p ON p.snapshot_id = r.snapshot_id "
+        f"WHERE r.uuid IN ({', '.join('?' * len(uuids))})"
+    )
+    params = list(uuids)
+
+    if rotations is not None:
+        query += f" AND r.rotation IN ({', '.join('?' * len(rotations))})"
+        params += rotations
+
+    cursor.execute(query, params)
+
+    results = []
+    for uuid, rotation, last_reset_timestamp, snapshot_id, *packed in cursor.fetchall():
+        snapshot = load_joined_snapshot(cursor, snapshot_id, *packed)
+
+        if snapshot is None:
+            raise DataNotFoundError(
+                f"Snapshot data missing for snapshot ID '{snapshot_id}'")
+
+        rotation_info = {
+            "uuid": uuid,
+            "rotation": rotation,
+            "last_reset_timestamp": last_reset_timestamp,
+            "snapshot_id": snapshot_id
+        }
+        results.append(BedwarsRotation(rotation_info, snapshot))
+
+    return results
+
+
+def get_rotations(
+    uuids: Iterable[PlayerUUID],
+    rotation_types: Iterable[RotationType] | None=None,
+    cursor: sqlite3.Cursor | None=None
+) -> dict[PlayerUUID, dict[RotationType, BedwarsRotation]]:
+    """
+    Get the current rotational data of several players and rotations,
+    along with their snapshots, in a single query per 500 players.
+    Players and rotations that aren't tracked are left out.
+
+    :param uuids: The uuids of the players.
+    :param rotation_types: The types of rotation to get, defaults to all of them.
+    :param cursor: Custom `sqlite3.Cursor` object to execute queries with.
+    """
+    uuids = list(dict.fromkeys(uuids))
+    rotations = None
+    if rotation_types is not None:
+        rotations = [rotation_type.value for rotation_type in rotation_types]
+
+    if not uuids or rotations == []:
+        return {}
+
+    def __get_rotations(cursor: sqlite3.Cursor) -> dict:
+        results: dict[PlayerUUID, dict[RotationType, BedwarsRotation]] = {}
+
+        for i in range(0, len(uuids), _UUID_BATCH_SIZE):
+            batch = uuids[i:i + _UUID_BATCH_SIZE]
+
+            for rotation in _select_rotations(cursor, batch, rotations):
+                results.setdefault(rotation.uuid, {})[
+                    RotationType(rotation.rotation)] = rotation
+        return results
+
+    if cursor is not None:
+        return __get_rotations(cursor)
+
+    with db_connect() as conn:
+        return __get_rotations(conn.cursor())
 
 
 class RotationalStatsManager:
@@ -47,16 +134,20 @@ class RotationalStatsManager:
 
         :param rotation_type: The type of rotation; daily, weekly, monthly, etc
         """
-        exec_select_query = lambda cursor: cursor.execute(
-            "SELECT * FROM rotational_info WHERE uuid = ? AND rotation = ?",
-            (self._uuid, rotation_type.value)
-        )
+        return self.get_rotations([rotation_type]).get(rotation_type)
 
-        result = self.__get_rotation_data(exec_select_query)
-        if result is None:
-            return None  # No data
 
-        return BedwarsRotation(*result)
+    def get_rotations(
+        self,
+        rotation_types: Iterable[RotationType] | None=None
+    ) -> dict[RotationType, BedwarsRotation]:
+        """
+        Get the current rotational data for several rotation types at once.
+        Rotations that aren't tracked for the player are left out.
+
+        :param rotation_types: The types of rotation to get, defaults to all of them.
+        """
+        return get_rotations([self._uuid], rotation_types).get(self._uuid, {})
 
 
     def get_historical_rotation_data(
@@ -100,29 +191,18 @@ class RotationalStatsManager:
             for key in BedwarsStatsSnapshot.keys(include_snapshot_id=False)
         ]
 
-        # Generate set clause
-        stat_keys = BedwarsStatsSnapshot.keys(include_snapshot_id=False)
-
-        set_clause = ", ".join(stat_keys)
-        question_marks = ", ".join("?"*len(stat_keys))
-
         timestamp = datetime.now(UTC).timestamp()
 
         with db_connect() as conn:
             cursor = conn.cursor()
 
             for rotation in RotationType:
-                # Insert rotational info data
-                snapshot_id = uuid4().hex
+                # Every rotation references the same snapshot
+                snapshot_id = store_snapshot(cursor, bedwars_data_list)
 
+                # Insert rotational info data
                 cursor.execute(
                     "INSERT INTO rotational_info (uuid, rotation, last_reset_timestamp, "
                     "snapshot_id) VALUES (?, ?, ?, ?)",
                     (self._uuid, rotation.value, timestamp, snapshot_id)
-                )
-
-                # Insert snapshot data
-                cursor.execute(
-                    f"INSERT INTO bedwars_stats_snapshots (snapshot_id, {set_clause}) VALUES (?, {question_marks})",
-                    (snapshot_id, *bedwars_data_list)
                 )
\ No newline at end of file
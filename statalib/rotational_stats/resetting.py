@@ -2,10 +2,14 @@ import logging
 import calendar
 from datetime import UTC, datetime, timedelta
 from dateutil.relativedelta import relativedelta
-from uuid import uuid4
 
 from statalib.errors import DataNotFoundError
-from statalib.stats_snapshot import BedwarsStatsSnapshot
+from statalib.stats_snapshot import (
+    BedwarsStatsSnapshot,
+    release_snapshot,
+    replace_snapshot,
+    store_snapshot
+)
 from ._types import (
     HistoricalRotationPeriodID,
     BedwarsRotation,
@@ -16,6 +20,7 @@ from .managers import RotationalStatsManager
 from ..aliases import PlayerUUID
 from ..calctools.utils import get_level
 from ..cfg import config
+from ..database import db_executor
 from ..functions import db_connect
 from ..linking import uuid_to_discord_id
 from ..permissions import has_access
@@ -97,16 +102,20 @@ class RotationalResetting:
         self,
         period_id: HistoricalRotationPeriodID,
         current_hypixel_data: dict,
+        current_rotational_data: BedwarsRotation | None=None
     ) -> str:
         """
         Save currently active rotational data as a historical data snapshot.
 
         :param period_id: The period ID information for the reset
         :param current_hypixel_data: The current hypixel data of the player.
+        :param current_rotational_data: The rotational data of the period's \
+            rotation type, if it was already fetched.
         :return: The snapshot ID to identify the data.
         """
-        manager = RotationalStatsManager(self._player_uuid)
-        current_rotational_data = manager.get_rotational_data(period_id.rotation_type)
+        if current_rotational_data is None:
+            manager = RotationalStatsManager(self._player_uuid)
+            current_rotational_data = manager.get_rotational_data(period_id.rotation_type)
 
         # Data was expected
         if current_rotational_data is None:
@@ -118,13 +127,32 @@ class RotationalResetting:
         calculated_values = self.__calculate_data_difference(
             current_rotational_data, current_hypixel_data)
 
-        # Misc values
-        snapshot_id = uuid4().hex
         current_bedwars_level = get_level(current_rotational_data.data.Experience)
 
         with db_connect() as conn:
             cursor = conn.cursor()
 
+            # Insert data, shared with identical snapshots like those of
+            # periods the player didn't play in
+            snapshot_id = store_snapshot(cursor, calculated_values)
+
+            cursor.execute(
+                "SELECT snapshot_id FROM historical_info "
+                "WHERE uuid = ? AND period_id = ? AND rolled_up = 1",
+                (self._player_uuid, period_id.to_string()))
+            rolled_up = cursor.fetchone()
+
+            if rolled_up is not None:
+                # Summed by the historical retention before the period was
+                # reset, the reset's difference replaces it
+                cursor.execute(
+                    "UPDATE historical_info SET level = ?, snapshot_id = ?, rolled_up = 0 "
+                    "WHERE uuid = ? AND period_id = ?",
+                    (current_bedwars_level, snapshot_id,
+                     self._player_uuid, period_id.to_string()))
+                release_snapshot(cursor, rolled_up[0])
+                return snapshot_id
+
             # Insert info
             cursor.execute(
                 "INSERT INTO historical_info (uuid, period_id, level, snapshot_id) "
@@ -132,16 +160,6 @@ class RotationalResetting:
                 (self._player_uuid, period_id.to_string(), current_bedwars_level, snapshot_id)
             )
 
-            # Insert data
-            keys = BedwarsStatsSnapshot.keys(include_snapshot_id=False)
-            column_names = ", ".join(keys)
-            question_marks = ", ".join("?"*len(keys))
-
-            cursor.execute(f"""
-                INSERT INTO bedwars_stats_snapshots
-                (snapshot_id, {column_names}) VALUES (?, {question_marks})
-            """, (snapshot_id, *calculated_values))
-
         return snapshot_id
 
 
@@ -170,15 +188,6 @@ class RotationalResetting:
             if result is None:
                 return None  # Probably raise an exception instead
 
-            # Update last reset timestamp
-            cursor.execute(
-                "UPDATE rotational_info SET last_reset_timestamp = ? "
-                "WHERE uuid = ? AND rotation = ?",
-                (timestamp, self._player_uuid, rotation_type.value)
-            )
-
-            snapshot_id = result[0]
-
             # Convert bedwars data to list of tracked values
             current_bedwars_data = get_bedwars_data(current_hypixel_data)
 
@@ -187,17 +196,14 @@ class RotationalResetting:
                 for key in BedwarsStatsSnapshot.keys(include_snapshot_id=False)
             ]
 
-            # Format set query
-            set_keys = [
-                f"{key} = ?"
-                for key in BedwarsStatsSnapshot.keys(include_snapshot_id=False)
-            ]
-            set_clause = ", ".join(set_keys)
+            # Replace snapshot data
+            snapshot_id = replace_snapshot(cursor, result[0], bedwars_data_list)
 
-            # Update snapshot data
+            # Update last reset timestamp and snapshot
             cursor.execute(
-                f"UPDATE bedwars_stats_snapshots SET {set_clause} WHERE snapshot_id = ?",
-                (*bedwars_data_list, snapshot_id)
+                "UPDATE rotational_info SET last_reset_timestamp = ?, snapshot_id = ? "
+                "WHERE uuid = ? AND rotation = ?",
+                (timestamp, snapshot_id, self._player_uuid, rotation_type.value)
             )
 
 
@@ -230,33 +236,22 @@ def reset_rotational_stats_if_whitelisted(
             "WHERE uuid = ?", (uuid,))
         last_resets: dict[str, int] = {k: v for k, v in cursor.fetchall()}
 
-    reset_manager = RotationalResetting(uuid)
+    # The rotations to reset, with a datetime in the period being archived
+    due_periods: dict[RotationType, datetime] = {}
 
     if last_resets.get('daily'):
         last_reset = last_resets['daily']
 
         # Has been more than 1 day since last reset.
         if now_timestamp - last_reset > 86400:
-            last_day_dt = now - timedelta(days=1)
-
-            period = HistoricalRotationPeriodID(RotationType.DAILY, last_day_dt)
-            reset_manager.archive_rotational_data(period, hypixel_data)
-            reset_manager.refresh_rotational_data(RotationType.DAILY, hypixel_data)
-
-            logger.info(f'(Manual) Reset daily tracker for: {uuid}')
+            due_periods[RotationType.DAILY] = now - timedelta(days=1)
 
     if last_resets.get('weekly'):
         last_reset = last_resets['weekly']
 
         # Has been more than 7 days since last reset
         if now_timestamp - last_reset > (86400 * 7):
-            last_week_dt = now - relativedelta(weeks=1)
-
-            period = HistoricalRotationPeriodID(RotationType.WEEKLY, last_week_dt)
-            reset_manager.archive_rotational_data(period, hypixel_data)
-            reset_manager.refresh_rotational_data(RotationType.WEEKLY, hypixel_data)
-
-            logger.info(f'(Manual) Reset weekly tracker for: {uuid}')
+            due_periods[RotationType.WEEKLY] = now - relativedelta(weeks=1)
 
     if last_resets.get('monthly'):
         last_reset = last_resets['monthly']
@@ -268,13 +263,7 @@ def reset_rotational_stats_if_whitelisted(
 
         # Has been more than 1 month since last reset
         if now_timestamp - last_reset > monthly_seconds:
-            last_month_dt = now - relativedelta(months=1)
-
-            period = HistoricalRotationPeriodID(RotationType.MONTHLY, last_month_dt)
-            reset_manager.archive_rotational_data(period, hypixel_data)
-            reset_manager.refresh_rotational_data(RotationType.MONTHLY, hypixel_data)
-
-            logger.info(f'(Manual) Reset monthly tracker for: {uuid}')
+            due_periods[RotationType.MONTHLY] = now - relativedelta(months=1)
 
     if last_resets.get('yearly'):
         last_reset = last_resets['yearly']
@@ -287,13 +276,22 @@ def reset_rotational_stats_if_whitelisted(
 
         # Has been more than 1 year since last reset
         if now_timestamp - last_reset > yearly_seconds:
-            last_year_dt = now - relativedelta(years=1)
+            due_periods[RotationType.YEARLY] = now - relativedelta(years=1)
+
+    if not due_periods:
+        return
+
+    # The data of every rotation to archive, in a single query
+    rotations = RotationalStatsManager(uuid).get_rotations(due_periods.keys())
+    reset_manager = RotationalResetting(uuid)
 
-            period = HistoricalRotationPeriodID(RotationType.YEARLY, last_year_dt)
-            reset_manager.archive_rotational_data(period, hypixel_data)
-            reset_manager.refresh_rotational_data(RotationType.YEARLY, hypixel_data)
+    for rotation_type, period_dt in due_periods.items():
+        period = HistoricalRotationPeriodID(rotation_type, period_dt)
+        reset_manager.archive_rotational_data(
+            period, hypixel_data, rotations.get(rotation_type))
+        reset_manager.refresh_rotational_data(rotation_type, hypixel_data)
 
-            logger.info(f'(Manual) Reset yearly tracker for: {uuid}')
+        logger.info(f'(Manual) Reset {rotation_type.value} tracker for: {uuid}')
 
 
 async def async_reset_rotational_stats_if_whitelisted(
@@ -301,4 +299,4 @@ async def async_reset_rotational_stats_if_whitelisted(
     hypixel_data: dict
 ) -> None:
     """Async wrapper for ~reset_rotational_stats_if_whitelisted()"""
-    reset_rotational_stats_if_whitelisted(uuid, hypixel_data)
+    await db_executor.write(reset_rotational_stats_if_whitelisted, uuid, hypixel_data)
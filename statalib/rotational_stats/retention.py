@@ -0,0 +1,399 @@
+"""
+Retention of historical rotational data.
+
+Every player gets a daily historical period per day they are tracked, but
+their daily periods can only be viewed as far back as the `max_lookback`
+property of the player's linked user allows, whatever the viewer's plan.
+Daily periods older than a player's lookback are folded into the weekly and
+monthly periods they belong to, and deleted.
+
+The weekly and monthly periods archived by resets are kept as they are, the
+folded daily differences are only summed into periods that weren't archived.
+Those periods are marked as `rolled_up`, so that the daily periods folded
+by later runs are added to them.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+
+import sqlite3
+
+from ._types import HistoricalRotationPeriodID, RotationType
+from .lookback import FALLBACK_MAX_LOOKBACK, get_max_lookback
+from ..aliases import PlayerUUID
+from ..cfg import config
+from ..database import db_executor
+from ..functions import db_connect
+from ..linking import uuid_to_discord_id
+from ..stats_snapshot import (
+    load_snapshot,
+    release_snapshot,
+    store_snapshot
+)
+
+
+logger = logging.getLogger('statalytics')
+
+_DAILY_PREFIX = 'daily_'
+_DAILY_FORMAT = 'daily_%Y_%m_%d'
+
+# Rotations daily periods are folded into
+ROLL_UP_ROTATIONS = (RotationType.WEEKLY, RotationType.MONTHLY)
+
+
+@dataclass
+class HistoricalRetentionConfig:
+    """Settings of the historical data retention."""
+    batch_size: int = 100
+    grace_days: int = 2
+
+    @staticmethod
+    def from_config() -> 'HistoricalRetentionConfig':
+        """
+        Load the settings from the `global.historical_retention` section of
+        the config file. Missing values use the dataclass defaults.
+        """
+        try:
+            retention_config: dict = config('global.historical_retention')
+        except KeyError:
+            retention_config = {}
+
+        return HistoricalRetentionConfig(**retention_config)
+
+
+@dataclass
+class RetentionResult:
+    """The outcome of compacting historical data, or what it would be."""
+    players: int = 0
+    folded_periods: int = 0
+    rolled_up_periods: int = 0
+    freed_snapshot_bytes: int = 0
+    freed_info_bytes: int = 0
+    dry_run: bool = False
+
+    @property
+    def freed_bytes(self) -> int:
+        """The bytes of row data freed, excluding the page overhead."""
+        return self.freed_snapshot_bytes + self.freed_info_bytes
+
+    def add(self, other: 'RetentionResult') -> None:
+        self.players += other.players
+        self.folded_periods += other.folded_periods
+        self.rolled_up_periods += other.rolled_up_periods
+        self.freed_snapshot_bytes += other.freed_snapshot_bytes
+        self.freed_info_bytes += other.freed_info_bytes
+
+    def summary(self) -> str:
+        action = 'Would fold' if self.dry_run else 'Folded'
+        return (
+            f'{action} {self.folded_periods} daily periods of {self.players} players '
+            f'into {self.rolled_up_periods} rolled up periods, freeing '
+            f'{self.freed_bytes / 1024:.0f} KiB '
+            f'({self.freed_snapshot_bytes / 1024:.0f} KiB of snapshots)')
+
+
+@dataclass
+class _RollUp:
+    level: float
+    values: list
+
+
+class _References:
+    """
+    Stores and releases snapshots, keeping track of how their reference
+    counts changed to tell which snapshots were created and deleted.
+    """
+    def __init__(self) -> None:
+        self._deltas: Counter[str] = Counter()
+        self._sizes: dict[str, int] = {}
+
+
+    @staticmethod
+    def _size(cursor: sqlite3.Cursor, snapshot_id: str) -> tuple[int, int] | None:
+        cursor.execute(
+            "SELECT refcount, LENGTH(data) FROM bedwars_stats_snapshots_packed "
+            "WHERE snapshot_id = ?", (snapshot_id,))
+        return cursor.fetchone()
+
+
+    def store(self, cursor: sqlite3.Cursor, values: list) -> str:
+        snapshot_id = store_snapshot(cursor, values)
+        self._deltas[snapshot_id] += 1
+        return snapshot_id
+
+
+    def release(self, cursor: sqlite3.Cursor, snapshot_id: str) -> None:
+        if snapshot_id not in self._sizes:
+            stored = self._size(cursor, snapshot_id)
+            self._sizes[snapshot_id] = stored[1] if stored else 0
+
+        release_snapshot(cursor, snapshot_id)
+        self._deltas[snapshot_id] -= 1
+
+
+    def freed_bytes(self, cursor: sqlite3.Cursor) -> int:
+        """The bytes of deleted snapshots minus those of created snapshots."""
+        freed = 0
+
+        for snapshot_id, delta in self._deltas.items():
+            stored = self._size(cursor, snapshot_id)
+            refcount = stored[0] if stored else 0
+
+            if stored is None and refcount - delta > 0:
+                freed += self._sizes.get(snapshot_id, 0)
+            elif stored is not None and refcount - delta <= 0:
+                freed -= stored[1]
+
+        return freed
+
+
+def _min_lookback() -> int | None:
+    """The shortest lookback of any subscription package, `None` if unlimited."""
+    try:
+        packages: dict = config('global.subscriptions.packages')
+    except KeyError:
+        return FALLBACK_MAX_LOOKBACK
+
+    lookbacks = [
+        package.get('properties', {}).get('max_lookback', FALLBACK_MAX_LOOKBACK)
+        for package in packages.values()
+    ]
+    lookbacks = [lookback for lookback in lookbacks if lookback is not None]
+
+    return min(lookbacks) if lookbacks else None
+
+
+def get_retention_days(uuid: PlayerUUID) -> int | None:
+    """
+    Returns the amount of days of daily periods kept for a player, which
+    is the lookback of their linked user, or `None` if unlimited. This is
+    also the daily lookback that the `/lastday` command allows.
+    :param uuid: The UUID of the player.
+    """
+    discord_id = uuid_to_discord_id(uuid)
+    return get_max_lookback([discord_id] if discord_id is not None else [])
+
+
+class HistoricalRetention:
+    """
+    Folds daily historical periods older than a player's lookback into
+    weekly and monthly periods. See the module docstring for details.
+
+    Players are compacted `batch_size` at a time, each batch in its own
+    transaction. Dry runs roll every transaction back, reporting what
+    would have been freed.
+    """
+    def __init__(
+        self,
+        retention_config: HistoricalRetentionConfig | None=None,
+        today: date | None=None
+    ) -> None:
+        """
+        :param retention_config: Override the configured settings.
+        :param today: Override the current date, in UTC.
+        """
+        self.config = retention_config or HistoricalRetentionConfig.from_config()
+        self._today = today
+
+
+    @property
+    def today(self) -> date:
+        return self._today or datetime.now(UTC).date()
+
+
+    def _cutoff(self, retention_days: int) -> str:
+        """The period ID that daily periods to fold are ordered before."""
+        cutoff = self.today - timedelta(days=retention_days + self.config.grace_days)
+        return cutoff.strftime(_DAILY_FORMAT)
+
+
+    def find_players(self, after_uuid: PlayerUUID='') -> list[PlayerUUID]:
+        """
+        Returns the next `batch_size` players, ordered by UUID, that have
+        daily periods older than the shortest lookback of any package.
+        :param after_uuid: The last UUID of the previous batch.
+        """
+        min_lookback = _min_lookback()
+        if min_lookback is None:
+            return []
+
+        with db_connect() as conn:
+            cursor = conn.execute(
+                "SELECT DISTINCT uuid FROM historical_info "
+                "WHERE uuid > ? AND period_id >= ? AND period_id < ? "
+                "ORDER BY uuid LIMIT ?",
+                (after_uuid, _DAILY_PREFIX, self._cutoff(min_lookback),
+                 self.config.batch_size))
+            return [row[0] for row in cursor.fetchall()]
+
+
+    def _roll_up(
+        self,
+        cursor: sqlite3.Cursor,
+        uuid: PlayerUUID,
+        period_id: str,
+        roll_up: _RollUp,
+        references: _References
+    ) -> bool:
+        """
+        Add summed daily differences to a rolled up period.
+        Returns whether the period was rolled up.
+        """
+        cursor.execute(
+            "SELECT snapshot_id, rolled_up FROM historical_info "
+            "WHERE uuid = ? AND period_id = ?", (uuid, period_id))
+        existing = cursor.fetchone()
+
+        if existing is None:
+            snapshot_id = references.store(cursor, roll_up.values)
+            cursor.execute(
+                "INSERT INTO historical_info "
+                "(uuid, period_id, level, snapshot_id, rolled_up) VALUES (?, ?, ?, ?, 1)",
+                (uuid, period_id, roll_up.level, snapshot_id))
+            return True
+
+        snapshot_id, rolled_up = existing
+        if not rolled_up:
+            return False  # Archived by a reset
+
+        current = load_snapshot(cursor, snapshot_id)
+        values = [
+            old + new for old, new
+            in zip(current.as_tuple(include_snapshot_id=False), roll_up.values)
+        ]
+
+        new_snapshot_id = references.store(cursor, values)
+        references.release(cursor, snapshot_id)
+
+        cursor.execute(
+            "UPDATE historical_info SET snapshot_id = ? WHERE uuid = ? AND period_id = ?",
+            (new_snapshot_id, uuid, period_id))
+        return True
+
+
+    def compact_player(
+        self,
+        cursor: sqlite3.Cursor,
+        uuid: PlayerUUID,
+        retention_days: int | None
+    ) -> RetentionResult:
+        """
+        Fold the daily periods of a player that are older than their lookback.
+        :param cursor: `sqlite3.Cursor` object to execute queries with.
+        :param uuid: The UUID of the player.
+        :param retention_days: The days of daily periods to keep for the player.
+        """
+        result = RetentionResult()
+
+        if retention_days is None:
+            return result
+
+        cursor.execute(
+            "SELECT period_id, level, snapshot_id, "
+            "LENGTH(uuid) + LENGTH(period_id) + LENGTH(snapshot_id) + 10 "
+            "FROM historical_info WHERE uuid = ? AND period_id >= ? AND period_id < ? "
+            "ORDER BY period_id",
+            (uuid, _DAILY_PREFIX, self._cutoff(retention_days)))
+        daily_periods = cursor.fetchall()
+
+        if not daily_periods:
+            return result
+
+        roll_ups: dict[str, _RollUp] = {}
+
+        for period_id, level, snapshot_id, row_bytes in daily_periods:
+            day = datetime.strptime(period_id, _DAILY_FORMAT).date()
+            snapshot = load_snapshot(cursor, snapshot_id)
+            result.freed_info_bytes += row_bytes
+
+            if snapshot is None:
+                continue  # Nothing to add
+            values = snapshot.as_tuple(include_snapshot_id=False)
+
+            for rotation_type in ROLL_UP_ROTATIONS:
+                roll_up_id = HistoricalRotationPeriodID(rotation_type, day).to_string()
+                roll_up = roll_ups.setdefault(roll_up_id, _RollUp(level, [0] * len(values)))
+                roll_up.values = [total + value for total, value in zip(roll_up.values, values)]
+
+        references = _References()
+
+        for roll_up_id, roll_up in roll_ups.items():
+            result.rolled_up_periods += self._roll_up(
+                cursor, uuid, roll_up_id, roll_up, references)
+
+        for _, _, snapshot_id, _ in daily_periods:
+            references.release(cursor, snapshot_id)
+
+        cursor.executemany(
+            "DELETE FROM historical_info WHERE uuid = ? AND period_id = ?",
+            [(uuid, row[0]) for row in daily_periods])
+
+        result.players = 1
+        result.folded_periods = len(daily_periods)
+        result.freed_snapshot_bytes = references.freed_bytes(cursor)
+        return result
+
+
+    def compact_players(
+        self,
+        uuids: list[PlayerUUID],
+        dry_run: bool=False
+    ) -> RetentionResult:
+        """
+        Fold the old daily periods of players in a single transaction.
+        :param uuids: The UUIDs of the players.
+        :param dry_run: Roll the transaction back instead of committing it.
+        """
+        result = RetentionResult(dry_run=dry_run)
+
+        # Looked up first, their queries would commit the transaction
+        retention_days = {uuid: get_retention_days(uuid) for uuid in uuids}
+
+        with db_connect() as conn:
+            cursor = conn.cursor()
+
+            try:
+                for uuid in uuids:
+                    result.add(self.compact_player(cursor, uuid, retention_days[uuid]))
+            finally:
+                if dry_run:
+                    conn.rollback()
+
+        return result
+
+
+    def run(self, dry_run: bool=False) -> RetentionResult:
+        """
+        Fold the old daily periods of every player, one batch at a time.
+        :param dry_run: Only report what would be folded and freed.
+        """
+        result = RetentionResult(dry_run=dry_run)
+        uuid = ''
+
+        while uuids := self.find_players(uuid):
+            result.add(self.compact_players(uuids, dry_run))
+            uuid = uuids[-1]
+
+        return result
+
+
+    async def async_run(self, dry_run: bool=False) -> RetentionResult:
+        """
+        Async version of ~run(). Each batch is compacted on the database
+        writer thread, so other writes are interleaved between batches.
+        :param dry_run: Only report what would be folded and freed.
+        """
+        result = RetentionResult(dry_run=dry_run)
+        uuid = ''
+
+        while uuids := await db_executor.read(self.find_players, uuid):
+            result.add(await db_executor.write(self.compact_players, uuids, dry_run))
+            uuid = uuids[-1]
+
+            await asyncio.sleep(0)
+
+        logger.info(result.summary())
+        return result
@@ -1,11 +1,15 @@
 import sqlite3
 from datetime import datetime, UTC
-from uuid import uuid4
 
 from .aliases import PlayerUUID
 from .errors import DataNotFoundError
 from .functions import db_connect
-from .stats_snapshot import BedwarsStatsSnapshot
+from .stats_snapshot import (
+    BedwarsStatsSnapshot,
+    load_snapshot,
+    release_snapshot,
+    store_snapshot
+)
 
 
 class BedwarsSession:
@@ -54,15 +58,12 @@ class SessionManager:
 
             # Select session stats
             snapshot_id = session_info_dict["snapshot_id"]
-            cursor.execute(
-                "SELECT * FROM bedwars_stats_snapshots WHERE snapshot_id = ?", (snapshot_id,))
-            session_data: tuple | None = cursor.fetchone()
+            session_snapshot_data = load_snapshot(cursor, snapshot_id)
 
-            if session_data is None:
+            if session_snapshot_data is None:
                 raise DataNotFoundError(
                     f"Snapshot data missing for snapshot ID '{snapshot_id}'")
 
-            session_snapshot_data = BedwarsStatsSnapshot(*session_data)
             return BedwarsSession(session_info_dict, session_data=session_snapshot_data)
 
 
@@ -78,16 +79,17 @@ class SessionManager:
         # Create dictionary of session data
         session_data = {
             k:bedwars_stats_data.get(k, 0)
-            for k in BedwarsStatsSnapshot.keys()
+            for k in BedwarsStatsSnapshot.keys(include_snapshot_id=False)
         }
 
-        # Generate timestamp and session snapshot id
         timestamp = datetime.now(UTC).timestamp()
-        snapshot_id = uuid4().hex
 
         with db_connect() as conn:
             cursor = conn.cursor()
 
+            # Store session data
+            snapshot_id = store_snapshot(cursor, session_data.values())
+
             # Insert session info
             cursor.execute("""
                 INSERT INTO session_info
@@ -95,14 +97,6 @@ class SessionManager:
                 VALUES (?, ?, ?, ?)
             """, (session_id, self._uuid, snapshot_id, timestamp))
 
-            # Insert session data
-            column_names = ", ".join(session_data.keys())
-            question_marks = ", ".join("?"*len(session_data.keys()))
-            cursor.execute(f"""
-                INSERT INTO bedwars_stats_snapshots
-                (snapshot_id, {column_names}) VALUES (?, {question_marks})
-            """, (snapshot_id, *session_data.values()))
-
 
     def delete_session(self, session_id: int) -> None:
         """
@@ -124,11 +118,11 @@ class SessionManager:
 
             snapshot_id = result[0]
 
-            cursor.execute(
-                "DELETE FROM bedwars_stats_snapshots WHERE snapshot_id = ?", (snapshot_id,))
+            release_snapshot(cursor, snapshot_id)
 
             cursor.execute(
-                "DELETE FROM session_info WHERE snapshot_id = ?", (snapshot_id,))
+                "DELETE FROM session_info WHERE session = ? AND uuid = ?",
+                (session_id, self._uuid))
 
 
     def session_count(self, cursor: sqlite3.Cursor | None=None) -> int:
@@ -0,0 +1,85 @@
+"""Coalescing of concurrent identical requests into a single upstream call."""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+
+logger = logging.getLogger('statalytics')
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for a single flight group."""
+    calls: int = 0
+    coalesced: int = 0
+
+    @property
+    def coalesced_ratio(self) -> float:
+        """The fraction of calls that were served by an in-flight request."""
+        if self.calls == 0:
+            return 0.0
+        return self.coalesced / self.calls
+
+
+class SingleFlight:
+    """
+    Ensures that only one call per key is in flight at a time. Concurrent
+    callers using the same key await the result of the call that is already
+    in flight instead of starting their own.
+
+    The shared call runs in its own task, so a caller being cancelled does
+    not cancel the call for the other callers awaiting it.
+    """
+    def __init__(self, name: str) -> None:
+        """
+        :param name: The name of the group, used for logging.
+        """
+        self.name = name
+        self.stats = SingleFlightStats()
+
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+
+    @property
+    def in_flight(self) -> int:
+        """The number of calls that are currently in flight."""
+        return len(self._in_flight)
+
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        **kwargs
+    ) -> Any:
+        """
+        Call `func(*args, **kwargs)` unless a call for the same key is already
+        in flight, in which case the result of that call is awaited instead.
+        :param key: The key that identifies identical calls.
+        :param func: The coroutine function to call.
+        """
+        self.stats.calls += 1
+
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            task.add_done_callback(lambda t: self._on_done(key, t))
+            self._in_flight[key] = task
+        else:
+            self.stats.coalesced += 1
+            logger.debug(f'Coalesced {self.name} request for: {key}')
+
+        return await asyncio.shield(task)
@@ -1,8 +1,27 @@
+"""
+Stored snapshots of a player's bedwars stats.
+
+Snapshots are stored packed, as a single BLOB of zigzag varint encoded
+integers in the order of a versioned field layout. Snapshots that can't be
+packed, because they contain values that aren't integers, and snapshots
+written before packing was introduced are stored with one column per stat
+in `bedwars_stats_snapshots`. Reads check both tables.
+
+Packed snapshots are stored by content: their ID is a hash of the packed
+stats, so identical snapshots, like the zero differences archived for
+inactive players or the rotations initialized together, share a row.
+The row counts its references and is deleted when the last one is
+released. Snapshots stored with columns aren't shared.
+"""
+
 from dataclasses import dataclass
+from typing import Iterable
+from uuid import uuid4
+import hashlib
 import sqlite3
 
 
-@dataclass
+@dataclass(slots=True)
 class BedwarsStatsSnapshot:
     snapshot_id: str
     Experience: int
@@ -68,19 +87,36 @@ class BedwarsStatsSnapshot:
     two_four_items_purchased_bedwars: int
 
     def as_tuple(self, include_snapshot_id: bool=True) -> tuple:
-        result = tuple(self.__dict__.values())
-
-        if include_snapshot_id is False:
-            # Remove snapshot ID
-            result = result[1:]
-        return result
+        keys = _STAT_KEYS if include_snapshot_id is False else _SNAPSHOT_KEYS
+        return tuple(getattr(self, key) for key in keys)
 
     def as_dict(self, include_snapshot_id: bool=True) -> dict:
-        result = self.__dict__
+        keys = _STAT_KEYS if include_snapshot_id is False else _SNAPSHOT_KEYS
+        return {key: getattr(self, key) for key in keys}
 
-        if include_snapshot_id is False:
-            result.pop("snapshot_id")
-        return result
+    def pack(self) -> bytes:
+        """Pack the stats using the current field layout."""
+        return pack_snapshot_values(self.as_tuple(include_snapshot_id=False))
+
+    @staticmethod
+    def unpack(
+        snapshot_id: str,
+        data: bytes,
+        layout_version: int=None
+    ) -> 'BedwarsStatsSnapshot':
+        """
+        Unpack packed stats into a snapshot.
+        :param snapshot_id: The ID of the snapshot.
+        :param data: The packed stats.
+        :param layout_version: The field layout the stats were packed with,\
+            defaults to the current layout.
+        """
+        layout = SNAPSHOT_LAYOUTS[layout_version or SNAPSHOT_LAYOUT_VERSION]
+        values = dict(zip(layout, unpack_snapshot_values(data)))
+
+        # Fields added after the stats were packed default to 0
+        return BedwarsStatsSnapshot(
+            snapshot_id, *(values.get(key, 0) for key in _STAT_KEYS))
 
     @staticmethod
     def keys(include_snapshot_id: bool=True) -> list[str]:
@@ -100,14 +136,212 @@ def get_snapshot_data(
     column_names = [col[0] for col in cursor.description]
     snapshot_info_dict = dict(zip(column_names, snapshot_info))
 
-    snapshot_id = snapshot_info_dict["snapshot_id"]
-    cursor.execute(
-        "SELECT * FROM bedwars_stats_snapshots WHERE snapshot_id = ?", (snapshot_id,))
-    rotation_data: tuple | None = cursor.fetchone()
+    snapshot_data = load_snapshot(cursor, snapshot_info_dict["snapshot_id"])
 
-    if rotation_data is None:
+    if snapshot_data is None:
         # Raise snapshot data missing error instead
         raise NotImplementedError("Data missing")
 
-    snapshot_data = BedwarsStatsSnapshot(*rotation_data)
     return snapshot_info_dict, snapshot_data
+
+
+_SNAPSHOT_KEYS = tuple(BedwarsStatsSnapshot.keys())
+_STAT_KEYS = _SNAPSHOT_KEYS[1:]
+
+# Field layouts of packed snapshots, by version. Layouts must never be
+# changed once used, add a new version instead.
+SNAPSHOT_LAYOUTS: dict[int, tuple[str, ...]] = {
+    1: _STAT_KEYS,
+}
+SNAPSHOT_LAYOUT_VERSION = 1
+
+
+def pack_snapshot_values(values: Iterable[int]) -> bytes:
+    """
+    Pack integers into zigzag encoded varints, using one byte for values
+    from -64 to 63 and one more for every 7 bits after that.
+    :param values: The integers to pack.
+    :raises ValueError: If a value isn't an integer.
+    """
+    buffer = bytearray()
+
+    for value in values:
+        if not isinstance(value, int):
+            if not (isinstance(value, float) and value.is_integer()):
+                raise ValueError(f'Snapshot values must be integers, got {value!r}')
+            value = int(value)
+
+        value = value * 2 if value >= 0 else -value * 2 - 1
+
+        while value > 0x7f:
+            buffer.append((value & 0x7f) | 0x80)
+            value >>= 7
+        buffer.append(value)
+
+    return bytes(buffer)
+
+
+def unpack_snapshot_values(data: bytes) -> list[int]:
+    """
+    Unpack integers packed with ~pack_snapshot_values().
+    :param data: The packed integers.
+    """
+    values = []
+    value = shift = 0
+
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+
+        values.append(-(value >> 1) - 1 if value & 1 else value >> 1)
+        value = shift = 0
+
+    return values
+
+
+def snapshot_content_id(data: bytes, layout_version: int=SNAPSHOT_LAYOUT_VERSION) -> str:
+    """
+    Returns the ID packed stats are stored under, a hash of their content.
+    :param data: The packed stats.
+    :param layout_version: The field layout the stats were packed with.
+    """
+    return hashlib.blake2b(
+        layout_version.to_bytes(2, 'big') + data, digest_size=16).hexdigest()
+
+
+def store_snapshot(cursor: sqlite3.Cursor, values: Iterable) -> str:
+    """
+    Store a snapshot and return its ID. Snapshots with the same stats are
+    stored once, storing them again adds a reference to the stored row.
+    Every stored snapshot must be released with ~release_snapshot().
+    :param cursor: `sqlite3.Cursor` object to execute queries with.
+    :param values: The stats, in the order of `BedwarsStatsSnapshot.keys()`.
+    """
+    values = tuple(values)
+
+    try:
+        data = pack_snapshot_values(values)
+    except ValueError:
+        snapshot_id = uuid4().hex
+
+        column_names = ", ".join(_STAT_KEYS)
+        question_marks = ", ".join("?"*len(_STAT_KEYS))
+        cursor.execute(
+            f"INSERT INTO bedwars_stats_snapshots (snapshot_id, {column_names}) "
+            f"VALUES (?, {question_marks})", (snapshot_id, *values))
+        return snapshot_id
+
+    snapshot_id = snapshot_content_id(data)
+    cursor.execute(
+        "INSERT INTO bedwars_stats_snapshots_packed "
+        "(snapshot_id, layout_version, data, refcount) VALUES (?, ?, ?, 1) "
+        "ON CONFLICT (snapshot_id) DO UPDATE SET refcount = refcount + 1",
+        (snapshot_id, SNAPSHOT_LAYOUT_VERSION, data))
+    return snapshot_id
+
+
+def release_snapshot(cursor: sqlite3.Cursor, snapshot_id: str) -> None:
+    """
+    Remove a reference to a stored snapshot, deleting the snapshot once
+    nothing references it anymore.
+    :param cursor: `sqlite3.Cursor` object to execute queries with.
+    :param snapshot_id: The ID of the snapshot.
+    """
+    cursor.execute(
+        "UPDATE bedwars_stats_snapshots_packed SET refcount = refcount - 1 "
+        "WHERE snapshot_id = ?", (snapshot_id,))
+
+    if cursor.rowcount:
+        cursor.execute(
+            "DELETE FROM bedwars_stats_snapshots_packed "
+            "WHERE snapshot_id = ? AND refcount <= 0", (snapshot_id,))
+    else:
+        # Snapshots stored with columns are never shared
+        cursor.execute(
+            "DELETE FROM bedwars_stats_snapshots WHERE snapshot_id = ?", (snapshot_id,))
+
+
+def replace_snapshot(cursor: sqlite3.Cursor, snapshot_id: str, values: Iterable) -> str:
+    """
+    Store new stats in place of a snapshot and return the ID of the new
+    snapshot, which whatever referenced the old snapshot must now use.
+    :param cursor: `sqlite3.Cursor` object to execute queries with.
+    :param snapshot_id: The ID of the snapshot to replace.
+    :param values: The stats, in the order of `BedwarsStatsSnapshot.keys()`.
+    """
+    # Stored first, so unchanged stats keep their row
+    new_snapshot_id = store_snapshot(cursor, values)
+    release_snapshot(cursor, snapshot_id)
+
+    return new_snapshot_id
+
+
+def load_snapshot(cursor: sqlite3.Cursor, snapshot_id: str) -> BedwarsStatsSnapshot | None:
+    """
+    Load a stored snapshot, returns `None` if it doesn't exist.
+    :param cursor: `sqlite3.Cursor` object to execute queries with.
+    :param snapshot_id: The ID of the snapshot.
+    """
+    cursor.execute(
+        "SELECT layout_version, data FROM bedwars_stats_snapshots_packed "
+        "WHERE snapshot_id = ?", (snapshot_id,))
+    packed = cursor.fetchone()
+
+    if packed is not None:
+        return BedwarsStatsSnapshot.unpack(snapshot_id, packed[1], packed[0])
+
+    cursor.execute(
+        "SELECT * FROM bedwars_stats_snapshots WHERE snapshot_id = ?", (snapshot_id,))
+    row = cursor.fetchone()
+
+    return BedwarsStatsSnapshot(*row) if row else None
+
+
+def load_joined_snapshot(
+    cursor: sqlite3.Cursor,
+    snapshot_id: str,
+    layout_version: int | None,
+    data: bytes | None
+) -> BedwarsStatsSnapshot | None:
+    """
+    Load a snapshot whose packed stats were selected along with what
+    references it, with a `LEFT JOIN` on `bedwars_stats_snapshots_packed`.
+    Snapshots stored with columns, which the join doesn't find, are
+    loaded with a query of their own.
+    :param cursor: `sqlite3.Cursor` object to execute queries with.
+    :param snapshot_id: The ID of the snapshot.
+    :param layout_version: The joined `layout_version` column.
+    :param data: The joined `data` column.
+    """
+    if data is not None:
+        return BedwarsStatsSnapshot.unpack(snapshot_id, data, layout_version)
+    return load_snapshot(cursor, snapshot_id)
+
+
+@dataclass
+class SnapshotDedupStats:
+    """How many snapshot references the stored packed snapshots serve."""
+    references: int = 0
+    stored: int = 0
+    referenced_bytes: int = 0
+    stored_bytes: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """The average amount of references to each stored snapshot."""
+        return self.references / self.stored if self.stored else 1.0
+
+
+def get_snapshot_dedup_stats(cursor: sqlite3.Cursor) -> SnapshotDedupStats:
+    """
+    Count the stored packed snapshots and the references to them.
+    :param cursor: `sqlite3.Cursor` object to execute queries with.
+    """
+    cursor.execute(
+        "SELECT IFNULL(SUM(refcount), 0), COUNT(*), "
+        "IFNULL(SUM(LENGTH(data) * refcount), 0), IFNULL(SUM(LENGTH(data)), 0) "
+        "FROM bedwars_stats_snapshots_packed")
+
+    return SnapshotDedupStats(*cursor.fetchone())
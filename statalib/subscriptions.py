@@ -1,11 +1,12 @@
-import json
-import socket
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, UTC
 from typing import Any
 
 from .cfg import config
+from .entitlements import entitlements_cache
+from .functions import db_connect
+from .role_updates import role_update_dispatcher
 
 
 class UnregisteredPackageError(Exception):
@@ -128,22 +129,7 @@ class SubscriptionManager:
         if not config.SHOULD_UPDATE_SUBSCRIPTION_ROLES:  # Overrules everything
             return
 
-        json_data = json.dumps({
-            "action": "dispatch_event",
-            "event_name": "subscription_update",
-            "args": [
-                self._discord_id,
-                subscription.package,
-                subscription.expiry_timestamp
-            ]
-        })
-
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as client:
-                client.connect(('utils', config("apps.utils.socket_server_port")))
-                client.send(json_data.encode())
-        except (ConnectionRefusedError, socket.gaierror):
-            return  # Utils bot is probably offline
+        role_update_dispatcher.dispatch(self._discord_id, subscription)
 
 
     def __set_active_subscription(
@@ -219,9 +205,38 @@ class SubscriptionManager:
             (self._discord_id, highest_tier_package[2])
         )
 
+        entitlements_cache.invalidate(self._discord_id)
         return subscription
 
 
+    def __select_active_subscription(
+        self,
+        cursor: sqlite3.Cursor
+    ) -> Subscription | None:
+        """
+        Select the active subscription without updating it.
+        :return: The active subscription or `None` if it has expired.
+        """
+        cursor.execute(
+            "SELECT package, expires FROM subscriptions_active WHERE discord_id = ?",
+            (self._discord_id,))
+
+        active_subscription = cursor.fetchone()
+
+        if active_subscription is None:
+            return Subscription(config("global.subscriptions.default_package"), None)
+
+        # Check if subscription has expired (and isn't lifetime)
+        if active_subscription[1] and \
+            active_subscription[1] < datetime.now(UTC).timestamp():
+            return None
+
+        return Subscription(
+            package=active_subscription[0],
+            expiry_timestamp=active_subscription[1]
+        )
+
+
     def get_subscription(
         self,
         update_roles: bool=True,
@@ -233,32 +248,17 @@ class SubscriptionManager:
             discord roles if their subscription state is updated.
         """
         def __get_subscription(cursor: sqlite3.Cursor) -> Subscription:
-            cursor.execute(
-                "SELECT package, expires FROM subscriptions_active WHERE discord_id = ?",
-                (self._discord_id,))
-
-            active_subscription = cursor.fetchone()
-
-            if active_subscription is None:
-                return Subscription(config("global.subscriptions.default_package"), None)
+            subscription = self.__select_active_subscription(cursor)
 
-            # Check if subscription has expired (and isn't lifetime)
-            if active_subscription[1] and \
-                active_subscription[1] < datetime.now(UTC).timestamp():
+            if subscription is None:
                 # Update subscription data
                 subscription = self.__update_active_subscription(cursor)
-            else:
-                subscription = Subscription(
-                    package=active_subscription[0],
-                    expiry_timestamp=active_subscription[1]
-                )
-
             return subscription
 
         if cursor is not None:
             subscription = __get_subscription(cursor)
         else:
-            with sqlite3.connect(config.DB_FILE_PATH) as conn:
+            with db_connect() as conn:
                 cursor = conn.cursor()
                 subscription = __get_subscription(cursor)
 
@@ -268,6 +268,29 @@ class SubscriptionManager:
         return subscription
 
 
+    def read_subscription(
+        self,
+        update_roles: bool=True,
+        cursor: sqlite3.Cursor=None
+    ) -> Subscription | None:
+        """
+        Get the user's current subscription without writing to the database.
+        :param update_roles: Whether or not to update the user's subscription \
+            discord roles.
+        :return: The subscription, or `None` if it has expired and has to be \
+            updated by `get_subscription()`.
+        """
+        if cursor is not None:
+            subscription = self.__select_active_subscription(cursor)
+        else:
+            with db_connect() as conn:
+                subscription = self.__select_active_subscription(conn.cursor())
+
+        if update_roles and subscription is not None:
+            self.__update_user_roles(subscription)
+        return subscription
+
+
     def _get_paused_subscriptions(
         self,
         package: str | None = None,
@@ -288,7 +311,7 @@ class SubscriptionManager:
         if cursor is not None:
             return __get_paused_subscriptions(cursor)
 
-        with sqlite3.connect(config.DB_FILE_PATH) as conn:
+        with db_connect() as conn:
             cursor = conn.cursor()
             return __get_paused_subscriptions(cursor)
 
@@ -310,7 +333,7 @@ class SubscriptionManager:
         if cursor is not None:
             return __add_paused_subscription(cursor)
 
-        with sqlite3.connect(config.DB_FILE_PATH) as conn:
+        with db_connect() as conn:
             cursor = conn.cursor()
             return __add_paused_subscription(cursor)
 
@@ -407,7 +430,7 @@ class SubscriptionManager:
         :param duration: The duration (in seconds) of the subscription. Can be \
             left as `None` for an infinite duration.
         """
-        with sqlite3.connect(config.DB_FILE_PATH) as conn:
+        with db_connect() as conn:
             cursor = conn.cursor()
 
             # Ensure active subscription is accurate
@@ -447,4 +470,7 @@ class SubscriptionManager:
                 new_subscription = self.get_subscription(
                     update_roles=False, cursor=cursor)
 
-                self.__update_user_roles(new_subscription)
+        entitlements_cache.invalidate(self._discord_id)
+
+        if update_roles:
+            self.__update_user_roles(new_subscription)
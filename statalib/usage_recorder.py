@@ -0,0 +1,226 @@
+"""
+Write-behind buffer for command usage and growth data.
+
+Instead of writing every command run to the database, the usage recorder
+counts them in memory and writes the totals every `flush_interval` seconds
+in a single transaction, along with the buffered growth events.
+
+Loss semantics: events are buffered for at most `flush_interval` seconds,
+or until `max_pending` events are buffered, whichever happens first. They
+are flushed when the bot shuts down cleanly, so only a crash or a killed
+process loses data, and at most the last `flush_interval` seconds of it.
+A flush that fails keeps its events for the next flush. Usage stats read
+from the database may lag behind by up to `flush_interval` seconds.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Literal
+
+from .cfg import config
+from .database import db_executor
+from .functions import db_connect, increment_command_usage, insert_growth_data
+
+
+logger = logging.getLogger('statalytics')
+
+
+@dataclass
+class UsageRecorderConfig:
+    """Flushing settings of the usage recorder."""
+    flush_interval: float = 5.0
+    max_pending: int = 1000
+
+    @staticmethod
+    def from_config() -> 'UsageRecorderConfig':
+        """
+        Load the settings from the `global.usage_recorder` section of the
+        config file. Missing values use the dataclass defaults.
+        """
+        try:
+            usage_recorder_config: dict = config('global.usage_recorder')
+        except KeyError:
+            usage_recorder_config = {}
+
+        return UsageRecorderConfig(**usage_recorder_config)
+
+
+@dataclass
+class UsageRecorderStats:
+    """Counters for the usage recorder."""
+    recorded: int = 0
+    flushes: int = 0
+    flushed: int = 0
+    failed_flushes: int = 0
+
+
+class UsageRecorder:
+    """
+    Buffers command usage increments and growth events in memory and
+    writes them to the database in batches. See the module docstring
+    for the loss semantics.
+    """
+    def __init__(self, usage_recorder_config: UsageRecorderConfig | None=None) -> None:
+        """
+        :param usage_recorder_config: Override the configured flushing settings.
+        """
+        self.config = usage_recorder_config or UsageRecorderConfig.from_config()
+        self.stats = UsageRecorderStats()
+
+        self._usage: Counter[tuple[int, str]] = Counter()
+        self._growth: list[tuple] = []
+        self._pending = 0
+
+        self._task: asyncio.Task | None = None
+        self._early_flush: asyncio.Task | None = None
+
+
+    @property
+    def pending(self) -> int:
+        """The amount of recorded events that haven't been written yet."""
+        return self._pending
+
+
+    def _recorded(self) -> None:
+        self._pending += 1
+        self.stats.recorded += 1
+
+        if self._pending < self.config.max_pending:
+            return
+
+        if self._early_flush is None or self._early_flush.done():
+            try:
+                self._early_flush = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                self.flush_sync()  # Not running in an event loop
+
+
+    def record_command(self, discord_id: int, command: str) -> None:
+        """
+        Buffer a command run, counted for both the user and the global usage.
+        :param discord_id: the user that ran the command
+        :param command: the command run by the user to increment
+        """
+        self._usage[(discord_id, command)] += 1
+        self._usage[(0, command)] += 1  # Global commands
+        self._recorded()
+
+
+    def record_growth(
+        self,
+        discord_id: int,
+        action: Literal['add', 'remove'],
+        growth: Literal['guild', 'user', 'linked'],
+        timestamp: float=None
+    ) -> None:
+        """
+        Buffer a growth event.
+        :param discord_id: the respective discord id of the event (guild, user, etc)
+        :param action: the action that caused growth (add, remove, etc)
+        :param growth: what impacted the growth (guild, user, etc)
+        :param timestamp: the timestamp of the action (defaults to now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        self._growth.append((timestamp, discord_id, action, growth))
+        self._recorded()
+
+
+    def _take(self) -> tuple[Counter, list[tuple], int]:
+        batch = self._usage, self._growth, self._pending
+        self._usage, self._growth, self._pending = Counter(), [], 0
+        return batch
+
+
+    def _restore(self, usage: Counter, growth: list[tuple], pending: int) -> None:
+        self._usage.update(usage)
+        self._growth[:0] = growth
+        self._pending += pending
+
+
+    @staticmethod
+    def _write(usage: Counter, growth: list[tuple]) -> None:
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            if usage:
+                increment_command_usage(cursor, usage)
+            for timestamp, discord_id, action, growth_type in growth:
+                insert_growth_data(discord_id, action, growth_type, timestamp, cursor)
+
+
+    def _flushed(self, pending: int) -> None:
+        self.stats.flushes += 1
+        self.stats.flushed += pending
+
+
+    def _failed(self, batch: tuple[Counter, list[tuple], int]) -> None:
+        self.stats.failed_flushes += 1
+        self._restore(*batch)
+        logger.exception(f'Failed to flush {batch[2]} usage events, keeping them')
+
+
+    async def flush(self) -> None:
+        """Write the buffered events on the database writer thread."""
+        # Taken synchronously, so concurrent flushes write separate batches
+        batch = self._take()
+        if not batch[2]:
+            return
+
+        try:
+            await db_executor.write(self._write, batch[0], batch[1])
+        except Exception:
+            self._failed(batch)
+        else:
+            self._flushed(batch[2])
+
+
+    def flush_sync(self) -> None:
+        """Write the buffered events from the calling thread."""
+        batch = self._take()
+        if not batch[2]:
+            return
+
+        try:
+            self._write(batch[0], batch[1])
+        except Exception:
+            self._failed(batch)
+        else:
+            self._flushed(batch[2])
+
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.flush_interval)
+            await self.flush()
+
+
+    @property
+    def running(self) -> bool:
+        """Whether the recorder is flushing periodically."""
+        return self._task is not None and not self._task.done()
+
+
+    def start(self) -> None:
+        """Start flushing the buffered events periodically."""
+        if not self.running:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+
+    async def stop(self) -> None:
+        """Stop flushing periodically and write the remaining events."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+
+usage_recorder = UsageRecorder()  # Globally used instance
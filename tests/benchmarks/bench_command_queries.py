@@ -0,0 +1,81 @@
+"""
+Counts the database queries made by the permission checks of a command,
+with and without the entitlements cache.
+
+Run from the repository root:
+`python tests/benchmarks/bench_command_queries.py --modes 6 --commands 100`
+
+Every simulated command does the checks of a rendered stats command: the
+interaction checks, the cooldown, the tip message and, for each rendered
+mode, the background lookup of the linked player.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('ENVIRONMENT', 'development')
+
+import statalib
+from statalib import config
+from statalib.discord_utils.cooldowns import _generic_command_cooldown
+from statalib.entitlements import EntitlementsCacheConfig
+
+
+def run_command(discord_id: int, modes: int) -> None:
+    statalib.get_entitlements(discord_id)  # The interaction checks
+    _generic_command_cooldown(discord_id)
+    statalib.random_tip_message(discord_id)
+
+    # The permission checks of `get_background`
+    for _ in range(modes):
+        statalib.has_access(discord_id, 'custom_backgrounds')
+        statalib.has_access(discord_id, 'voter_themes')
+
+
+def run(cache_config: EntitlementsCacheConfig, args: argparse.Namespace):
+    # Reconfigure the globally used instance, which every module references
+    statalib.entitlements_cache.__init__(cache_config)
+
+    with statalib.count_queries() as counter:
+        start = time.perf_counter()
+        for discord_id in range(args.commands):
+            run_command(discord_id % args.users, args.modes)
+        duration = time.perf_counter() - start
+
+    return counter.queries / args.commands, duration / args.commands
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--modes', type=int, default=6,
+                        help='modes rendered per command')
+    parser.add_argument('--commands', type=int, default=100,
+                        help='commands to simulate per run')
+    parser.add_argument('--users', type=int, default=10,
+                        help='distinct users running the commands')
+    args = parser.parse_args()
+
+    config.SHOULD_UPDATE_SUBSCRIPTION_ROLES = False
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        config.DB_FILE_PATH = f'{tempdir}/core.db'
+        statalib.setup_database_schema(db_fp=config.DB_FILE_PATH)
+
+        runs = {
+            'uncached': EntitlementsCacheConfig(ttl=0),
+            'cached': EntitlementsCacheConfig(),
+        }
+        results = {name: run(cache_config, args) for name, cache_config in runs.items()}
+        statalib.connection_manager.close()
+
+    print(f'\n{args.commands} commands by {args.users} users, {args.modes} modes each')
+    for name, (queries, duration) in results.items():
+        print(f'{name}: {queries:.1f} queries per command, {duration * 1000:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+Counts the database connections opened by bot commands, by running the
+real command callbacks of a few cogs against the local stand-in server.
+
+Run from the repository root:
+`python tests/benchmarks/bench_db_connections.py --runs 20`
+
+Every command is run once before it is measured, so that one time setup,
+like the creation of sessions and rotational trackers, isn't counted.
+Only connections to the core database are counted.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import signal
+import sqlite3
+import sys
+import time
+from statistics import median
+from types import SimpleNamespace
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REL_PATH = os.path.abspath(os.path.join(BENCHMARKS_DIR, '..', '..'))
+
+sys.path.append(REL_PATH)
+sys.path.append(os.path.join(REL_PATH, 'apps', 'bot'))
+os.environ.setdefault('ENVIRONMENT', 'development')
+os.environ.setdefault('API_KEY_HYPIXEL', 'stand-in')
+
+import statalib
+from statalib import config
+from cogs.commands.bedwars.rotational.daily import Daily
+from cogs.commands.bedwars.sessions import Sessions
+from cogs.commands.bedwars.total import Total
+from cogs.commands.bedwars.winstreaks import Winstreaks
+
+from bench_load import wait_for_standin
+from standin_server import (
+    add_standin_args,
+    run_standin_server,
+    standin_config_from_args,
+    uuid_from_name
+)
+
+
+DISCORD_ID = 10 ** 17
+PLAYER_NAME = 'Player1'
+
+
+class ConnectionCounter:
+    """Counts the `sqlite3.connect` calls made to the core database"""
+    def __init__(self) -> None:
+        self.count = 0
+        self._connect = sqlite3.connect
+
+    def __call__(self, database, *args, **kwargs) -> sqlite3.Connection:
+        if os.path.abspath(database) == os.path.abspath(config.DB_FILE_PATH):
+            self.count += 1
+        return self._connect(database, *args, **kwargs)
+
+
+class FakeInteraction:
+    """Stands in for the parts of an interaction that commands use"""
+    def __init__(self, interaction_id: int) -> None:
+        self.id = interaction_id
+        self.user = SimpleNamespace(id=DISCORD_ID)
+        self._done = False
+
+        self.response = SimpleNamespace(
+            defer=self._respond, send_message=self._respond, is_done=lambda: self._done)
+        self.followup = SimpleNamespace(send=self._respond)
+
+    async def _respond(self, *args, **kwargs) -> None:
+        self._done = True
+
+    async def edit_original_response(self, **kwargs) -> None:
+        pass
+
+
+def commands() -> dict[str, callable]:
+    daily, sessions = Daily(None), Sessions(None)
+    total, winstreaks = Total(None), Winstreaks(None)
+
+    return {
+        'daily': lambda i: daily.daily.callback(daily, i, None),
+        'session': lambda i: sessions.session.callback(sessions, i, None, None),
+        'bedwars': lambda i: total.total.callback(total, i, None),
+        'winstreaks': lambda i: winstreaks.winstreaks.callback(winstreaks, i, None),
+    }
+
+
+async def run_command(command, interaction_id: int) -> None:
+    try:
+        await command(FakeInteraction(interaction_id))
+    except statalib.SessionNotFoundError:
+        pass
+    finally:
+        shutil.rmtree(
+            f'{REL_PATH}/database/rendered/{interaction_id}', ignore_errors=True)
+
+
+async def bench_commands(runs: int) -> dict[str, tuple[float, float]]:
+    """Returns the connections per run and median duration of each command"""
+    counter = ConnectionCounter()
+    sqlite3.connect = counter
+
+    results = {}
+    interaction_id = 1
+
+    for name, command in commands().items():
+        await run_command(command, interaction_id)
+        interaction_id += 1
+
+        counter.count = 0
+        durations = []
+
+        for _ in range(runs):
+            start = time.perf_counter()
+            await run_command(command, interaction_id)
+            durations.append(time.perf_counter() - start)
+            interaction_id += 1
+
+        results[name] = (counter.count / runs, median(durations))
+
+    await statalib.http_client.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20,
+                        help='measured runs of each command')
+    add_standin_args(parser)
+    args = parser.parse_args()
+
+    standin_config = standin_config_from_args(args)
+    standin_process = multiprocessing.Process(
+        target=run_standin_server, args=(standin_config,), daemon=True)
+    standin_process.start()
+
+    def terminate(*_):
+        standin_process.terminate()
+        os._exit(1)
+
+    signal.signal(signal.SIGTERM, terminate)
+
+    standin_url = f'http://{standin_config.host}:{standin_config.port}'
+    wait_for_standin(standin_config.host, standin_config.port)
+
+    upstream_urls: dict = config('global.network.upstream_urls')
+    for upstream in upstream_urls:
+        upstream_urls[upstream] = standin_url
+
+    os.makedirs(f'{REL_PATH}/database', exist_ok=True)
+    statalib.setup_database_schema()
+    statalib.set_linked_data(DISCORD_ID, uuid_from_name(PLAYER_NAME))
+
+    try:
+        results = asyncio.run(bench_commands(args.runs))
+    finally:
+        standin_process.terminate()
+
+    print(f'\n{args.runs} runs per command')
+    for name, (connections, duration) in results.items():
+        print(f'/{name}: {connections:.1f} connections, {duration * 1000:.0f} ms median')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark of the available JSON codecs on Hypixel player responses.
+Run from the repository root: `python tests/benchmarks/bench_json_codec.py`
+"""
+
+import asyncio
+import os
+import sys
+import time
+from statistics import median
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('ENVIRONMENT', 'development')
+
+from statalib.json_codec import (
+    JSONCodec,
+    ORJSON_CODEC,
+    STDLIB_JSON_CODEC,
+    set_json_codec,
+    async_json_loads
+)
+from statalib.player_projection import project_hypixel_data
+from fixtures import load_player_fixtures
+
+
+ROUNDS = 5
+
+
+def bench_decode(codec: JSONCodec, bodies: list[bytes]) -> float:
+    """Returns the median time in milliseconds to decode a body"""
+    timings = []
+    for _ in range(ROUNDS):
+        for body in bodies:
+            start = time.perf_counter()
+            codec.loads(body)
+            timings.append(time.perf_counter() - start)
+    return median(timings) * 1000
+
+
+async def bench_loop_stall(bodies: list[bytes]) -> float:
+    """
+    Decode every body while a ticker task runs on the event loop.
+    Returns the longest time in milliseconds that the ticker was stalled for.
+    """
+    stalls = []
+    running = True
+
+    async def ticker():
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            stalls.append(time.perf_counter() - start)
+
+    ticker_task = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+
+    for body in bodies:
+        await async_json_loads(body)
+        await asyncio.sleep(0)
+
+    running = False
+    await ticker_task
+    return max(stalls) * 1000
+
+
+def main():
+    bodies = load_player_fixtures()
+    projected = [
+        STDLIB_JSON_CODEC.dumps(project_hypixel_data(STDLIB_JSON_CODEC.loads(body)))
+        for body in bodies
+    ]
+
+    average_size = sum(map(len, bodies)) / len(bodies) / 1024
+    average_projected_size = sum(map(len, projected)) / len(projected) / 1024
+    print(f'{len(bodies)} responses, average {average_size:.1f} KiB '
+          f'({average_projected_size:.1f} KiB projected)\n')
+
+    codecs = [codec for codec in (STDLIB_JSON_CODEC, ORJSON_CODEC) if codec]
+
+    print(f'{"codec":<8} {"full (ms)":>10} {"projected (ms)":>15} {"max stall (ms)":>15}')
+    for codec in codecs:
+        set_json_codec(codec)
+        stall = asyncio.run(bench_loop_stall(bodies))
+
+        print(f'{codec.name:<8} {bench_decode(codec, bodies):>10.2f} '
+              f'{bench_decode(codec, projected):>15.2f} {stall:>15.2f}')
+
+
+if __name__ == '__main__':
+    main()
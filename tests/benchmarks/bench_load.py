@@ -0,0 +1,181 @@
+"""
+End-to-end load benchmark of the interaction pipeline against the local
+stand-in server: `fetch_player_info` -> hypixel & skin fetch -> calc -> render.
+
+Run from the repository root:
+`python tests/benchmarks/bench_load.py --interactions 500 --concurrency 50`
+
+The stand-in server is started in a separate process so that it doesn't
+compete with the benchmarked event loop. Cached responses are written to the
+regular `.cache` directory, and the database schema is created if missing.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from statistics import quantiles
+from types import SimpleNamespace
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REL_PATH = os.path.abspath(os.path.join(BENCHMARKS_DIR, '..', '..'))
+
+sys.path.append(REL_PATH)
+sys.path.append(os.path.join(REL_PATH, 'apps', 'bot'))
+os.environ.setdefault('ENVIRONMENT', 'development')
+os.environ.setdefault('API_KEY_HYPIXEL', 'stand-in')
+
+import statalib
+from statalib import config
+from calc.winstreaks import WinstreakStats
+from render.winstreaks import render_winstreaks
+
+from standin_server import (
+    add_standin_args,
+    run_standin_server,
+    standin_config_from_args
+)
+
+
+def wait_for_standin(host: str, port: int, timeout: float=60) -> None:
+    """Wait until the stand-in server accepts connections"""
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def fake_interaction(interaction_id: int) -> SimpleNamespace:
+    """An object standing in for the parts of an interaction that are used"""
+    return SimpleNamespace(id=interaction_id, user=SimpleNamespace(id=interaction_id))
+
+
+async def run_interaction(interaction_id: int, player: str, render: bool) -> None:
+    interaction = fake_interaction(interaction_id)
+
+    name, uuid = await statalib.fetch_player_info(player, interaction)
+
+    skin_model, hypixel_data = await asyncio.gather(
+        statalib.fetch_skin_model(uuid, 144),
+        statalib.fetch_hypixel_data(uuid)
+    )
+
+    if render:
+        await render_winstreaks(name, uuid, hypixel_data, skin_model)
+    else:
+        WinstreakStats(hypixel_data)
+
+
+async def run_load(
+    interactions: int,
+    concurrency: int,
+    players: int,
+    render: bool
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def run(interaction_id: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await run_interaction(
+                    interaction_id, f'Player{interaction_id % players}', render)
+            except Exception as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[run(i) for i in range(interactions)])
+    duration = time.perf_counter() - start
+
+    await statalib.http_client.close()
+
+    return {'duration': duration, 'latencies': latencies, 'errors': errors}
+
+
+def print_report(results: dict, interactions: int, concurrency: int) -> None:
+    latencies = sorted(results['latencies'])
+    duration = results['duration']
+
+    print(f'\n{interactions} interactions, concurrency {concurrency}, '
+          f'{duration:.2f} s')
+    print(f'throughput: {len(latencies) / duration:.1f} interactions/s')
+
+    if len(latencies) >= 2:
+        percentiles = quantiles(latencies, n=100, method='inclusive')
+        print('latency (ms): ' + ', '.join(
+            f'p{p} {percentiles[p - 1] * 1000:.0f}' for p in (50, 90, 99)
+        ) + f', max {latencies[-1] * 1000:.0f}')
+
+    if results['errors']:
+        print(f'errors: {results["errors"]}')
+
+    for group, metrics in statalib.get_network_metrics().items():
+        print(f'{group}: {metrics}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--interactions', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--players', type=int, default=100,
+                        help='amount of distinct players to look up')
+    parser.add_argument('--skip-render', action='store_true',
+                        help='only calculate the stats instead of rendering them')
+    parser.add_argument('--standin-url', default=None,
+                        help='use an already running stand-in server')
+    add_standin_args(parser)
+    args = parser.parse_args()
+
+    standin_url = args.standin_url
+    standin_process = None
+
+    if standin_url is None:
+        standin_config = standin_config_from_args(args)
+        standin_process = multiprocessing.Process(
+            target=run_standin_server, args=(standin_config,), daemon=True)
+        standin_process.start()
+
+        # Worker threads of the database and cache backends keep the process
+        # alive after a `SystemExit`, so stop the stand-in and exit directly
+        def terminate(*_):
+            standin_process.terminate()
+            os._exit(1)
+
+        signal.signal(signal.SIGTERM, terminate)
+
+        standin_url = f'http://{standin_config.host}:{standin_config.port}'
+        wait_for_standin(standin_config.host, standin_config.port)
+
+    upstream_urls: dict = config('global.network.upstream_urls')
+    for upstream in upstream_urls:
+        upstream_urls[upstream] = standin_url
+
+    os.makedirs(f'{REL_PATH}/database', exist_ok=True)
+    statalib.setup_database_schema()
+
+    try:
+        results = asyncio.run(
+            run_load(args.interactions, args.concurrency, args.players,
+                     render=not args.skip_render))
+        print_report(results, args.interactions, args.concurrency)
+    finally:
+        if standin_process is not None:
+            standin_process.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Measures how long the event loop is blocked while interactions query the
+database, comparing the synchronous helpers to their async versions.
+
+Run from the repository root:
+`python tests/benchmarks/bench_loop_lag.py --interactions 500 --concurrency 50`
+
+Every simulated interaction does the database work of a rotational stats
+command: creating the account, getting the linked player, reading the reset
+time and rotational data, and updating the command usage. A background
+thread holds the database write lock in short bursts, the way trackers and
+other processes do, so that queries have to wait on it.
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('ENVIRONMENT', 'development')
+
+import statalib
+from statalib import config
+from statalib.loop_lag import LoopLagConfig, LoopLagMonitor
+from statalib.rotational_stats import (
+    RotationalStatsManager,
+    RotationType,
+    get_dynamic_reset_time
+)
+
+
+PLAYERS = 50
+DISCORD_ID_OFFSET = 10 ** 17
+
+hypixel_data = {
+    "player": {"stats": {"Bedwars": {"final_kills_bedwars": 1}}}
+}
+
+
+def hold_write_lock(stop: threading.Event, hold: float, pause: float) -> None:
+    """Repeatedly holds the write lock of the database like a busy writer"""
+    conn = sqlite3.connect(config.DB_FILE_PATH, timeout=30)
+
+    while not stop.is_set():
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute(
+            'UPDATE command_usage SET count = count WHERE discord_id = ?',
+            (DISCORD_ID_OFFSET,))
+        time.sleep(hold)
+        conn.commit()
+        time.sleep(pause)
+
+    conn.close()
+
+
+def sync_interaction(discord_id: int) -> None:
+    statalib.create_account(discord_id)
+    uuid = statalib.get_linked_player(discord_id)
+
+    get_dynamic_reset_time(uuid)
+    RotationalStatsManager(uuid).get_rotational_data(RotationType.DAILY)
+
+    statalib.update_command_stats(discord_id, 'daily')
+
+
+async def async_interaction(discord_id: int) -> None:
+    await statalib.async_create_account(discord_id)
+    uuid = await statalib.async_get_linked_player(discord_id)
+
+    await statalib.async_get_dynamic_reset_time(uuid)
+    await statalib.AsyncRotationalStatsManager(uuid)\
+        .get_rotational_data(RotationType.DAILY)
+
+    await statalib.async_update_command_stats(discord_id, 'daily')
+
+
+async def run_interactions(
+    use_async: bool,
+    interactions: int,
+    concurrency: int
+) -> tuple[dict, float]:
+    """Returns the loop lag snapshot and the interactions per second"""
+    monitor = LoopLagMonitor(
+        LoopLagConfig(interval=0.005, window=100_000, warn_threshold=float('inf')))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def interaction(i: int) -> None:
+        discord_id = DISCORD_ID_OFFSET + i % PLAYERS
+        async with semaphore:
+            if use_async:
+                await async_interaction(discord_id)
+            else:
+                sync_interaction(discord_id)
+            # Stands in for the network requests of the interaction
+            await asyncio.sleep(0.01)
+
+    monitor.start()
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(interaction(i) for i in range(interactions)))
+    duration = time.perf_counter() - start
+
+    await monitor.stop()
+    return monitor.snapshot(), interactions / duration
+
+
+def setup_players() -> None:
+    statalib.setup_database_schema(db_fp=config.DB_FILE_PATH)
+
+    for i in range(PLAYERS):
+        discord_id = DISCORD_ID_OFFSET + i
+        uuid = f'{i:031x}a'
+        statalib.set_linked_data(discord_id, uuid)
+        statalib.update_command_stats(discord_id, 'daily')
+        RotationalStatsManager(uuid).initialize_rotational_tracking(hypixel_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--interactions', type=int, default=500,
+                        help='interactions simulated per variant')
+    parser.add_argument('--concurrency', type=int, default=50,
+                        help='interactions running at the same time')
+    parser.add_argument('--lock-hold', type=float, default=0.02,
+                        help='seconds the background writer holds the lock for')
+    parser.add_argument('--lock-pause', type=float, default=0.02,
+                        help='seconds between the background writer\'s locks')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        config.DB_FILE_PATH = f'{tempdir}/bench.db'
+        setup_players()
+
+        stop = threading.Event()
+        writer = threading.Thread(
+            target=hold_write_lock, args=(stop, args.lock_hold, args.lock_pause))
+        writer.start()
+
+        try:
+            results = {
+                name: asyncio.run(
+                    run_interactions(use_async, args.interactions, args.concurrency))
+                for name, use_async in (('sync', False), ('async', True))
+            }
+        finally:
+            stop.set()
+            writer.join()
+            statalib.db_executor.shutdown()
+            statalib.connection_manager.close()
+
+    print(f'\n{args.interactions} interactions, {args.concurrency} concurrent, '
+          f'write lock held {args.lock_hold * 1000:.0f}ms '
+          f'every {(args.lock_hold + args.lock_pause) * 1000:.0f}ms')
+    for name, (snapshot, throughput) in results.items():
+        print(
+            f"{name}: loop lag p50 {snapshot['p50_ms']}ms, p99 {snapshot['p99_ms']}ms, "
+            f"max {snapshot['max_ms']}ms, {throughput:.0f} interactions/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Reports how many stats snapshot references each stored snapshot serves.
+
+Run from the repository root, either against a simulated history:
+`python tests/benchmarks/bench_snapshot_dedup.py --players 500 --days 60`
+or against a copy of a real database, which is migrated to the current
+schema first:
+`python tests/benchmarks/bench_snapshot_dedup.py --database database/core.db`
+
+The database given is never modified, it is copied and the copy migrated.
+
+The simulation runs the rotational resets of players over a number of
+days. Some players never play, the others play on some of the days, and
+every player has a session started when they were first tracked.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+from datetime import UTC, datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('ENVIRONMENT', 'development')
+
+import statalib
+from statalib import config
+from statalib.rotational_stats import (
+    HistoricalRotationPeriodID,
+    RotationalResetting,
+    RotationalStatsManager,
+    RotationType
+)
+from statalib.sessions import SessionManager
+from statalib.stats_snapshot import BedwarsStatsSnapshot, get_snapshot_dedup_stats
+
+
+STAT_KEYS = BedwarsStatsSnapshot.keys(include_snapshot_id=False)
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def play(rng: random.Random, stats: dict) -> None:
+    """Adds the stats of a day of games"""
+    games = rng.randint(1, 20)
+    for key in rng.sample(STAT_KEYS, 20):
+        stats[key] = stats.get(key, 0) + rng.randint(0, games * 3)
+    stats['Experience'] = stats.get('Experience', 0) + games * 400
+
+
+def reset(uuid: str, rotation_type: RotationType, day: datetime, hypixel_data: dict) -> None:
+    resetting = RotationalResetting(uuid)
+    period_id = HistoricalRotationPeriodID(rotation_type, day)
+
+    resetting.archive_rotational_data(period_id, hypixel_data)
+    resetting.refresh_rotational_data(rotation_type, hypixel_data)
+
+
+def simulate(args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    players = {}
+
+    for i in range(args.players):
+        uuid = f'{i:032x}'
+        stats = {}
+        play(rng, stats)
+
+        hypixel_data = {'player': {'stats': {'Bedwars': stats}}}
+        RotationalStatsManager(uuid).initialize_rotational_tracking(hypixel_data)
+        SessionManager(uuid).create_session(1, hypixel_data)
+
+        players[uuid] = (stats, rng.random() >= args.inactive)
+
+    for day_number in range(1, args.days + 1):
+        day = START + timedelta(days=day_number)
+
+        for uuid, (stats, active) in players.items():
+            if active and rng.random() < args.play_chance:
+                play(rng, stats)
+
+            hypixel_data = {'player': {'stats': {'Bedwars': stats}}}
+            reset(uuid, RotationType.DAILY, day, hypixel_data)
+            if day_number % 7 == 0:
+                reset(uuid, RotationType.WEEKLY, day, hypixel_data)
+            if day_number % 30 == 0:
+                reset(uuid, RotationType.MONTHLY, day, hypixel_data)
+
+
+def copy_database(database: str) -> None:
+    """Copies the database, and the attached databases next to it"""
+    copies = {database: config.DB_FILE_PATH}
+
+    for filename in statalib.connection_manager.config.attached_databases.values():
+        copies[os.path.join(os.path.dirname(database), filename)] = \
+            os.path.join(os.path.dirname(config.DB_FILE_PATH), filename)
+
+    for source_fp, copy_fp in copies.items():
+        if not os.path.exists(source_fp):
+            continue
+
+        source = sqlite3.connect(f'file:{source_fp}?mode=ro', uri=True)
+        copy = sqlite3.connect(copy_fp)
+
+        source.backup(copy)
+
+        copy.close()
+        source.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database', help='report a copy of this database instead')
+    parser.add_argument('--players', type=int, default=500,
+                        help='players to simulate')
+    parser.add_argument('--days', type=int, default=60,
+                        help='days of resets to simulate')
+    parser.add_argument('--inactive', type=float, default=0.4,
+                        help='fraction of players that never play')
+    parser.add_argument('--play-chance', type=float, default=0.3,
+                        help='chance of an active player playing on a day')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        config.DB_FILE_PATH = f'{tempdir}/bench.db'
+
+        if args.database:
+            copy_database(args.database)
+            statalib.setup_database_schema(db_fp=config.DB_FILE_PATH)
+        else:
+            statalib.setup_database_schema(db_fp=config.DB_FILE_PATH)
+            simulate(args)
+
+        with statalib.db_connect() as conn:
+            stats = get_snapshot_dedup_stats(conn.cursor())
+
+        statalib.connection_manager.close()
+
+    if args.database:
+        print(f'\n{args.database}')
+    else:
+        print(f'\n{args.players} players, {args.days} days, '
+              f'{args.inactive:.0%} inactive, active players play '
+              f'{args.play_chance:.0%} of days')
+    print(f'references: {stats.references}, stored snapshots: {stats.stored}, '
+          f'ratio {stats.ratio:.2f}')
+    print(f'packed data: {stats.stored_bytes / 1024:.0f} KiB stored for '
+          f'{stats.referenced_bytes / 1024:.0f} KiB referenced')
+
+
+if __name__ == '__main__':
+    main()
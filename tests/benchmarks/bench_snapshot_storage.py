@@ -0,0 +1,178 @@
+"""
+Compares the on-disk size and read throughput of stats snapshots stored
+with one column per stat to snapshots stored packed.
+
+Run from the repository root:
+`python tests/benchmarks/bench_snapshot_storage.py --snapshots 20000`
+
+Snapshots are generated with lifetime stats of active players, where
+every mode is played by some players and not at all by others. The sizes
+are of the whole database files after a `VACUUM`.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('ENVIRONMENT', 'development')
+
+import statalib
+from statalib import config
+from statalib.stats_snapshot import (
+    SNAPSHOT_LAYOUT_VERSION,
+    BedwarsStatsSnapshot,
+    load_snapshot,
+    pack_snapshot_values
+)
+
+
+MODES = ('eight_one_', 'eight_two_', 'four_three_', 'four_four_', 'two_four_')
+STAT_KEYS = BedwarsStatsSnapshot.keys(include_snapshot_id=False)
+
+
+def generate_values(rng: random.Random) -> list[int]:
+    """Generate the lifetime stats of a player"""
+    games = rng.randint(50, 20_000)
+    played_modes = [mode for mode in MODES if rng.random() < 0.6]
+    values = {}
+
+    for mode in played_modes:
+        mode_games = rng.randint(1, games)
+        wins = rng.randint(0, mode_games)
+        values.update({
+            f'{mode}games_played_bedwars': mode_games,
+            f'{mode}wins_bedwars': wins,
+            f'{mode}losses_bedwars': mode_games - wins,
+            f'{mode}final_kills_bedwars': rng.randint(0, mode_games * 3),
+            f'{mode}final_deaths_bedwars': rng.randint(0, mode_games),
+            f'{mode}kills_bedwars': rng.randint(0, mode_games * 5),
+            f'{mode}deaths_bedwars': rng.randint(0, mode_games * 5),
+            f'{mode}beds_broken_bedwars': rng.randint(0, mode_games * 2),
+            f'{mode}beds_lost_bedwars': rng.randint(0, mode_games),
+            f'{mode}items_purchased_bedwars': rng.randint(0, mode_games * 40),
+        })
+
+    for key in STAT_KEYS:
+        if not key.startswith(MODES) and key != 'Experience':
+            values[key] = sum(values.get(f'{mode}{key}', 0) for mode in MODES)
+    values['Experience'] = games * rng.randint(200, 600)
+
+    return [values.get(key, 0) for key in STAT_KEYS]
+
+
+def database_size() -> int:
+    """The size of the database files, including attached ones"""
+    size = 0
+
+    with statalib.db_connect() as conn:
+        schemas = [row[1] for row in conn.execute('PRAGMA database_list') if row[1] != 'temp']
+
+        for schema in schemas:
+            conn.execute(f'VACUUM {schema}')
+            page_count = conn.execute(f'PRAGMA {schema}.page_count').fetchone()[0]
+            page_size = conn.execute(f'PRAGMA {schema}.page_size').fetchone()[0]
+            size += page_count * page_size
+
+    return size
+
+
+def pack_column_snapshots(cursor, batch_size: int=1000) -> int:
+    """
+    Move the generated snapshots from the column table to the packed
+    table and return how many were moved. They keep their IDs rather than
+    being stored by content, which is fine for generated stats that are
+    all different, but not for a real database.
+    """
+    packed_count = 0
+    last_snapshot_id = ''
+
+    while True:
+        cursor.execute(
+            'SELECT * FROM bedwars_stats_snapshots WHERE snapshot_id > ? '
+            'ORDER BY snapshot_id LIMIT ?', (last_snapshot_id, batch_size))
+        rows = cursor.fetchall()
+
+        if not rows:
+            return packed_count
+        last_snapshot_id = rows[-1][0]
+
+        packed_rows = [
+            (snapshot_id, SNAPSHOT_LAYOUT_VERSION, pack_snapshot_values(values))
+            for snapshot_id, *values in rows]
+
+        cursor.executemany(
+            'INSERT INTO bedwars_stats_snapshots_packed (snapshot_id, layout_version, data) '
+            'VALUES (?, ?, ?)', packed_rows)
+        cursor.executemany(
+            'DELETE FROM bedwars_stats_snapshots WHERE snapshot_id = ?',
+            [(row[0],) for row in packed_rows])
+
+        packed_count += len(packed_rows)
+
+
+def bench_reads(snapshot_ids: list[str], reads: int) -> float:
+    """Returns the snapshots loaded per second"""
+    rng = random.Random(1)
+    read_ids = [rng.choice(snapshot_ids) for _ in range(reads)]
+
+    with statalib.db_connect() as conn:
+        cursor = conn.cursor()
+
+        start = time.perf_counter()
+        for snapshot_id in read_ids:
+            load_snapshot(cursor, snapshot_id)
+        return reads / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--snapshots', type=int, default=20_000,
+                        help='snapshots to store')
+    parser.add_argument('--reads', type=int, default=20_000,
+                        help='random snapshot loads to time')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    snapshot_ids = [f'{rng.getrandbits(128):032x}' for _ in range(args.snapshots)]
+
+    column_names = ', '.join(STAT_KEYS)
+    question_marks = ', '.join('?' * len(STAT_KEYS))
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        config.DB_FILE_PATH = f'{tempdir}/bench.db'
+        statalib.setup_database_schema(db_fp=config.DB_FILE_PATH)
+        empty_size = database_size()
+
+        with statalib.db_connect() as conn:
+            conn.executemany(
+                f'INSERT INTO bedwars_stats_snapshots (snapshot_id, {column_names}) '
+                f'VALUES (?, {question_marks})',
+                [(snapshot_id, *generate_values(rng)) for snapshot_id in snapshot_ids])
+
+        columns_size = database_size() - empty_size
+        columns_reads = bench_reads(snapshot_ids, args.reads)
+
+        start = time.perf_counter()
+        with statalib.db_connect() as conn:
+            packed = pack_column_snapshots(conn.cursor())
+        pack_duration = time.perf_counter() - start
+
+        packed_size = database_size() - empty_size
+        packed_reads = bench_reads(snapshot_ids, args.reads)
+
+        statalib.connection_manager.close()
+
+    print(f'\n{args.snapshots} snapshots, {args.reads} random loads')
+    print(f'columns: {columns_size / 1024:.0f} KiB '
+          f'({columns_size / args.snapshots:.0f} B/snapshot), {columns_reads:.0f} loads/s')
+    print(f'packed:  {packed_size / 1024:.0f} KiB '
+          f'({packed_size / args.snapshots:.0f} B/snapshot), {packed_reads:.0f} loads/s')
+    print(f'packed {packed} snapshots in {pack_duration:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
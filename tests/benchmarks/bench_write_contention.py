@@ -0,0 +1,109 @@
+"""
+Measures how long account writes wait on snapshot writes made by another
+connection, with the snapshots in an attached database and in one file.
+
+Run from the repository root:
+`python tests/benchmarks/bench_write_contention.py --writes 200`
+
+A background thread stands in for the trackers app, writing historical
+snapshots in transactions that hold the write lock for a while, the way a
+batch of tracker resets does. The main thread links accounts like the bot.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from statistics import quantiles
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('ENVIRONMENT', 'development')
+
+import statalib
+from statalib import config
+from statalib.stats_snapshot import store_snapshot
+
+
+STAT_COUNT = len(statalib.rotational_stats.BedwarsStatsSnapshot.keys()) - 1
+
+
+def write_snapshots(stop: threading.Event, hold: float, pause: float) -> None:
+    """Repeatedly archives snapshots, holding the lock for `hold` seconds"""
+    period = 0
+
+    while not stop.is_set():
+        with statalib.db_connect() as conn:
+            cursor = conn.cursor()
+            snapshot_id = store_snapshot(cursor, [period] * STAT_COUNT)
+            cursor.execute(
+                'INSERT INTO historical_info (uuid, period_id, level, snapshot_id) '
+                'VALUES (?, ?, 0, ?)', ('tracked', f'daily_{period}', snapshot_id))
+            time.sleep(hold)
+
+        period += 1
+        time.sleep(pause)
+
+    statalib.connection_manager.close()
+
+
+def link_accounts(writes: int) -> list[float]:
+    """Returns the duration of every account write in seconds"""
+    durations = []
+
+    for discord_id in range(writes):
+        start = time.perf_counter()
+        statalib.set_linked_data(discord_id, f'{discord_id:032x}')
+        durations.append(time.perf_counter() - start)
+
+    return durations
+
+
+def run(attached_databases: dict, args: argparse.Namespace) -> list[float]:
+    with tempfile.TemporaryDirectory() as tempdir:
+        config.DB_FILE_PATH = f'{tempdir}/core.db'
+        statalib.connection_manager.config.attached_databases = attached_databases
+        statalib.setup_database_schema(db_fp=config.DB_FILE_PATH)
+
+        stop = threading.Event()
+        tracker = threading.Thread(
+            target=write_snapshots, args=(stop, args.lock_hold, args.lock_pause))
+        tracker.start()
+
+        try:
+            return link_accounts(args.writes)
+        finally:
+            stop.set()
+            tracker.join()
+            statalib.connection_manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--writes', type=int, default=200,
+                        help='account writes to time per layout')
+    parser.add_argument('--lock-hold', type=float, default=0.02,
+                        help='seconds the snapshot writer holds the lock for')
+    parser.add_argument('--lock-pause', type=float, default=0.005,
+                        help='seconds between the snapshot writer\'s transactions')
+    args = parser.parse_args()
+
+    layouts = {
+        'single file': {},
+        'attached': {'snapshots': 'snapshots.db'},
+    }
+    results = {name: run(attached, args) for name, attached in layouts.items()}
+
+    print(f'\n{args.writes} account writes, snapshot write lock held '
+          f'{args.lock_hold * 1000:.0f}ms every '
+          f'{(args.lock_hold + args.lock_pause) * 1000:.0f}ms')
+    for name, durations in results.items():
+        percentiles = quantiles(durations, n=100, method='inclusive')
+        print(
+            f'{name}: p50 {percentiles[49] * 1000:.2f}ms, '
+            f'p99 {percentiles[98] * 1000:.2f}ms, max {max(durations) * 1000:.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Hypixel player response fixtures for benchmarks."""
+
+import json
+import os
+import random
+from glob import glob
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def _random_key(rng: random.Random) -> str:
+    return ''.join(
+        rng.choice('abcdefghijklmnopqrstuvwxyz_') for _ in range(rng.randint(8, 28)))
+
+
+def generate_player_response(seed: int=0) -> dict:
+    """
+    Generate a response shaped like a full Hypixel player response,
+    with stats for 35 games, ~900 achievements and 300 quests.
+    :param seed: The seed to generate the response with.
+    """
+    rng = random.Random(seed)
+    key = lambda: _random_key(rng)
+
+    stats = {
+        f'Game{game}': {key(): rng.randint(0, 10**6) for _ in range(250)}
+        for game in range(35)
+    }
+    stats['Bedwars'] = {
+        f'{key()}_bedwars': rng.randint(0, 10**5) for _ in range(1100)}
+    stats['Bedwars']['Experience'] = rng.randint(0, 10**7)
+
+    quest_games = ('bedwars_', 'skywars_', 'duels_', 'arcade_')
+
+    return {
+        'success': True,
+        'player': {
+            'uuid': f'{seed:032x}',
+            'displayname': f'Player{seed}',
+            'newPackageRank': 'MVP_PLUS',
+            'rankPlusColor': 'RED',
+            'stats': stats,
+            'achievements': {
+                **{key(): rng.randint(0, 5000) for _ in range(900)},
+                'bedwars_level': rng.randint(0, 1000)
+            },
+            'achievementsOneTime': [key() for _ in range(600)],
+            'quests': {
+                rng.choice(quest_games) + key(): {
+                    'completions': [
+                        {'time': 1700000000000 + i} for i in range(rng.randint(0, 40))]
+                }
+                for _ in range(300)
+            },
+            'socialMedia': {'links': {'DISCORD': f'player{seed}'}}
+        }
+    }
+
+
+def load_player_fixtures(count: int=20) -> list[bytes]:
+    """
+    Load the raw bodies of the recorded player responses in `fixtures/`.
+    If there are none, `count` generated responses are used instead.
+    Responses can be recorded with:
+    `curl -H "API-Key: $API_KEY_HYPIXEL" \
+        "https://api.hypixel.net/player?uuid=<uuid>" > fixtures/<uuid>.json`
+    :param count: The amount of responses to generate if none are recorded.
+    """
+    bodies = []
+    for path in sorted(glob(os.path.join(FIXTURES_DIR, '*.json'))):
+        with open(path, 'rb') as fixture:
+            bodies.append(fixture.read())
+
+    if bodies:
+        return bodies
+
+    return [
+        json.dumps(generate_player_response(seed)).encode() for seed in range(count)]
@@ -0,0 +1,269 @@
+"""
+Local stand-in for the Hypixel, Mojang and visage APIs.
+
+Serves the player fixtures from `fixtures.py` with configurable latency,
+error rates and rate limiting. Point statalib at it by overriding the
+`global.network.upstream_urls` config section with the stand-in's url.
+
+Run from the repository root:
+`python tests/benchmarks/standin_server.py --port 8765 --latency 50`
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import zlib
+from base64 import b64encode
+from dataclasses import dataclass
+from hashlib import md5
+from io import BytesIO
+
+from aiohttp import web
+from PIL import Image
+
+from fixtures import load_player_fixtures
+
+
+REL_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Amount of distinct skin textures that are served
+SKIN_TEXTURE_COUNT = 20
+
+
+@dataclass
+class StandInConfig:
+    """Behaviour of the stand-in server."""
+    host: str = '127.0.0.1'
+    port: int = 8765
+    latency: float = 0.05
+    latency_jitter: float = 0.02
+    error_rate: float = 0.0
+    rate_limit: int = 100_000
+    rate_limit_window: int = 300
+
+
+def generate_skin_texture(seed: int) -> bytes:
+    """Returns a random but stable 64x64 skin texture"""
+    rng = random.Random(seed)
+    pixels = bytes(rng.randrange(256) for _ in range(64 * 64 * 3))
+
+    texture = Image.frombytes('RGB', (64, 64), pixels).convert('RGBA')
+    texture_bytes = BytesIO()
+    texture.save(texture_bytes, format='PNG')
+    return texture_bytes.getvalue()
+
+
+def uuid_from_name(name: str) -> str:
+    """Returns the stable fake uuid of a player name"""
+    return md5(name.lower().encode()).hexdigest()
+
+
+class StandInServer:
+    """
+    Serves:
+    - `GET /player?uuid=<uuid>` like `api.hypixel.net`
+    - `GET /users/profiles/minecraft/<name>` like `api.mojang.com`
+    - `POST /profiles/minecraft` like `api.mojang.com`
+    - `GET /session/minecraft/profile/<uuid>` like `sessionserver.mojang.com`
+    - `GET /texture/<texture_id>` like `textures.minecraft.net`
+    - `GET /<style>/<size>/<uuid>` like `visage.surgeplay.com`
+    """
+    def __init__(self, standin_config: StandInConfig) -> None:
+        self.config = standin_config
+        self.url = f'http://{standin_config.host}:{standin_config.port}'
+
+        self._player_fixtures = [json.loads(body) for body in load_player_fixtures()]
+        with open(f'{REL_PATH}/assets/steve_bust.png', 'rb') as skin:
+            self._skin = skin.read()
+        self._textures = [generate_skin_texture(i) for i in range(SKIN_TEXTURE_COUNT)]
+
+        self._names: dict[str, str] = {}
+
+        self._remaining = standin_config.rate_limit
+        self._window_start = time.monotonic()
+
+        self._runner: web.AppRunner | None = None
+
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/player', self._hypixel_player)
+        app.router.add_get('/users/profiles/minecraft/{name}', self._mojang_profile)
+        app.router.add_post('/profiles/minecraft', self._mojang_bulk_profiles)
+        app.router.add_get('/session/minecraft/profile/{uuid}', self._mojang_session)
+        app.router.add_get('/texture/{texture_id}', self._skin_texture)
+        app.router.add_get('/{style}/{size}/{uuid}', self._visage_render)
+        return app
+
+
+    async def _simulate(self) -> None:
+        jitter = random.uniform(-self.config.latency_jitter, self.config.latency_jitter)
+        await asyncio.sleep(max(0.0, self.config.latency + jitter))
+
+        if random.random() < self.config.error_rate:
+            raise web.HTTPBadGateway(text='<html>502 Bad Gateway</html>')
+
+
+    def _rate_limit_headers(self) -> dict[str, str]:
+        now = time.monotonic()
+        if now - self._window_start >= self.config.rate_limit_window:
+            self._window_start = now
+            self._remaining = self.config.rate_limit
+
+        self._remaining -= 1
+        reset = self.config.rate_limit_window - (now - self._window_start)
+
+        return {
+            'RateLimit-Limit': str(self.config.rate_limit),
+            'RateLimit-Remaining': str(max(0, self._remaining)),
+            'RateLimit-Reset': str(int(reset))
+        }
+
+
+    async def _hypixel_player(self, request: web.Request) -> web.Response:
+        await self._simulate()
+        headers = self._rate_limit_headers()
+
+        if self._remaining < 0:
+            return web.json_response(
+                {'success': False, 'cause': 'Key throttle', 'throttle': True},
+                status=429, headers=headers)
+
+        uuid = request.query.get('uuid', '')
+        fixture_index = zlib.crc32(uuid.encode()) % len(self._player_fixtures)
+        hypixel_data = self._player_fixtures[fixture_index]
+
+        player_data = {
+            **hypixel_data['player'],
+            'uuid': uuid,
+            'displayname': self._names.get(uuid, f'Player{uuid[:6]}')
+        }
+        return web.json_response({**hypixel_data, 'player': player_data}, headers=headers)
+
+
+    async def _mojang_profile(self, request: web.Request) -> web.Response:
+        await self._simulate()
+
+        name = request.match_info['name']
+        uuid = uuid_from_name(name)
+        self._names[uuid] = name
+
+        return web.json_response({'id': uuid, 'name': name})
+
+
+    async def _mojang_bulk_profiles(self, request: web.Request) -> web.Response:
+        await self._simulate()
+
+        names: list[str] = await request.json()
+        if len(names) > 10:
+            raise web.HTTPBadRequest(text='Not more that 10 profile name per call is allowed.')
+
+        profiles = []
+        for name in names:
+            uuid = uuid_from_name(name)
+            self._names[uuid] = name
+            profiles.append({'id': uuid, 'name': name})
+
+        return web.json_response(profiles)
+
+
+    async def _mojang_session(self, request: web.Request) -> web.Response:
+        await self._simulate()
+
+        uuid = request.match_info['uuid']
+
+        # Players share a small set of textures, like players using the same skin
+        texture_id = zlib.crc32(uuid.encode()) % SKIN_TEXTURE_COUNT
+        skin = {'url': f'{self.url}/texture/{texture_id}'}
+        if texture_id % 2:
+            skin['metadata'] = {'model': 'slim'}
+        textures = {'textures': {'SKIN': skin}}
+
+        return web.json_response({
+            'id': uuid,
+            'name': self._names.get(uuid, f'Player{uuid[:6]}'),
+            'properties': [{
+                'name': 'textures',
+                'value': b64encode(json.dumps(textures).encode()).decode()
+            }]
+        })
+
+
+    async def _skin_texture(self, request: web.Request) -> web.Response:
+        await self._simulate()
+
+        texture_id = int(request.match_info['texture_id'])
+        if not 0 <= texture_id < SKIN_TEXTURE_COUNT:
+            raise web.HTTPNotFound()
+
+        return web.Response(body=self._textures[texture_id], content_type='image/png')
+
+
+    async def _visage_render(self, request: web.Request) -> web.Response:
+        await self._simulate()
+        return web.Response(body=self._skin, content_type='image/png')
+
+
+    async def start(self) -> None:
+        """Start serving requests on the configured host and port."""
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.config.host, self.config.port).start()
+
+
+    async def close(self) -> None:
+        """Stop serving requests."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def run_standin_server(standin_config: StandInConfig) -> None:
+    """
+    Run a stand-in server until the process is terminated.
+    :param standin_config: The behaviour of the stand-in server.
+    """
+    async def serve():
+        server = StandInServer(standin_config)
+        await server.start()
+        print(f'Stand-in server listening on {server.url}', flush=True)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def add_standin_args(parser: argparse.ArgumentParser) -> None:
+    """Add the stand-in server's options to an argument parser"""
+    defaults = StandInConfig()
+    parser.add_argument('--port', type=int, default=defaults.port)
+    parser.add_argument('--latency', type=float, default=defaults.latency * 1000,
+                        help='mean upstream latency in milliseconds')
+    parser.add_argument('--latency-jitter', type=float,
+                        default=defaults.latency_jitter * 1000,
+                        help='maximum latency deviation in milliseconds')
+    parser.add_argument('--error-rate', type=float, default=defaults.error_rate,
+                        help='fraction of requests answered with a 502')
+    parser.add_argument('--rate-limit', type=int, default=defaults.rate_limit,
+                        help='hypixel requests allowed per rate limit window')
+    parser.add_argument('--rate-limit-window', type=int,
+                        default=defaults.rate_limit_window)
+
+
+def standin_config_from_args(args: argparse.Namespace) -> StandInConfig:
+    """Create a stand-in config from the options added by `add_standin_args`"""
+    return StandInConfig(
+        port=args.port,
+        latency=args.latency / 1000,
+        latency_jitter=args.latency_jitter / 1000,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_standin_args(parser)
+    run_standin_server(standin_config_from_args(parser.parse_args()))
@@ -0,0 +1,110 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from statalib.accounts import create_account
+from statalib.async_database import (
+    AsyncRotationalStatsManager,
+    AsyncSessionManager,
+    async_get_entitlements,
+    async_get_linked_player,
+    async_set_linked_data
+)
+from statalib.database import db_executor
+from statalib.entitlements import entitlements_cache
+from statalib.rotational_stats import (
+    RotationType,
+    async_reset_rotational_stats_if_whitelisted
+)
+from statalib.subscriptions import SubscriptionManager
+
+from utils import clean_database, MockData
+
+
+mock_hypixel_data = {
+    "player": {"stats": {"Bedwars": {"final_kills_bedwars": 1}}}
+}
+
+
+class TestAsyncDatabase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+
+    async def test_linking(self):
+        await async_set_linked_data(MockData.discord_id, MockData.uuid)
+
+        self.assertEqual(
+            await async_get_linked_player(MockData.discord_id), MockData.uuid)
+        self.assertIsNone(await async_get_linked_player(MockData.discord_id_2))
+
+    async def test_runs_off_event_loop(self):
+        main_thread = threading.current_thread()
+        threads = []
+
+        def get_linked_player(*args):
+            threads.append(threading.current_thread())
+
+        with patch('statalib.async_database.get_linked_player', get_linked_player):
+            await async_get_linked_player(MockData.discord_id)
+
+        self.assertIsNot(threads[0], main_thread)
+
+    async def test_session_manager(self):
+        manager = AsyncSessionManager(MockData.uuid)
+        await manager.create_session(1, mock_hypixel_data)
+
+        self.assertEqual(await manager.active_sessions(), [1])
+        self.assertEqual(await manager.session_count(), 1)
+        self.assertIsNotNone(await manager.get_session(1))
+
+        await manager.delete_session(1)
+        self.assertIsNone(await manager.get_session(1))
+
+    async def test_rotational_stats_manager(self):
+        manager = AsyncRotationalStatsManager(MockData.uuid)
+        await manager.initialize_rotational_tracking(mock_hypixel_data)
+
+        rotational_data = await manager.get_rotational_data(RotationType.DAILY)
+        self.assertEqual(rotational_data.data.final_kills_bedwars, 1)
+
+    async def test_entitlements_only_written_if_needed(self):
+        writes = db_executor.stats.writes
+
+        # The account has to be created first
+        entitlements = await async_get_entitlements(MockData.discord_id)
+        self.assertFalse(entitlements.blacklisted)
+        self.assertEqual(db_executor.stats.writes, writes + 1)
+
+        entitlements_cache.clear()
+        await async_get_entitlements(MockData.discord_id)
+        self.assertEqual(db_executor.stats.writes, writes + 1)
+
+    async def test_expired_subscription_written(self):
+        create_account(MockData.discord_id)
+        SubscriptionManager(MockData.discord_id).add_subscription(
+            'pro', duration=-1, update_roles=False)
+        entitlements_cache.clear()
+        writes = db_executor.stats.writes
+
+        entitlements = await async_get_entitlements(MockData.discord_id)
+        self.assertEqual(entitlements.subscription.package, 'free')
+        self.assertEqual(db_executor.stats.writes, writes + 1)
+
+    async def test_reset_on_writer(self):
+        threads = []
+
+        def reset_rotational_stats_if_whitelisted(*args):
+            threads.append(threading.current_thread().name)
+
+        with patch(
+            'statalib.rotational_stats.resetting.reset_rotational_stats_if_whitelisted',
+            reset_rotational_stats_if_whitelisted
+        ):
+            await async_reset_rotational_stats_if_whitelisted(MockData.uuid, {})
+
+        self.assertTrue(threads[0].startswith('db-writer'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from aiohttp_client_cache import CachedResponse, SQLiteBackend
+
+from statalib.cache_maintenance import CacheMaintenanceConfig, CacheSweeper
+
+
+def cached_response(url: str, expires: datetime | None, size: int=1024) -> CachedResponse:
+    return CachedResponse(
+        method='GET', reason='OK', status=200, url=url,
+        version='1.1', body=os.urandom(size), expires=expires)
+
+
+class TestCacheSweeper(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.backend = SQLiteBackend(cache_name=f'{self.tempdir.name}/test_cache')
+        self.sweeper = CacheSweeper('test', self.backend, CacheMaintenanceConfig(
+            batch_size=7, max_bytes=1024 * 1024 * 1024, vacuum_pages=16))
+
+    async def asyncTearDown(self) -> None:
+        await self.backend.close()
+        self.tempdir.cleanup()
+
+    async def save(self, count: int, expires: datetime | None, size: int=1024) -> None:
+        for i in range(count):
+            url = f'https://example.com/{expires}/{i}'
+            await self.backend.save_response(
+                cached_response(url, expires, size),
+                self.backend.create_key('GET', url), expires)
+
+
+    async def test_sweep_expired_in_batches(self):
+        await self.save(20, datetime.utcnow() - timedelta(seconds=1))
+        await self.save(15, datetime.utcnow() + timedelta(hours=1))
+        await self.save(5, None)
+
+        self.assertEqual(await self.sweeper.sweep_expired(), 20)
+        self.assertEqual(await self.backend.responses.size(), 20)
+
+    async def test_sweep_removes_redirects_of_expired(self):
+        await self.save(1, datetime.utcnow() - timedelta(seconds=1))
+        key = [key async for key in self.backend.responses.keys()][0]
+        await self.backend.redirects.write('alias', key)
+
+        await self.sweeper.sweep_expired()
+        self.assertEqual(await self.backend.redirects.size(), 0)
+
+    async def test_enforce_size_limit_evicts_oldest(self):
+        expires = datetime.utcnow() + timedelta(hours=1)
+        await self.save(50, expires, size=16 * 1024)
+        newest_key = self.backend.create_key('GET', f'https://example.com/{expires}/49')
+
+        self.sweeper.config.max_bytes = 256 * 1024
+        evicted = await self.sweeper.enforce_size_limit()
+
+        self.assertGreater(evicted, 0)
+        self.assertLessEqual(await self.sweeper.data_size(), 256 * 1024)
+        self.assertTrue(await self.backend.responses.contains(newest_key))
+        self.assertEqual(await self.backend.responses.size(), 50 - evicted)
+
+    async def test_sweep_reclaims_space(self):
+        await self.save(40, datetime.utcnow() - timedelta(seconds=1), size=16 * 1024)
+        await self.save(5, datetime.utcnow() + timedelta(hours=1), size=16 * 1024)
+        size_before = self.sweeper.file_size()
+
+        result = await self.sweeper.sweep()
+
+        self.assertEqual(result.expired, 40)
+        self.assertEqual(result.evicted, 0)
+        self.assertGreater(result.reclaimed_bytes, 0)
+        self.assertEqual(self.sweeper.file_size(), size_before - result.reclaimed_bytes)
+        self.assertEqual(self.sweeper.stats.sweeps, 1)
+
+        # Incremental mode is kept, so later sweeps don't need a full vacuum
+        async with self.backend.responses.get_connection() as db:
+            cursor = await db.execute('PRAGMA auto_vacuum')
+            self.assertEqual((await cursor.fetchone())[0], 2)
+
+        await self.save(40, datetime.utcnow() - timedelta(seconds=1), size=16 * 1024)
+        result = await self.sweeper.sweep()
+        self.assertGreater(result.reclaimed_bytes, 0)
+        self.assertEqual(await self.backend.responses.size(), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import time
+import unittest
+
+from statalib.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitState
+)
+from statalib.errors import CircuitOpenError
+
+
+class TestCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.breaker = CircuitBreaker('test', CircuitBreakerConfig(
+            failure_rate=0.5, minimum_calls=4, window=60,
+            open_duration=0.05, half_open_probes=1))
+
+    async def succeed(self) -> str:
+        return 'ok'
+
+    async def fail(self) -> None:
+        raise ConnectionError('upstream failed')
+
+    async def call(self, func):
+        return await self.breaker.call(func, failure_exceptions=(ConnectionError,))
+
+    async def open_breaker(self) -> None:
+        for _ in range(4):
+            with self.assertRaises(ConnectionError):
+                await self.call(self.fail)
+
+
+    async def test_stays_closed_below_failure_rate(self):
+        for func in (self.succeed, self.succeed, self.succeed, self.fail):
+            try:
+                await self.call(func)
+            except ConnectionError:
+                pass
+
+        assert self.breaker.state == CircuitState.CLOSED
+        assert self.breaker.failure_rate == 0.25
+
+    async def test_stays_closed_below_minimum_calls(self):
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                await self.call(self.fail)
+
+        assert self.breaker.state == CircuitState.CLOSED
+
+    async def test_opens_and_rejects(self):
+        await self.open_breaker()
+
+        assert self.breaker.state == CircuitState.OPEN
+        with self.assertRaises(CircuitOpenError):
+            await self.call(self.succeed)
+
+        assert self.breaker.stats.opened == 1
+        assert self.breaker.stats.rejected == 1
+
+    async def test_half_open_probe_closes(self):
+        await self.open_breaker()
+        time.sleep(0.06)
+
+        assert self.breaker.state == CircuitState.HALF_OPEN
+        assert await self.call(self.succeed) == 'ok'
+        assert self.breaker.state == CircuitState.CLOSED
+
+    async def test_half_open_probe_failure_reopens(self):
+        await self.open_breaker()
+        time.sleep(0.06)
+
+        with self.assertRaises(ConnectionError):
+            await self.call(self.fail)
+
+        assert self.breaker.state == CircuitState.OPEN
+        assert self.breaker.stats.opened == 2
+
+    async def test_half_open_limits_probes(self):
+        await self.open_breaker()
+        time.sleep(0.06)
+
+        async def slow():
+            await asyncio.sleep(0.01)
+            return 'ok'
+
+        probe = asyncio.ensure_future(self.call(slow))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(CircuitOpenError):
+            await self.call(self.succeed)
+
+        assert await probe == 'ok'
+        assert self.breaker.state == CircuitState.CLOSED
+
+    async def test_cancelled_probe_released(self):
+        await self.open_breaker()
+        time.sleep(0.06)
+
+        probe = asyncio.ensure_future(self.call(lambda: asyncio.sleep(1)))
+        await asyncio.sleep(0)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+        assert self.breaker.state == CircuitState.HALF_OPEN
+        assert await self.call(self.succeed) == 'ok'
+
+    async def test_unlisted_exceptions_not_recorded(self):
+        async def invalid():
+            raise ValueError
+
+        for _ in range(4):
+            with self.assertRaises(ValueError):
+                await self.call(invalid)
+
+        assert self.breaker.state == CircuitState.CLOSED
+        assert self.breaker.stats.failures == 0
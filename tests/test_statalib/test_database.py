@@ -0,0 +1,187 @@
+import asyncio
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from statalib.database import (
+    ConnectionManager,
+    DatabaseConfig,
+    DatabaseExecutor,
+    count_queries
+)
+
+
+class TestConnectionManager(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.db_fp = f'{self.tempdir.name}/test.db'
+        self.manager = ConnectionManager(DatabaseConfig())
+
+        with self.manager.connect(self.db_fp) as conn:
+            conn.execute('CREATE TABLE items (item TEXT)')
+
+    def tearDown(self) -> None:
+        self.manager.close()
+        self.tempdir.cleanup()
+
+
+    def test_connection_reused_within_thread(self):
+        conn = self.manager.connect(self.db_fp)
+
+        self.assertIs(self.manager.connect(self.db_fp), conn)
+        self.assertEqual(self.manager.stats.opened, 1)
+        self.assertEqual(self.manager.stats.reused, 2)
+
+    def test_connection_per_thread(self):
+        conn = self.manager.connect(self.db_fp)
+        thread_conns = []
+
+        thread = threading.Thread(
+            target=lambda: thread_conns.append(self.manager.connect(self.db_fp)))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(thread_conns[0], conn)
+        self.assertEqual(self.manager.stats.opened, 2)
+
+    def test_connection_per_database(self):
+        other_conn = self.manager.connect(f'{self.tempdir.name}/other.db')
+        self.assertIsNot(other_conn, self.manager.connect(self.db_fp))
+
+    def test_pragmas(self):
+        conn = self.manager.connect(self.db_fp)
+
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 1)
+        self.assertEqual(conn.execute('PRAGMA cache_size').fetchone()[0], -16 * 1024)
+
+    def test_attached_databases(self):
+        conn = self.manager.connect(self.db_fp)
+        conn.execute('CREATE TABLE snapshots.snapshot_items (item TEXT)')
+        conn.execute("INSERT INTO snapshot_items VALUES ('attached')")
+        conn.commit()
+
+        self.assertEqual(conn.execute('PRAGMA snapshots.journal_mode').fetchone()[0], 'wal')
+
+        # Stored in its own file, next to the main database
+        with sqlite3.connect(f'{self.tempdir.name}/snapshots.db') as other_conn:
+            rows = other_conn.execute('SELECT item FROM snapshot_items').fetchall()
+        self.assertEqual(rows, [('attached',)])
+
+    def test_transactions(self):
+        with self.manager.connect(self.db_fp) as conn:
+            conn.execute("INSERT INTO items VALUES ('committed')")
+
+        with self.assertRaises(ValueError):
+            with self.manager.connect(self.db_fp) as conn:
+                conn.execute("INSERT INTO items VALUES ('rolled back')")
+                raise ValueError
+
+        # Other connections only see committed rows
+        with sqlite3.connect(self.db_fp) as other_conn:
+            rows = other_conn.execute('SELECT item FROM items').fetchall()
+        self.assertEqual(rows, [('committed',)])
+
+    def test_close(self):
+        conn = self.manager.connect(self.db_fp)
+        self.manager.close()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
+        self.assertIsNot(self.manager.connect(self.db_fp), conn)
+
+    def test_count_queries(self):
+        conn = self.manager.connect(self.db_fp)
+        conn.execute('SELECT 1')  # Not counted
+
+        with count_queries() as counter:
+            conn.execute('SELECT item FROM items')
+            conn.execute('SELECT COUNT(*) FROM items')
+        self.assertEqual(counter.queries, 2)
+
+
+class TestDatabaseExecutor(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.executor = DatabaseExecutor(reader_threads=4)
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+
+
+    async def test_threads(self):
+        reader = await self.executor.read(lambda: threading.current_thread().name)
+        writer = await self.executor.write(lambda: threading.current_thread().name)
+
+        self.assertTrue(reader.startswith('db-reader'))
+        self.assertTrue(writer.startswith('db-writer'))
+        self.assertEqual(self.executor.stats.reads, 1)
+        self.assertEqual(self.executor.stats.writes, 1)
+
+    async def test_arguments(self):
+        result = await self.executor.read(lambda a, b=0: a + b, 1, b=2)
+        self.assertEqual(result, 3)
+
+    async def test_single_writer(self):
+        active, overlaps = [], []
+
+        def write():
+            active.append(None)
+            overlaps.append(len(active))
+            time.sleep(0.01)
+            active.pop()
+
+        await asyncio.gather(*(self.executor.write(write) for _ in range(5)))
+        self.assertEqual(max(overlaps), 1)
+
+    async def test_concurrent_readers(self):
+        barrier = threading.Barrier(3, timeout=2)
+
+        # Only completes if the three reads run at the same time
+        await asyncio.gather(*(self.executor.read(barrier.wait) for _ in range(3)))
+
+    async def test_reads_not_blocked_by_writes(self):
+        write_started, release_write = threading.Event(), threading.Event()
+
+        def write():
+            write_started.set()
+            release_write.wait(2)
+
+        write_task = asyncio.create_task(self.executor.write(write))
+        await asyncio.to_thread(write_started.wait, 2)
+
+        self.assertEqual(await self.executor.read(lambda: 'read'), 'read')
+        self.assertFalse(write_task.done())
+
+        release_write.set()
+        await write_task
+        self.assertEqual(self.executor.stats.pending, 0)
+
+    async def test_exceptions(self):
+        def fail():
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            await self.executor.write(fail)
+        self.assertEqual(self.executor.stats.pending, 0)
+
+    async def test_count_queries(self):
+        manager = ConnectionManager(DatabaseConfig())
+
+        def query():
+            try:
+                manager.connect(':memory:').execute('SELECT 1')
+            finally:
+                manager.close()
+
+        with count_queries() as counter:
+            await self.executor.read(query)
+            await self.executor.write(query)
+
+        # Counted from the executor threads, excluding the pragmas
+        self.assertEqual(counter.queries, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
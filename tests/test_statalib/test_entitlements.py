@@ -0,0 +1,79 @@
+import time
+import unittest
+
+from statalib.accounts import create_account, set_account_blacklist
+from statalib.database import count_queries
+from statalib.entitlements import entitlements_cache
+from statalib.permissions import (
+    add_permission,
+    get_entitlements,
+    has_access,
+    has_permission,
+    remove_permission
+)
+from statalib.subscriptions import SubscriptionManager
+
+from utils import clean_database, MockData
+
+
+class TestEntitlementsCache(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+        create_account(MockData.discord_id)
+
+    def test_cached(self):
+        with count_queries() as first:
+            self.assertFalse(has_access(MockData.discord_id, 'custom_backgrounds'))
+
+        with count_queries() as repeated:
+            self.assertFalse(has_access(MockData.discord_id, 'custom_backgrounds'))
+            self.assertFalse(has_permission(MockData.discord_id, 'no_tips'))
+            get_entitlements(MockData.discord_id)
+
+        self.assertGreater(first.queries, 0)
+        self.assertEqual(repeated.queries, 0)
+
+    def test_permissions_invalidate(self):
+        self.assertFalse(has_permission(MockData.discord_id, 'no_tips'))
+
+        add_permission(MockData.discord_id, 'no_tips')
+        self.assertTrue(has_permission(MockData.discord_id, 'no_tips'))
+
+        remove_permission(MockData.discord_id, 'no_tips')
+        self.assertFalse(has_permission(MockData.discord_id, 'no_tips'))
+
+    def test_subscription_invalidates(self):
+        self.assertFalse(has_access(MockData.discord_id, 'custom_backgrounds'))
+
+        SubscriptionManager(MockData.discord_id).add_subscription('pro', update_roles=False)
+
+        self.assertTrue(has_access(MockData.discord_id, 'custom_backgrounds'))
+        self.assertEqual(get_entitlements(MockData.discord_id).subscription.package, 'pro')
+
+    def test_blacklist_invalidates(self):
+        self.assertFalse(get_entitlements(MockData.discord_id).blacklisted)
+
+        set_account_blacklist(MockData.discord_id)
+        self.assertTrue(get_entitlements(MockData.discord_id).blacklisted)
+
+    def test_expiring_subscription(self):
+        SubscriptionManager(MockData.discord_id).add_subscription(
+            'pro', duration=0.2, update_roles=False)
+        self.assertTrue(has_access(MockData.discord_id, 'custom_backgrounds'))
+
+        # Cached for no longer than the subscription lasts
+        time.sleep(0.25)
+        self.assertFalse(has_access(MockData.discord_id, 'custom_backgrounds'))
+
+    def test_concurrent_invalidation(self):
+        generation = entitlements_cache.generation()
+        entitlements = get_entitlements(MockData.discord_id_2)
+        entitlements_cache.invalidate(MockData.discord_id_2)
+
+        # Loaded before the invalidation, so it may be outdated
+        entitlements_cache.set(MockData.discord_id_2, entitlements, generation)
+        self.assertIsNone(entitlements_cache.get(MockData.discord_id_2))
+
+
+if __name__ == '__main__':
+    unittest.main()
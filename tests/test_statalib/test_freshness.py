@@ -0,0 +1,30 @@
+import unittest
+
+from statalib.freshness import FreshnessPolicy
+
+
+class TestFreshnessPolicy(unittest.TestCase):
+    def test_strict_policy(self):
+        policy = FreshnessPolicy(max_age=300)
+
+        assert policy.is_fresh(300)
+        assert not policy.is_fresh(301)
+        assert not policy.can_revalidate(301)
+        assert not policy.can_serve_on_error(301)
+
+    def test_stale_while_revalidate(self):
+        policy = FreshnessPolicy(max_age=300, stale_while_revalidate=300)
+
+        assert not policy.is_fresh(400)
+        assert policy.can_revalidate(400)
+        assert policy.can_revalidate(600)
+        assert not policy.can_revalidate(601)
+
+    def test_stale_if_error(self):
+        policy = FreshnessPolicy(
+            max_age=300, stale_while_revalidate=60, stale_if_error=3300)
+
+        assert not policy.can_revalidate(1000)
+        assert policy.can_serve_on_error(1000)
+        assert policy.can_serve_on_error(3600)
+        assert not policy.can_serve_on_error(3601)
@@ -0,0 +1,152 @@
+import asyncio
+import time
+import unittest
+
+from aiohttp import ClientConnectionError
+
+from statalib.functions import db_connect
+from statalib.identity_cache import IdentityCache, IdentityCacheConfig, PlayerIdentity
+
+from utils import clean_database
+
+
+class FakeIdentityCache(IdentityCache):
+    """Answers lookups from a dict of existing players instead of Mojang"""
+    def __init__(self, players: dict[str, str]) -> None:
+        super().__init__(IdentityCacheConfig(
+            refresh_after=60, max_age=3600, negative_ttl=60, batch_delay=0.01))
+        self.players = players  # name -> uuid
+        self.bulk_calls: list[list[str]] = []
+        self.uuid_calls: list[str] = []
+        self.error: Exception | None = None
+
+    async def _fetch_profiles(self, names: list[str]) -> list[dict]:
+        self.bulk_calls.append(names)
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+
+        lower_players = {name.lower(): (name, uuid) for name, uuid in self.players.items()}
+        return [
+            {'id': lower_players[name][1], 'name': lower_players[name][0]}
+            for name in names if name in lower_players
+        ]
+
+    async def _fetch_by_uuid(self, uuid: str) -> PlayerIdentity | None:
+        self.uuid_calls.append(uuid)
+        for name, player_uuid in self.players.items():
+            if player_uuid == uuid:
+                identity = PlayerIdentity(uuid, name, time.time())
+                self._store([identity])
+                return identity
+        return None
+
+
+class TestIdentityCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        clean_database()
+        self.cache = FakeIdentityCache({
+            f'Player{i}': f'{i:032x}' for i in range(25)
+        })
+
+    def age_identities(self, seconds: float) -> None:
+        with db_connect() as conn:
+            conn.execute(
+                'UPDATE player_identities SET verified_at = verified_at - ?', (seconds,))
+
+
+    async def test_names_resolved_in_one_bulk_request(self):
+        identities = await self.cache.resolve_names(['player1', 'PLAYER2', 'Player3'])
+
+        self.assertEqual(len(self.cache.bulk_calls), 1)
+        self.assertEqual(identities['PLAYER2'].name, 'Player2')
+        self.assertEqual(identities['Player3'].uuid, f'{3:032x}')
+
+    async def test_bulk_requests_split_at_limit(self):
+        names = [f'Player{i}' for i in range(25)]
+        identities = await self.cache.resolve_names(names)
+
+        self.assertEqual([len(call) for call in self.cache.bulk_calls], [10, 10, 5])
+        self.assertTrue(all(identities.values()))
+
+    async def test_concurrent_lookups_share_request(self):
+        first, second = await asyncio.gather(
+            self.cache.resolve_name('Player1'), self.cache.resolve_name('player1'))
+
+        self.assertEqual(self.cache.bulk_calls, [['player1']])
+        self.assertEqual(first, second)
+
+    async def test_cached_identities(self):
+        await self.cache.resolve_name('Player1')
+        identity = await self.cache.resolve_name('Player1')
+
+        self.assertEqual(len(self.cache.bulk_calls), 1)
+        self.assertEqual(self.cache.stats.hits, 1)
+
+        # Resolving by uuid uses the identity stored by the name lookup
+        self.assertEqual(await self.cache.resolve_uuid(identity.uuid), identity)
+        self.assertEqual(self.cache.uuid_calls, [])
+
+    async def test_missing_names_negatively_cached(self):
+        self.assertIsNone(await self.cache.resolve_name('Nobody'))
+        self.assertIsNone(await self.cache.resolve_name('nobody'))
+
+        self.assertEqual(len(self.cache.bulk_calls), 1)
+        self.assertEqual(self.cache.stats.negative_hits, 1)
+
+    async def test_invalid_names_not_looked_up(self):
+        self.assertIsNone(await self.cache.resolve_name('not a name'))
+        self.assertIsNone(await self.cache.resolve_name('a' * 17))
+        self.assertEqual(self.cache.bulk_calls, [])
+
+    async def test_stale_identity_refreshed_in_background(self):
+        await self.cache.resolve_name('Player1')
+        self.age_identities(120)
+
+        identity = await self.cache.resolve_name('Player1')
+        self.assertIsNotNone(identity)
+        self.assertEqual(self.cache.stats.stale_hits, 1)
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(self.cache.bulk_calls), 2)
+        self.assertEqual(self.cache.stats.hits, 0)
+        await self.cache.resolve_name('Player1')
+        self.assertEqual(self.cache.stats.hits, 1)
+
+    async def test_expired_identity_resolved_again(self):
+        await self.cache.resolve_uuid(f'{1:032x}')
+        self.age_identities(7200)
+
+        await self.cache.resolve_uuid(f'{1:032x}')
+        self.assertEqual(len(self.cache.uuid_calls), 2)
+
+    async def test_renamed_name_moves_to_new_owner(self):
+        await self.cache.resolve_name('Player1')
+        self.age_identities(7200)
+
+        self.cache.players['Player1'] = f'{99:032x}'
+        identity = await self.cache.resolve_name('Player1')
+
+        self.assertEqual(identity.uuid, f'{99:032x}')
+        self.assertIsNone(self.cache._get_by_uuid(f'{1:032x}'))
+
+    async def test_dashed_uuid_normalized(self):
+        uuid = f'{1:032x}'
+        dashed = f'{uuid[:8]}-{uuid[8:12]}-{uuid[12:16]}-{uuid[16:20]}-{uuid[20:]}'
+
+        identity = await self.cache.resolve(dashed.upper())
+        self.assertEqual(identity.uuid, uuid)
+
+    async def test_errors_raised_to_every_waiter(self):
+        self.cache.error = ClientConnectionError()
+
+        results = await asyncio.gather(
+            self.cache.resolve_name('Player1'), self.cache.resolve_name('Player2'),
+            return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ClientConnectionError) for result in results))
+        self.assertEqual(len(self.cache.bulk_calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
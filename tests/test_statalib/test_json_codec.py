@@ -0,0 +1,49 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from statalib import json_codec
+from statalib.json_codec import (
+    STDLIB_JSON_CODEC,
+    async_json_loads,
+    get_json_codec,
+    json_dumps,
+    json_loads,
+    set_json_codec
+)
+
+
+class TestJSONCodec(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.original_codec = get_json_codec()
+
+    def tearDown(self) -> None:
+        set_json_codec(self.original_codec)
+
+
+    def test_round_trip(self):
+        data = {'success': True, 'player': {'displayname': 'Player', 'level': 1.5}}
+
+        assert json_loads(json_dumps(data)) == data
+        assert json_loads(json_dumps(data).decode()) == data
+
+    def test_stdlib_fallback(self):
+        set_json_codec(STDLIB_JSON_CODEC)
+
+        assert json_dumps({'a': [1, 2]}) == b'{"a":[1,2]}'
+        assert json_loads(b'{"a":[1,2]}') == {'a': [1, 2]}
+
+    def test_invalid_json_raises_decode_error(self):
+        for codec in (get_json_codec(), STDLIB_JSON_CODEC):
+            set_json_codec(codec)
+            with self.assertRaises(json.JSONDecodeError):
+                json_loads(b'<html>Bad Gateway</html>')
+
+    async def test_async_loads(self):
+        body = json_dumps({'a': 1})
+
+        with patch.object(json_codec, 'JSON_OFFLOAD_THRESHOLD', 1):
+            assert await async_json_loads(body) == {'a': 1}
+
+        with patch.object(json_codec, 'JSON_OFFLOAD_THRESHOLD', 10**6):
+            assert await async_json_loads(body) == {'a': 1}
@@ -0,0 +1,63 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from statalib.loop_lag import LoopLagConfig, LoopLagMonitor
+
+
+class TestLoopLagMonitor(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.monitor = LoopLagMonitor(
+            LoopLagConfig(interval=0.01, window=100, warn_threshold=0.1))
+
+    async def asyncTearDown(self) -> None:
+        await self.monitor.stop()
+
+
+    async def test_start_stop(self):
+        self.monitor.start()
+        self.assertTrue(self.monitor.running)
+
+        await asyncio.sleep(0.05)
+        await self.monitor.stop()
+
+        self.assertFalse(self.monitor.running)
+        self.assertGreater(self.monitor.stats.samples, 0)
+
+    async def test_blocking_call_recorded(self):
+        self.monitor.start()
+        await asyncio.sleep(0.02)
+
+        with patch('statalib.loop_lag.logger') as logger:
+            time.sleep(0.15)  # Blocks the event loop
+            await asyncio.sleep(0.03)
+
+        self.assertEqual(self.monitor.stats.stalls, 1)
+        self.assertGreaterEqual(self.monitor.stats.max_lag, 0.1)
+        logger.warning.assert_called_once()
+
+    def test_percentiles(self):
+        for lag in range(1, 101):
+            self.monitor._record(lag / 1000)
+
+        self.assertAlmostEqual(self.monitor.percentile(50), 0.0505)
+        self.assertEqual(self.monitor.snapshot()['max_ms'], 100)
+
+    def test_window(self):
+        for _ in range(150):
+            self.monitor._record(0.001)
+
+        self.assertEqual(len(self.monitor._lags), 100)
+        self.assertEqual(self.monitor.stats.samples, 150)
+
+    def test_reset(self):
+        self.monitor._record(0.5)
+        self.monitor.reset()
+
+        self.assertEqual(self.monitor.snapshot()['samples'], 0)
+        self.assertEqual(self.monitor.percentile(99), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import time
+import unittest
+
+from statalib.memory_cache import MemoryCache, MemoryCacheConfig
+
+
+class TestMemoryCache(unittest.TestCase):
+    def make_cache(self, max_bytes: int=100, ttl: float=300):
+        return MemoryCache('test', MemoryCacheConfig(max_bytes, ttl))
+
+
+    def test_get_set(self):
+        cache = self.make_cache()
+
+        assert cache.get('a') is None
+        cache.set('a', {'value': 1}, 10)
+
+        assert cache.get('a') == {'value': 1}
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.size == 10
+
+    def test_evicts_least_recently_used(self):
+        cache = self.make_cache(max_bytes=30)
+
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 10)
+        cache.set('c', 3, 10)
+        cache.get('a')
+        cache.set('d', 4, 10)
+
+        assert 'b' not in cache
+        assert all(key in cache for key in ('a', 'c', 'd'))
+        assert cache.stats.evictions == 1
+        assert cache.size == 30
+
+    def test_bounded_by_bytes(self):
+        cache = self.make_cache(max_bytes=30)
+
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 10)
+        cache.set('c', 3, 25)
+
+        assert len(cache) == 1
+        assert cache.stats.evictions == 2
+
+    def test_value_larger_than_cache_not_stored(self):
+        cache = self.make_cache(max_bytes=30)
+
+        cache.set('a', 1, 10)
+        cache.set('b', 2, 50)
+
+        assert 'a' in cache
+        assert 'b' not in cache
+
+    def test_replace_updates_size(self):
+        cache = self.make_cache()
+
+        cache.set('a', 1, 10)
+        cache.set('a', 2, 20)
+
+        assert cache.get('a') == 2
+        assert cache.size == 20
+
+    def test_expired_entries_missed(self):
+        cache = self.make_cache(ttl=0.05)
+
+        cache.set('a', 1, 10)
+        time.sleep(0.06)
+
+        assert cache.get('a') is None
+        assert cache.stats.expirations == 1
+        assert cache.size == 0
+
+    def test_ttl_capped_by_cache_ttl(self):
+        cache = self.make_cache(ttl=0.05)
+
+        cache.set('a', 1, 10, ttl=100)
+        cache.set('b', 2, 10, ttl=-1)
+        time.sleep(0.06)
+
+        assert 'a' not in cache
+        assert 'b' not in cache
@@ -0,0 +1,322 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from statalib.common import REL_PATH
+from statalib.database import connection_manager
+from statalib import migrations
+from statalib.migrations import (
+    MigrationError,
+    apply_migrations,
+    get_schema_version,
+    load_migrations
+)
+from statalib.stats_snapshot import (
+    SNAPSHOT_LAYOUTS,
+    BedwarsStatsSnapshot,
+    pack_snapshot_values,
+    snapshot_content_id
+)
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.db_fp = f'{self.tempdir.name}/test.db'
+        self.migrations_dir = f'{self.tempdir.name}/migrations'
+        os.mkdir(self.migrations_dir)
+
+    def tearDown(self) -> None:
+        connection_manager.close()
+        self.tempdir.cleanup()
+
+    def write_migration(self, filename: str, sql: str) -> None:
+        with open(f'{self.migrations_dir}/{filename}', 'w') as migration_file:
+            migration_file.write(sql)
+
+    def copy_repo_migration(self, name: str) -> None:
+        """Copy one of the repository's migrations as migration 1"""
+        for filename in os.listdir(f'{REL_PATH}/migrations'):
+            if filename.split('_', 1)[1].rsplit('.', 1)[0] == name:
+                shutil.copy(
+                    f'{REL_PATH}/migrations/{filename}',
+                    f"{self.migrations_dir}/0001_{filename.split('_', 1)[1]}")
+
+    def schema_version(self) -> int:
+        with sqlite3.connect(self.db_fp) as conn:
+            return get_schema_version(conn)
+
+
+    def test_load_order(self):
+        self.write_migration('0002_second.sql', '')
+        self.write_migration('0001_first.sql', '')
+        self.write_migration('README.md', '')
+
+        migrations = load_migrations(self.migrations_dir)
+        self.assertEqual([m.name for m in migrations], ['first', 'second'])
+
+    def test_load_gap(self):
+        self.write_migration('0001_first.sql', '')
+        self.write_migration('0003_third.sql', '')
+
+        with self.assertRaises(MigrationError):
+            load_migrations(self.migrations_dir)
+
+    def test_apply_pending_only(self):
+        self.write_migration('0001_create.sql', 'CREATE TABLE items (item TEXT);')
+
+        applied = apply_migrations(self.db_fp, self.migrations_dir)
+        self.assertEqual([m.version for m in applied], [1])
+
+        self.write_migration('0002_insert.sql', "INSERT INTO items VALUES ('item');")
+
+        applied = apply_migrations(self.db_fp, self.migrations_dir)
+        self.assertEqual([m.version for m in applied], [2])
+        self.assertEqual(apply_migrations(self.db_fp, self.migrations_dir), [])
+        self.assertEqual(self.schema_version(), 2)
+
+    def test_failed_migration_rolled_back(self):
+        self.write_migration('0001_create.sql', 'CREATE TABLE items (item TEXT);')
+        self.write_migration(
+            '0002_broken.sql',
+            "INSERT INTO items VALUES ('item');\nINSERT INTO missing VALUES (1);")
+
+        with self.assertRaises(MigrationError):
+            apply_migrations(self.db_fp, self.migrations_dir)
+
+        self.assertEqual(self.schema_version(), 1)
+        with sqlite3.connect(self.db_fp) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM items').fetchone()[0], 0)
+
+    def test_applied_concurrently(self):
+        self.write_migration('0001_create.sql', 'CREATE TABLE items (item TEXT);')
+        self.write_migration('0002_insert.py', (
+            'def migrate(conn):\n'
+            '    conn.execute("INSERT INTO items VALUES (1)")\n'))
+        apply_migrations(self.db_fp, self.migrations_dir)
+
+        # Another process applied them after the version was first read
+        versions = iter([0])
+
+        def get_schema_version(conn):
+            return next(versions, None) or real_get_schema_version(conn)
+
+        real_get_schema_version = migrations.get_schema_version
+        with patch.object(migrations, 'get_schema_version', get_schema_version):
+            self.assertEqual(apply_migrations(self.db_fp, self.migrations_dir), [])
+
+        with sqlite3.connect(self.db_fp) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM items').fetchone()[0], 1)
+
+    def test_permissions_primary_key(self):
+        with sqlite3.connect(self.db_fp) as conn:
+            conn.execute('CREATE TABLE permissions (discord_id INTEGER PRIMRAY KEY, permissions TEXT)')
+            conn.executemany(
+                'INSERT INTO permissions VALUES (?, ?)',
+                [(1, 'old'), (2, 'other'), (1, 'new')])
+
+        self.copy_repo_migration('permissions_primary_key')
+        apply_migrations(self.db_fp, self.migrations_dir)
+
+        with sqlite3.connect(self.db_fp) as conn:
+            rows = conn.execute('SELECT * FROM permissions ORDER BY discord_id').fetchall()
+            self.assertEqual(rows, [(1, 'new'), (2, 'other')])
+
+            with self.assertRaises(sqlite3.IntegrityError):
+                conn.execute("INSERT INTO permissions VALUES (1, 'duplicate')")
+
+    def test_python_migration(self):
+        self.write_migration('0001_create.sql', 'CREATE TABLE items (item TEXT);')
+        self.write_migration(
+            '0002_insert.py',
+            'def migrate(conn):\n'
+            '    conn.executemany("INSERT INTO items VALUES (?)", [("a",), ("b",)])\n')
+
+        applied = apply_migrations(self.db_fp, self.migrations_dir)
+
+        self.assertEqual([m.name for m in applied], ['create', 'insert'])
+        with sqlite3.connect(self.db_fp) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM items').fetchone()[0], 2)
+
+    def test_failed_python_migration_rolled_back(self):
+        self.write_migration('0001_create.sql', 'CREATE TABLE items (item TEXT);')
+        self.write_migration(
+            '0002_broken.py',
+            'def migrate(conn):\n'
+            '    conn.execute("INSERT INTO items VALUES (1)")\n'
+            '    raise ValueError\n')
+
+        with self.assertRaises(MigrationError):
+            apply_migrations(self.db_fp, self.migrations_dir)
+
+        self.assertEqual(self.schema_version(), 1)
+        with sqlite3.connect(self.db_fp) as conn:
+            self.assertEqual(conn.execute('SELECT COUNT(*) FROM items').fetchone()[0], 0)
+
+    def test_long_command_usage(self):
+        with sqlite3.connect(self.db_fp) as conn:
+            conn.execute(
+                'CREATE TABLE command_usage (discord_id INTEGER PRIMARY KEY, '
+                'overall INTEGER, bedwars INTEGER, session INTEGER)')
+            conn.executemany(
+                'INSERT INTO command_usage VALUES (?, ?, ?, ?)',
+                [(0, 5, 4, 1), (1, 4, 3, 1), (2, 1, 1, None)])
+
+        self.copy_repo_migration('long_command_usage')
+        apply_migrations(self.db_fp, self.migrations_dir)
+
+        with sqlite3.connect(self.db_fp) as conn:
+            rows = conn.execute(
+                'SELECT * FROM command_usage ORDER BY discord_id, command').fetchall()
+        self.assertEqual(rows, [
+            (0, 'bedwars', 4), (0, 'session', 1),
+            (1, 'bedwars', 3), (1, 'session', 1),
+            (2, 'bedwars', 1)])
+
+    def test_packed_stats_snapshots(self):
+        # Columns in another order, and one that a later layout added
+        keys = list(reversed(SNAPSHOT_LAYOUTS[1])) + ['added_later']
+
+        with sqlite3.connect(self.db_fp) as conn:
+            conn.execute(
+                f'CREATE TABLE bedwars_stats_snapshots (snapshot_id TEXT, {", ".join(keys)})')
+            conn.execute(
+                f'INSERT INTO bedwars_stats_snapshots VALUES ({", ".join("?" * (len(keys) + 1))})',
+                ('id', *range(len(keys))))
+
+        self.copy_repo_migration('packed_stats_snapshots')
+        apply_migrations(self.db_fp, self.migrations_dir)
+
+        with sqlite3.connect(self.db_fp) as conn:
+            layout_version, data = conn.execute(
+                'SELECT layout_version, data FROM bedwars_stats_snapshots_packed').fetchone()
+
+        snapshot = BedwarsStatsSnapshot.unpack('id', data, layout_version)
+        self.assertEqual(snapshot.Experience, keys.index('Experience'))
+        self.assertEqual(snapshot.wins_bedwars, keys.index('wins_bedwars'))
+
+    def test_shared_stats_snapshots(self):
+        zeros = pack_snapshot_values([0, 0])
+        stats = pack_snapshot_values([5, 10])
+
+        with sqlite3.connect(self.db_fp) as conn:
+            conn.executescript(
+                'CREATE TABLE session_info (session INTEGER, uuid TEXT, '
+                'snapshot_id TEXT NOT NULL UNIQUE, creation_timestamp REAL NOT NULL, '
+                'PRIMARY KEY (session, uuid));'
+                'CREATE TABLE historical_info (uuid TEXT, period_id TEXT, level REAL, '
+                'snapshot_id TEXT NOT NULL UNIQUE, PRIMARY KEY (uuid, period_id));'
+                'CREATE TABLE rotational_info (uuid TEXT NOT NULL, rotation TEXT NOT NULL, '
+                'last_reset_timestamp REAL, snapshot_id TEXT NOT NULL UNIQUE, '
+                'PRIMARY KEY (uuid, rotation));'
+                'CREATE TABLE bedwars_stats_snapshots_packed (snapshot_id TEXT NOT NULL '
+                'PRIMARY KEY, layout_version INTEGER NOT NULL, data BLOB NOT NULL) '
+                'WITHOUT ROWID;')
+            conn.executemany(
+                'INSERT INTO bedwars_stats_snapshots_packed VALUES (?, 1, ?)',
+                [('r1', stats), ('r2', stats), ('h1', zeros), ('h2', zeros),
+                 ('s1', stats), ('orphan', zeros)])
+            conn.executemany(
+                'INSERT INTO rotational_info VALUES (?, ?, 0, ?)',
+                [('abc', 'daily', 'r1'), ('abc', 'weekly', 'r2')])
+            conn.executemany(
+                'INSERT INTO historical_info VALUES (?, ?, 1, ?)',
+                [('abc', 'daily_1', 'h1'), ('abc', 'daily_2', 'h2')])
+            conn.execute("INSERT INTO session_info VALUES (1, 'abc', 'unpacked', 0)")
+
+        self.copy_repo_migration('shared_stats_snapshots')
+        apply_migrations(self.db_fp, self.migrations_dir)
+
+        stats_id, zeros_id = snapshot_content_id(stats), snapshot_content_id(zeros)
+
+        with sqlite3.connect(self.db_fp) as conn:
+            rows = conn.execute(
+                'SELECT snapshot_id, data, refcount FROM bedwars_stats_snapshots_packed '
+                'ORDER BY data').fetchall()
+            self.assertEqual(rows, [(zeros_id, zeros, 2), (stats_id, stats, 2)])
+
+            self.assertEqual(
+                conn.execute('SELECT DISTINCT snapshot_id FROM rotational_info').fetchall(),
+                [(stats_id,)])
+            self.assertEqual(
+                conn.execute('SELECT DISTINCT snapshot_id FROM historical_info').fetchall(),
+                [(zeros_id,)])
+            # Snapshots that weren't packed keep their IDs
+            self.assertEqual(
+                conn.execute('SELECT snapshot_id FROM session_info').fetchall(),
+                [('unpacked',)])
+
+    def test_snapshots_database(self):
+        with sqlite3.connect(self.db_fp) as conn:
+            conn.executescript(
+                'CREATE TABLE session_info (session INTEGER, uuid TEXT, '
+                'snapshot_id TEXT NOT NULL, PRIMARY KEY (session, uuid));'
+                'CREATE INDEX session_info_uuid ON session_info (uuid, session);'
+                "INSERT INTO session_info VALUES (1, 'abc', 'id');"
+                'CREATE TABLE accounts (discord_id INTEGER PRIMARY KEY);')
+
+        self.copy_repo_migration('snapshots_database')
+        apply_migrations(self.db_fp, self.migrations_dir)
+
+        with sqlite3.connect(f'{self.tempdir.name}/snapshots.db') as conn:
+            self.assertEqual(
+                conn.execute('SELECT * FROM session_info').fetchall(), [(1, 'abc', 'id')])
+            self.assertEqual(
+                conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'").fetchall(),
+                [('sqlite_autoindex_session_info_1',), ('session_info_uuid',)])
+
+        with sqlite3.connect(self.db_fp) as conn:
+            tables = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name != 'schema_version'").fetchall()
+        self.assertEqual(tables, [('accounts',)])
+
+        # Still found without naming the database
+        conn = connection_manager.connect(self.db_fp)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM session_info').fetchone()[0], 1)
+
+    def test_snapshots_database_concurrent_writes(self):
+        with sqlite3.connect(self.db_fp) as conn:
+            conn.execute(
+                'CREATE TABLE session_info (session INTEGER, uuid TEXT, '
+                'snapshot_id TEXT NOT NULL, PRIMARY KEY (session, uuid))')
+            conn.executemany(
+                'INSERT INTO session_info VALUES (?, ?, ?)',
+                [(1, 'abc', 'id'), (3, 'ghi', 'id'), (4, 'jkl', 'id')])
+
+        self.copy_repo_migration('snapshots_database')
+        migrate = load_migrations(self.migrations_dir)[0].migrate
+        db_fp = self.db_fp
+
+        class TrackerWritingConnection:
+            """Writes to the tables while the copied tables are committed"""
+            def __init__(self, conn: sqlite3.Connection) -> None:
+                self.conn = conn
+
+            def execute(self, *args):
+                return self.conn.execute(*args)
+
+            def commit(self):
+                self.conn.commit()
+                with sqlite3.connect(db_fp) as other:
+                    other.execute("INSERT INTO session_info VALUES (2, 'def', 'id')")
+                    other.execute("UPDATE session_info SET snapshot_id = 'new' WHERE session = 3")
+                    other.execute('DELETE FROM session_info WHERE session = 4')
+
+        conn = connection_manager.connect(self.db_fp)
+        conn.execute('BEGIN IMMEDIATE')
+        migrate(TrackerWritingConnection(conn))
+        conn.commit()
+
+        self.assertEqual(
+            conn.execute(
+                'SELECT session, snapshot_id FROM session_info ORDER BY session').fetchall(),
+            [(1, 'id'), (2, 'id'), (3, 'new')])
+
+
+if __name__ == '__main__':
+    unittest.main()
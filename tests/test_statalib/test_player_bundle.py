@@ -0,0 +1,151 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from statalib.discord_utils import interactions
+from statalib.discord_utils.interactions import fetch_player_bundle
+from statalib.errors import PlayerNotFoundError
+from statalib.identity_cache import PlayerIdentity
+from statalib.linking import set_linked_data
+
+from utils import clean_database
+
+
+PLAYER_UUID = 'a' * 31 + '1'
+LINKED_DISCORD_ID = 123456789012345678
+
+
+class FakeUser:
+    id = 1
+
+
+class FakeResponse:
+    def is_done(self) -> bool:
+        return True
+
+
+class FakeFollowup:
+    def __init__(self, messages: list[str]) -> None:
+        self.messages = messages
+
+    async def send(self, content: str, **kwargs) -> None:
+        await asyncio.sleep(0.01)
+        self.messages.append(content)
+
+
+class FakeInteraction:
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+        self.user = FakeUser()
+        self.response = FakeResponse()
+        self.followup = FakeFollowup(self.messages)
+
+    async def edit_original_response(self, content: str, **kwargs) -> None:
+        self.messages[0] = content
+
+
+class FakeIdentityCache:
+    """Resolves a single player after a delay, like an uncached Mojang lookup"""
+    def __init__(self) -> None:
+        self.resolved_at: float | None = None
+
+    async def resolve(self, identifier: str) -> PlayerIdentity | None:
+        await asyncio.sleep(0.05)
+        self.resolved_at = time.monotonic()
+
+        if identifier.lower() in ('player1', PLAYER_UUID):
+            return PlayerIdentity(PLAYER_UUID, 'Player1', time.time())
+        return None
+
+    async def resolve_uuid(self, uuid: str) -> PlayerIdentity | None:
+        return await self.resolve(uuid)
+
+
+class TestFetchPlayerBundle(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        clean_database()
+        self.interaction = FakeInteraction()
+        self.identity_cache = FakeIdentityCache()
+        self.fetched: dict[str, float] = {}
+        self.cancelled: list[str] = []
+
+        patches = [
+            patch.object(interactions, 'identity_cache', self.identity_cache),
+            patch.object(interactions, 'fetch_hypixel_data', self.fetch_hypixel_data),
+            patch.object(interactions, 'fetch_skin_model', self.fetch_skin_model),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def _fetch(self, kind: str, uuid: str):
+        self.fetched[kind] = time.monotonic()
+        try:
+            await asyncio.sleep(0.1)
+        except asyncio.CancelledError:
+            self.cancelled.append(kind)
+            raise
+        return {'player': {'uuid': uuid}} if kind == 'hypixel' else b'skin'
+
+    async def fetch_hypixel_data(self, uuid: str, **kwargs) -> dict:
+        return await self._fetch('hypixel', uuid)
+
+    async def fetch_skin_model(self, uuid: str, size: int) -> bytes:
+        return await self._fetch('skin', uuid)
+
+
+    async def test_known_uuid_fetched_before_name_resolved(self):
+        bundle = await fetch_player_bundle(PLAYER_UUID, self.interaction, 'Loading')
+
+        self.assertEqual(bundle.name, 'Player1')
+        self.assertEqual(bundle.hypixel_data, {'player': {'uuid': PLAYER_UUID}})
+        self.assertEqual(bundle.skin_model, b'skin')
+        self.assertLess(self.fetched['hypixel'], self.identity_cache.resolved_at)
+        self.assertLess(self.fetched['skin'], self.identity_cache.resolved_at)
+        self.assertEqual(self.interaction.messages, ['Loading'])
+
+    async def test_linked_player_fetched_before_name_resolved(self):
+        set_linked_data(LINKED_DISCORD_ID, PLAYER_UUID)
+
+        name, uuid, _, _ = await fetch_player_bundle(
+            str(LINKED_DISCORD_ID), self.interaction)
+
+        self.assertEqual((name, uuid), ('Player1', PLAYER_UUID))
+        self.assertLess(self.fetched['hypixel'], self.identity_cache.resolved_at)
+
+    async def test_name_fetched_after_resolution(self):
+        bundle = await fetch_player_bundle(
+            'player1', self.interaction, 'Loading', skin_size=None)
+
+        self.assertEqual(bundle.uuid, PLAYER_UUID)
+        self.assertIsNone(bundle.skin_model)
+        self.assertNotIn('skin', self.fetched)
+        self.assertGreaterEqual(self.fetched['hypixel'], self.identity_cache.resolved_at)
+
+    async def test_missing_player_cancels_fetches(self):
+        with self.assertRaises(PlayerNotFoundError):
+            await fetch_player_bundle('a' * 31 + '2', self.interaction, 'Loading')
+
+        self.assertCountEqual(self.cancelled, ['hypixel', 'skin'])
+        # The loading message is replaced by the error
+        self.assertEqual(self.interaction.messages, ['That player does not exist!'])
+
+    async def test_missing_name_without_loading_message(self):
+        with self.assertRaises(PlayerNotFoundError):
+            await fetch_player_bundle('Nobody', self.interaction)
+
+        self.assertEqual(self.fetched, {})
+        self.assertEqual(self.interaction.messages, ['That player does not exist!'])
+
+    async def test_not_linked(self):
+        with self.assertRaises(PlayerNotFoundError):
+            await fetch_player_bundle(None, self.interaction, 'Loading')
+
+        self.assertEqual(self.fetched, {})
+        self.assertEqual(len(self.interaction.messages), 1)
+        self.assertIn('You are not linked!', self.interaction.messages[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
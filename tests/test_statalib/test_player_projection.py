@@ -0,0 +1,61 @@
+import unittest
+
+from statalib.player_projection import project_hypixel_data
+
+
+class TestPlayerProjection(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hypixel_data = {
+            'success': True,
+            'player': {
+                'uuid': 'abc',
+                'displayname': 'Player',
+                'newPackageRank': 'MVP_PLUS',
+                'rankPlusColor': 'RED',
+                'stats': {
+                    'Bedwars': {'Experience': 500, 'wins_bedwars': 2},
+                    'SkyWars': {'wins': 5}
+                },
+                'achievements': {'bedwars_level': 1, 'skywars_wins': 5},
+                'achievementsOneTime': ['general_first_join'],
+                'quests': {
+                    'bedwars_daily_win': {'completions': [{'time': 1}]},
+                    'skywars_solo_win': {'completions': [{'time': 2}]}
+                },
+                'socialMedia': {'links': {'DISCORD': 'player', 'YOUTUBE': 'yt'}}
+            }
+        }
+
+
+    def test_keeps_used_fields(self):
+        player = project_hypixel_data(self.hypixel_data)['player']
+
+        assert player['uuid'] == 'abc'
+        assert player['displayname'] == 'Player'
+        assert player['newPackageRank'] == 'MVP_PLUS'
+        assert player['rankPlusColor'] == 'RED'
+        assert player['stats'] == {'Bedwars': {'Experience': 500, 'wins_bedwars': 2}}
+        assert player['achievements'] == {'bedwars_level': 1}
+        assert player['socialMedia'] == {'links': {'DISCORD': 'player'}}
+        assert list(player['quests']) == ['bedwars_daily_win']
+
+    def test_drops_unused_fields(self):
+        player = project_hypixel_data(self.hypixel_data)['player']
+
+        assert 'achievementsOneTime' not in player
+        assert 'SkyWars' not in player['stats']
+
+    def test_missing_fields_not_added(self):
+        projected = project_hypixel_data({'success': True, 'player': {'uuid': 'abc'}})
+        assert projected == {'success': True, 'player': {'uuid': 'abc'}}
+
+    def test_non_player_responses_unchanged(self):
+        throttled = {'success': False, 'cause': 'Key throttle', 'throttle': True}
+        assert project_hypixel_data(throttled) == throttled
+
+        no_player = {'success': True, 'player': None}
+        assert project_hypixel_data(no_player) == no_player
+
+    def test_original_not_modified(self):
+        project_hypixel_data(self.hypixel_data)
+        assert 'SkyWars' in self.hypixel_data['player']['stats']
@@ -0,0 +1,58 @@
+import unittest
+
+from statalib.functions import db_connect
+
+
+# Queries made on most interactions, none of which may scan a whole table
+HOT_QUERIES = {
+    'uuid_to_discord_id': ("SELECT discord_id FROM linked_accounts WHERE uuid = ?", ('uuid',)),
+    'get_linked_player': ("SELECT * FROM linked_accounts WHERE discord_id = ?", (1,)),
+    'autofill_lookup': ("SELECT * FROM autofill WHERE discord_id = ?", (1,)),
+    'username_autocomplete': (
+        "SELECT * FROM autofill WHERE username LIKE ? ESCAPE '\\' LIMIT 25", ('abc%',)),
+    'account': ("SELECT * FROM accounts WHERE discord_id = ?", (1,)),
+    'permissions': ("SELECT permissions FROM permissions WHERE discord_id = ?", (1,)),
+    'active_subscription': ("SELECT * FROM subscriptions_active WHERE discord_id = ?", (1,)),
+    'paused_subscriptions': (
+        "SELECT package, duration_remaining, id FROM subscriptions_paused "
+        "WHERE discord_id = ?", (1,)),
+    'growth_since': ("SELECT * FROM growth_data WHERE timestamp >= ?", (0,)),
+    'active_sessions': (
+        "SELECT session FROM session_info WHERE uuid = ? ORDER BY session ASC", ('uuid',)),
+    'rotational_info': (
+        "SELECT * FROM rotational_info WHERE uuid = ? AND rotation = ?", ('uuid', 'daily')),
+    'historical_info': (
+        "SELECT * FROM historical_info WHERE uuid = ? AND period_id = ?", ('uuid', 'id')),
+    'stats_snapshot': (
+        "SELECT * FROM bedwars_stats_snapshots WHERE snapshot_id = ?", ('id',)),
+    'packed_stats_snapshot': (
+        "SELECT layout_version, data FROM bedwars_stats_snapshots_packed "
+        "WHERE snapshot_id = ?", ('id',)),
+    'default_reset_time': ("SELECT * FROM default_reset_times WHERE uuid = ?", ('uuid',)),
+    'configured_reset_time': (
+        "SELECT * FROM configured_reset_times WHERE discord_id = ?", (1,)),
+    'command_usage': (
+        "SELECT command, count FROM command_usage WHERE discord_id = ? ORDER BY count DESC",
+        (1,)),
+    'commands_ran': ("SELECT SUM(count) FROM command_usage WHERE discord_id = ?", (1,)),
+    'identity_by_name': (
+        "SELECT uuid, name, verified_at FROM player_identities "
+        "WHERE name_lower = ? ORDER BY verified_at DESC LIMIT 1", ('name',)),
+}
+
+
+class TestQueryPlans(unittest.TestCase):
+    def test_no_full_scans(self):
+        with db_connect() as conn:
+            for name, (query, params) in HOT_QUERIES.items():
+                plan = conn.execute(f'EXPLAIN QUERY PLAN {query}', params).fetchall()
+                details = [row[3] for row in plan]
+
+                with self.subTest(query=name):
+                    self.assertFalse(
+                        any(detail.startswith('SCAN') for detail in details),
+                        f'{name} scans a table: {details}')
+
+
+if __name__ == '__main__':
+    unittest.main()
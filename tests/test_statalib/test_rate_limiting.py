@@ -0,0 +1,118 @@
+import asyncio
+import time
+import unittest
+
+from statalib.rate_limiting import (
+    HeaderRateLimiter,
+    RateLimitConfig,
+    RequestPriority
+)
+
+
+def rate_limit_headers(limit: int, remaining: int, reset: int) -> dict:
+    return {
+        'RateLimit-Limit': str(limit),
+        'RateLimit-Remaining': str(remaining),
+        'RateLimit-Reset': str(reset)
+    }
+
+
+class TestHeaderRateLimiter(unittest.IsolatedAsyncioTestCase):
+    def make_limiter(self, limit: int=10, window: float=1, reserve: int=0):
+        return HeaderRateLimiter(
+            'test', RateLimitConfig(limit, window, background_reserve=reserve))
+
+
+    async def test_acquire_within_limit(self):
+        limiter = self.make_limiter(limit=5)
+
+        start = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire()
+            limiter.release()
+
+        assert time.monotonic() - start < 0.05
+
+    async def test_acquire_waits_for_refill(self):
+        limiter = self.make_limiter(limit=10, window=1)
+        for _ in range(10):
+            await limiter.acquire()
+
+        start = time.monotonic()
+        await limiter.acquire()
+
+        # One token refills every 0.1 seconds
+        assert 0.05 < time.monotonic() - start < 0.3
+
+    async def test_headers_override_tokens(self):
+        limiter = self.make_limiter(limit=10)
+
+        await limiter.acquire()
+        limiter.update_from_headers(rate_limit_headers(120, 3, 60))
+
+        assert 2.9 < limiter.tokens < 3.1
+
+    async def test_exhausted_headers_block(self):
+        limiter = self.make_limiter(limit=10)
+
+        await limiter.acquire()
+        limiter.update_from_headers(rate_limit_headers(10, 0, 0.2))
+
+        assert limiter.blocked_for > 0
+
+        start = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.15
+        assert limiter.tokens > 8
+
+    async def test_missing_headers_ignored(self):
+        limiter = self.make_limiter(limit=10)
+
+        await limiter.acquire()
+        limiter.update_from_headers({})
+
+        assert limiter.blocked_for == 0
+        assert limiter.tokens > 8
+
+    async def test_background_respects_reserve(self):
+        limiter = self.make_limiter(limit=10, window=1, reserve=9)
+
+        await limiter.acquire(RequestPriority.BACKGROUND)
+
+        start = time.monotonic()
+        await limiter.acquire(RequestPriority.INTERACTIVE)
+        assert time.monotonic() - start < 0.05
+
+        start = time.monotonic()
+        await limiter.acquire(RequestPriority.BACKGROUND)
+        assert time.monotonic() - start >= 0.1
+
+    async def test_reserve_synced_from_headers(self):
+        # Another process used most of the key's quota
+        limiter = self.make_limiter(limit=10, window=1)
+        limiter.background_reserve = 5
+
+        await limiter.acquire(RequestPriority.BACKGROUND)
+        limiter.update_from_headers(rate_limit_headers(10, 5, 1))
+
+        start = time.monotonic()
+        await limiter.acquire(RequestPriority.BACKGROUND)
+        assert time.monotonic() - start >= 0.05
+
+    async def test_interactive_preempts_background(self):
+        limiter = self.make_limiter(limit=2, window=0.4)
+        for _ in range(2):
+            await limiter.acquire()
+
+        order = []
+
+        async def acquire(priority: RequestPriority):
+            await limiter.acquire(priority)
+            order.append(priority)
+
+        background = asyncio.ensure_future(acquire(RequestPriority.BACKGROUND))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(acquire(RequestPriority.INTERACTIVE))
+
+        await asyncio.gather(background, interactive)
+        assert order[0] == RequestPriority.INTERACTIVE
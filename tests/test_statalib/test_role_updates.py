@@ -0,0 +1,195 @@
+import asyncio
+import json
+import unittest
+
+from statalib.cfg import config
+from statalib.role_updates import (
+    RoleUpdateConfig,
+    RoleUpdateDispatcher,
+    role_update_dispatcher
+)
+from statalib.subscriptions import Subscription, SubscriptionManager
+
+from utils import clean_database, MockData
+
+
+class UtilsStandIn:
+    """Local stand-in for the utils app's socket server."""
+    def __init__(self) -> None:
+        self.events: list[list] = []
+        self.connections = 0
+        self.received = asyncio.Event()
+        self._writers: list[asyncio.StreamWriter] = []
+
+    async def start(self, port: int=0) -> int:
+        self.server = await asyncio.start_server(self._handle, '127.0.0.1', port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.append(writer)
+
+        while line := await reader.readline():
+            self.events.append(json.loads(line)['args'])
+            self.received.set()
+
+    async def disconnect_clients(self) -> None:
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+        await asyncio.sleep(0.01)
+
+    async def stop(self) -> None:
+        await self.disconnect_clients()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def wait_for_events(self, count: int) -> None:
+        while len(self.events) < count:
+            self.received.clear()
+            await asyncio.wait_for(self.received.wait(), 2)
+
+
+class TestRoleUpdateDispatcher(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.utils = UtilsStandIn()
+        port = await self.utils.start()
+        self.dispatcher = RoleUpdateDispatcher(RoleUpdateConfig(
+            host='127.0.0.1', port=port, flush_interval=0.01, persistent_connection=True))
+
+    async def asyncTearDown(self) -> None:
+        await self.dispatcher.stop()
+        await self.utils.stop()
+
+
+    async def test_coalesced(self):
+        self.dispatcher.dispatch(1, Subscription('basic', 100))
+        self.dispatcher.dispatch(1, Subscription('pro', 200))
+        self.dispatcher.dispatch(2, Subscription('free', None))
+
+        self.assertTrue(await self.dispatcher.flush())
+        await self.utils.wait_for_events(2)
+
+        self.assertEqual(self.utils.events, [[1, 'pro', 200], [2, 'free', None]])
+        self.assertEqual(self.dispatcher.stats.coalesced, 1)
+        self.assertEqual(self.dispatcher.stats.batches, 1)
+
+    async def test_unchanged_not_sent(self):
+        self.dispatcher.dispatch(1, Subscription('pro', None))
+        await self.dispatcher.flush()
+
+        self.dispatcher.dispatch(1, Subscription('pro', None))
+        self.assertEqual(self.dispatcher.pending, 0)
+
+        # Changed and changed back before being sent
+        self.dispatcher.dispatch(1, Subscription('free', None))
+        self.dispatcher.dispatch(1, Subscription('pro', None))
+        await self.dispatcher.flush()
+
+        await self.utils.wait_for_events(1)
+        self.assertEqual(self.utils.events, [[1, 'pro', None]])
+        self.assertEqual(self.dispatcher.stats.unchanged, 2)
+
+    async def test_persistent_connection(self):
+        for package in ('basic', 'pro'):
+            self.dispatcher.dispatch(1, Subscription(package, None))
+            await self.dispatcher.flush()
+
+        await self.utils.wait_for_events(2)
+        self.assertEqual(self.utils.connections, 1)
+
+    async def test_reconnects(self):
+        self.dispatcher.dispatch(1, Subscription('basic', None))
+        await self.dispatcher.flush()
+        await self.utils.wait_for_events(1)
+
+        await self.utils.disconnect_clients()
+
+        self.dispatcher.dispatch(1, Subscription('pro', None))
+        self.assertTrue(await self.dispatcher.flush())
+        await self.utils.wait_for_events(2)
+        self.assertEqual(self.utils.connections, 2)
+
+    async def test_utils_offline(self):
+        port = self.dispatcher.config.port
+        await self.utils.stop()
+
+        self.dispatcher.dispatch(1, Subscription('pro', None))
+        self.assertFalse(await self.dispatcher.flush())
+        self.assertEqual(self.dispatcher.pending, 1)
+
+        # Kept and sent once the utils app is back
+        await self.utils.start(port)
+        self.assertTrue(await self.dispatcher.flush())
+        await self.utils.wait_for_events(1)
+        self.assertEqual(self.utils.events, [[1, 'pro', None]])
+
+    async def test_dispatched_from_threads(self):
+        self.dispatcher.start()
+
+        await asyncio.gather(*(
+            asyncio.to_thread(self.dispatcher.dispatch, discord_id, Subscription('pro', None))
+            for discord_id in range(10)
+        ))
+
+        await self.utils.wait_for_events(10)
+        self.assertEqual(sorted(event[0] for event in self.utils.events), list(range(10)))
+
+
+class TestPerConnectionRoleUpdates(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.utils = UtilsStandIn()
+        port = await self.utils.start()
+        self.dispatcher = RoleUpdateDispatcher(
+            RoleUpdateConfig(host='127.0.0.1', port=port, flush_interval=0.01))
+
+    async def asyncTearDown(self) -> None:
+        await self.dispatcher.stop()
+        await self.utils.stop()
+
+
+    async def test_connection_per_update(self):
+        self.dispatcher.dispatch(1, Subscription('basic', 100))
+        self.dispatcher.dispatch(1, Subscription('pro', 200))
+        self.dispatcher.dispatch(2, Subscription('free', None))
+
+        self.assertTrue(await self.dispatcher.flush())
+        await self.utils.wait_for_events(2)
+
+        self.assertEqual(self.utils.events, [[1, 'pro', 200], [2, 'free', None]])
+        self.assertEqual(self.utils.connections, 2)
+
+    async def test_utils_offline(self):
+        await self.utils.stop()
+
+        self.dispatcher.dispatch(1, Subscription('pro', None))
+        self.assertFalse(await self.dispatcher.flush())
+        self.assertEqual(self.dispatcher.pending, 1)
+
+    async def test_warns_if_not_running(self):
+        with self.assertLogs('statalytics', 'WARNING'):
+            self.dispatcher.dispatch(1, Subscription('pro', None))
+
+        self.dispatcher.start()
+        with self.assertNoLogs('statalytics', 'WARNING'):
+            self.dispatcher.dispatch(2, Subscription('pro', None))
+
+
+class TestSubscriptionRoleUpdates(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+        config.SHOULD_UPDATE_SUBSCRIPTION_ROLES = True
+
+    def tearDown(self) -> None:
+        config.SHOULD_UPDATE_SUBSCRIPTION_ROLES = False
+        role_update_dispatcher._take()
+
+    def test_get_subscription_queues(self):
+        SubscriptionManager(MockData.discord_id).get_subscription()
+        SubscriptionManager(MockData.discord_id).get_subscription()
+
+        self.assertEqual(role_update_dispatcher.pending, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
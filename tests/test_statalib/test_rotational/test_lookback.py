@@ -62,3 +62,7 @@ class TestGetMaxLookback(unittest.TestCase):
     def test_no_users(self):
         max_lookback = get_max_lookback([])
         assert max_lookback == 30
+
+    def test_unlinked_player(self):
+        max_lookback = get_max_lookback([None])
+        assert max_lookback == 30
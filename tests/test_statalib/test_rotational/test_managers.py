@@ -1,12 +1,17 @@
 from datetime import UTC, datetime
 import unittest
 
+from statalib.database import count_queries
+from statalib.errors import DataNotFoundError
+from statalib.functions import db_connect
 from statalib.rotational_stats import (
     RotationalStatsManager,
     RotationType,
     HistoricalRotationPeriodID,
-    RotationalResetting
+    RotationalResetting,
+    get_rotations
 )
+from statalib.stats_snapshot import BedwarsStatsSnapshot
 
 from utils import clean_database, MockData
 
@@ -47,6 +52,68 @@ class TestGetRotationalData(unittest.TestCase):
             RotationType.YEARLY).data.final_kills_bedwars == 0
 
 
+class TestGetRotations(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+        RotationalStatsManager(MockData.uuid) \
+            .initialize_rotational_tracking(mock_hypixel_data_1)
+        RotationalStatsManager('def') \
+            .initialize_rotational_tracking(mock_hypixel_data_2)
+
+    def test_all_rotations(self):
+        with count_queries() as counter:
+            rotations = RotationalStatsManager(MockData.uuid).get_rotations()
+
+        self.assertEqual(set(rotations), set(RotationType))
+        self.assertEqual(rotations[RotationType.WEEKLY].rotation, 'weekly')
+        self.assertEqual(counter.queries, 1)
+
+    def test_players_and_rotations(self):
+        rotation_types = [RotationType.DAILY, RotationType.YEARLY]
+
+        with count_queries() as counter:
+            rotations = get_rotations([MockData.uuid, 'def', 'untracked'], rotation_types)
+
+        self.assertEqual(set(rotations), {MockData.uuid, 'def'})
+        self.assertEqual(set(rotations['def']), set(rotation_types))
+        self.assertEqual(
+            rotations['def'][RotationType.YEARLY].data.final_kills_bedwars, 1)
+        self.assertEqual(
+            rotations[MockData.uuid][RotationType.DAILY].data.final_kills_bedwars, 0)
+        self.assertEqual(counter.queries, 1)
+
+    def test_column_snapshots(self):
+        # Snapshots written before packing, which the join doesn't find
+        values = range(len(BedwarsStatsSnapshot.keys(include_snapshot_id=False)))
+        column_names = ', '.join(BedwarsStatsSnapshot.keys())
+
+        with db_connect() as conn:
+            conn.execute(
+                f"INSERT INTO bedwars_stats_snapshots ({column_names}) "
+                f"VALUES ('columns', {', '.join('?' * len(values))})", tuple(values))
+            conn.execute(
+                "UPDATE rotational_info SET snapshot_id = 'columns' "
+                "WHERE uuid = ? AND rotation = 'monthly'", (MockData.uuid,))
+
+        rotation = RotationalStatsManager(MockData.uuid) \
+            .get_rotational_data(RotationType.MONTHLY)
+        self.assertEqual(rotation.data.as_tuple(), ('columns', *values))
+
+    def test_missing_snapshot(self):
+        with db_connect() as conn:
+            conn.execute(
+                "UPDATE rotational_info SET snapshot_id = 'missing' WHERE uuid = ?",
+                (MockData.uuid,))
+
+        with self.assertRaises(DataNotFoundError):
+            RotationalStatsManager(MockData.uuid).get_rotations()
+
+    def test_no_rotations(self):
+        self.assertEqual(get_rotations([]), {})
+        self.assertEqual(get_rotations([MockData.uuid], []), {})
+
+
 class TestGetHistoricalRotationalData(unittest.TestCase):
     manager = RotationalStatsManager(MockData.uuid)
 
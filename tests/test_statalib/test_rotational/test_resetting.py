@@ -2,8 +2,10 @@ import unittest
 from datetime import datetime, UTC
 
 from statalib import PermissionManager
+from statalib.functions import db_connect
 from statalib.rotational_stats import (
     has_auto_reset_access,
+    reset_rotational_stats_if_whitelisted,
     RotationalStatsManager,
     RotationType,
     HistoricalRotationPeriodID,
@@ -88,3 +90,55 @@ class TestRotationalResetting(unittest.TestCase):
 
         result = self.manager.get_rotational_data(RotationType.DAILY)
         assert result.data.final_kills_bedwars == 1  # New data
+
+    def test_refresh_keeps_other_rotations(self):
+        self.manager.initialize_rotational_tracking(mock_hypixel_data_1)
+
+        RotationalResetting(MockData.uuid) \
+            .refresh_rotational_data(RotationType.DAILY, mock_hypixel_data_2)
+
+        # Rotations initialized together share their snapshot
+        result = self.manager.get_rotational_data(RotationType.WEEKLY)
+        assert result.data.final_kills_bedwars == 0  # Old data
+
+    def test_inactive_periods_shared(self):
+        resetting = RotationalResetting(MockData.uuid)
+        self.manager.initialize_rotational_tracking(mock_hypixel_data_1)
+
+        snapshot_ids = {
+            resetting.archive_rotational_data(
+                HistoricalRotationPeriodID(
+                    RotationType.DAILY, datetime(2025, 1, day, tzinfo=UTC)),
+                mock_hypixel_data_1)
+            for day in range(1, 4)
+        }
+        assert len(snapshot_ids) == 1
+
+
+class TestManualResetting(unittest.TestCase):
+    manager = RotationalStatsManager(MockData.uuid)
+
+    def setUp(self) -> None:
+        clean_database()
+        self.manager.initialize_rotational_tracking(mock_hypixel_data_1)
+
+    def test_resets_due_rotations(self):
+        # Last reset 8 days ago, due for a daily and weekly reset
+        with db_connect() as conn:
+            conn.execute(
+                "UPDATE rotational_info SET last_reset_timestamp = ? "
+                "WHERE rotation IN ('daily', 'weekly')",
+                (datetime.now(UTC).timestamp() - 86400 * 8,))
+
+        reset_rotational_stats_if_whitelisted(MockData.uuid, mock_hypixel_data_2)
+
+        with db_connect() as conn:
+            period_ids = [row[0] for row in conn.execute(
+                "SELECT period_id FROM historical_info ORDER BY period_id")]
+        assert [period_id.split('_')[0] for period_id in period_ids] \
+            == ['daily', 'weekly']
+
+        rotations = self.manager.get_rotations()
+        assert rotations[RotationType.DAILY].data.final_kills_bedwars == 1
+        assert rotations[RotationType.WEEKLY].data.final_kills_bedwars == 1
+        assert rotations[RotationType.MONTHLY].data.final_kills_bedwars == 0
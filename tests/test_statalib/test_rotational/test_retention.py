@@ -0,0 +1,150 @@
+import unittest
+from datetime import date, timedelta
+
+from statalib.functions import db_connect
+from statalib.linking import set_linked_data
+from statalib.rotational_stats import (
+    HistoricalRetention,
+    HistoricalRetentionConfig,
+    HistoricalRotationPeriodID,
+    RotationalResetting,
+    RotationalStatsManager,
+    RotationType,
+    get_max_lookback
+)
+from statalib.stats_snapshot import BedwarsStatsSnapshot, store_snapshot
+from statalib.subscriptions import SubscriptionManager
+
+from utils import clean_database, MockData
+
+
+STAT_COUNT = len(BedwarsStatsSnapshot.keys(include_snapshot_id=False))
+
+
+def add_period(
+    period_id: str,
+    wins: int,
+    rolled_up: int=0,
+    uuid: str=MockData.uuid
+) -> None:
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        snapshot_id = store_snapshot(cursor, [0, wins] + [0] * (STAT_COUNT - 2))
+        cursor.execute(
+            'INSERT INTO historical_info (uuid, period_id, level, snapshot_id, rolled_up) '
+            'VALUES (?, ?, ?, ?, ?)', (uuid, period_id, 1, snapshot_id, rolled_up))
+
+
+def add_days(start: date, days: int, wins: int=1, uuid: str=MockData.uuid) -> None:
+    for day in range(days):
+        add_period(
+            (start + timedelta(days=day)).strftime('daily_%Y_%m_%d'), wins, uuid=uuid)
+
+
+def period_ids(uuid: str=MockData.uuid) -> list[str]:
+    with db_connect() as conn:
+        return [row[0] for row in conn.execute(
+            'SELECT period_id FROM historical_info WHERE uuid = ? ORDER BY period_id',
+            (uuid,))]
+
+
+def period_wins(period_id: str) -> int | None:
+    historical = RotationalStatsManager(MockData.uuid) \
+        .get_historical_rotation_data(period_id)
+    return historical.data.wins_bedwars if historical else None
+
+
+class TestHistoricalRetention(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+    def retention(self, today: date) -> HistoricalRetention:
+        return HistoricalRetention(
+            HistoricalRetentionConfig(batch_size=2, grace_days=0), today)
+
+    def today_after(self, last_day: date) -> date:
+        """A date after which every day up to `last_day` is past the lookback"""
+        return last_day + timedelta(days=get_max_lookback([]) + 1)
+
+    def test_folds_old_days(self):
+        # Sunday the 5th to Saturday the 11th, week 1 of 2025
+        add_days(date(2025, 1, 5), 7)
+        recent = date(2025, 1, 12)
+        add_days(recent, 1)
+
+        result = self.retention(self.today_after(recent - timedelta(days=1))).run()
+
+        self.assertEqual(result.folded_periods, 7)
+        self.assertEqual(result.rolled_up_periods, 2)
+        self.assertGreater(result.freed_bytes, 0)
+        self.assertEqual(
+            period_ids(), ['daily_2025_01_12', 'monthly_2025_01', 'weekly_2025_01'])
+        self.assertEqual(period_wins('weekly_2025_01'), 7)
+        self.assertEqual(period_wins('monthly_2025_01'), 7)
+
+    def test_keeps_archived_periods(self):
+        add_days(date(2025, 1, 5), 7)
+        add_period('weekly_2025_01', wins=100)
+
+        self.retention(self.today_after(date(2025, 1, 11))).run()
+
+        self.assertEqual(period_wins('weekly_2025_01'), 100)
+        self.assertEqual(period_wins('monthly_2025_01'), 7)
+
+    def test_adds_to_rolled_up_periods(self):
+        add_days(date(2025, 1, 5), 7)
+
+        self.retention(self.today_after(date(2025, 1, 8))).run()
+        self.assertEqual(period_wins('weekly_2025_01'), 4)
+
+        self.retention(self.today_after(date(2025, 1, 11))).run()
+        self.assertEqual(period_wins('weekly_2025_01'), 7)
+        self.assertEqual(period_wins('monthly_2025_01'), 7)
+
+    def test_dry_run(self):
+        add_days(date(2025, 1, 5), 7)
+        add_days(date(2025, 1, 5), 7, wins=2, uuid='def')
+        before = period_ids(), period_ids('def')
+        retention = self.retention(self.today_after(date(2025, 1, 11)))
+
+        dry_result = retention.run(dry_run=True)
+        self.assertEqual((period_ids(), period_ids('def')), before)
+
+        result = retention.run()
+        self.assertEqual(dry_result.folded_periods, result.folded_periods)
+        self.assertEqual(dry_result.freed_bytes, result.freed_bytes)
+
+    def test_unlimited_lookback_kept(self):
+        set_linked_data(MockData.discord_id, MockData.uuid)
+        SubscriptionManager(MockData.discord_id).add_subscription('pro', update_roles=False)
+        add_days(date(2025, 1, 5), 7)
+
+        result = self.retention(self.today_after(date(2025, 1, 11))).run()
+
+        self.assertEqual(result.folded_periods, 0)
+        self.assertEqual(len(period_ids()), 7)
+
+
+    def test_reset_after_roll_up(self):
+        add_days(date(2025, 1, 5), 7)
+        self.retention(self.today_after(date(2025, 1, 11))).run()
+
+        # The monthly reset of a player that isn't reset automatically
+        manager = RotationalStatsManager(MockData.uuid)
+        manager.initialize_rotational_tracking({})
+        RotationalResetting(MockData.uuid).archive_rotational_data(
+            HistoricalRotationPeriodID(RotationType.MONTHLY, date(2025, 1, 31)),
+            {"player": {"stats": {"Bedwars": {"wins_bedwars": 20}}}})
+
+        self.assertEqual(period_wins('monthly_2025_01'), 20)
+        with db_connect() as conn:
+            self.assertEqual(conn.execute(
+                "SELECT rolled_up FROM historical_info WHERE period_id = 'monthly_2025_01'"
+            ).fetchone()[0], 0)
+            # The rolled up snapshot was released
+            self.assertEqual(conn.execute(
+                'SELECT COUNT(*) FROM bedwars_stats_snapshots_packed').fetchone()[0], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
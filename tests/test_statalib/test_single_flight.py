@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from statalib.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.group = SingleFlight('test')
+        self.call_count = 0
+
+    async def fetch(self, value: int) -> int:
+        self.call_count += 1
+        await asyncio.sleep(0.01)
+        return value
+
+    async def fail(self) -> None:
+        self.call_count += 1
+        await asyncio.sleep(0.01)
+        raise ValueError('upstream failed')
+
+
+    async def test_concurrent_calls_coalesced(self):
+        results = await asyncio.gather(
+            *[self.group.do('abc', self.fetch, 1) for _ in range(5)])
+
+        assert results == [1] * 5
+        assert self.call_count == 1
+        assert self.group.stats.calls == 5
+        assert self.group.stats.coalesced == 4
+        assert self.group.in_flight == 0
+
+    async def test_different_keys_not_coalesced(self):
+        results = await asyncio.gather(
+            self.group.do('abc', self.fetch, 1),
+            self.group.do('def', self.fetch, 2))
+
+        assert results == [1, 2]
+        assert self.call_count == 2
+        assert self.group.stats.coalesced == 0
+
+    async def test_sequential_calls_not_coalesced(self):
+        await self.group.do('abc', self.fetch, 1)
+        await self.group.do('abc', self.fetch, 1)
+
+        assert self.call_count == 2
+
+    async def test_exception_shared(self):
+        results = await asyncio.gather(
+            self.group.do('abc', self.fail),
+            self.group.do('abc', self.fail),
+            return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert self.call_count == 1
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        first = asyncio.ensure_future(self.group.do('abc', self.fetch, 1))
+        second = asyncio.ensure_future(self.group.do('abc', self.fetch, 1))
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        assert await second == 1
+        assert self.call_count == 1
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import time
+import unittest
+from io import BytesIO
+
+from PIL import Image
+
+from statalib.render.skins import (
+    RENDERABLE_SKIN_STYLES,
+    SkinRenderCache,
+    default_skin_variant,
+    render_skin_model,
+    skin_texture_hash
+)
+
+
+FACE_COLOR = (200, 150, 100, 255)
+HAT_COLOR = (250, 250, 0, 255)
+
+
+def make_texture(size: tuple[int, int]=(64, 64), hat: bool=False) -> bytes:
+    texture = Image.new('RGBA', size, (90, 90, 90, 255))
+    # Front of the head
+    texture.paste(FACE_COLOR, (8, 8, 16, 16))
+    # Hat layer, transparent apart from its front
+    texture.paste((0, 0, 0, 0), (32, 0, 64, 16))
+    if hat:
+        texture.paste(HAT_COLOR, (40, 8, 48, 16))
+
+    texture_bytes = BytesIO()
+    texture.save(texture_bytes, format='PNG')
+    return texture_bytes.getvalue()
+
+
+def open_render(render: bytes) -> Image.Image:
+    return Image.open(BytesIO(render)).convert('RGBA')
+
+
+class TestRenderSkinModel(unittest.TestCase):
+    def test_render_sizes(self):
+        texture = make_texture()
+
+        for style in RENDERABLE_SKIN_STYLES:
+            image = open_render(render_skin_model(texture, style, 128))
+
+            if style in ('skin', 'processedskin'):
+                self.assertEqual(image.size, (64, 64))
+            elif style in ('full', 'frontfull'):
+                self.assertEqual(image.height, 128)
+                self.assertLess(image.width, 128)
+            else:
+                self.assertEqual(image.size, (128, 128))
+
+    def test_face_is_front_of_head(self):
+        image = open_render(render_skin_model(make_texture(), 'face', 64))
+        self.assertEqual(image.getpixel((32, 32))[3], 255)
+        # Flat faces are shaded slightly, but keep their hue
+        red, green, blue, _ = image.getpixel((32, 32))
+        self.assertGreater(red, green)
+        self.assertGreater(green, blue)
+
+    def test_transparent_hat_shows_face(self):
+        without_hat = open_render(render_skin_model(make_texture(), 'face', 64))
+        with_hat = open_render(render_skin_model(make_texture(hat=True), 'face', 64))
+
+        self.assertNotEqual(without_hat.getpixel((32, 32)), with_hat.getpixel((32, 32)))
+        self.assertEqual(with_hat.getpixel((32, 32))[2], 0)
+
+    def test_background_is_transparent(self):
+        image = open_render(render_skin_model(make_texture(), 'bust', 128))
+        self.assertEqual(image.getpixel((0, 0))[3], 0)
+        self.assertEqual(image.getpixel((127, 0))[3], 0)
+
+    def test_slim_variant_is_narrower(self):
+        classic = open_render(render_skin_model(make_texture(), 'frontfull', 128))
+        slim = open_render(render_skin_model(make_texture(), 'frontfull', 128, 'slim'))
+        self.assertLess(slim.width, classic.width)
+
+    def test_legacy_texture(self):
+        image = open_render(render_skin_model(make_texture((64, 32)), 'full', 128))
+        self.assertEqual(image.height, 128)
+
+    def test_invalid_texture(self):
+        with self.assertRaises(ValueError):
+            render_skin_model(make_texture((32, 32)), 'bust', 128)
+
+        with self.assertRaises(ValueError):
+            render_skin_model(b'not an image', 'bust', 128)
+
+        with self.assertRaises(ValueError):
+            render_skin_model(make_texture(), 'cape', 128)
+
+
+class TestDefaultSkinVariant(unittest.TestCase):
+    def test_java_hash_code_parity(self):
+        # Java's `UUID.hashCode()` xors the four 32 bit parts
+        self.assertEqual(default_skin_variant('0' * 32), 'classic')
+        self.assertEqual(default_skin_variant('0' * 31 + '1'), 'slim')
+        self.assertEqual(default_skin_variant('00000001' + '0' * 24), 'slim')
+        self.assertEqual(default_skin_variant('00000001' + '0' * 23 + '1'), 'classic')
+
+    def test_dashed_uuid(self):
+        self.assertEqual(
+            default_skin_variant('00000000-0000-0000-0000-000000000001'), 'slim')
+
+
+class TestSkinRenderCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.cache = SkinRenderCache(self.tempdir.name, max_bytes=10_000)
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def test_textures_and_renders(self):
+        texture = make_texture()
+        texture_hash = skin_texture_hash(texture)
+
+        self.assertIsNone(self.cache.get_texture('https://example.com/texture'))
+        self.cache.set_texture('https://example.com/texture', texture)
+        self.assertEqual(self.cache.get_texture('https://example.com/texture'), texture)
+
+        self.assertIsNone(self.cache.get_render(texture_hash, 'classic', 'bust', 144))
+        self.cache.set_render(texture_hash, 'classic', 'bust', 144, b'render')
+        self.assertEqual(self.cache.get_render(texture_hash, 'classic', 'bust', 144), b'render')
+        self.assertIsNone(self.cache.get_render(texture_hash, 'slim', 'bust', 144))
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 3))
+
+    def test_prune_least_recently_used(self):
+        for i in range(5):
+            self.cache.set_render(str(i), 'classic', 'bust', 144, os.urandom(3000))
+            os.utime(self.cache._render_path(str(i), 'classic', 'bust', 144),
+                     (time.time() - 100 + i, time.time() - 100 + i))
+
+        # Reading a render marks it as recently used
+        self.cache.get_render('0', 'classic', 'bust', 144)
+
+        self.assertEqual(self.cache.prune(), 6000)
+        self.assertIsNotNone(self.cache.get_render('0', 'classic', 'bust', 144))
+        self.assertIsNone(self.cache.get_render('1', 'classic', 'bust', 144))
+        self.assertIsNone(self.cache.get_render('2', 'classic', 'bust', 144))
+        self.assertIsNotNone(self.cache.get_render('4', 'classic', 'bust', 144))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+from unittest.mock import patch
+
+from statalib import stats_snapshot
+from statalib.functions import db_connect
+from statalib.stats_snapshot import (
+    BedwarsStatsSnapshot,
+    get_snapshot_dedup_stats,
+    load_snapshot,
+    pack_snapshot_values,
+    release_snapshot,
+    replace_snapshot,
+    snapshot_content_id,
+    store_snapshot,
+    unpack_snapshot_values
+)
+
+from utils import clean_database
+
+
+STAT_KEYS = BedwarsStatsSnapshot.keys(include_snapshot_id=False)
+VALUES = [i * 37 for i in range(len(STAT_KEYS))]
+
+
+def table_count(table: str) -> int:
+    with db_connect() as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+
+class TestPacking(unittest.TestCase):
+    def test_round_trip(self):
+        values = [0, 1, -1, 63, -64, 64, 127, 128, 10**7, -10**7, 2**70]
+        self.assertEqual(unpack_snapshot_values(pack_snapshot_values(values)), values)
+
+    def test_small_values_one_byte(self):
+        self.assertEqual(len(pack_snapshot_values([0, 63, -64])), 3)
+        self.assertEqual(len(pack_snapshot_values([64])), 2)
+
+    def test_integral_floats(self):
+        self.assertEqual(unpack_snapshot_values(pack_snapshot_values([5.0])), [5])
+
+    def test_non_integers(self):
+        for value in (1.5, None, '1'):
+            with self.assertRaises(ValueError):
+                pack_snapshot_values([value])
+
+    def test_snapshot_round_trip(self):
+        snapshot = BedwarsStatsSnapshot('id', *VALUES)
+        self.assertEqual(BedwarsStatsSnapshot.unpack('id', snapshot.pack()), snapshot)
+
+    def test_older_layout(self):
+        layouts = {1: ('wins_bedwars', 'Experience'), 2: tuple(STAT_KEYS)}
+
+        with patch.object(stats_snapshot, 'SNAPSHOT_LAYOUTS', layouts):
+            snapshot = BedwarsStatsSnapshot.unpack(
+                'id', pack_snapshot_values([3, 500]), layout_version=1)
+
+        self.assertEqual(snapshot.wins_bedwars, 3)
+        self.assertEqual(snapshot.Experience, 500)
+        self.assertEqual(snapshot.losses_bedwars, 0)
+
+
+class TestSnapshotStorage(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+    def test_store_packed(self):
+        with db_connect() as conn:
+            snapshot_id = store_snapshot(conn.cursor(), VALUES)
+
+        self.assertEqual(snapshot_id, snapshot_content_id(pack_snapshot_values(VALUES)))
+        self.assertEqual(table_count('bedwars_stats_snapshots_packed'), 1)
+        self.assertEqual(table_count('bedwars_stats_snapshots'), 0)
+
+        with db_connect() as conn:
+            snapshot = load_snapshot(conn.cursor(), snapshot_id)
+        self.assertEqual(snapshot.as_tuple(), (snapshot_id, *VALUES))
+
+    def test_unpackable_stored_in_columns(self):
+        values = [0.5, *VALUES[1:]]
+
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            snapshot_id = store_snapshot(cursor, values)
+            self.assertNotEqual(store_snapshot(cursor, values), snapshot_id)
+
+            snapshot = load_snapshot(cursor, snapshot_id)
+
+        self.assertEqual(table_count('bedwars_stats_snapshots'), 2)
+        self.assertEqual(snapshot.Experience, 0.5)
+
+    def test_identical_snapshots_shared(self):
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            snapshot_ids = {store_snapshot(cursor, VALUES) for _ in range(3)}
+            other_id = store_snapshot(cursor, [0] * len(VALUES))
+
+            self.assertEqual(len(snapshot_ids), 1)
+            self.assertNotIn(other_id, snapshot_ids)
+            self.assertEqual(table_count('bedwars_stats_snapshots_packed'), 2)
+
+            stats = get_snapshot_dedup_stats(cursor)
+            self.assertEqual((stats.references, stats.stored), (4, 2))
+            self.assertEqual(stats.ratio, 2.0)
+
+    def test_release(self):
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            snapshot_id = store_snapshot(cursor, VALUES)
+            store_snapshot(cursor, VALUES)
+
+            release_snapshot(cursor, snapshot_id)
+            self.assertIsNotNone(load_snapshot(cursor, snapshot_id))
+
+            release_snapshot(cursor, snapshot_id)
+            self.assertIsNone(load_snapshot(cursor, snapshot_id))
+
+            unpacked_id = store_snapshot(cursor, [0.5, *VALUES[1:]])
+            release_snapshot(cursor, unpacked_id)
+            self.assertIsNone(load_snapshot(cursor, unpacked_id))
+
+    def test_replace(self):
+        new_values = [value + 1 for value in VALUES]
+
+        with db_connect() as conn:
+            cursor = conn.cursor()
+            packed_id = store_snapshot(cursor, VALUES)
+            shared_id = store_snapshot(cursor, VALUES)
+            columns_id = store_snapshot(cursor, [0.5, *VALUES[1:]])
+
+            self.assertEqual(replace_snapshot(cursor, packed_id, VALUES), packed_id)
+
+            for snapshot_id in (shared_id, columns_id):
+                new_id = replace_snapshot(cursor, snapshot_id, new_values)
+                self.assertEqual(
+                    load_snapshot(cursor, new_id).as_tuple(include_snapshot_id=False),
+                    tuple(new_values))
+
+            # Still referenced once
+            self.assertEqual(
+                load_snapshot(cursor, packed_id).as_tuple(include_snapshot_id=False),
+                tuple(VALUES))
+
+        self.assertEqual(table_count('bedwars_stats_snapshots'), 0)
+        self.assertEqual(table_count('bedwars_stats_snapshots_packed'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from statalib.functions import (
+    commands_ran,
+    db_connect,
+    get_command_usage,
+    update_command_stats
+)
+from statalib.usage_recorder import UsageRecorder, UsageRecorderConfig
+
+from utils import clean_database, MockData
+
+
+def command_usage(discord_id: int, command: str) -> tuple[int, int] | None:
+    """Returns the user's overall usage and usage of the command"""
+    usage = get_command_usage(discord_id)
+    if not usage:
+        return None
+    return commands_ran(discord_id), usage.get(command)
+
+
+def growth_data() -> list[tuple]:
+    with db_connect() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT discord_id, action, growth FROM growth_data ORDER BY rowid')
+        return cursor.fetchall()
+
+
+class TestUpdateCommandStats(unittest.TestCase):
+    def setUp(self) -> None:
+        clean_database()
+
+    def test_new_and_existing_user(self):
+        update_command_stats(MockData.discord_id, 'bedwars')
+        update_command_stats(MockData.discord_id, 'bedwars')
+        update_command_stats(MockData.discord_id, 'session')
+
+        self.assertEqual(command_usage(MockData.discord_id, 'bedwars'), (3, 2))
+        self.assertEqual(command_usage(MockData.discord_id, 'session'), (3, 1))
+        self.assertEqual(command_usage(0, 'bedwars'), (3, 2))
+
+        self.assertIn((MockData.discord_id, 'add', 'user'), growth_data())
+
+    def test_usage_order(self):
+        update_command_stats(MockData.discord_id, 'session')
+        update_command_stats(MockData.discord_id, 'bedwars')
+        update_command_stats(MockData.discord_id, 'bedwars')
+
+        self.assertEqual(
+            list(get_command_usage(MockData.discord_id).items()),
+            [('bedwars', 2), ('session', 1)])
+        self.assertEqual(commands_ran(MockData.discord_id_2, default=None), None)
+
+
+class TestUsageRecorder(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        clean_database()
+        self.recorder = UsageRecorder(
+            UsageRecorderConfig(flush_interval=0.05, max_pending=100))
+
+
+    async def test_buffered_until_flush(self):
+        self.recorder.record_command(MockData.discord_id, 'bedwars')
+        self.recorder.record_growth(MockData.discord_id_2, 'add', 'guild')
+
+        self.assertIsNone(command_usage(MockData.discord_id, 'bedwars'))
+        self.assertEqual(self.recorder.pending, 2)
+
+        await self.recorder.flush()
+
+        self.assertEqual(command_usage(MockData.discord_id, 'bedwars'), (1, 1))
+        self.assertIn((MockData.discord_id_2, 'add', 'guild'), growth_data())
+        self.assertEqual(self.recorder.pending, 0)
+
+    async def test_increments_aggregated(self):
+        for _ in range(5):
+            self.recorder.record_command(MockData.discord_id, 'bedwars')
+        self.recorder.record_command(MockData.discord_id_2, 'bedwars')
+        await self.recorder.flush()
+
+        self.assertEqual(command_usage(MockData.discord_id, 'bedwars'), (5, 5))
+        self.assertEqual(command_usage(0, 'bedwars'), (6, 6))
+        self.assertEqual(self.recorder.stats.flushes, 1)
+
+    async def test_periodic_flush_and_stop(self):
+        self.recorder.start()
+        self.recorder.record_command(MockData.discord_id, 'bedwars')
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(command_usage(MockData.discord_id, 'bedwars'), (1, 1))
+
+        self.recorder.record_command(MockData.discord_id, 'bedwars')
+        await self.recorder.stop()
+
+        self.assertFalse(self.recorder.running)
+        self.assertEqual(command_usage(MockData.discord_id, 'bedwars'), (2, 2))
+
+    async def test_max_pending_flushes_early(self):
+        for _ in range(100):
+            self.recorder.record_command(MockData.discord_id, 'bedwars')
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(command_usage(MockData.discord_id, 'bedwars'), (100, 100))
+
+    async def test_failed_flush_keeps_events(self):
+        self.recorder.record_command(MockData.discord_id, 'bedwars')
+
+        with patch('statalib.usage_recorder.increment_command_usage', side_effect=OSError), \
+                patch('statalib.usage_recorder.logger'):
+            await self.recorder.flush()
+
+        self.assertEqual(self.recorder.pending, 1)
+        self.assertEqual(self.recorder.stats.failed_flushes, 1)
+
+        await self.recorder.flush()
+        self.assertEqual(command_usage(MockData.discord_id, 'bedwars'), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
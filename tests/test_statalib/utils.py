@@ -1,5 +1,4 @@
 import os
-import sqlite3
 
 from dotenv import load_dotenv
 
@@ -22,17 +21,25 @@ class MockData:
 
 
 def clean_database() -> None:
-    with sqlite3.connect(config.DB_FILE_PATH) as conn:
+    with statalib.db_connect() as conn:
         cursor = conn.cursor()
 
-        # Get all table names
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
+        # Get all table names, including those of attached databases
+        cursor.execute("PRAGMA database_list")
+        schemas = [row[1] for row in cursor.fetchall() if row[1] != 'temp']
+
+        tables = []
+        for schema in schemas:
+            cursor.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type='table'")
+            tables += [f"{schema}.{row[0]}" for row in cursor.fetchall()]
 
         # Clear each table
         for table in tables:
             cursor.execute(f"DELETE FROM {table}")
 
+    # The tables were cleared without going through the invalidating functions
+    statalib.entitlements_cache.clear()
+
 
 link_mock_data = lambda: statalib \
     .LinkingManager(MockData.discord_id) \